@@ -1,4 +1,5 @@
 import { useState, useEffect, useRef, useCallback, useMemo } from "react";
+import { applyLogFrame } from "../logEvents.js";
 
 // ─── CONFIGURATION ─────────────────────────────────────────────────
 const WS_URL = `ws://${window.location.hostname}:8765`;
@@ -99,7 +100,12 @@ function cardLabel(card) {
     return `${col?.name || card.color} ${card.value}`;
   }
   const info = TACTICS_INFO[card.id];
-  return info?.name || card.name || card.id;
+  return info?.name || card.id;
+}
+
+// State cards carry only their id; the subtype comes from the catalog.
+function tacticSubtype(card) {
+  return card.type === "tactics" ? TACTICS_INFO[card.id]?.subtype : undefined;
 }
 
 function classifyFormation(cards, hasFog) {
@@ -123,8 +129,9 @@ function classifyFormation(cards, hasFog) {
 
 function getPlayActionKind(card) {
   if (card.type === "troop") return "play_troop";
-  if (card.subtype === "leader" || card.subtype === "morale") return "play_morale_tactic";
-  if (card.subtype === "environment") return "play_environment";
+  const subtype = tacticSubtype(card);
+  if (subtype === "leader" || subtype === "morale") return "play_morale_tactic";
+  if (subtype === "environment") return "play_environment";
   if (card.id === "scout") return "play_scout";
   if (card.id === "redeploy") return "play_redeploy";
   if (card.id === "deserter") return "play_deserter";
@@ -133,7 +140,8 @@ function getPlayActionKind(card) {
 }
 
 function needsFlagTarget(card) {
-  return card.type === "troop" || card.subtype === "leader" || card.subtype === "morale" || card.subtype === "environment";
+  const subtype = tacticSubtype(card);
+  return card.type === "troop" || subtype === "leader" || subtype === "morale" || subtype === "environment";
 }
 
 function getValidFlags(state, myIdx, card) {
@@ -141,7 +149,7 @@ function getValidFlags(state, myIdx, card) {
   for (let fi = 0; fi < 9; fi++) {
     const flag = state.flags[fi];
     if (flag.claimed_by !== null) continue;
-    if (card.subtype === "environment") {
+    if (tacticSubtype(card) === "environment") {
       if (!flag.environment.includes(card.id)) valid.push(fi);
     } else {
       const required = flag.environment.includes("mud") ? 4 : 3;
@@ -171,6 +179,7 @@ function useGameConnection() {
 
   const wsRef = useRef(null);
   const tokenRef = useRef(null);
+  const logTemplatesRef = useRef({});
 
   const send = useCallback((msg) => {
     if (wsRef.current?.readyState === WebSocket.OPEN) {
@@ -227,14 +236,15 @@ function useGameConnection() {
         case "game_started":
           setGameStarted(true);
           break;
+        case "catalog":
+          logTemplatesRef.current = msg.catalog.log || {};
+          break;
         case "game_state":
           setGameState(msg.state);
           setPhaseInfo(msg.phase_info);
           setYourTurn(msg.your_turn);
           setWaitingFor(msg.waiting_for || []);
-          break;
-        case "game_log":
-          setGameLogs(prev => [...prev, ...(msg.messages || [])]);
+          setGameLogs(prev => applyLogFrame(prev, msg, logTemplatesRef.current));
           break;
         case "action_error":
           setError(msg.message);
@@ -343,7 +353,7 @@ function TroopCard({ card, onClick, selected, disabled, small }) {
 }
 
 function TacticsCard({ card, onClick, selected, disabled, small }) {
-  const info = TACTICS_INFO[card.id] || { name: card.name || card.id, icon: "?", subtype: "?" };
+  const info = TACTICS_INFO[card.id] || { name: card.id, icon: "?", subtype: "?" };
   const w = small ? 48 : 60;
   const h = small ? 68 : 85;
   return (
@@ -772,7 +782,7 @@ function ActionPanel({ state, myIdx, yourTurn, sendAction, selectedHandIndex, se
 
   // ── Play Card Phase ──
   if (phase === "play_card") {
-    const isGuile = selectedCard?.subtype === "guile";
+    const isGuile = selectedCard ? tacticSubtype(selectedCard) === "guile" : false;
     const hasTroops = hand.some(c => c.type === "troop");
     const hasOpenFlags = state.flags.some(f =>
       f.claimed_by === null &&
@@ -1178,10 +1188,10 @@ function GameScreen({ conn }) {
     if (!card) return false;
 
     if (subPhase === "redeploy_pick" && side === myIdx) {
-      return card.type === "troop" || card.subtype === "leader" || card.subtype === "morale";
+      return card.type === "troop" || ["leader", "morale"].includes(tacticSubtype(card));
     }
     if (subPhase === "deserter_pick" && side === oppIdx) {
-      return card.type === "troop" || card.subtype === "leader" || card.subtype === "morale";
+      return card.type === "troop" || ["leader", "morale"].includes(tacticSubtype(card));
     }
     if (subPhase === "traitor_pick" && side === oppIdx) {
       return card.type === "troop";
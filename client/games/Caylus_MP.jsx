@@ -1,4 +1,5 @@
 import { useState, useRef, useCallback, useEffect } from "react";
+import { applyLogFrame } from "../logEvents.js";
 
 const WS_URL = `ws://${window.location.hostname}:8765`;
 
@@ -213,6 +214,29 @@ function ResourceBadge({ type, count, small }) {
   );
 }
 
+// ============================================================
+// CATALOG — building definitions, sent by the server once per
+// connection. State holds building ids; resolve them here.
+// ============================================================
+
+const CATALOG_KEY = "catalog_caylus";
+
+function loadCachedCatalog() {
+  try { return JSON.parse(localStorage.getItem(CATALOG_KEY)); } catch { return null; }
+}
+
+function hydrateState(state, catalog) {
+  const buildings = catalog?.catalog?.buildings || {};
+  const lookup = (id) => (id == null ? null : buildings[id] || { id, name: id });
+  return {
+    ...state,
+    road: state.road.map(slot => ({ ...slot, building: lookup(slot.building) })),
+    building_stock: Object.fromEntries(
+      Object.entries(state.building_stock).map(([type, ids]) => [type, ids.map(lookup)])
+    ),
+  };
+}
+
 // ============================================================
 // WEBSOCKET CONNECTION HOOK
 // ============================================================
@@ -235,6 +259,7 @@ function useGameConnection() {
 
   const wsRef = useRef(null);
   const tokenRef = useRef(null);
+  const catalogRef = useRef(loadCachedCatalog());
 
   const send = useCallback((msg) => {
     if (wsRef.current?.readyState === WebSocket.OPEN)
@@ -249,7 +274,7 @@ function useGameConnection() {
       setConnected(true);
       setError(null);
       if (tokenRef.current)
-        ws.send(JSON.stringify({ type: "reconnect", token: tokenRef.current }));
+        ws.send(JSON.stringify({ type: "reconnect", token: tokenRef.current, catalog_hash: catalogRef.current?.hash }));
       onOpen?.();
     };
     ws.onmessage = (evt) => {
@@ -262,7 +287,7 @@ function useGameConnection() {
           setToken(msg.token);
           tokenRef.current = msg.token;
           sessionStorage.setItem("game_token", msg.token);
-          ws.send(JSON.stringify({ type: "auth", token: msg.token }));
+          ws.send(JSON.stringify({ type: "auth", token: msg.token, catalog_hash: catalogRef.current?.hash }));
           break;
         case "authenticated":
           setRoomCode(msg.room_code);
@@ -277,14 +302,16 @@ function useGameConnection() {
         case "game_started":
           setGameStarted(true);
           break;
+        case "catalog":
+          catalogRef.current = { hash: msg.hash, catalog: msg.catalog };
+          localStorage.setItem(CATALOG_KEY, JSON.stringify(catalogRef.current));
+          break;
         case "game_state":
-          setGameState(msg.state);
+          setGameState(hydrateState(msg.state, catalogRef.current));
           setPhaseInfo(msg.phase_info);
           setYourTurn(msg.your_turn);
           setWaitingFor(msg.waiting_for || []);
-          break;
-        case "game_log":
-          setGameLogs((prev) => [...prev, ...msg.messages]);
+          setGameLogs(prev => applyLogFrame(prev, msg, catalogRef.current?.catalog?.log));
           break;
         case "game_over":
           setGameOver(true);
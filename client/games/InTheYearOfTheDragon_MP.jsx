@@ -1,4 +1,5 @@
 import { useState, useEffect, useRef, useCallback, useMemo } from "react";
+import { applyLogFrame, renderLogEntry } from "../logEvents.js";
 
 // ─── CONFIGURATION ─────────────────────────────────────────────────
 const WS_URL = `ws://${window.location.hostname}:8765`;
@@ -91,6 +92,28 @@ function countSymbols(player, typeId) {
   return total;
 }
 
+// ─── CATALOG ───────────────────────────────────────────────────────
+// Event definitions arrive from the server once per connection; the
+// state's event track holds only {id, slot}, and the current event's log
+// holds log events, rendered here with the catalog's templates.
+
+const CATALOG_KEY = "catalog_dragon";
+
+function loadCachedCatalog() {
+  try { return JSON.parse(localStorage.getItem(CATALOG_KEY)); } catch { return null; }
+}
+
+function hydrateState(state, catalog) {
+  const events = catalog?.catalog?.events || {};
+  const templates = catalog?.catalog?.log;
+  const ev = state.event;
+  return {
+    ...state,
+    events: (state.events || []).map(tile => ({ ...(events[tile.id] || { name: tile.id }), ...tile })),
+    event: ev && { ...ev, log: (ev.log || []).map(entry => renderLogEntry(entry, templates, state.players)) },
+  };
+}
+
 // ─── WEBSOCKET HOOK ────────────────────────────────────────────────
 
 function useGameConnection() {
@@ -111,6 +134,7 @@ function useGameConnection() {
 
   const wsRef = useRef(null);
   const tokenRef = useRef(null);
+  const catalogRef = useRef(loadCachedCatalog());
 
   const send = useCallback((msg) => {
     if (wsRef.current?.readyState === WebSocket.OPEN) {
@@ -131,7 +155,7 @@ function useGameConnection() {
       setError(null);
       // If we have a token, auto-reconnect
       if (tokenRef.current) {
-        ws.send(JSON.stringify({ type: "reconnect", token: tokenRef.current }));
+        ws.send(JSON.stringify({ type: "reconnect", token: tokenRef.current, catalog_hash: catalogRef.current?.hash }));
       }
       onOpen?.();
     };
@@ -147,7 +171,7 @@ function useGameConnection() {
           tokenRef.current = msg.token;
           sessionStorage.setItem("game_token", msg.token);
           // Auto-auth after create
-          ws.send(JSON.stringify({ type: "auth", token: msg.token }));
+          ws.send(JSON.stringify({ type: "auth", token: msg.token, catalog_hash: catalogRef.current?.hash }));
           break;
 
         case "joined":
@@ -156,7 +180,7 @@ function useGameConnection() {
           setToken(msg.token);
           tokenRef.current = msg.token;
           sessionStorage.setItem("game_token", msg.token);
-          ws.send(JSON.stringify({ type: "auth", token: msg.token }));
+          ws.send(JSON.stringify({ type: "auth", token: msg.token, catalog_hash: catalogRef.current?.hash }));
           break;
 
         case "authenticated":
@@ -175,15 +199,17 @@ function useGameConnection() {
           setGameStarted(true);
           break;
 
+        case "catalog":
+          catalogRef.current = { hash: msg.hash, catalog: msg.catalog };
+          localStorage.setItem(CATALOG_KEY, JSON.stringify(catalogRef.current));
+          break;
+
         case "game_state":
-          setGameState(msg.state);
+          setGameState(hydrateState(msg.state, catalogRef.current));
           setPhaseInfo(msg.phase_info);
           setYourTurn(msg.your_turn);
           setWaitingFor(msg.waiting_for || []);
-          break;
-
-        case "game_log":
-          setGameLogs(prev => [...prev, ...(msg.messages || [])]);
+          setGameLogs(prev => applyLogFrame(prev, msg, catalogRef.current?.catalog?.log));
           break;
 
         case "action_error":
@@ -1,4 +1,5 @@
 import React, { useState, useEffect, useRef, useCallback, useMemo } from "react";
+import { applyLogFrame } from "../logEvents.js";
 
 // ─── CONFIGURATION ─────────────────────────────────────────────────
 const WS_URL = `ws://${window.location.hostname}:8765`;
@@ -99,6 +100,7 @@ function useGameConnection() {
 
   const wsRef = useRef(null);
   const tokenRef = useRef(null);
+  const logTemplatesRef = useRef({});
 
   const send = useCallback((msg) => {
     if (wsRef.current?.readyState === WebSocket.OPEN)
@@ -143,14 +145,15 @@ function useGameConnection() {
         case "game_started":
           setGameStarted(true);
           break;
+        case "catalog":
+          logTemplatesRef.current = msg.catalog.log || {};
+          break;
         case "game_state":
           setGameState(msg.state);
           setPhaseInfo(msg.phase_info);
           setYourTurn(msg.your_turn);
           setWaitingFor(msg.waiting_for || []);
-          break;
-        case "game_log":
-          setGameLogs((prev) => [...prev, ...msg.messages]);
+          setGameLogs(prev => applyLogFrame(prev, msg, logTemplatesRef.current));
           break;
         case "game_over":
           setGameOver(true);
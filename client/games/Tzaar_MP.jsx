@@ -1,4 +1,5 @@
 import React, { useState, useEffect, useRef, useCallback, useMemo } from "react";
+import { applyLogFrame } from "../logEvents.js";
 
 // ─── CONFIGURATION ─────────────────────────────────────────────────
 const WS_URL = `ws://${window.location.hostname}:8765`;
@@ -101,6 +102,7 @@ function useGameConnection() {
   const [error, setError] = useState(null);
   const wsRef = useRef(null);
   const tokenRef = useRef(null);
+  const logTemplatesRef = useRef({});
 
   const send = useCallback((msg) => { if (wsRef.current?.readyState === WebSocket.OPEN) wsRef.current.send(JSON.stringify(msg)); }, []);
 
@@ -115,8 +117,8 @@ function useGameConnection() {
         case "authenticated": setRoomCode(msg.room_code); setPlayerId(msg.player_id); setIsHost(msg.is_host); setGameStarted(msg.game_started); break;
         case "lobby_update": setLobby(msg.players); if (msg.game_started !== undefined) setGameStarted(msg.game_started); break;
         case "game_started": setGameStarted(true); break;
-        case "game_state": setGameState(msg.state); setPhaseInfo(msg.phase_info); setYourTurn(msg.your_turn); setWaitingFor(msg.waiting_for || []); break;
-        case "game_log": setGameLogs(prev => [...prev, ...msg.messages]); break;
+        case "catalog": logTemplatesRef.current = msg.catalog.log || {}; break;
+        case "game_state": setGameState(msg.state); setPhaseInfo(msg.phase_info); setYourTurn(msg.your_turn); setWaitingFor(msg.waiting_for || []); setGameLogs(prev => applyLogFrame(prev, msg, logTemplatesRef.current)); break;
         case "game_over": setGameOver(true); break;
         case "action_error": setError(msg.message); break;
         case "error": setError(msg.message); break;
@@ -0,0 +1,40 @@
+// ============================================================
+// GAME LOG EVENTS
+// The server sends log entries as events, [code, ...args], in the
+// "log" field of each game_state frame. The catalog's "log" section maps
+// codes to templates like "{player} passes"; arguments fill the fields in
+// order of first appearance, and player fields ("player", "*_player")
+// hold a seat index. Plain strings pass through unchanged.
+// Mirrors server/log_events.py.
+// ============================================================
+
+const FIELD = /\{(\w+)\}/g;
+
+function isPlayerField(name) {
+  return name === "player" || name.endsWith("_player");
+}
+
+export function renderLogEntry(entry, templates, players) {
+  if (typeof entry === "string") return entry;
+  const [code, ...args] = entry;
+  const template = templates?.[code];
+  if (template == null) return code;
+  const values = {};
+  let i = 0;
+  for (const [, name] of template.matchAll(FIELD)) {
+    if (name in values || i >= args.length) continue;
+    const arg = args[i++];
+    values[name] = isPlayerField(name) ? (players?.[arg]?.name ?? String(arg)) : arg;
+  }
+  return template.replace(FIELD, (field, name) => (name in values ? String(values[name]) : field));
+}
+
+// Fold a game_state frame's log into the rendered log so far. A frame with
+// log_start 0 carries the whole log (join, reconnect); others carry only
+// the entries since the previous frame.
+export function applyLogFrame(prev, msg, templates) {
+  if (!msg.log) return prev;
+  const lines = msg.log.map(entry => renderLogEntry(entry, templates, msg.state?.players));
+  if (msg.log_start === 0) return lines;
+  return lines.length ? [...prev, ...lines] : prev;
+}
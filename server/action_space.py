@@ -0,0 +1,165 @@
+"""
+Fixed integer action spaces.
+
+An ActionSpace lays out every action an engine could ever accept as one
+dense range of integers, so bots, replay logs and the wire protocol can
+pass small ints around instead of action dicts.
+
+Each action kind owns a contiguous block of indices. Within a block the
+index is a mixed-radix number over the kind's parameter domains, e.g.
+Dvonn's "move_stack" block is 49 × 49 wide (from × to).
+
+Legal-action masks are plain Python ints used as bit arrays: bit i is set
+when action i is legal. mask_to_bytes packs one into a compact
+little-endian byte string.
+"""
+
+from bisect import bisect_right
+
+
+def _freeze(value):
+    """Make a parameter value hashable (lists become tuples)."""
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    """Inverse of _freeze, so decoded actions look like client actions."""
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def action_key(action):
+    """
+    Return a canonical hashable key for an action dict. Two actions with
+    the same fields and values get the same key regardless of field order.
+    """
+    return tuple(sorted((name, _freeze(value)) for name, value in action.items()))
+
+
+class _KindBlock:
+    """One contiguous block of the action space."""
+
+    __slots__ = ("kind", "fixed", "names", "values", "lookups", "radices", "offset", "size", "key")
+
+    def __init__(self, kind, fields, fixed, offset, set_fields):
+        self.kind = kind
+        self.fixed = dict(fixed or {})
+        self.names = [name for name, _ in fields]
+        self.values = [list(domain) for _, domain in fields]
+        self.lookups = []
+        self.key = {}
+        for name, domain in fields:
+            normalize = frozenset if name in set_fields else _freeze
+            self.key[name] = normalize
+            self.lookups.append({normalize(v): i for i, v in enumerate(domain)})
+        self.radices = [len(v) for v in self.values]
+        size = 1
+        for r in self.radices:
+            size *= r
+        self.offset = offset
+        self.size = size
+
+    def matches(self, action):
+        return all(action.get(k) == v for k, v in self.fixed.items())
+
+    def encode(self, action):
+        index = 0
+        for name, lookup, radix in zip(self.names, self.lookups, self.radices):
+            value = action.get(name)
+            try:
+                pos = lookup[self.key[name](value)]
+            except (KeyError, TypeError):
+                raise ValueError(f"Value {value!r} for '{name}' is outside the {self.kind} action space")
+            index = index * radix + pos
+        return self.offset + index
+
+    def decode(self, index):
+        action = {"kind": self.kind}
+        action.update(self.fixed)
+        rest = index - self.offset
+        positions = []
+        for radix in reversed(self.radices):
+            rest, pos = divmod(rest, radix)
+            positions.append(pos)
+        for name, values, pos in zip(self.names, self.values, reversed(positions)):
+            action[name] = _thaw(_freeze(values[pos]))
+        return action
+
+
+class ActionSpace:
+    """
+    Dense integer encoding for an engine's actions.
+
+    kinds is a list of (kind, fields) or (kind, fields, fixed) tuples:
+      fields — list of (field_name, domain) pairs; domain is every value the
+               field can take, in a fixed order
+      fixed  — constant fields that distinguish two blocks sharing a kind,
+               e.g. {"source": "discard"}
+
+    set_fields names fields (as (kind, field) pairs) whose values are
+    unordered key lists, so ["a", "b"] and ["b", "a"] encode the same.
+    """
+
+    def __init__(self, kinds, set_fields=()):
+        self._blocks = []
+        self._by_kind = {}
+        offset = 0
+        for spec in kinds:
+            kind, fields = spec[0], spec[1]
+            fixed = spec[2] if len(spec) > 2 else None
+            unordered = {f for k, f in set_fields if k == kind}
+            block = _KindBlock(kind, fields, fixed, offset, unordered)
+            self._blocks.append(block)
+            self._by_kind.setdefault(kind, []).append(block)
+            offset += block.size
+        self._offsets = [b.offset for b in self._blocks]
+        self.size = offset
+
+    def __len__(self):
+        return self.size
+
+    def encode(self, action):
+        """Return the integer index of an action dict. Raises ValueError if unknown."""
+        kind = action.get("kind")
+        for block in self._by_kind.get(kind, ()):
+            if block.matches(action):
+                return block.encode(action)
+        raise ValueError(f"Action kind '{kind}' is not in the action space")
+
+    def decode(self, index):
+        """Return the action dict for an integer index. Raises ValueError if out of range."""
+        if not isinstance(index, int) or not 0 <= index < self.size:
+            raise ValueError(f"Action index {index!r} out of range (0..{self.size - 1})")
+        block = self._blocks[bisect_right(self._offsets, index) - 1]
+        return block.decode(index)
+
+    def offset(self, kind):
+        """Return the first index of a kind's block (its first block, if it has several)."""
+        if kind not in self._by_kind:
+            raise ValueError(f"Action kind '{kind}' is not in the action space")
+        return self._by_kind[kind][0].offset
+
+    def mask(self, actions):
+        """Build a legal-action bit mask (Python int) from an iterable of actions."""
+        mask = 0
+        for action in actions:
+            mask |= 1 << self.encode(action)
+        return mask
+
+    def mask_to_bytes(self, mask):
+        """Pack a mask into (size + 7) // 8 little-endian bytes."""
+        return mask.to_bytes((self.size + 7) // 8, "little")
+
+    def mask_from_bytes(self, data):
+        return int.from_bytes(data, "little")
+
+    @staticmethod
+    def iter_mask(mask):
+        """Yield the indices of set bits in a mask, lowest first."""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
@@ -10,60 +10,129 @@ Phase machine:
 
 from copy import deepcopy
 
+from server.action_space import ActionSpace
 from server.game_engine import GameEngine, ActionResult
+from server.log_events import log_event
+from server.snapshot import SnapshotCodec
+from server.views import BY_INDEX, Private, build_view, count, drop
 from server.arboretum.state import (
     create_initial_state, get_valid_placements, pos_key, parse_key,
+    GRID_SIZE, HAND_SIZE, SPECIES, VALUES,
 )
 from server.arboretum.scoring import compute_final_scores
 
 
+# ── Action space ──────────────────────────────────────────────────────
+
+# A hand holds HAND_SIZE + 2 cards between drawing and discarding.
+_HAND_SLOTS = range(HAND_SIZE + 2)
+
+ACTION_SPACE = ActionSpace([
+    ("draw_card", [], {"source": "deck"}),
+    ("draw_card", [("player_index", range(4))], {"source": "discard"}),
+    ("place_card", [("card_index", _HAND_SLOTS), ("row", range(GRID_SIZE)), ("col", range(GRID_SIZE))]),
+    ("discard_card", [("card_index", _HAND_SLOTS)]),
+])
+
+
+# ── Hidden information ────────────────────────────────────────────────
+
+REDACTIONS = [
+    Private(("players", "*", "hand"), count, owner=BY_INDEX),
+    Private(("draw_pile",), count),
+    Private(("rng",), drop),
+]
+
+
+# ── Log events ────────────────────────────────────────────────────
+
+LOG_EVENTS = {
+    "draw_deck": "{player} draws from the deck",
+    "draw_own_discard": "{player} draws from own discard",
+    "draw_discard": "{player} draws from {target_player}'s discard",
+    "place": "{player} places {species} {value} at ({row},{col})",
+    "discard": "{player} discards {species} {value}",
+    "win": "Game over! {player} wins with {score} points!",
+    "tie": "Game over! {names} tie with {score} points!",
+}
+
+
+# ── Snapshots ─────────────────────────────────────────────────────────
+
+SNAPSHOT_CODEC = SnapshotCodec(
+    "arboretum",
+    strings=[
+        "index", "player_id", "name", "hand", "discard", "grid",
+        "game", "player_ids", "player_count", "players", "active_species", "draw_pile",
+        "draw_pile_count", "current_player", "turn_number", "phase", "draw_state",
+        "cards_drawn", "first_drawn_card", "winner", "game_over", "scoring_results", "rng",
+        "seed", "draws",
+        "species_results", "species", "rights", "hand_cards", "raw_sums", "adjusted_sums",
+        "one_holders", "eights_cancelled", "eligible", "paths", "player_index", "has_rights",
+        "path", "path_score", "actual_score", "totals", "winners",
+        "arboretum", "draw1", "draw2", "place",
+        *(pos_key(row, col) for row in range(GRID_SIZE) for col in range(GRID_SIZE)),
+    ],
+    atoms=[{"species": species["id"], "value": value} for species in SPECIES for value in VALUES]
+          + SPECIES,
+)
+
+
 class ArboretumEngine(GameEngine):
 
     player_count_range = (2, 4)
+    action_space = ACTION_SPACE
+    log_events = LOG_EVENTS
+    snapshot_codec = SNAPSHOT_CODEC
 
     # ── Setup ─────────────────────────────────────────────────────────
 
-    def initial_state(self, player_ids, player_names):
+    def initial_state(self, player_ids, player_names, seed=None):
         if len(player_ids) < 2 or len(player_ids) > 4:
             raise ValueError("Arboretum requires 2-4 players")
-        return create_initial_state(player_ids, player_names)
+        return create_initial_state(player_ids, player_names, seed)
 
     # ── Views ─────────────────────────────────────────────────────────
 
     def get_player_view(self, state, player_id):
         """Return state with opponents' hands and draw pile hidden."""
-        view = deepcopy(state)
-        player_idx = self._player_index(state, player_id)
-
-        # Hide other players' hands (show count only)
-        for i, p in enumerate(view["players"]):
-            if i != player_idx:
-                p["hand"] = len(p["hand"])
-
-        # Hide draw pile contents (show count only)
-        view["draw_pile"] = len(view["draw_pile"])
+        self._player_index(state, player_id)  # raises for unknown players
+        view = build_view(state, REDACTIONS, player_id)
         view["draw_pile_count"] = view["draw_pile"]
 
         return view
 
     def get_valid_actions(self, state, player_id):
+        return list(self.iter_valid_actions(state, player_id))
+
+    def iter_valid_actions(self, state, player_id):
         player_idx = self._player_index(state, player_id)
         if state["game_over"]:
-            return []
+            return
         if state["current_player"] != player_idx:
-            return []
+            return
 
         phase = state["phase"]
-        player = state["players"][player_idx]
 
         if phase in ("draw1", "draw2"):
-            return self._valid_draw_actions(state, player_idx)
+            yield from self._iter_draw_actions(state, player_idx)
         elif phase == "place":
-            return self._valid_place_actions(state, player_idx)
+            yield from self._iter_place_actions(state, player_idx)
         elif phase == "discard":
-            return self._valid_discard_actions(state, player_idx)
-        else:
-            return []
+            yield from self._iter_discard_actions(state, player_idx)
+
+    def legal_action_mask(self, state, player_id):
+        # Valid placements leave card_index to the client; any hand card
+        # may go to any valid position, so expand each one across the hand.
+        mask = 0
+        for action in self.iter_valid_actions(state, player_id):
+            if action["kind"] == "place_card" and "card_index" not in action:
+                hand = state["players"][self._player_index(state, player_id)]["hand"]
+                for ci in range(len(hand)):
+                    mask |= 1 << self.encode_action(state, dict(action, card_index=ci))
+            else:
+                mask |= 1 << self.encode_action(state, action)
+        return mask
 
     def get_waiting_for(self, state):
         if state["game_over"]:
@@ -127,46 +196,37 @@ class ArboretumEngine(GameEngine):
 
     # ── Valid Action Generators ───────────────────────────────────────
 
-    def _valid_draw_actions(self, state, player_idx):
-        actions = []
-
+    def _iter_draw_actions(self, state, player_idx):
         # Draw from draw pile
         if state["draw_pile"]:
-            actions.append({"kind": "draw_card", "source": "deck"})
+            yield {"kind": "draw_card", "source": "deck"}
 
         # Draw from any player's discard pile (including own)
         for pi, player in enumerate(state["players"]):
             if player["discard"]:
-                actions.append({
+                yield {
                     "kind": "draw_card",
                     "source": "discard",
                     "player_index": pi,
-                })
-
-        return actions
+                }
 
-    def _valid_place_actions(self, state, player_idx):
-        """Return valid placement positions (not card×position combos)."""
+    def _iter_place_actions(self, state, player_idx):
+        """Yield valid placement positions (not card×position combos)."""
         player = state["players"][player_idx]
         grid = player["grid"]
         valid_positions = get_valid_placements(grid)
 
-        actions = []
         for row, col in valid_positions:
-            actions.append({
+            yield {
                 "kind": "place_card",
                 "row": row,
                 "col": col,
-            })
-
-        return actions
+            }
 
-    def _valid_discard_actions(self, state, player_idx):
+    def _iter_discard_actions(self, state, player_idx):
         player = state["players"][player_idx]
-        actions = []
         for ci in range(len(player["hand"])):
-            actions.append({"kind": "discard_card", "card_index": ci})
-        return actions
+            yield {"kind": "discard_card", "card_index": ci}
 
     # ── Action Implementations ────────────────────────────────────────
 
@@ -180,7 +240,7 @@ class ArboretumEngine(GameEngine):
             card = state["draw_pile"].pop()
             player["hand"].append(card)
             state["draw_pile_count"] = len(state["draw_pile"])
-            log_msg = f"{player['name']} draws from the deck"
+            log_msg = log_event("draw_deck", player_idx)
 
         elif source == "discard":
             pi = action.get("player_index")
@@ -192,11 +252,10 @@ class ArboretumEngine(GameEngine):
             # Take top card (last in list)
             card = target_player["discard"].pop()
             player["hand"].append(card)
-            target_name = target_player["name"]
             if pi == player_idx:
-                log_msg = f"{player['name']} draws from own discard"
+                log_msg = log_event("draw_own_discard", player_idx)
             else:
-                log_msg = f"{player['name']} draws from {target_name}'s discard"
+                log_msg = log_event("draw_discard", player_idx, pi)
 
         else:
             raise ValueError(f"Invalid draw source: {source}")
@@ -253,7 +312,7 @@ class ArboretumEngine(GameEngine):
 
         state["phase"] = "discard"
         species_name = self._species_display_name(state, card["species"])
-        return [f"{player['name']} places {species_name} {card['value']} at ({row},{col})"]
+        return [log_event("place", player_idx, species_name, card["value"], row, col)]
 
     def _do_discard_card(self, state, player_idx, action):
         ci = action.get("card_index")
@@ -267,7 +326,7 @@ class ArboretumEngine(GameEngine):
         player["discard"].append(card)
 
         species_name = self._species_display_name(state, card["species"])
-        log = [f"{player['name']} discards {species_name} {card['value']}"]
+        log = [log_event("discard", player_idx, species_name, card["value"])]
 
         # Check if game should end (draw pile empty after discard)
         if not state["draw_pile"]:
@@ -309,10 +368,9 @@ class ArboretumEngine(GameEngine):
         winners = scoring["winners"]
         if len(winners) == 1:
             state["winner"] = winners[0]
-            winner_name = state["players"][winners[0]]["name"]
-            return [f"Game over! {winner_name} wins with {scoring['totals'][winners[0]]} points!"]
+            return [log_event("win", winners[0], scoring["totals"][winners[0]])]
         else:
             state["winner"] = winners[0]  # First tied player for simplicity
             names = " and ".join(state["players"][w]["name"] for w in winners)
             score = scoring["totals"][winners[0]]
-            return [f"Game over! {names} tie with {score} points!"]
+            return [log_event("tie", names, score)]
@@ -213,7 +213,8 @@ def compute_final_scores(state):
             species_result["paths"].append({
                 "player_index": pi,
                 "has_rights": pi in rights[species_id],
-                "path": path,
+                # [row, col] pairs, so the scoring stays plain JSON
+                "path": [list(pos) for pos in path],
                 "path_score": score,
                 "actual_score": actual_score,
             })
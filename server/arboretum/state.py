@@ -4,9 +4,10 @@ Constants and state helpers for Arboretum.
 Cards, deck generation, grid helpers, and initial state creation.
 """
 
-import random
 from copy import deepcopy
 
+from server.rng import new_rng, sample, shuffle
+
 # ── Species Constants ────────────────────────────────────────────────
 
 SPECIES = [
@@ -75,8 +76,8 @@ def get_valid_placements(grid):
 
 # ── Deck Generation ──────────────────────────────────────────────────
 
-def generate_deck(active_species):
-    """Generate and shuffle a deck for the given species list."""
+def generate_deck(active_species, rng):
+    """Generate a deck for the given species list, shuffled from the rng stream."""
     deck = []
     for species in active_species:
         for value in VALUES:
@@ -84,18 +85,19 @@ def generate_deck(active_species):
                 "species": species["id"],
                 "value": value,
             })
-    random.shuffle(deck)
+    shuffle(rng, deck)
     return deck
 
 
 # ── State Creation ───────────────────────────────────────────────────
 
-def create_initial_state(player_ids, player_names):
+def create_initial_state(player_ids, player_names, seed=None):
     """Build the full initial game state for an Arboretum game."""
+    rng = new_rng(seed)
     player_count = len(player_ids)
     species_count = SPECIES_COUNT_BY_PLAYERS[player_count]
-    active_species = random.sample(SPECIES, species_count)
-    deck = generate_deck(active_species)
+    active_species = sample(rng, SPECIES, species_count)
+    deck = generate_deck(active_species, rng)
 
     players = []
     for i, (pid, name) in enumerate(zip(player_ids, player_names)):
@@ -126,4 +128,5 @@ def create_initial_state(player_ids, player_names):
         "winner": None,
         "game_over": False,
         "scoring_results": None,
+        "rng": rng,
     }
@@ -0,0 +1,140 @@
+"""
+Batched game states for playouts.
+
+A StateBatch holds many games of one engine and advances all of them by
+one action each per step, for random playouts, search rollouts and
+training-data generation. Actions are the engine's action-space indices;
+dict states are only read on the way in and written on the way out:
+
+    batch = engine.pack_batch(states)
+    while True:
+        moves = [rng.choice(a) if a else None
+                 for a in (batch.legal_actions(i) for i in range(batch.size))]
+        if not any(m is not None for m in moves): break
+        batch.step(moves)                     # one pass over every game
+    states = batch.states()                   # == the apply_action results
+
+Engines with a packed form (Yinsh, Tzaar) keep every board in one flat
+bytearray, `size` rows of one byte per cell, with per-game scalars in
+arrays beside it, and step without building any dicts or copies; e.g.
+numpy.frombuffer(batch.cells, numpy.uint8).reshape(batch.size, -1) is
+a view of all boards. Other engines get a DictBatch, which runs the
+same loop over apply_action.
+
+Batches skip the action log. A step applies actions in game order and
+raises ValueError on the first illegal one; games before it have
+already advanced, the rest have not.
+"""
+
+
+class StateBatch:
+    """
+    Many games of one engine, advanced together. Subclasses implement the
+    per-game methods below; player numbers are indices into player_ids.
+    """
+
+    def __init__(self, engine, states):
+        self.engine = engine
+        self.size = len(states)
+
+    def __len__(self):
+        return self.size
+
+    def legal_actions(self, i):
+        """Action indices game i's waiting player may take, [] once it is over."""
+        raise NotImplementedError
+
+    def to_move(self, i):
+        """The player game i waits on, or -1 once it is over."""
+        raise NotImplementedError
+
+    def is_over(self, i):
+        return self.to_move(i) < 0
+
+    def step(self, actions):
+        """
+        Apply one action per game, by its waiting player. A None entry
+        leaves that game as it is.
+        """
+        raise NotImplementedError
+
+    def state(self, i):
+        """Game i as a dict state, as apply_action would have left it."""
+        raise NotImplementedError
+
+    def states(self):
+        return [self.state(i) for i in range(self.size)]
+
+    def _check_actions(self, actions):
+        if len(actions) != self.size:
+            raise ValueError(f"Expected {self.size} actions, got {len(actions)}")
+
+
+class DictBatch(StateBatch):
+    """Fallback batch for engines without a packed form: dict states and apply_action."""
+
+    def __init__(self, engine, states):
+        super().__init__(engine, states)
+        if engine.action_space is None:
+            raise ValueError(f"{type(engine).__name__} has no fixed action space")
+        self._states = list(states)
+
+    def _waiting(self, i):
+        waiting = self.engine.get_waiting_for(self._states[i])
+        return waiting[0] if waiting else None
+
+    def legal_actions(self, i):
+        # From the legal mask, not get_valid_actions: offered actions may
+        # leave a field to the client (Arboretum's card_index), which the
+        # engine's mask expands. Indices come out in ascending order.
+        player_id = self._waiting(i)
+        if player_id is None:
+            return []
+        engine = self.engine
+        return list(engine.action_space.iter_mask(engine.legal_action_mask(self._states[i], player_id)))
+
+    def to_move(self, i):
+        player_id = self._waiting(i)
+        return -1 if player_id is None else self._states[i]["player_ids"].index(player_id)
+
+    def step(self, actions):
+        self._check_actions(actions)
+        engine = self.engine
+        for i, index in enumerate(actions):
+            if index is None:
+                continue
+            state = self._states[i]
+            player_id = self._waiting(i)
+            if player_id is None:
+                raise ValueError(f"Game {i} is over")
+            action = engine.decode_action(state, index)
+            self._states[i] = engine.apply_action(state, player_id, action).new_state
+
+    def state(self, i):
+        return self._states[i]
+
+
+def random_playouts(batch, rng, max_steps=None):
+    """
+    Play every game of a batch to its end (or max_steps steps), each move
+    drawn uniformly with rng.choice. Games whose waiting player has no
+    legal action stop where they are. Returns the number of actions taken.
+    """
+    taken = steps = 0
+    size = batch.size
+    legal_actions = batch.legal_actions
+    choice = rng.choice
+    while max_steps is None or steps < max_steps:
+        moves = [None] * size
+        live = 0
+        for i in range(size):
+            legal = legal_actions(i)
+            if legal:
+                moves[i] = choice(legal)
+                live += 1
+        if not live:
+            break
+        batch.step(moves)
+        taken += live
+        steps += 1
+    return taken
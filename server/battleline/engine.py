@@ -10,80 +10,167 @@ Phase machine:
 
 from copy import deepcopy
 
+from server.action_space import ActionSpace
 from server.game_engine import GameEngine, ActionResult
+from server.log_events import log_event
+from server.snapshot import SnapshotCodec
+from server.views import Private, build_view, count, drop, keep_fields
 from server.battleline.state import (
-    create_initial_state, check_win_condition, NUM_FLAGS,
+    create_initial_state, check_win_condition, tactic_subtype, TACTICS_CARDS, TROOP_COLORS, NUM_FLAGS,
 )
 from server.battleline.formations import can_claim_flag, best_formation
 
 
+# ── Action space ──────────────────────────────────────────────────────
+
+# A hand has no fixed cap (a player holding only tactics cards may pass
+# and still draw), so slots cover every card in the game; a flag side
+# holds at most 4 cards (Mud).
+_HAND_SLOTS = range(len(TROOP_COLORS) * 10 + len(TACTICS_CARDS))
+_FLAG_SLOTS = range(4)
+_FLAGS = range(NUM_FLAGS)
+_DECKS = ["troop", "tactics"]
+
+ACTION_SPACE = ActionSpace([
+    ("play_troop", [("card_index", _HAND_SLOTS), ("flag_index", _FLAGS)]),
+    ("play_morale_tactic", [("card_index", _HAND_SLOTS), ("flag_index", _FLAGS)]),
+    ("play_environment", [("card_index", _HAND_SLOTS), ("flag_index", _FLAGS)]),
+    ("play_scout", [("card_index", _HAND_SLOTS)]),
+    ("play_redeploy", [("card_index", _HAND_SLOTS)]),
+    ("play_deserter", [("card_index", _HAND_SLOTS)]),
+    ("play_traitor", [("card_index", _HAND_SLOTS)]),
+    ("pass", []),
+    ("claim_flag", [("flag_index", _FLAGS)]),
+    ("done_claiming", []),
+    ("draw_card", [("deck", _DECKS)]),
+    ("scout_draw_card", [("deck", _DECKS)]),
+    ("scout_return_card", [("card_index", _HAND_SLOTS), ("deck", _DECKS)]),
+    ("redeploy_pick", [("flag_index", _FLAGS), ("card_index_at_flag", _FLAG_SLOTS)]),
+    ("redeploy_discard", []),
+    ("redeploy_place_to_flag", [("flag_index", _FLAGS)]),
+    ("deserter_pick", [("flag_index", _FLAGS), ("card_index_at_flag", _FLAG_SLOTS)]),
+    ("traitor_pick", [("flag_index", _FLAGS), ("card_index_at_flag", _FLAG_SLOTS)]),
+    ("traitor_place", [("flag_index", _FLAGS)]),
+    ("toggle_auto_claim", []),
+])
+
+
+# ── Hidden information ────────────────────────────────────────────────
+
+REDACTIONS = [
+    # Opponent hand: card types only (troop vs tactics)
+    Private(("players", "*", "hand"), keep_fields("type"), owner="player_id"),
+    # Decks: sizes only
+    Private(("troop_deck",), count),
+    Private(("tactics_deck",), count),
+    # Internal log (the server broadcasts log lines separately)
+    Private(("log",), drop),
+    # The seed would reveal the deck order
+    Private(("rng",), drop),
+]
+
+
+# ── Log events ────────────────────────────────────────────────────
+
+LOG_EVENTS = {
+    "auto_claim_on": "Auto-claim turned on",
+    "auto_claim_off": "Auto-claim turned off",
+    "play_troop": "{player} plays {color} {value} on flag {flag}",
+    "play_tactic": "{player} plays {card} on flag {flag}",
+    "pass": "{player} passes",
+    "double_pass": "Both players passed consecutively — game is a draw",
+    "play_scout": "{player} plays Scout",
+    "play_redeploy": "{player} plays Redeploy",
+    "play_deserter": "{player} plays Deserter",
+    "play_traitor": "{player} plays Traitor",
+    "claim_flag": "{player} claims flag {flag}",
+    "redeploy_discard": "{player} discards {card}",
+    "redeploy": "{player} redeploys {card} to flag {flag}",
+    "desert": "{player} deserts {card} from flag {flag}",
+    "steal": "{player} steals {card} from flag {flag}",
+    "traitor": "{player} places stolen {card} on flag {flag}",
+    "win": "{player} wins!",
+}
+
+
+# ── Snapshots ─────────────────────────────────────────────────────────
+
+SNAPSHOT_CODEC = SnapshotCodec(
+    "battleline",
+    strings=[
+        "claimed_by", "slots", "environment", "completion_turn",
+        "index", "player_id", "name", "hand", "tactics_played", "has_leader_on_board",
+        "game", "player_ids", "players", "flags", "troop_deck", "tactics_deck", "discard",
+        "current_player", "turn_number", "phase", "sub_phase", "scout_state", "redeploy_state",
+        "traitor_state", "auto_claim", "consecutive_passes", "log", "winner", "rng", "seed",
+        "draws", "skip_draw", "draws_remaining", "returns_remaining", "picked_card", "from_flag",
+        "battleline", "fog", "mud", "play_card", "draw_card", "claim_flags", "scout_draw",
+        "scout_return", "redeploy_pick", "redeploy_place", "traitor_pick", "traitor_place",
+        "deserter_pick",
+    ],
+    atoms=[{"type": "troop", "color": color, "value": value}
+           for color in TROOP_COLORS for value in range(1, 11)]
+          + [{"type": "tactics", "id": card_id} for card_id in TACTICS_CARDS],
+)
+
+
 class BattleLineEngine(GameEngine):
 
     player_count_range = (2, 2)
+    action_space = ACTION_SPACE
+    log_events = LOG_EVENTS
+    snapshot_codec = SNAPSHOT_CODEC
+    catalog = {"tactics": TACTICS_CARDS}
+    prevalidated_kinds = frozenset({"claim_flag"})
 
     # ── Setup ─────────────────────────────────────────────────────────
 
-    def initial_state(self, player_ids, player_names):
+    def initial_state(self, player_ids, player_names, seed=None):
         if len(player_ids) != 2:
             raise ValueError("Battle Line requires exactly 2 players")
-        return create_initial_state(player_ids, player_names)
+        return create_initial_state(player_ids, player_names, seed)
 
     # ── Views ─────────────────────────────────────────────────────────
 
     def get_player_view(self, state, player_id):
         """Return state with opponent's hand and deck contents hidden."""
-        view = deepcopy(state)
-        player_idx = self._player_index(state, player_id)
-        opponent_idx = 1 - player_idx
-
-        # Hide opponent hand — show card types only (troop vs tactics)
-        opp_hand = view["players"][opponent_idx]["hand"]
-        view["players"][opponent_idx]["hand"] = [{"type": card["type"]} for card in opp_hand]
-
-        # Hide deck contents — show sizes only
-        view["troop_deck"] = len(view["troop_deck"])
-        view["tactics_deck"] = len(view["tactics_deck"])
-
-        # Remove internal log from view (server broadcasts separately)
-        view.pop("log", None)
-
-        return view
+        return build_view(state, REDACTIONS, player_id)
 
     def get_valid_actions(self, state, player_id):
+        return self._collect_valid_actions(state, player_id)
+
+    def iter_valid_actions(self, state, player_id):
         player_idx = self._player_index(state, player_id)
         if state["winner"] is not None:
-            return []
+            return
         if state["current_player"] != player_idx:
-            return []
+            return
 
         phase = state["phase"]
         sub = state["sub_phase"]
 
         if phase == "play_card":
-            actions = self._valid_play_actions(state, player_idx)
+            yield from self._iter_play_actions(state, player_idx)
         elif phase == "claim_flags":
-            actions = self._valid_claim_actions(state, player_idx)
+            yield from self._iter_claim_actions(state, player_idx)
         elif phase == "draw_card":
-            actions = self._valid_draw_actions(state)
+            yield from self._iter_draw_actions(state)
         elif sub == "scout_draw":
-            actions = self._valid_scout_draw_actions(state)
+            yield from self._iter_scout_draw_actions(state)
         elif sub == "scout_return":
-            actions = self._valid_scout_return_actions(state, player_idx)
+            yield from self._iter_scout_return_actions(state, player_idx)
         elif sub == "redeploy_pick":
-            actions = self._valid_redeploy_pick_actions(state, player_idx)
+            yield from self._iter_redeploy_pick_actions(state, player_idx)
         elif sub == "redeploy_place":
-            actions = self._valid_redeploy_place_actions(state, player_idx)
+            yield from self._iter_redeploy_place_actions(state, player_idx)
         elif sub == "deserter_pick":
-            actions = self._valid_deserter_pick_actions(state, player_idx)
+            yield from self._iter_deserter_pick_actions(state, player_idx)
         elif sub == "traitor_pick":
-            actions = self._valid_traitor_pick_actions(state, player_idx)
+            yield from self._iter_traitor_pick_actions(state, player_idx)
         elif sub == "traitor_place":
-            actions = self._valid_traitor_place_actions(state, player_idx)
-        else:
-            actions = []
+            yield from self._iter_traitor_place_actions(state, player_idx)
 
-        actions.append({"kind": "toggle_auto_claim"})
-        return actions
+        yield {"kind": "toggle_auto_claim"}
 
     def get_waiting_for(self, state):
         if state["winner"] is not None:
@@ -128,6 +215,7 @@ class BattleLineEngine(GameEngine):
         if state["current_player"] != player_idx:
             raise ValueError("Not your turn")
 
+        known_legal = self._is_known_legal(state, player_id, action)
         state = deepcopy(state)
         kind = action.get("kind")
 
@@ -143,7 +231,7 @@ class BattleLineEngine(GameEngine):
         if kind == "toggle_auto_claim":
             state["auto_claim"] = not state.get("auto_claim", True)
             mode = "on" if state["auto_claim"] else "off"
-            return ActionResult(new_state=state, log=[f"Auto-claim turned {mode}"], game_over=False)
+            return ActionResult(new_state=state, log=[log_event(f"auto_claim_{mode}")], game_over=False)
 
         phase = state["phase"]
         sub = state["sub_phase"]
@@ -173,7 +261,7 @@ class BattleLineEngine(GameEngine):
         # ── Claim Flags Phase ─────────────────────────────────────
         elif phase == "claim_flags":
             if kind == "claim_flag":
-                log = self._do_claim_flag(state, player_idx, action)
+                log = self._do_claim_flag(state, player_idx, action, known_legal)
             elif kind == "done_claiming":
                 log = self._do_done_claiming(state, player_idx)
             else:
@@ -241,17 +329,16 @@ class BattleLineEngine(GameEngine):
             if winner is not None:
                 state["winner"] = winner
                 game_over = True
-                log.append(f"{state['players'][winner]['name']} wins!")
+                log.append(log_event("win", winner))
 
         return ActionResult(new_state=state, log=log, game_over=game_over)
 
     # ── Valid Action Generators ───────────────────────────────────────
 
-    def _valid_play_actions(self, state, player_idx):
+    def _iter_play_actions(self, state, player_idx):
         player = state["players"][player_idx]
         opponent = state["players"][1 - player_idx]
         hand = player["hand"]
-        actions = []
 
         # Available flag indices for placing cards
         available_flags = []
@@ -268,11 +355,11 @@ class BattleLineEngine(GameEngine):
         for ci, card in enumerate(hand):
             if card["type"] == "troop":
                 for fi in available_flags:
-                    actions.append({"kind": "play_troop", "card_index": ci, "flag_index": fi})
+                    yield {"kind": "play_troop", "card_index": ci, "flag_index": fi}
             elif card["type"] == "tactics":
                 if not can_play_tactic:
                     continue
-                subtype = card.get("subtype")
+                subtype = tactic_subtype(card)
                 card_id = card.get("id")
 
                 if subtype in ("leader", "morale"):
@@ -280,7 +367,7 @@ class BattleLineEngine(GameEngine):
                     if subtype == "leader" and player["has_leader_on_board"]:
                         continue
                     for fi in available_flags:
-                        actions.append({"kind": "play_morale_tactic", "card_index": ci, "flag_index": fi})
+                        yield {"kind": "play_morale_tactic", "card_index": ci, "flag_index": fi}
 
                 elif subtype == "environment":
                     for fi in range(NUM_FLAGS):
@@ -290,83 +377,72 @@ class BattleLineEngine(GameEngine):
                         # Can't duplicate same environment on a flag
                         if card_id in flag["environment"]:
                             continue
-                        actions.append({"kind": "play_environment", "card_index": ci, "flag_index": fi})
+                        yield {"kind": "play_environment", "card_index": ci, "flag_index": fi}
 
                 elif card_id == "scout":
                     # Scout needs at least one deck to draw from
                     if state["troop_deck"] or state["tactics_deck"]:
-                        actions.append({"kind": "play_scout", "card_index": ci})
+                        yield {"kind": "play_scout", "card_index": ci}
 
                 elif card_id == "redeploy":
                     # Need at least one own card on an unclaimed flag
                     if self._has_own_cards_on_unclaimed_flags(state, player_idx):
-                        actions.append({"kind": "play_redeploy", "card_index": ci})
+                        yield {"kind": "play_redeploy", "card_index": ci}
 
                 elif card_id == "deserter":
                     # Need at least one opponent card on an unclaimed flag
                     if self._has_cards_on_unclaimed_flags(state, 1 - player_idx):
-                        actions.append({"kind": "play_deserter", "card_index": ci})
+                        yield {"kind": "play_deserter", "card_index": ci}
 
                 elif card_id == "traitor":
                     # Need at least one opponent TROOP on an unclaimed flag
                     if self._has_troops_on_unclaimed_flags(state, 1 - player_idx):
-                        actions.append({"kind": "play_traitor", "card_index": ci})
+                        yield {"kind": "play_traitor", "card_index": ci}
 
         # Pass: allowed if no troop cards in hand OR all flag slots full
         has_troops = any(c["type"] == "troop" for c in hand)
         if not has_troops or not available_flags:
-            actions.append({"kind": "pass"})
+            yield {"kind": "pass"}
 
-        return actions
 
-    def _valid_claim_actions(self, state, player_idx):
-        actions = []
+    def _iter_claim_actions(self, state, player_idx):
         for fi in range(NUM_FLAGS):
             if can_claim_flag(state, player_idx, fi):
-                actions.append({"kind": "claim_flag", "flag_index": fi})
-        actions.append({"kind": "done_claiming"})
-        return actions
+                yield {"kind": "claim_flag", "flag_index": fi}
+        yield {"kind": "done_claiming"}
 
-    def _valid_draw_actions(self, state):
-        actions = []
+    def _iter_draw_actions(self, state):
         if state["troop_deck"]:
-            actions.append({"kind": "draw_card", "deck": "troop"})
+            yield {"kind": "draw_card", "deck": "troop"}
         if state["tactics_deck"]:
-            actions.append({"kind": "draw_card", "deck": "tactics"})
-        return actions
+            yield {"kind": "draw_card", "deck": "tactics"}
 
-    def _valid_scout_draw_actions(self, state):
-        actions = []
+    def _iter_scout_draw_actions(self, state):
         if state["troop_deck"]:
-            actions.append({"kind": "scout_draw_card", "deck": "troop"})
+            yield {"kind": "scout_draw_card", "deck": "troop"}
         if state["tactics_deck"]:
-            actions.append({"kind": "scout_draw_card", "deck": "tactics"})
-        return actions
+            yield {"kind": "scout_draw_card", "deck": "tactics"}
 
-    def _valid_scout_return_actions(self, state, player_idx):
+    def _iter_scout_return_actions(self, state, player_idx):
         hand = state["players"][player_idx]["hand"]
-        actions = []
         for ci, card in enumerate(hand):
             if card["type"] == "troop":
-                actions.append({"kind": "scout_return_card", "card_index": ci, "deck": "troop"})
+                yield {"kind": "scout_return_card", "card_index": ci, "deck": "troop"}
             elif card["type"] == "tactics":
-                actions.append({"kind": "scout_return_card", "card_index": ci, "deck": "tactics"})
-        return actions
+                yield {"kind": "scout_return_card", "card_index": ci, "deck": "tactics"}
 
-    def _valid_redeploy_pick_actions(self, state, player_idx):
-        actions = []
+    def _iter_redeploy_pick_actions(self, state, player_idx):
         for fi in range(NUM_FLAGS):
             flag = state["flags"][fi]
             if flag["claimed_by"] is not None:
                 continue
             for ci, card in enumerate(flag["slots"][player_idx]):
                 # Can redeploy troop or morale tactics
-                if card["type"] == "troop" or card.get("subtype") in ("leader", "morale"):
-                    actions.append({"kind": "redeploy_pick", "flag_index": fi, "card_index_at_flag": ci})
-        return actions
+                if card["type"] == "troop" or tactic_subtype(card) in ("leader", "morale"):
+                    yield {"kind": "redeploy_pick", "flag_index": fi, "card_index_at_flag": ci}
 
-    def _valid_redeploy_place_actions(self, state, player_idx):
-        actions = [{"kind": "redeploy_discard"}]
+    def _iter_redeploy_place_actions(self, state, player_idx):
+        yield {"kind": "redeploy_discard"}
         rs = state["redeploy_state"]
         from_flag = rs["from_flag"]
         for fi in range(NUM_FLAGS):
@@ -377,25 +453,21 @@ class BattleLineEngine(GameEngine):
                 continue
             required = 4 if "mud" in flag["environment"] else 3
             if len(flag["slots"][player_idx]) < required:
-                actions.append({"kind": "redeploy_place_to_flag", "flag_index": fi})
-        return actions
+                yield {"kind": "redeploy_place_to_flag", "flag_index": fi}
 
-    def _valid_deserter_pick_actions(self, state, player_idx):
+    def _iter_deserter_pick_actions(self, state, player_idx):
         opponent = 1 - player_idx
-        actions = []
         for fi in range(NUM_FLAGS):
             flag = state["flags"][fi]
             if flag["claimed_by"] is not None:
                 continue
             for ci, card in enumerate(flag["slots"][opponent]):
                 # Deserter can target troop or morale tactics
-                if card["type"] == "troop" or card.get("subtype") in ("leader", "morale"):
-                    actions.append({"kind": "deserter_pick", "flag_index": fi, "card_index_at_flag": ci})
-        return actions
+                if card["type"] == "troop" or tactic_subtype(card) in ("leader", "morale"):
+                    yield {"kind": "deserter_pick", "flag_index": fi, "card_index_at_flag": ci}
 
-    def _valid_traitor_pick_actions(self, state, player_idx):
+    def _iter_traitor_pick_actions(self, state, player_idx):
         opponent = 1 - player_idx
-        actions = []
         for fi in range(NUM_FLAGS):
             flag = state["flags"][fi]
             if flag["claimed_by"] is not None:
@@ -403,19 +475,16 @@ class BattleLineEngine(GameEngine):
             for ci, card in enumerate(flag["slots"][opponent]):
                 # Traitor can only steal troop cards
                 if card["type"] == "troop":
-                    actions.append({"kind": "traitor_pick", "flag_index": fi, "card_index_at_flag": ci})
-        return actions
+                    yield {"kind": "traitor_pick", "flag_index": fi, "card_index_at_flag": ci}
 
-    def _valid_traitor_place_actions(self, state, player_idx):
-        actions = []
+    def _iter_traitor_place_actions(self, state, player_idx):
         for fi in range(NUM_FLAGS):
             flag = state["flags"][fi]
             if flag["claimed_by"] is not None:
                 continue
             required = 4 if "mud" in flag["environment"] else 3
             if len(flag["slots"][player_idx]) < required:
-                actions.append({"kind": "traitor_place", "flag_index": fi})
-        return actions
+                yield {"kind": "traitor_place", "flag_index": fi}
 
     # ── Action Implementations ────────────────────────────────────────
 
@@ -437,7 +506,7 @@ class BattleLineEngine(GameEngine):
         state["flags"][fi]["slots"][player_idx].append(card)
         self._check_completion(state, player_idx, fi)
 
-        log = [f"{player['name']} plays {card['color']} {card['value']} on flag {fi + 1}"]
+        log = [log_event("play_troop", player_idx, card["color"], card["value"], fi + 1)]
         log += self._enter_claim_phase(state, player_idx)
         return log
 
@@ -450,11 +519,11 @@ class BattleLineEngine(GameEngine):
 
         self._validate_card_index(hand, ci)
         card = hand[ci]
-        if card["type"] != "tactics" or card.get("subtype") not in ("leader", "morale"):
+        if card["type"] != "tactics" or tactic_subtype(card) not in ("leader", "morale"):
             raise ValueError("Selected card is not a morale tactic")
 
         self._validate_tactics_limit(player, opponent)
-        if card.get("subtype") == "leader" and player["has_leader_on_board"]:
+        if tactic_subtype(card) == "leader" and player["has_leader_on_board"]:
             raise ValueError("You already have a leader on the board")
 
         self._validate_flag_placement(state, player_idx, fi)
@@ -463,11 +532,11 @@ class BattleLineEngine(GameEngine):
         hand.pop(ci)
         state["flags"][fi]["slots"][player_idx].append(card)
         player["tactics_played"] += 1
-        if card.get("subtype") == "leader":
+        if tactic_subtype(card) == "leader":
             player["has_leader_on_board"] = True
         self._check_completion(state, player_idx, fi)
 
-        log = [f"{player['name']} plays {card['name']} on flag {fi + 1}"]
+        log = [log_event("play_tactic", player_idx, TACTICS_CARDS[card["id"]]["name"], fi + 1)]
         log += self._enter_claim_phase(state, player_idx)
         return log
 
@@ -480,7 +549,7 @@ class BattleLineEngine(GameEngine):
 
         self._validate_card_index(hand, ci)
         card = hand[ci]
-        if card["type"] != "tactics" or card.get("subtype") != "environment":
+        if card["type"] != "tactics" or tactic_subtype(card) != "environment":
             raise ValueError("Selected card is not an environment tactic")
 
         self._validate_tactics_limit(player, opponent)
@@ -489,7 +558,7 @@ class BattleLineEngine(GameEngine):
         if flag["claimed_by"] is not None:
             raise ValueError("Flag already claimed")
         if card["id"] in flag["environment"]:
-            raise ValueError(f"{card['name']} already on this flag")
+            raise ValueError(f"{TACTICS_CARDS[card['id']]['name']} already on this flag")
 
         # Play the card onto the flag's environment list
         hand.pop(ci)
@@ -502,7 +571,7 @@ class BattleLineEngine(GameEngine):
             for pidx in range(2):
                 self._uncheck_completion(state, pidx, fi)
 
-        log = [f"{player['name']} plays {card['name']} on flag {fi + 1}"]
+        log = [log_event("play_tactic", player_idx, TACTICS_CARDS[card["id"]]["name"], fi + 1)]
         log += self._enter_claim_phase(state, player_idx)
         return log
 
@@ -535,7 +604,7 @@ class BattleLineEngine(GameEngine):
         state["scout_state"] = {"draws_remaining": draws, "returns_remaining": 2}
         state["skip_draw"] = True
 
-        return [f"{player['name']} plays Scout"]
+        return [log_event("play_scout", player_idx)]
 
     def _do_play_redeploy(self, state, player_idx, action):
         ci = action["card_index"]
@@ -560,7 +629,7 @@ class BattleLineEngine(GameEngine):
         state["phase"] = "sub_phase"
         state["sub_phase"] = "redeploy_pick"
 
-        return [f"{player['name']} plays Redeploy"]
+        return [log_event("play_redeploy", player_idx)]
 
     def _do_play_deserter(self, state, player_idx, action):
         ci = action["card_index"]
@@ -585,7 +654,7 @@ class BattleLineEngine(GameEngine):
         state["phase"] = "sub_phase"
         state["sub_phase"] = "deserter_pick"
 
-        return [f"{player['name']} plays Deserter"]
+        return [log_event("play_deserter", player_idx)]
 
     def _do_play_traitor(self, state, player_idx, action):
         ci = action["card_index"]
@@ -610,7 +679,7 @@ class BattleLineEngine(GameEngine):
         state["phase"] = "sub_phase"
         state["sub_phase"] = "traitor_pick"
 
-        return [f"{player['name']} plays Traitor"]
+        return [log_event("play_traitor", player_idx)]
 
     def _do_pass(self, state, player_idx):
         player = state["players"][player_idx]
@@ -627,12 +696,12 @@ class BattleLineEngine(GameEngine):
             raise ValueError("You have troop cards and open flag slots — must play a card")
 
         state["consecutive_passes"] = state.get("consecutive_passes", 0) + 1
-        log = [f"{player['name']} passes"]
+        log = [log_event("pass", player_idx)]
 
         # Two consecutive passes = draw
         if state["consecutive_passes"] >= 2:
             state["winner"] = "draw"
-            log.append("Both players passed consecutively — game is a draw")
+            log.append(log_event("double_pass"))
             return log
 
         log += self._enter_claim_phase(state, player_idx)
@@ -651,8 +720,7 @@ class BattleLineEngine(GameEngine):
             for fi in range(NUM_FLAGS):
                 if can_claim_flag(state, player_idx, fi):
                     state["flags"][fi]["claimed_by"] = player_idx
-                    name = state["players"][player_idx]["name"]
-                    log.append(f"{name} claims flag {fi + 1}")
+                    log.append(log_event("claim_flag", player_idx, fi + 1))
             if skip_draw:
                 log += self._advance_turn(state)
             else:
@@ -665,17 +733,17 @@ class BattleLineEngine(GameEngine):
                 state["skip_draw"] = True
         return log
 
-    def _do_claim_flag(self, state, player_idx, action):
+    def _do_claim_flag(self, state, player_idx, action, known_legal=False):
         fi = action["flag_index"]
         if fi < 0 or fi >= NUM_FLAGS:
             raise ValueError("Invalid flag index")
 
-        if not can_claim_flag(state, player_idx, fi):
+        # The claim proof already ran when this flag was offered
+        if not known_legal and not can_claim_flag(state, player_idx, fi):
             raise ValueError("Cannot claim this flag")
 
         state["flags"][fi]["claimed_by"] = player_idx
-        name = state["players"][player_idx]["name"]
-        return [f"{name} claims flag {fi + 1}"]
+        return [log_event("claim_flag", player_idx, fi + 1)]
 
     def _do_done_claiming(self, state, player_idx):
         # Skip draw phase if flagged (e.g. after Scout)
@@ -778,7 +846,7 @@ class BattleLineEngine(GameEngine):
             raise ValueError("Invalid card index at flag")
 
         card = slots[ci]
-        if card["type"] != "troop" and card.get("subtype") not in ("leader", "morale"):
+        if card["type"] != "troop" and tactic_subtype(card) not in ("leader", "morale"):
             raise ValueError("Can only redeploy troops or morale tactics")
 
         # Remove card from flag
@@ -788,7 +856,7 @@ class BattleLineEngine(GameEngine):
         self._uncheck_completion(state, player_idx, fi)
 
         # Update leader tracking if needed
-        if picked.get("subtype") == "leader":
+        if tactic_subtype(picked) == "leader":
             state["players"][player_idx]["has_leader_on_board"] = False
 
         state["redeploy_state"] = {"picked_card": picked, "from_flag": fi}
@@ -802,23 +870,21 @@ class BattleLineEngine(GameEngine):
 
         if action["kind"] == "redeploy_discard":
             state["discard"][player_idx].append(card)
-            log_msg = f"discards {self._card_name(card)}"
+            log = [log_event("redeploy_discard", player_idx, self._card_name(card))]
         else:
             fi = action["flag_index"]
             self._validate_flag_placement(state, player_idx, fi)
             if fi == rs["from_flag"]:
                 raise ValueError("Cannot redeploy to the same flag")
             state["flags"][fi]["slots"][player_idx].append(card)
-            if card.get("subtype") == "leader":
+            if tactic_subtype(card) == "leader":
                 state["players"][player_idx]["has_leader_on_board"] = True
             self._check_completion(state, player_idx, fi)
-            log_msg = f"redeploys {self._card_name(card)} to flag {fi + 1}"
+            log = [log_event("redeploy", player_idx, self._card_name(card), fi + 1)]
 
         state["redeploy_state"] = None
         state["sub_phase"] = None
 
-        name = state["players"][player_idx]["name"]
-        log = [f"{name} {log_msg}"]
         log += self._enter_claim_phase(state, player_idx)
         return log
 
@@ -838,7 +904,7 @@ class BattleLineEngine(GameEngine):
             raise ValueError("Invalid card index at flag")
 
         card = slots[ci]
-        if card["type"] != "troop" and card.get("subtype") not in ("leader", "morale"):
+        if card["type"] != "troop" and tactic_subtype(card) not in ("leader", "morale"):
             raise ValueError("Can only desert troops or morale tactics")
 
         # Remove and discard
@@ -847,13 +913,12 @@ class BattleLineEngine(GameEngine):
 
         # Update completion and leader tracking
         self._uncheck_completion(state, opponent, fi)
-        if removed.get("subtype") == "leader":
+        if tactic_subtype(removed) == "leader":
             state["players"][opponent]["has_leader_on_board"] = False
 
         state["sub_phase"] = None
 
-        name = state["players"][player_idx]["name"]
-        log = [f"{name} deserts {self._card_name(removed)} from flag {fi + 1}"]
+        log = [log_event("desert", player_idx, self._card_name(removed), fi + 1)]
         log += self._enter_claim_phase(state, player_idx)
         return log
 
@@ -883,8 +948,7 @@ class BattleLineEngine(GameEngine):
         state["traitor_state"] = {"picked_card": stolen, "from_flag": fi}
         state["sub_phase"] = "traitor_place"
 
-        name = state["players"][player_idx]["name"]
-        return [f"{name} steals {self._card_name(stolen)} from flag {fi + 1}"]
+        return [log_event("steal", player_idx, self._card_name(stolen), fi + 1)]
 
     def _do_traitor_place(self, state, player_idx, action):
         fi = action["flag_index"]
@@ -899,8 +963,7 @@ class BattleLineEngine(GameEngine):
         state["traitor_state"] = None
         state["sub_phase"] = None
 
-        name = state["players"][player_idx]["name"]
-        log = [f"{name} places stolen {self._card_name(card)} on flag {fi + 1}"]
+        log = [log_event("traitor", player_idx, self._card_name(card), fi + 1)]
         log += self._enter_claim_phase(state, player_idx)
         return log
 
@@ -966,7 +1029,7 @@ class BattleLineEngine(GameEngine):
             flag = state["flags"][fi]
             if flag["claimed_by"] is None:
                 for card in flag["slots"][player_idx]:
-                    if card["type"] == "troop" or card.get("subtype") in ("leader", "morale"):
+                    if card["type"] == "troop" or tactic_subtype(card) in ("leader", "morale"):
                         return True
         return False
 
@@ -4,9 +4,10 @@ Constants and state helpers for Battle Line.
 Cards, deck generation, player creation, and win-condition checking.
 """
 
-import random
 from copy import deepcopy
 
+from server.rng import new_rng, shuffle
+
 # ── Card Constants ────────────────────────────────────────────────────
 
 TROOP_COLORS = ("red", "blue", "yellow", "green", "purple", "orange")
@@ -35,27 +36,30 @@ NUM_FLAGS = 9
 
 # ── Deck Generation ──────────────────────────────────────────────────
 
-def generate_troop_deck():
-    """Return a shuffled deck of 60 troop cards."""
+def generate_troop_deck(rng):
+    """Return a deck of 60 troop cards, shuffled from the rng stream."""
     deck = []
     for color in TROOP_COLORS:
         for value in range(1, 11):
             deck.append({"type": "troop", "color": color, "value": value})
-    random.shuffle(deck)
+    shuffle(rng, deck)
     return deck
 
 
-def generate_tactics_deck():
-    """Return a shuffled deck of 10 tactics cards."""
-    deck = []
-    for card_id, info in TACTICS_CARDS.items():
-        card = dict(info)
-        card["id"] = card_id
-        deck.append(card)
-    random.shuffle(deck)
+def generate_tactics_deck(rng):
+    """Return a shuffled deck of 10 tactics cards, referenced by id."""
+    deck = [{"type": "tactics", "id": card_id} for card_id in TACTICS_CARDS]
+    shuffle(rng, deck)
     return deck
 
 
+def tactic_subtype(card):
+    """Subtype of a tactics card from TACTICS_CARDS (None for troops)."""
+    if card["type"] != "tactics":
+        return None
+    return TACTICS_CARDS[card["id"]]["subtype"]
+
+
 # ── Player / State Creation ──────────────────────────────────────────
 
 def create_player(index, player_id, name):
@@ -70,10 +74,11 @@ def create_player(index, player_id, name):
     }
 
 
-def create_initial_state(player_ids, player_names):
+def create_initial_state(player_ids, player_names, seed=None):
     """Build the full initial game state for a 2-player Battle Line game."""
-    troop_deck = generate_troop_deck()
-    tactics_deck = generate_tactics_deck()
+    rng = new_rng(seed)
+    troop_deck = generate_troop_deck(rng)
+    tactics_deck = generate_tactics_deck(rng)
 
     players = []
     for i, (pid, name) in enumerate(zip(player_ids, player_names)):
@@ -111,6 +116,7 @@ def create_initial_state(player_ids, player_names):
         "consecutive_passes": 0,
         "log": [],
         "winner": None,
+        "rng": rng,
     }
 
 
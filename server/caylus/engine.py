@@ -9,11 +9,14 @@ All state uses player indices (0-based) instead of color names.
 
 from copy import deepcopy
 from server.game_engine import GameEngine, ActionResult
+from server.log_events import log_event
+from server.snapshot import SnapshotCodec
+from server.rng import new_rng
 from server.caylus.state import (
     PLAYER_COLORS, RESOURCE_TYPES, NON_GOLD_RESOURCES,
     CASTLE_SECTIONS, CASTLE_COUNT_TRIGGERS,
     SPECIAL_BUILDINGS, SPECIAL_BUILDING_IDS,
-    NEUTRAL_BUILDINGS, BASIC_BUILDINGS, WOOD_BUILDINGS, STONE_BUILDINGS, PRESTIGE_BUILDINGS,
+    BUILDINGS, RESIDENTIAL_BUILDING,
     FAVOR_TRACKS, PHASES, ROAD_SIZE, FIXED_POSITIONS,
     create_player, generate_road, create_special_state, create_castle, create_building_stock,
     player_name, has_resources, pay_resources, gain_resources,
@@ -23,12 +26,166 @@ from server.caylus.state import (
 )
 
 
+# ── Log events ───────────────────────────────────────
+
+_SEATS = ["first", "second", "third", "fourth", "fifth"]
+
+LOG_EVENTS = {
+    # Phases
+    "phase_workers": "— Phase 2: Place Workers —",
+    "phase_special": "— Phase 3: Special Buildings —",
+    "phase_provost": "— Phase 4: Move Provost —",
+    "phase_activate": "— Phase 5: Activate Buildings —",
+    "phase_castle": "— Phase 6: Castle —",
+    "phase_end_turn": "— Phase 7: End of Turn —",
+    # Income and workers
+    "income": "{player} collects {amount}$",
+    "place": "{player} → {building} for {cost}$",
+    "place_own": "{player} → own {building} for {cost}$",
+    "place_owned": "{player} → {building} ({owner_player}'s, +1VP) for {cost}$",
+    "place_castle": "{player} → Castle for {cost}$",
+    "pass_first": "{player} passes (first — gains 1$)",
+    "pass": "{player} passes",
+    # Special buildings
+    "gate_redirect": "{player} may redirect Gate worker",
+    "gate_blocked": "{player}'s Gate — no unoccupied buildings",
+    "gate_skip": "{player} skips Gate — worker returns",
+    "gate_castle": "{player} Gate → Castle (free)",
+    "gate_special": "{player} Gate → {building} (free)",
+    "gate_road": "{player} Gate → {building} (pos {pos}) (free)",
+    "gate_owned": "{player} Gate → {building} ({owner_player}'s, +1VP) (free)",
+    "trading_post": "{player} gains 3$ (Trading Post)",
+    "guild": "{player} may move provost via Merchants' Guild",
+    "joust": "{player} pays 1$+1cloth at Joust Field → 1 favor",
+    "joust_unpaid": "{player} can't pay for Joust Field",
+    **{f"stables_order_{n}": "Stables: new turn order — "
+       + ", ".join(f"{{{seat}_player}}" for seat in _SEATS[:n])
+       for n in range(2, len(_SEATS) + 1)},
+    "inn_driven_out": "{player} driven out of Inn",
+    "inn_enter": "{player} enters Inn (1$ workers)",
+    "inn_stay": "{player} stays in Inn (1$ workers)",
+    "inn_leave": "{player} leaves Inn",
+    # Provost
+    "provost_broke": "{player} has no deniers — passes on provost",
+    "provost_pass": "{player} passes on provost",
+    "provost_move": "{player} moves provost {steps} {direction} to pos {pos} (-{cost}$)",
+    "provost_move_guild": "{player} moves provost {steps} {direction} to pos {pos} (free, Guild)",
+    "beyond_provost": "{player}'s worker beyond provost (pos {pos}) — returns unused",
+    # Building activation
+    "activate_gain": "{player} activates {building}: +{amount} {resource}",
+    "activate_gain_2": "{player} activates {building}: +{amount} {resource}, {second_amount} {second_resource}",
+    "activate_skipped": "{player} activates {building} — no valid options, skipped",
+    "skip_activation": "{player} skips {building}",
+    "owner_bonus": "  {player} +1 {resource} (owner bonus)",
+    "owner_bonus_choice": "{player} takes +1 {resource} (owner bonus for {building})",
+    "sell": "{player} sells 1 {resource} for {price}$ at {building}",
+    "buy": "{player} buys 1 {resource} for {price}$ at {building}",
+    "church": "{player} Church: -{cost}$ → +{vp}VP",
+    "tailor": "{player} Tailor: -{cloth} cloth → +{vp}VP",
+    "bank": "{player} Bank: -{cost}$ → +{gold} gold",
+    "alchemist_give": "{player} gives 1 {resource} to Alchemist ({given}/{target})",
+    "alchemist_gold": "{player} Alchemist: → +{gold} gold",
+    "alchemist_ran_out": "{player} Alchemist: ran out → +{gold} gold",
+    "build": "{player} builds {building} → +{vp}VP",
+    "build_prestige": "{player} builds {building} (replacing Residential at pos {pos}) → +{vp}VP",
+    "build_favors": "  {building} grants {count} favor(s)",
+    "lawyer_delayed": "{player} pays for {building} transformation (delayed — worker present)",
+    "transform": "{player} transforms {building} → Residential (+2VP)",
+    "transform_delayed": "  Delayed: {building} → Residential (lawyer by {player})",
+    "stock_return": "  {building} returned to {stock} building stock",
+    # Castle
+    "castle_build": "{player} builds {section} (food+{resource}+{second_resource}) → +{vp}VP",
+    "castle_penalty": "{player} can't contribute to castle → -2VP",
+    "castle_decline": "{player} declines to build castle → -2VP",
+    "castle_full": "{player} — no room left (no penalty)",
+    "castle_towers_full": "{player} — no room left in Towers (no penalty)",
+    "castle_stop_one": "{player} stops building castle ({count} batch)",
+    "castle_stop": "{player} stops building castle ({count} batches)",
+    "best_builder_one": "{player} is best castle builder ({count} batch) → 1 favor",
+    "best_builder": "{player} is best castle builder ({count} batches) → 1 favor",
+    # End of turn
+    "bailiff": "Bailiff moves {steps} → pos {pos}, Provost resets",
+    "counting": "Counting {section}!",
+    "count_none": "{player}: 0 houses → -{vp}VP",
+    "count_one": "{player}: {houses} house",
+    "count_favor": "{player}: {houses} houses → 1 favor",
+    "count_favors": "{player}: {houses} houses → {favors} favors",
+    "walls_begin": "Walls phase begins. Favor cols 3-4 open.",
+    "towers_begin": "Towers phase begins. All favor cols open.",
+    "game_over": "Game Over!",
+    "turn": "Turn {turn}",
+    "final_scoring": "FINAL SCORING",
+    "final_score": "{player}: +{gold}(gold) +{cubes}(cubes) +{deniers}($) = {score}VP total",
+    "win": "{player} wins with {score}VP!",
+    # Favors
+    "favor": "{player} takes {track} favor → col {column}",
+    "favor_maxed": "{player} uses {track} favor (maxed at col 5)",
+    "favor_vp": "  +1 VP",
+    "favor_deniers": "  +3$",
+    "favor_food": "  +1 food",
+    "favor_no_effect": "  No effect",
+    "favor_no_buildings": "  No building effects available",
+    "favor_no_transform": "  No buildings to transform",
+    "favor_take_vp": "  {player} takes +{vp} VP",
+    "favor_take_deniers": "  {player} takes +{amount}$",
+    "favor_take": "  {player} takes +1 {resource}",
+    "favor_pick": "  {player} picks +1 {resource}",
+    "favor_give": "  {player} gives 1 {resource}",
+    "favor_swap_take": "  {player} takes +1 {resource} ({picks}/2)",
+    "favor_no_cubes": "  {player} has no cubes to trade",
+    "favor_build": "  {player} builds {building} (favor discount) → +{vp}VP",
+    "favor_transform": "  {player} transforms {building} → Residential (+2VP, -1 cloth) (favor lawyer)",
+    "favor_skip_building": "  {player} skips building effect",
+    "favor_skip_build": "  {player} skips building favor",
+    "favor_skip_prestige": "  {player} skips prestige placement",
+    "favor_skip_lawyer": "  {player} skips lawyer favor",
+    "favors_exhausted": "{player} has no more available favor tracks",
+}
+
+
+def _gain_event(player_idx, building, resources):
+    """Log event for a building's resource gain (one or two resources)."""
+    code = "activate_gain" if len(resources) == 1 else "activate_gain_2"
+    return log_event(code, player_idx, building, *(x for r, a in resources.items() for x in (a, r)))
+
+
+# ── Snapshots ────────────────────────────────────────
+
+SNAPSHOT_CODEC = SnapshotCodec(
+    "caylus",
+    strings=[
+        "index", "worker", "building", "house",
+        "player_id", "name", "color", "deniers", "resources", "workers_total",
+        "workers_placed", "houses_total", "houses_placed", "score", "passed", "pass_order",
+        "favors", "prestige", "buildings", "inn_occupant", *RESOURCE_TYPES,
+        "game", "player_ids", "player_count", "players", "road", "special_state",
+        *SPECIAL_BUILDING_IDS, "left", "right",
+        "castle", "current_section", *CASTLE_SECTIONS, "workers", "dungeon_counted",
+        "walls_counted", "towers_counted", "building_stock", "bailiff_position",
+        "provost_position", "turn_order", "current_phase", "current_player_idx", "turn",
+        "passing_scale", "game_over", "favor_columns_available", "pending_activation",
+        "activation_index", "provost_phase", "pending_provost", "pending_favors",
+        "pending_gate", "pending_castle", "castle_phase", "pending_inn",
+        "pending_owner_bonus", "delayed_transformations", "rng", "seed", "draws",
+        "id", "label", "player_idx", "type", "max_delta", "min_pos", "max_pos",
+        "road_index", "worker_idx", "building_name", "effect_type", "choices", "can_skip",
+        "order", "old_building",
+        "caylus", *BUILDINGS,
+    ],
+    atoms=PLAYER_COLORS,
+)
+
+
 class CaylusEngine(GameEngine):
     player_count_range = (2, 5)
+    catalog = {"buildings": BUILDINGS, "special_buildings": SPECIAL_BUILDINGS}
+    log_events = LOG_EVENTS
+    snapshot_codec = SNAPSHOT_CODEC
 
     # ── Core Interface ───────────────────────────────────────────────
 
-    def initial_state(self, player_ids, player_names):
+    def initial_state(self, player_ids, player_names, seed=None):
+        rng = new_rng(seed)
         players = []
         for i, (pid, pname) in enumerate(zip(player_ids, player_names)):
             players.append(create_player(i, pid, pname))
@@ -40,7 +197,7 @@ class CaylusEngine(GameEngine):
             "player_ids": player_ids,
             "player_count": len(players),
             "players": players,
-            "road": generate_road(),
+            "road": generate_road(rng),
             "special_state": create_special_state(),
             "castle": create_castle(),
             "building_stock": create_building_stock(),
@@ -65,12 +222,14 @@ class CaylusEngine(GameEngine):
             "pending_inn": None,
             "pending_owner_bonus": None,
             "delayed_transformations": [],
+            "rng": rng,
         }
         return state
 
     def get_player_view(self, state, player_id):
         # Caylus is open-information, so we return full state with player context
         view = deepcopy(state)
+        view.pop("rng", None)
         pidx = self._player_idx(state, player_id)
         view["your_player_id"] = player_id
         view["your_player_idx"] = pidx
@@ -78,62 +237,71 @@ class CaylusEngine(GameEngine):
         return view
 
     def get_valid_actions(self, state, player_id):
+        return list(self.iter_valid_actions(state, player_id))
+
+    def iter_valid_actions(self, state, player_id):
         pidx = self._player_idx(state, player_id)
         if pidx is None or state["game_over"]:
-            return []
+            return
 
         # Pending favors — the favor picker player acts
         pf = state.get("pending_favors")
         if pf:
             entry = pf["queue"][pf["queue_index"]]
             if entry["player_idx"] != pidx:
-                return []
-            return self._get_favor_actions(state, pidx, pf)
+                return
+            yield from self._get_favor_actions(state, pidx, pf)
+            return
 
         # Pending gate
         pg = state.get("pending_gate")
         if pg:
             if pg["player_idx"] != pidx:
-                return []
-            return self._get_gate_actions(state, pg)
+                return
+            yield from self._get_gate_actions(state, pg)
+            return
 
         # Pending owner bonus
         ob = state.get("pending_owner_bonus")
         if ob:
             if ob["owner_idx"] != pidx:
-                return []
-            return [{"kind": "owner_bonus", "resource": r} for r in ob["options"]]
+                return
+            for r in ob["options"]:
+                yield {"kind": "owner_bonus", "resource": r}
+            return
 
         # Pending inn
         pi = state.get("pending_inn")
         if pi:
             if pi["player_idx"] != pidx:
-                return []
-            return [
-                {"kind": "inn_choice", "stay": True, "description": "Stay in Inn"},
-                {"kind": "inn_choice", "stay": False, "description": "Leave Inn"},
-            ]
+                return
+            yield {"kind": "inn_choice", "stay": True, "description": "Stay in Inn"}
+            yield {"kind": "inn_choice", "stay": False, "description": "Leave Inn"}
+            return
 
         # Pending provost move
         pp = state.get("pending_provost")
         if pp:
             if pp["player_idx"] != pidx:
-                return []
-            return self._get_provost_actions(state, pp)
+                return
+            yield from self._get_provost_actions(state, pp)
+            return
 
         # Pending activation
         pa = state.get("pending_activation")
         if pa:
             if pa["worker_idx"] != pidx:
-                return []
-            return self._get_activation_actions(state, pa)
+                return
+            yield from self._get_activation_actions(state, pa)
+            return
 
         # Pending castle
         pc = state.get("pending_castle")
         if pc:
             if pc["player_idx"] != pidx:
-                return []
-            return self._get_castle_actions(state, pidx)
+                return
+            yield from self._get_castle_actions(state, pidx)
+            return
 
         phase = state["current_phase"]
 
@@ -141,16 +309,14 @@ class CaylusEngine(GameEngine):
         if phase == 0:
             # Only first player in turn order triggers income
             if pidx == state["turn_order"][0]:
-                return [{"kind": "collect_income", "description": "Collect income for all players"}]
-            return []
+                yield {"kind": "collect_income", "description": "Collect income for all players"}
+            return
 
         # Phase 1: Worker placement
         if phase == 1:
             if state["current_player_idx"] != pidx:
-                return []
-            return self._get_placement_actions(state, pidx)
-
-        return []
+                return
+            yield from self._get_placement_actions(state, pidx)
 
     def apply_action(self, state, player_id, action):
         state = deepcopy(state)
@@ -310,11 +476,11 @@ class CaylusEngine(GameEngine):
             if player_has_building(state, p["index"], "p_hotel"):
                 income += 2
             p["deniers"] += income
-            log.append(f"{player_name(p)} collects {income}$")
+            log.append(log_event("income", p["index"], income))
 
         state["current_phase"] = 1
         state["current_player_idx"] = state["turn_order"][0]
-        log.append("— Phase 2: Place Workers —")
+        log.append(log_event("phase_workers"))
         return self._result(state, log)
 
     # ── Phase 1: Worker Placement ────────────────────────────────────
@@ -334,7 +500,7 @@ class CaylusEngine(GameEngine):
             for i, slot in enumerate(state["road"]):
                 if not slot["building"]:
                     continue
-                if slot["building"]["type"] in ("prestige", "residential"):
+                if BUILDINGS[slot["building"]]["type"] in ("prestige", "residential"):
                     continue
                 if slot["worker"] is not None:
                     continue
@@ -345,9 +511,9 @@ class CaylusEngine(GameEngine):
                         "kind": "place_worker",
                         "road_index": i,
                         "cost": slot_cost,
-                        "building_name": slot["building"]["name"],
+                        "building_name": BUILDINGS[slot["building"]]["name"],
                         "is_own": is_own,
-                        "description": f"Place on {slot['building']['name']} (pos {i+1}) for {slot_cost}$",
+                        "description": f"Place on {BUILDINGS[slot['building']]['name']} (pos {i+1}) for {slot_cost}$",
                     })
 
             # Special buildings
@@ -402,7 +568,7 @@ class CaylusEngine(GameEngine):
             raise ValueError("Invalid road index")
 
         slot = state["road"][road_index]
-        if not slot["building"] or slot["building"]["type"] in ("prestige", "residential"):
+        if not slot["building"] or BUILDINGS[slot["building"]]["type"] in ("prestige", "residential"):
             raise ValueError("Cannot place on this building")
         if slot["worker"] is not None:
             raise ValueError("Building already occupied")
@@ -425,11 +591,11 @@ class CaylusEngine(GameEngine):
             owner = find_player_by_idx(state, slot["house"])
             if owner:
                 owner["score"] += 1
-                log.append(f"{player_name(p)} → {slot['building']['name']} ({player_name(owner)}'s, +1VP) for {cost}$")
+                log.append(log_event("place_owned", p["index"], BUILDINGS[slot["building"]]["name"], owner["index"], cost))
         elif is_own:
-            log.append(f"{player_name(p)} → own {slot['building']['name']} for {cost}$")
+            log.append(log_event("place_own", p["index"], BUILDINGS[slot["building"]]["name"], cost))
         else:
-            log.append(f"{player_name(p)} → {slot['building']['name']} for {cost}$")
+            log.append(log_event("place", p["index"], BUILDINGS[slot["building"]]["name"], cost))
 
         if all_players_passed(state):
             return self._advance_to_phase3(state, log)
@@ -473,7 +639,7 @@ class CaylusEngine(GameEngine):
         p["deniers"] -= cost
         p["workers_placed"] += 1
 
-        log = [f"{player_name(p)} → {SPECIAL_BUILDINGS[special_id]['name']} for {cost}$"]
+        log = [log_event("place", p["index"], SPECIAL_BUILDINGS[special_id]["name"], cost)]
 
         if all_players_passed(state):
             return self._advance_to_phase3(state, log)
@@ -502,7 +668,7 @@ class CaylusEngine(GameEngine):
         p["workers_placed"] += 1
         state["castle"]["workers"].append(pidx)
 
-        log = [f"{player_name(p)} → Castle for {cost}$"]
+        log = [log_event("place_castle", p["index"], cost)]
 
         if all_players_passed(state):
             return self._advance_to_phase3(state, log)
@@ -531,9 +697,9 @@ class CaylusEngine(GameEngine):
         log = []
         if slot_idx == 0:
             p["deniers"] += 1
-            log.append(f"{player_name(p)} passes (first — gains 1$)")
+            log.append(log_event("pass_first", p["index"]))
         else:
-            log.append(f"{player_name(p)} passes")
+            log.append(log_event("pass", p["index"]))
 
         if all_players_passed(state):
             return self._advance_to_phase3(state, log)
@@ -544,7 +710,7 @@ class CaylusEngine(GameEngine):
 
     def _advance_to_phase3(self, state, log):
         state["current_phase"] = 2
-        log.append("— Phase 3: Special Buildings —")
+        log.append(log_event("phase_special"))
         more_log = self._process_special_buildings(state)
         log.extend(more_log)
         return self._result(state, log)
@@ -561,7 +727,7 @@ class CaylusEngine(GameEngine):
             p = find_player_by_idx(state, gate_pidx)
             road_targets = [i for i, s in enumerate(state["road"])
                             if s["building"] and s["worker"] is None
-                            and s["building"]["type"] not in ("residential", "prestige")]
+                            and BUILDINGS[s["building"]]["type"] not in ("residential", "prestige")]
             special_targets = []
             if ss["trading_post"]["worker"] is None:
                 special_targets.append("trading_post")
@@ -576,7 +742,7 @@ class CaylusEngine(GameEngine):
             can_castle = gate_pidx not in state["castle"]["workers"]
 
             if road_targets or special_targets or can_castle:
-                log.append(f"{player_name(p)} may redirect Gate worker")
+                log.append(log_event("gate_redirect", p["index"]))
                 ss["gate"]["worker"] = None
                 state["pending_gate"] = {
                     "player_idx": gate_pidx,
@@ -585,7 +751,7 @@ class CaylusEngine(GameEngine):
                 }
                 return log  # Pause for player choice
             else:
-                log.append(f"{player_name(p)}'s Gate — no unoccupied buildings")
+                log.append(log_event("gate_blocked", p["index"]))
                 return_worker(state, gate_pidx)
                 ss["gate"]["worker"] = None
 
@@ -599,7 +765,7 @@ class CaylusEngine(GameEngine):
             tp_pidx = ss["trading_post"]["worker"]
             p = find_player_by_idx(state, tp_pidx)
             p["deniers"] += 3
-            log.append(f"{player_name(p)} gains 3$ (Trading Post)")
+            log.append(log_event("trading_post", p["index"]))
             return_worker(state, tp_pidx)
             ss["trading_post"]["worker"] = None
 
@@ -607,7 +773,7 @@ class CaylusEngine(GameEngine):
         if ss["merchants_guild"]["worker"] is not None:
             mg_pidx = ss["merchants_guild"]["worker"]
             p = find_player_by_idx(state, mg_pidx)
-            log.append(f"{player_name(p)} may move provost via Merchants' Guild")
+            log.append(log_event("guild", p["index"]))
             return_worker(state, mg_pidx)
             ss["merchants_guild"]["worker"] = None
             state["pending_provost"] = {
@@ -631,13 +797,13 @@ class CaylusEngine(GameEngine):
             if p["deniers"] >= 1 and p["resources"]["cloth"] >= 1:
                 p["deniers"] -= 1
                 p["resources"]["cloth"] -= 1
-                log.append(f"{player_name(p)} pays 1$+1cloth at Joust Field → 1 favor")
+                log.append(log_event("joust", p["index"]))
                 return_worker(state, jf_pidx)
                 ss["joust_field"]["worker"] = None
                 self._grant_favors(state, [{"player_idx": jf_pidx, "count": 1}], "continue_special")
                 return log  # Pause for favor
             else:
-                log.append(f"{player_name(p)} can't pay for Joust Field")
+                log.append(log_event("joust_unpaid", p["index"]))
             return_worker(state, jf_pidx)
             ss["joust_field"]["worker"] = None
 
@@ -662,8 +828,8 @@ class CaylusEngine(GameEngine):
             state["turn_order"] = sorted(order_map.keys(), key=lambda x: order_map[x])
             for p in state["players"]:
                 pass  # turn_order list already updated
-            names = [player_name(find_player_by_idx(state, i)) for i in state["turn_order"]]
-            log.append(f"Stables: new turn order — {', '.join(names)}")
+            order = state["turn_order"]
+            log.append(log_event(f"stables_order_{len(order)}", *order))
             ss["stables"] = [None, None, None]
 
         # Inn
@@ -674,13 +840,13 @@ class CaylusEngine(GameEngine):
                 if old_p:
                     old_p["inn_occupant"] = False
                 return_worker(state, old_pidx)
-                log.append(f"{player_name(old_p)} driven out of Inn")
+                log.append(log_event("inn_driven_out", old_pidx))
             ss["inn"]["right"] = ss["inn"]["left"]
             ss["inn"]["left"] = None
             new_p = find_player_by_idx(state, ss["inn"]["right"])
             if new_p:
                 new_p["inn_occupant"] = True
-            log.append(f"{player_name(new_p)} enters Inn (1$ workers)")
+            log.append(log_event("inn_enter", ss["inn"]["right"]))
         elif ss["inn"]["right"] is not None:
             # Nobody played inn — occupant chooses stay/leave
             state["pending_inn"] = {"player_idx": ss["inn"]["right"]}
@@ -692,7 +858,7 @@ class CaylusEngine(GameEngine):
 
     def _start_provost_phase(self, state, log):
         state["current_phase"] = 3
-        log.append("— Phase 4: Move Provost —")
+        log.append(log_event("phase_provost"))
 
         order = [s for s in state["passing_scale"] if s is not None]
         for pidx in state["turn_order"]:
@@ -713,7 +879,7 @@ class CaylusEngine(GameEngine):
         max_delta = min(3, max_afford)
 
         if max_delta == 0:
-            log.append(f"{player_name(p)} has no deniers — passes on provost")
+            log.append(log_event("provost_broke", pidx))
             pp["index"] += 1
             return self._advance_provost_phase(state, log)
 
@@ -730,14 +896,13 @@ class CaylusEngine(GameEngine):
         state["provost_phase"] = None
         state["pending_provost"] = None
         state["current_phase"] = 4
-        log.append("— Phase 5: Activate Buildings —")
+        log.append(log_event("phase_activate"))
 
         # Remove workers beyond provost
         for i in range(state["provost_position"] + 1, len(state["road"])):
             if state["road"][i]["worker"] is not None:
                 wc = state["road"][i]["worker"]
-                wp = find_player_by_idx(state, wc)
-                log.append(f"{player_name(wp)}'s worker beyond provost (pos {i+1}) — returns unused")
+                log.append(log_event("beyond_provost", wc, i + 1))
                 return_worker(state, wc)
                 state["road"][i]["worker"] = None
                 self._apply_delayed_transformations(state, i, log)
@@ -776,7 +941,7 @@ class CaylusEngine(GameEngine):
         log = []
 
         if delta == 0:
-            log.append(f"{player_name(p)} passes on provost")
+            log.append(log_event("provost_pass", pidx))
         else:
             new_pos = state["provost_position"] + delta
             clamped = max(pp["min_pos"], min(pp["max_pos"], new_pos))
@@ -792,10 +957,12 @@ class CaylusEngine(GameEngine):
                     p["deniers"] -= cost
                 state["provost_position"] = clamped
                 direction = "forward" if actual_delta > 0 else "backward"
-                cost_str = "(free, Guild)" if is_free else f"(-{cost}$)"
-                log.append(f"{player_name(p)} moves provost {abs(actual_delta)} {direction} to pos {clamped+1} {cost_str}")
+                if is_free:
+                    log.append(log_event("provost_move_guild", pidx, abs(actual_delta), direction, clamped + 1))
+                else:
+                    log.append(log_event("provost_move", pidx, abs(actual_delta), direction, clamped + 1, cost))
             else:
-                log.append(f"{player_name(p)} passes on provost")
+                log.append(log_event("provost_pass", pidx))
 
         state["pending_provost"] = None
 
@@ -826,7 +993,7 @@ class CaylusEngine(GameEngine):
                 slot["worker"] = None
                 continue
 
-            eff = slot["building"].get("effect")
+            eff = BUILDINGS[slot["building"]].get("effect")
             if not eff:
                 return_worker(state, wc)
                 slot["worker"] = None
@@ -835,18 +1002,17 @@ class CaylusEngine(GameEngine):
             # Auto-resolve simple gain
             if eff["type"] == "gain":
                 gain_resources(p, eff["resources"])
-                gains = ", ".join(f"{a} {r}" for r, a in eff["resources"].items())
-                log.append(f"{player_name(p)} activates {slot['building']['name']}: +{gains}")
+                log.append(_gain_event(wc, BUILDINGS[slot["building"]]["name"], eff["resources"]))
 
                 # Owner bonus for stone buildings
-                if (slot["building"]["type"] == "stone" and slot["house"] is not None
-                        and slot["house"] != wc and slot["building"].get("owner_bonus")):
+                if (BUILDINGS[slot["building"]]["type"] == "stone" and slot["house"] is not None
+                        and slot["house"] != wc and BUILDINGS[slot["building"]].get("owner_bonus")):
                     owner = find_player_by_idx(state, slot["house"])
                     if owner:
-                        bonus = slot["building"]["owner_bonus"]
+                        bonus = BUILDINGS[slot["building"]]["owner_bonus"]
                         if len(bonus) == 1:
                             owner["resources"][bonus[0]] += 1
-                            log.append(f"  {player_name(owner)} +1 {bonus[0]} (owner bonus)")
+                            log.append(log_event("owner_bonus", owner["index"], bonus[0]))
                         else:
                             return_worker(state, wc)
                             slot["worker"] = None
@@ -854,7 +1020,7 @@ class CaylusEngine(GameEngine):
                             state["pending_owner_bonus"] = {
                                 "owner_idx": slot["house"],
                                 "options": bonus,
-                                "building_name": slot["building"]["name"],
+                                "building_name": BUILDINGS[slot["building"]]["name"],
                             }
                             return log  # Pause
 
@@ -869,7 +1035,7 @@ class CaylusEngine(GameEngine):
                 state["pending_activation"] = pending
                 return log  # Pause
 
-            log.append(f"{player_name(p)} activates {slot['building']['name']} — no valid options, skipped")
+            log.append(log_event("activate_skipped", wc, BUILDINGS[slot["building"]]["name"]))
             return_worker(state, wc)
             slot["worker"] = None
 
@@ -877,13 +1043,13 @@ class CaylusEngine(GameEngine):
         state["activation_index"] = -1
         state["pending_activation"] = None
         state["current_phase"] = 5
-        log.append("— Phase 6: Castle —")
+        log.append(log_event("phase_castle"))
         return self._process_castle(state, log)
 
     def _build_pending_activation(self, state, road_index, slot, player):
         wc = slot["worker"]
-        b_name = slot["building"]["name"]
-        eff = slot["building"]["effect"]
+        b_name = BUILDINGS[slot["building"]]["name"]
+        eff = BUILDINGS[slot["building"]]["effect"]
 
         base = {"road_index": road_index, "worker_idx": wc, "building_name": b_name}
 
@@ -892,7 +1058,7 @@ class CaylusEngine(GameEngine):
             for i, opt in enumerate(eff["options"]):
                 label = " + ".join(f"{a} {r}" for r, a in opt.items())
                 choices.append({"id": f"opt_{i}", "label": label})
-            return {**base, "effect_type": "choice", "choices": choices, "can_skip": slot["building"]["category"] != "production"}
+            return {**base, "effect_type": "choice", "choices": choices, "can_skip": BUILDINGS[slot["building"]]["category"] != "production"}
 
         if eff["type"] == "sell":
             sellable = [r for r in RESOURCE_TYPES if player["resources"].get(r, 0) > 0]
@@ -908,11 +1074,12 @@ class CaylusEngine(GameEngine):
         if eff["type"] == "build":
             stock = state["building_stock"].get(eff["build_type"], [])
             is_prestige = eff["build_type"] == "prestige"
-            valid_target = (any(s["building"] and s["building"]["type"] == "residential" and s["house"] == wc
+            valid_target = (any(s["building"] and BUILDINGS[s["building"]]["type"] == "residential" and s["house"] == wc
                                for s in state["road"]) if is_prestige
                            else any(s["building"] is None for s in state["road"]))
             choices = []
-            for b in stock:
+            for b_id in stock:
+                b = BUILDINGS[b_id]
                 can_afford = has_resources(player, b.get("cost", {}))
                 choices.append({
                     "id": f"build_{b['id']}", "label": b["name"],
@@ -959,14 +1126,14 @@ class CaylusEngine(GameEngine):
         if eff["type"] == "lawyer":
             choices = []
             for ri, rs in enumerate(state["road"]):
-                if not rs["building"] or rs["building"].get("cannot_be_transformed"):
+                if not rs["building"] or BUILDINGS[rs["building"]].get("cannot_be_transformed"):
                     continue
-                bt = rs["building"]["type"]
+                bt = BUILDINGS[rs["building"]]["type"]
                 if bt in ("prestige", "residential", "basic"):
                     continue
                 if bt == "neutral" or (rs["house"] == wc and bt in ("wood", "stone")):
                     desc = "Transform neutral" if bt == "neutral" else "Transform your building"
-                    choices.append({"id": f"lawyer_{ri}", "label": f"{rs['building']['name']} (pos {ri+1})",
+                    choices.append({"id": f"lawyer_{ri}", "label": f"{BUILDINGS[rs['building']]['name']} (pos {ri+1})",
                                     "description": desc, "target_index": ri})
             can_pay = player["deniers"] >= 1 and player["resources"]["cloth"] >= 1
             return {**base, "effect_type": "lawyer", "choices": choices if can_pay else [], "can_skip": True}
@@ -991,11 +1158,11 @@ class CaylusEngine(GameEngine):
         choice_id = action.get("choice_id")
         slot = state["road"][pa["road_index"]]
         p = find_player_by_idx(state, pidx)
-        eff = slot["building"].get("effect", {})
+        eff = BUILDINGS[slot["building"]].get("effect", {})
         log = []
 
         if choice_id == "skip":
-            log.append(f"{player_name(p)} skips {pa['building_name']}")
+            log.append(log_event("skip_activation", pidx, pa["building_name"]))
             return_worker(state, pidx)
             slot["worker"] = None
             state["pending_activation"] = None
@@ -1007,17 +1174,16 @@ class CaylusEngine(GameEngine):
             opt_idx = int(choice_id.split("_")[1])
             chosen = eff["options"][opt_idx]
             gain_resources(p, chosen)
-            gains = ", ".join(f"{a} {r}" for r, a in chosen.items())
-            log.append(f"{player_name(p)} activates {pa['building_name']}: +{gains}")
+            log.append(_gain_event(pidx, pa["building_name"], chosen))
             # Owner bonus check
-            if (slot["building"]["type"] == "stone" and slot["house"] is not None
-                    and slot["house"] != pidx and slot["building"].get("owner_bonus")):
+            if (BUILDINGS[slot["building"]]["type"] == "stone" and slot["house"] is not None
+                    and slot["house"] != pidx and BUILDINGS[slot["building"]].get("owner_bonus")):
                 owner = find_player_by_idx(state, slot["house"])
                 if owner:
-                    bonus = slot["building"]["owner_bonus"]
+                    bonus = BUILDINGS[slot["building"]]["owner_bonus"]
                     if len(bonus) == 1:
                         owner["resources"][bonus[0]] += 1
-                        log.append(f"  {player_name(owner)} +1 {bonus[0]} (owner bonus)")
+                        log.append(log_event("owner_bonus", owner["index"], bonus[0]))
                     else:
                         return_worker(state, pidx)
                         slot["worker"] = None
@@ -1025,7 +1191,7 @@ class CaylusEngine(GameEngine):
                         state["pending_owner_bonus"] = {
                             "owner_idx": slot["house"],
                             "options": bonus,
-                            "building_name": slot["building"]["name"],
+                            "building_name": BUILDINGS[slot["building"]]["name"],
                         }
                         return self._result(state, log)
 
@@ -1033,13 +1199,13 @@ class CaylusEngine(GameEngine):
             res = choice_id.split("_")[1]
             p["resources"][res] -= 1
             p["deniers"] += pa["price"]
-            log.append(f"{player_name(p)} sells 1 {res} for {pa['price']}$ at {pa['building_name']}")
+            log.append(log_event("sell", pidx, res, pa["price"], pa["building_name"]))
 
         elif pa["effect_type"] == "buy":
             res = choice_id.split("_")[1]
             p["deniers"] -= pa["buy_cost_per"]
             p["resources"][res] += 1
-            log.append(f"{player_name(p)} buys 1 {res} for {pa['buy_cost_per']}$ at {pa['building_name']}")
+            log.append(log_event("buy", pidx, res, pa["buy_cost_per"], pa["building_name"]))
             remaining = pa.get("buy_remaining", pa["buy_max"]) - 1
             if remaining > 0 and p["deniers"] >= pa["buy_cost_per"]:
                 choices = [{"id": f"buy_{r}", "label": f"Buy 1 {r} ({pa['buy_cost_per']}$)"} for r in NON_GOLD_RESOURCES]
@@ -1050,31 +1216,31 @@ class CaylusEngine(GameEngine):
             if choice_id == "church_4":
                 p["deniers"] -= 4
                 p["score"] += 5
-                log.append(f"{player_name(p)} Church: -4$ → +5VP")
+                log.append(log_event("church", pidx, 4, 5))
             else:
                 p["deniers"] -= 2
                 p["score"] += 3
-                log.append(f"{player_name(p)} Church: -2$ → +3VP")
+                log.append(log_event("church", pidx, 2, 3))
 
         elif pa["effect_type"] == "tailor":
             if choice_id == "tailor_3":
                 p["resources"]["cloth"] -= 3
                 p["score"] += 6
-                log.append(f"{player_name(p)} Tailor: -3 cloth → +6VP")
+                log.append(log_event("tailor", pidx, 3, 6))
             else:
                 p["resources"]["cloth"] -= 1
                 p["score"] += 2
-                log.append(f"{player_name(p)} Tailor: -1 cloth → +2VP")
+                log.append(log_event("tailor", pidx, 1, 2))
 
         elif pa["effect_type"] == "bank":
             if choice_id == "bank_5":
                 p["deniers"] -= 5
                 p["resources"]["gold"] += 2
-                log.append(f"{player_name(p)} Bank: -5$ → +2 gold")
+                log.append(log_event("bank", pidx, 5, 2))
             else:
                 p["deniers"] -= 2
                 p["resources"]["gold"] += 1
-                log.append(f"{player_name(p)} Bank: -2$ → +1 gold")
+                log.append(log_event("bank", pidx, 2, 1))
 
         elif pa["effect_type"] == "alchemist":
             if not pa.get("alch_picking"):
@@ -1092,10 +1258,10 @@ class CaylusEngine(GameEngine):
             res = choice_id.replace("alchcube_", "")
             p["resources"][res] -= 1
             new_picked = pa["alch_picked"] + 1
-            log.append(f"{player_name(p)} gives 1 {res} to Alchemist ({new_picked}/{pa['alch_target']})")
+            log.append(log_event("alchemist_give", pidx, res, new_picked, pa["alch_target"]))
             if new_picked >= pa["alch_target"]:
                 p["resources"]["gold"] += pa["alch_gold"]
-                log.append(f"{player_name(p)} Alchemist: → +{pa['alch_gold']} gold")
+                log.append(log_event("alchemist_gold", pidx, pa["alch_gold"]))
             else:
                 available = [{"id": f"alchcube_{r}", "label": f"Give 1 {r}"}
                              for r in NON_GOLD_RESOURCES if p["resources"].get(r, 0) > 0]
@@ -1103,13 +1269,13 @@ class CaylusEngine(GameEngine):
                     state["pending_activation"] = {**pa, "alch_picked": new_picked, "choices": available}
                     return self._result(state, log)
                 p["resources"]["gold"] += pa["alch_gold"]
-                log.append(f"{player_name(p)} Alchemist: ran out → +{pa['alch_gold']} gold")
+                log.append(log_event("alchemist_ran_out", pidx, pa["alch_gold"]))
 
         elif pa["effect_type"] == "build":
             if pa.get("needs_target") and not pa.get("chosen_building_id"):
                 b_id = choice_id.replace("build_", "")
                 stock = state["building_stock"][pa["build_type"]]
-                b = next((x for x in stock if x["id"] == b_id), None)
+                b = BUILDINGS[b_id] if b_id in stock else None
                 if not b:
                     return_worker(state, pidx)
                     slot["worker"] = None
@@ -1119,7 +1285,7 @@ class CaylusEngine(GameEngine):
                     return self._result(state, log)
                 targets = []
                 for ri, rs in enumerate(state["road"]):
-                    if rs["building"] and rs["building"]["type"] == "residential" and rs["house"] == pidx:
+                    if rs["building"] and BUILDINGS[rs["building"]]["type"] == "residential" and rs["house"] == pidx:
                         targets.append({"id": f"ptarget_{ri}", "label": f"Residential (pos {ri+1})", "target_index": ri})
                 state["pending_activation"] = {
                     **pa, "effect_type": "prestige_target", "chosen_building_id": b_id,
@@ -1129,9 +1295,9 @@ class CaylusEngine(GameEngine):
 
             b_id = choice_id.replace("build_", "")
             stock = state["building_stock"][pa["build_type"]]
-            b_idx = next((i for i, b in enumerate(stock) if b["id"] == b_id), None)
+            b_idx = stock.index(b_id) if b_id in stock else None
             if b_idx is not None:
-                b = stock[b_idx]
+                b = BUILDINGS[stock[b_idx]]
                 pay_resources(p, b.get("cost", {}))
                 empty_slot = next((s for s in state["road"] if s["building"] is None and s["index"] not in FIXED_POSITIONS), None)
                 if empty_slot:
@@ -1139,9 +1305,9 @@ class CaylusEngine(GameEngine):
                     empty_slot["house"] = pidx
                     p["score"] += b.get("vp", 0)
                     p["houses_placed"] += 1
-                    log.append(f"{player_name(p)} builds {b['name']} → +{b.get('vp', 0)}VP")
+                    log.append(log_event("build", pidx, b["name"], b.get("vp", 0)))
                     if b.get("favor_on_build"):
-                        log.append(f"  {b['name']} grants {b['favor_on_build']} favor(s)")
+                        log.append(log_event("build_favors", b["name"], b["favor_on_build"]))
                         return_worker(state, pidx)
                         slot["worker"] = None
                         self._apply_delayed_transformations(state, pa["road_index"], log)
@@ -1154,16 +1320,16 @@ class CaylusEngine(GameEngine):
             if target_choice:
                 target_idx = target_choice["target_index"]
                 stock = state["building_stock"]["prestige"]
-                b_idx = next((i for i, b in enumerate(stock) if b["id"] == pa["chosen_building_id"]), None)
+                b_idx = stock.index(pa["chosen_building_id"]) if pa["chosen_building_id"] in stock else None
                 if b_idx is not None:
-                    b = stock[b_idx]
+                    b = BUILDINGS[stock[b_idx]]
                     pay_resources(p, b.get("cost", {}))
                     target = state["road"][target_idx]
                     target["building"] = stock.pop(b_idx)
                     p["score"] += b.get("vp", 0)
-                    log.append(f"{player_name(p)} builds {b['name']} (replacing Residential at pos {target_idx+1}) → +{b.get('vp', 0)}VP")
+                    log.append(log_event("build_prestige", pidx, b["name"], target_idx + 1, b.get("vp", 0)))
                     if b.get("favor_on_build"):
-                        log.append(f"  {b['name']} grants {b['favor_on_build']} favor(s)")
+                        log.append(log_event("build_favors", b["name"], b["favor_on_build"]))
                         return_worker(state, pidx)
                         slot["worker"] = None
                         self._apply_delayed_transformations(state, pa["road_index"], log)
@@ -1178,7 +1344,7 @@ class CaylusEngine(GameEngine):
                 p["deniers"] -= 1
                 p["resources"]["cloth"] -= 1
                 target = state["road"][target_idx]
-                old_building = target["building"]
+                old_building = BUILDINGS[target["building"]]
                 old_name = old_building["name"]
                 was_neutral = old_building["type"] == "neutral"
 
@@ -1188,24 +1354,20 @@ class CaylusEngine(GameEngine):
                         "lawyer_idx": pidx,
                         "was_neutral": was_neutral,
                         "old_building_type": old_building["type"],
-                        "old_building": deepcopy(old_building),
+                        "old_building": old_building["id"],
                     })
-                    log.append(f"{player_name(p)} pays for {old_name} transformation (delayed — worker present)")
+                    log.append(log_event("lawyer_delayed", pidx, old_name))
                     p["score"] += 2
                 else:
                     if not was_neutral and old_building["type"] in ("wood", "stone"):
                         stock_type = old_building["type"]
-                        state["building_stock"][stock_type].append(deepcopy(old_building))
-                        log.append(f"  {old_name} returned to {stock_type} building stock")
-                    target["building"] = {
-                        "id": f"res_{target_idx}", "name": "Residential",
-                        "type": "residential", "category": "residential",
-                        "description": "+1 denier income",
-                    }
+                        state["building_stock"][stock_type].append(old_building["id"])
+                        log.append(log_event("stock_return", old_name, stock_type))
+                    target["building"] = RESIDENTIAL_BUILDING["id"]
                     if was_neutral:
                         target["house"] = pidx
                     p["score"] += 2
-                    log.append(f"{player_name(p)} transforms {old_name} → Residential (+2VP)")
+                    log.append(log_event("transform", pidx, old_name))
 
         # Done — return worker and advance
         return_worker(state, pidx)
@@ -1226,18 +1388,14 @@ class CaylusEngine(GameEngine):
         state["delayed_transformations"] = [dt for dt in dt_list if dt["target_index"] != road_index]
         for dt in pending:
             target = state["road"][dt["target_index"]]
-            old_name = dt["old_building"]["name"]
+            old_name = BUILDINGS[dt["old_building"]]["name"]
             if not dt["was_neutral"] and dt["old_building_type"] in ("wood", "stone"):
-                state["building_stock"][dt["old_building_type"]].append(deepcopy(dt["old_building"]))
-                log.append(f"  {old_name} returned to {dt['old_building_type']} building stock")
-            target["building"] = {
-                "id": f"res_{dt['target_index']}", "name": "Residential",
-                "type": "residential", "category": "residential",
-                "description": "+1 denier income",
-            }
+                state["building_stock"][dt["old_building_type"]].append(dt["old_building"])
+                log.append(log_event("stock_return", old_name, dt["old_building_type"]))
+            target["building"] = RESIDENTIAL_BUILDING["id"]
             if dt["was_neutral"]:
                 target["house"] = dt["lawyer_idx"]
-            log.append(f"  Delayed: {old_name} → Residential (lawyer by {player_name(find_player_by_idx(state, dt['lawyer_idx']))})")
+            log.append(log_event("transform_delayed", old_name, dt["lawyer_idx"]))
 
     # ── Owner Bonus ──────────────────────────────────────────────────
 
@@ -1252,7 +1410,7 @@ class CaylusEngine(GameEngine):
 
         p = find_player_by_idx(state, pidx)
         p["resources"][resource] += 1
-        log = [f"{player_name(p)} takes +1 {resource} (owner bonus for {ob['building_name']})"]
+        log = [log_event("owner_bonus_choice", pidx, resource, ob["building_name"])]
         state["pending_owner_bonus"] = None
 
         more = self._advance_activation(state, [])
@@ -1265,9 +1423,9 @@ class CaylusEngine(GameEngine):
         actions = []
         for i, s in enumerate(state["road"]):
             if (s["building"] and s["worker"] is None
-                    and s["building"]["type"] not in ("residential", "prestige")):
+                    and BUILDINGS[s["building"]]["type"] not in ("residential", "prestige")):
                 actions.append({"kind": "gate_choice", "target": i,
-                                "description": f"Gate → {s['building']['name']} (pos {i+1})"})
+                                "description": f"Gate → {BUILDINGS[s['building']]['name']} (pos {i+1})"})
         for sid in pg.get("special_targets", []):
             actions.append({"kind": "gate_choice", "target": f"special_{sid}",
                             "description": f"Gate → {SPECIAL_BUILDINGS[sid]['name']}"})
@@ -1288,11 +1446,11 @@ class CaylusEngine(GameEngine):
         log = []
 
         if target == "skip":
-            log.append(f"{player_name(p)} skips Gate — worker returns")
+            log.append(log_event("gate_skip", pidx))
             return_worker(state, pidx)
         elif target == "castle":
             state["castle"]["workers"].append(pidx)
-            log.append(f"{player_name(p)} Gate → Castle (free)")
+            log.append(log_event("gate_castle", pidx))
         elif isinstance(target, str) and target.startswith("special_"):
             spec_id = target.replace("special_", "")
             ss = state["special_state"]
@@ -1303,7 +1461,7 @@ class CaylusEngine(GameEngine):
                 ss["inn"]["left"] = pidx
             else:
                 ss[spec_id]["worker"] = pidx
-            log.append(f"{player_name(p)} Gate → {SPECIAL_BUILDINGS[spec_id]['name']} (free)")
+            log.append(log_event("gate_special", pidx, SPECIAL_BUILDINGS[spec_id]["name"]))
         else:
             # Road index
             road_index = int(target)
@@ -1312,9 +1470,9 @@ class CaylusEngine(GameEngine):
                 owner = find_player_by_idx(state, slot["house"])
                 if owner:
                     owner["score"] += 1
-                    log.append(f"{player_name(p)} Gate → {slot['building']['name']} ({player_name(owner)}'s, +1VP) (free)")
+                    log.append(log_event("gate_owned", pidx, BUILDINGS[slot["building"]]["name"], owner["index"]))
             else:
-                log.append(f"{player_name(p)} Gate → {slot['building']['name']} (pos {road_index+1}) (free)")
+                log.append(log_event("gate_road", pidx, BUILDINGS[slot["building"]]["name"], road_index + 1))
             slot["worker"] = pidx
 
         state["pending_gate"] = None
@@ -1334,12 +1492,12 @@ class CaylusEngine(GameEngine):
         log = []
 
         if stay:
-            log.append(f"{player_name(p)} stays in Inn (1$ workers)")
+            log.append(log_event("inn_stay", pidx))
         else:
             p["inn_occupant"] = False
             return_worker(state, pidx)
             state["special_state"]["inn"]["right"] = None
-            log.append(f"{player_name(p)} leaves Inn")
+            log.append(log_event("inn_leave", pidx))
 
         state["pending_inn"] = None
         more = self._start_provost_phase(state, [])
@@ -1351,7 +1509,7 @@ class CaylusEngine(GameEngine):
     def _process_castle(self, state, log):
         if not state["castle"]["workers"]:
             state["current_phase"] = 6
-            log.append("— Phase 7: End of Turn —")
+            log.append(log_event("phase_end_turn"))
             return self._process_end_turn(state, log)
 
         state["castle_phase"] = {"worker_index": 0, "houses_this_turn": {}}
@@ -1381,10 +1539,10 @@ class CaylusEngine(GameEngine):
         next_full = next_sec and all(x is not None for x in state["castle"][next_sec])
 
         if sec == "towers" and sec_full and (not next_sec or next_full):
-            log.append(f"{player_name(p)} — no room left in Towers (no penalty)")
+            log.append(log_event("castle_towers_full", wc))
         else:
             p["score"] = max(0, p["score"] - 2)
-            log.append(f"{player_name(p)} can't contribute to castle → -2VP")
+            log.append(log_event("castle_penalty", wc))
 
         return_worker(state, wc)
         cp["worker_index"] += 1
@@ -1444,7 +1602,7 @@ class CaylusEngine(GameEngine):
             p["score"] += vp
             p["houses_placed"] += 1
             cp["houses_this_turn"][str(wc)] = cp["houses_this_turn"].get(str(wc), 0) + 1
-            log.append(f"{player_name(p)} builds {CASTLE_SECTIONS[placed_section]['name']} (food+{res1}+{res2}) → +{vp}VP")
+            log.append(log_event("castle_build", wc, CASTLE_SECTIONS[placed_section]["name"], res1, res2, vp))
 
         more_options = get_castle_batch_options(p, state)
         if more_options:
@@ -1475,13 +1633,13 @@ class CaylusEngine(GameEngine):
             next_sec = {"dungeon": "walls", "walls": "towers"}.get(sec)
             next_full = next_sec and all(x is not None for x in state["castle"][next_sec])
             if sec == "towers" and sec_full and (not next_sec or next_full):
-                log.append(f"{player_name(p)} — no room left (no penalty)")
+                log.append(log_event("castle_full", wc))
             else:
                 p["score"] = max(0, p["score"] - 2)
-                log.append(f"{player_name(p)} declines to build castle → -2VP")
+                log.append(log_event("castle_decline", wc))
         else:
             count = cp["houses_this_turn"][str(wc)]
-            log.append(f"{player_name(p)} stops building castle ({count} batch{'es' if count > 1 else ''})")
+            log.append(log_event("castle_stop" if count > 1 else "castle_stop_one", wc, count))
 
         state["pending_castle"] = None
         return_worker(state, wc)
@@ -1513,12 +1671,11 @@ class CaylusEngine(GameEngine):
         state["current_phase"] = 6
 
         if best is not None and best_count > 0:
-            bp = find_player_by_idx(state, best)
-            log.append(f"{player_name(bp)} is best castle builder ({best_count} batch{'es' if best_count > 1 else ''}) → 1 favor")
+            log.append(log_event("best_builder" if best_count > 1 else "best_builder_one", best, best_count))
             self._grant_favors(state, [{"player_idx": best, "count": 1}], "after_castle")
             return log
 
-        log.append("— Phase 7: End of Turn —")
+        log.append(log_event("phase_end_turn"))
         return self._process_end_turn(state, log)
 
     # ── Phase 7: End Turn ────────────────────────────────────────────
@@ -1528,7 +1685,7 @@ class CaylusEngine(GameEngine):
         mv = 2 if ahead else 1
         state["bailiff_position"] = min(state["bailiff_position"] + mv, len(state["road"]) - 1)
         state["provost_position"] = state["bailiff_position"]
-        log.append(f"Bailiff moves {mv} → pos {state['bailiff_position']+1}, Provost resets")
+        log.append(log_event("bailiff", mv, state["bailiff_position"] + 1))
 
         sec = state["castle"]["current_section"]
         parts = state["castle"][sec]
@@ -1545,7 +1702,7 @@ class CaylusEngine(GameEngine):
     def _process_castle_count(self, state, log):
         sec = state["castle"]["current_section"]
         parts = state["castle"][sec]
-        log.append(f"Counting {CASTLE_SECTIONS[sec]['name']}!")
+        log.append(log_event("counting", CASTLE_SECTIONS[sec]["name"]))
 
         favor_queue = []
         for p in state["players"]:
@@ -1554,42 +1711,42 @@ class CaylusEngine(GameEngine):
             if sec == "dungeon":
                 if h == 0:
                     p["score"] = max(0, p["score"] - 2)
-                    log.append(f"{player_name(p)}: 0 houses → -2VP")
+                    log.append(log_event("count_none", p["index"], 2))
                 elif h >= 2:
                     favors = 1
-                    log.append(f"{player_name(p)}: {h} houses → 1 favor")
+                    log.append(log_event("count_favor", p["index"], h))
                 else:
-                    log.append(f"{player_name(p)}: {h} house")
+                    log.append(log_event("count_one", p["index"], h))
             elif sec == "walls":
                 if h == 0:
                     p["score"] = max(0, p["score"] - 3)
-                    log.append(f"{player_name(p)}: 0 houses → -3VP")
+                    log.append(log_event("count_none", p["index"], 3))
                 elif h >= 5:
                     favors = 3
-                    log.append(f"{player_name(p)}: {h} houses → 3 favors")
+                    log.append(log_event("count_favors", p["index"], h, 3))
                 elif h >= 3:
                     favors = 2
-                    log.append(f"{player_name(p)}: {h} houses → 2 favors")
+                    log.append(log_event("count_favors", p["index"], h, 2))
                 elif h >= 2:
                     favors = 1
-                    log.append(f"{player_name(p)}: {h} houses → 1 favor")
+                    log.append(log_event("count_favor", p["index"], h))
                 else:
-                    log.append(f"{player_name(p)}: {h} house")
+                    log.append(log_event("count_one", p["index"], h))
             else:  # towers
                 if h == 0:
                     p["score"] = max(0, p["score"] - 4)
-                    log.append(f"{player_name(p)}: 0 houses → -4VP")
+                    log.append(log_event("count_none", p["index"], 4))
                 elif h >= 6:
                     favors = 3
-                    log.append(f"{player_name(p)}: {h} houses → 3 favors")
+                    log.append(log_event("count_favors", p["index"], h, 3))
                 elif h >= 4:
                     favors = 2
-                    log.append(f"{player_name(p)}: {h} houses → 2 favors")
+                    log.append(log_event("count_favors", p["index"], h, 2))
                 elif h >= 2:
                     favors = 1
-                    log.append(f"{player_name(p)}: {h} houses → 1 favor")
+                    log.append(log_event("count_favor", p["index"], h))
                 else:
-                    log.append(f"{player_name(p)}: {h} house")
+                    log.append(log_event("count_one", p["index"], h))
             if favors > 0:
                 favor_queue.append({"player_idx": p["index"], "count": favors})
 
@@ -1598,16 +1755,16 @@ class CaylusEngine(GameEngine):
             state["castle"]["dungeon_counted"] = True
             state["castle"]["current_section"] = "walls"
             state["favor_columns_available"] = 4
-            log.append("Walls phase begins. Favor cols 3-4 open.")
+            log.append(log_event("walls_begin"))
         elif sec == "walls":
             state["castle"]["walls_counted"] = True
             state["castle"]["current_section"] = "towers"
             state["favor_columns_available"] = 5
-            log.append("Towers phase begins. All favor cols open.")
+            log.append(log_event("towers_begin"))
         else:
             state["castle"]["towers_counted"] = True
             state["game_over"] = True
-            log.append("Game Over!")
+            log.append(log_event("game_over"))
 
         if favor_queue:
             self._grant_favors(state, favor_queue, "after_count")
@@ -1638,21 +1795,21 @@ class CaylusEngine(GameEngine):
         if state["game_over"]:
             self._process_end_game(state, log)
         else:
-            log.append(f"Turn {state['turn']}")
+            log.append(log_event("turn", state["turn"]))
 
         return log
 
     def _process_end_game(self, state, log):
-        log.append("FINAL SCORING")
+        log.append(log_event("final_scoring"))
         for p in state["players"]:
             gb = p["resources"]["gold"] * 3
             non_gold = sum(p["resources"].get(r, 0) for r in NON_GOLD_RESOURCES)
             cb = non_gold // 3
             db = p["deniers"] // 4
             p["score"] += gb + cb + db
-            log.append(f"{player_name(p)}: +{gb}(gold) +{cb}(cubes) +{db}($) = {p['score']}VP total")
+            log.append(log_event("final_score", p["index"], gb, cb, db, p["score"]))
         winner = max(state["players"], key=lambda p: p["score"])
-        log.append(f"{player_name(winner)} wins with {winner['score']}VP!")
+        log.append(log_event("win", winner["index"], winner["score"]))
 
     # ── Favor System ─────────────────────────────────────────────────
 
@@ -1738,15 +1895,15 @@ class CaylusEngine(GameEngine):
 
         track = FAVOR_TRACKS[track_key]
         if maxed:
-            log.append(f"{player_name(p)} uses {track['name']} favor (maxed at col 5)")
+            log.append(log_event("favor_maxed", pidx, track["name"]))
         else:
-            log.append(f"{player_name(p)} takes {track['name']} favor → col {next_level}")
+            log.append(log_event("favor", pidx, track["name"], next_level))
 
         # Handle track-specific effects
         if track_key == "prestige":
             if next_level == 1:
                 p["score"] += 1
-                log.append("  +1 VP")
+                log.append(log_event("favor_vp"))
             else:
                 options = [{"id": f"prestlvl_{lvl}", "label": f"+{lvl} VP"} for lvl in range(1, next_level + 1)]
                 pf["sub_choice"] = {"type": "prestige_level_pick", "options": options}
@@ -1755,7 +1912,7 @@ class CaylusEngine(GameEngine):
         elif track_key == "deniers":
             if next_level == 1:
                 p["deniers"] += 3
-                log.append("  +3$")
+                log.append(log_event("favor_deniers"))
             else:
                 options = [{"id": f"denlvl_{lvl}", "label": f"+{lvl + 2}$"} for lvl in range(1, next_level + 1)]
                 pf["sub_choice"] = {"type": "deniers_level_pick", "options": options}
@@ -1764,7 +1921,7 @@ class CaylusEngine(GameEngine):
         elif track_key == "resources":
             if next_level == 1:
                 p["resources"]["food"] += 1
-                log.append("  +1 food")
+                log.append(log_event("favor_food"))
             else:
                 options = [{"id": "reslvl_1", "label": "+1 food"}]
                 if next_level >= 2:
@@ -1780,14 +1937,14 @@ class CaylusEngine(GameEngine):
 
         elif track_key == "buildings":
             if next_level == 1:
-                log.append("  No effect")
+                log.append(log_event("favor_no_effect"))
             else:
                 options = self._get_building_favor_options(state, p, pidx, next_level)
                 options.append({"id": "bldlvl_skip", "label": "Skip"})
                 if len(options) > 1:
                     pf["sub_choice"] = {"type": "bld_level_pick", "options": options}
                     return self._result(state, log)
-                log.append("  No building effects available")
+                log.append(log_event("favor_no_buildings"))
 
         entry["remaining"] -= 1
         return self._advance_favor_queue(state, log)
@@ -1805,16 +1962,16 @@ class CaylusEngine(GameEngine):
                             "disabled": not s_stock or not has_empty})
         if next_level >= 4:
             has_target = any(
-                rs["building"] and not rs["building"].get("cannot_be_transformed")
-                and rs["building"]["type"] not in ("prestige", "residential", "basic")
-                and (rs["building"]["type"] == "neutral" or (rs["house"] == pidx and rs["building"]["type"] in ("wood", "stone")))
+                rs["building"] and not BUILDINGS[rs["building"]].get("cannot_be_transformed")
+                and BUILDINGS[rs["building"]]["type"] not in ("prestige", "residential", "basic")
+                and (BUILDINGS[rs["building"]]["type"] == "neutral" or (rs["house"] == pidx and BUILDINGS[rs["building"]]["type"] in ("wood", "stone")))
                 for rs in state["road"]
             )
             options.append({"id": "bldlvl_4", "label": "Lawyer",
                             "disabled": not has_target or player["resources"]["cloth"] < 1})
         if next_level >= 5:
             p_stock = state["building_stock"].get("prestige", [])
-            has_residential = any(s["building"] and s["building"]["type"] == "residential" and s["house"] == pidx
+            has_residential = any(s["building"] and BUILDINGS[s["building"]]["type"] == "residential" and s["house"] == pidx
                                   for s in state["road"])
             options.append({"id": "bldlvl_5", "label": "Architect -1",
                             "disabled": not p_stock or not has_residential})
@@ -1836,7 +1993,7 @@ class CaylusEngine(GameEngine):
         if sc["type"] == "prestige_level_pick":
             lvl = int(choice_id.replace("prestlvl_", ""))
             p["score"] += lvl
-            log.append(f"  {player_name(p)} takes +{lvl} VP")
+            log.append(log_event("favor_take_vp", pidx, lvl))
             pf["sub_choice"] = None
             entry["remaining"] -= 1
             return self._advance_favor_queue(state, log)
@@ -1845,7 +2002,7 @@ class CaylusEngine(GameEngine):
             lvl = int(choice_id.replace("denlvl_", ""))
             amount = lvl + 2
             p["deniers"] += amount
-            log.append(f"  {player_name(p)} takes +{amount}$")
+            log.append(log_event("favor_take_deniers", pidx, amount))
             pf["sub_choice"] = None
             entry["remaining"] -= 1
             return self._advance_favor_queue(state, log)
@@ -1854,7 +2011,7 @@ class CaylusEngine(GameEngine):
             lvl = int(choice_id.replace("reslvl_", ""))
             if lvl == 1:
                 p["resources"]["food"] += 1
-                log.append(f"  {player_name(p)} takes +1 food")
+                log.append(log_event("favor_take", pidx, "food"))
             elif lvl == 2:
                 pf["sub_choice"] = {"type": "res2", "options": [
                     {"id": "wood", "label": "+1 wood"},
@@ -1863,30 +2020,30 @@ class CaylusEngine(GameEngine):
                 return self._result(state, log)
             elif lvl == 3:
                 p["resources"]["cloth"] += 1
-                log.append(f"  {player_name(p)} takes +1 cloth")
+                log.append(log_event("favor_take", pidx, "cloth"))
             elif lvl == 4:
                 give_options = [{"id": r, "label": f"-1 {r}"} for r in RESOURCE_TYPES if p["resources"].get(r, 0) > 0]
                 if give_options:
                     pf["sub_choice"] = {"type": "res4_give", "options": give_options}
                     return self._result(state, log)
-                log.append(f"  {player_name(p)} has no cubes to trade")
+                log.append(log_event("favor_no_cubes", pidx))
             elif lvl == 5:
                 p["resources"]["gold"] += 1
-                log.append(f"  {player_name(p)} takes +1 gold")
+                log.append(log_event("favor_take", pidx, "gold"))
             pf["sub_choice"] = None
             entry["remaining"] -= 1
             return self._advance_favor_queue(state, log)
 
         if sc["type"] == "res2":
             p["resources"][choice_id] += 1
-            log.append(f"  {player_name(p)} picks +1 {choice_id}")
+            log.append(log_event("favor_pick", pidx, choice_id))
             pf["sub_choice"] = None
             entry["remaining"] -= 1
             return self._advance_favor_queue(state, log)
 
         if sc["type"] == "res4_give":
             p["resources"][choice_id] -= 1
-            log.append(f"  {player_name(p)} gives 1 {choice_id}")
+            log.append(log_event("favor_give", pidx, choice_id))
             pf["sub_choice"] = {"type": "res4_take", "picks": 0, "max_picks": 2, "options": [
                 {"id": r, "label": f"+1 {r}"} for r in NON_GOLD_RESOURCES
             ]}
@@ -1895,7 +2052,7 @@ class CaylusEngine(GameEngine):
         if sc["type"] == "res4_take":
             p["resources"][choice_id] += 1
             sc["picks"] += 1
-            log.append(f"  {player_name(p)} takes +1 {choice_id} ({sc['picks']}/2)")
+            log.append(log_event("favor_swap_take", pidx, choice_id, sc["picks"]))
             if sc["picks"] >= sc["max_picks"]:
                 pf["sub_choice"] = None
                 entry["remaining"] -= 1
@@ -1904,7 +2061,7 @@ class CaylusEngine(GameEngine):
 
         if sc["type"] == "bld_level_pick":
             if choice_id == "bldlvl_skip":
-                log.append(f"  {player_name(p)} skips building effect")
+                log.append(log_event("favor_skip_building", pidx))
                 pf["sub_choice"] = None
                 entry["remaining"] -= 1
                 return self._advance_favor_queue(state, log)
@@ -1915,7 +2072,8 @@ class CaylusEngine(GameEngine):
                 stock = state["building_stock"].get(build_type, [])
                 is_prestige = lvl == 5
                 options = []
-                for b in stock:
+                for b_id in stock:
+                    b = BUILDINGS[b_id]
                     can_afford, _ = can_afford_with_discount(p, b.get("cost", {}))
                     options.append({"id": f"fbuild_{b['id']}", "label": b["name"], "disabled": not can_afford})
                 pf["sub_choice"] = {"type": "build_favor", "build_type": build_type,
@@ -1924,18 +2082,18 @@ class CaylusEngine(GameEngine):
             elif lvl == 4:
                 options = []
                 for ri, rs in enumerate(state["road"]):
-                    if not rs["building"] or rs["building"].get("cannot_be_transformed"):
+                    if not rs["building"] or BUILDINGS[rs["building"]].get("cannot_be_transformed"):
                         continue
-                    bt = rs["building"]["type"]
+                    bt = BUILDINGS[rs["building"]]["type"]
                     if bt in ("prestige", "residential", "basic"):
                         continue
                     if bt == "neutral" or (rs["house"] == pidx and bt in ("wood", "stone")):
-                        options.append({"id": f"flawyer_{ri}", "label": f"{rs['building']['name']} (pos {ri+1})",
+                        options.append({"id": f"flawyer_{ri}", "label": f"{BUILDINGS[rs['building']]['name']} (pos {ri+1})",
                                         "target_index": ri})
                 if options:
                     pf["sub_choice"] = {"type": "lawyer_favor", "options": options}
                     return self._result(state, log)
-                log.append("  No buildings to transform")
+                log.append(log_event("favor_no_transform"))
 
             pf["sub_choice"] = None
             entry["remaining"] -= 1
@@ -1943,12 +2101,12 @@ class CaylusEngine(GameEngine):
 
         if sc["type"] == "build_favor":
             if choice_id == "skip":
-                log.append(f"  {player_name(p)} skips building favor")
+                log.append(log_event("favor_skip_build", pidx))
             elif sc.get("is_prestige") and not sc.get("chosen_building_id"):
                 b_id = choice_id.replace("fbuild_", "")
                 targets = []
                 for ri, rs in enumerate(state["road"]):
-                    if rs["building"] and rs["building"]["type"] == "residential" and rs["house"] == pidx:
+                    if rs["building"] and BUILDINGS[rs["building"]]["type"] == "residential" and rs["house"] == pidx:
                         targets.append({"id": f"fptarget_{ri}", "label": f"Residential (pos {ri+1})", "target_index": ri})
                 pf["sub_choice"] = {"type": "build_favor_prestige_target",
                                     "build_type": sc["build_type"], "chosen_building_id": b_id,
@@ -1957,9 +2115,9 @@ class CaylusEngine(GameEngine):
             else:
                 b_id = choice_id.replace("fbuild_", "")
                 stock = state["building_stock"][sc["build_type"]]
-                b_idx = next((i for i, b in enumerate(stock) if b["id"] == b_id), None)
+                b_idx = stock.index(b_id) if b_id in stock else None
                 if b_idx is not None:
-                    b = stock[b_idx]
+                    b = BUILDINGS[stock[b_idx]]
                     apply_discounted_cost(p, b.get("cost", {}))
                     empty_slot = next((s for s in state["road"] if s["building"] is None and s["index"] not in FIXED_POSITIONS), None)
                     if empty_slot:
@@ -1967,9 +2125,9 @@ class CaylusEngine(GameEngine):
                         empty_slot["house"] = pidx
                         p["score"] += b.get("vp", 0)
                         p["houses_placed"] += 1
-                        log.append(f"  {player_name(p)} builds {b['name']} (favor discount) → +{b.get('vp', 0)}VP")
+                        log.append(log_event("favor_build", pidx, b["name"], b.get("vp", 0)))
                         if b.get("favor_on_build"):
-                            log.append(f"  {b['name']} grants {b['favor_on_build']} favor(s)")
+                            log.append(log_event("build_favors", b["name"], b["favor_on_build"]))
                             entry["remaining"] += b["favor_on_build"]
 
             pf["sub_choice"] = None
@@ -1978,21 +2136,21 @@ class CaylusEngine(GameEngine):
 
         if sc["type"] == "build_favor_prestige_target":
             if choice_id == "skip":
-                log.append(f"  {player_name(p)} skips prestige placement")
+                log.append(log_event("favor_skip_prestige", pidx))
             else:
                 opt = next((o for o in sc["options"] if o["id"] == choice_id), None)
                 if opt:
                     stock = state["building_stock"]["prestige"]
-                    b_idx = next((i for i, b in enumerate(stock) if b["id"] == sc["chosen_building_id"]), None)
+                    b_idx = stock.index(sc["chosen_building_id"]) if sc["chosen_building_id"] in stock else None
                     if b_idx is not None:
-                        b = stock[b_idx]
+                        b = BUILDINGS[stock[b_idx]]
                         apply_discounted_cost(p, b.get("cost", {}))
                         target = state["road"][opt["target_index"]]
                         target["building"] = stock.pop(b_idx)
                         p["score"] += b.get("vp", 0)
-                        log.append(f"  {player_name(p)} builds {b['name']} (favor discount) → +{b.get('vp', 0)}VP")
+                        log.append(log_event("favor_build", pidx, b["name"], b.get("vp", 0)))
                         if b.get("favor_on_build"):
-                            log.append(f"  {b['name']} grants {b['favor_on_build']} favor(s)")
+                            log.append(log_event("build_favors", b["name"], b["favor_on_build"]))
                             entry["remaining"] += b["favor_on_build"]
             pf["sub_choice"] = None
             entry["remaining"] -= 1
@@ -2000,26 +2158,22 @@ class CaylusEngine(GameEngine):
 
         if sc["type"] == "lawyer_favor":
             if choice_id == "skip":
-                log.append(f"  {player_name(p)} skips lawyer favor")
+                log.append(log_event("favor_skip_lawyer", pidx))
             else:
                 opt = next((o for o in sc["options"] if o["id"] == choice_id), None)
                 if opt and p["resources"]["cloth"] >= 1:
                     p["resources"]["cloth"] -= 1
                     target = state["road"][opt["target_index"]]
-                    old_building = target["building"]
+                    old_building = BUILDINGS[target["building"]]
                     old_name = old_building["name"]
                     was_neutral = old_building["type"] == "neutral"
                     if not was_neutral and old_building["type"] in ("wood", "stone"):
-                        state["building_stock"][old_building["type"]].append(deepcopy(old_building))
-                    target["building"] = {
-                        "id": f"res_{opt['target_index']}", "name": "Residential",
-                        "type": "residential", "category": "residential",
-                        "description": "+1 denier income",
-                    }
+                        state["building_stock"][old_building["type"]].append(old_building["id"])
+                    target["building"] = RESIDENTIAL_BUILDING["id"]
                     if was_neutral:
                         target["house"] = pidx
                     p["score"] += 2
-                    log.append(f"  {player_name(p)} transforms {old_name} → Residential (+2VP, -1 cloth) (favor lawyer)")
+                    log.append(log_event("favor_transform", pidx, old_name))
             pf["sub_choice"] = None
             entry["remaining"] -= 1
             return self._advance_favor_queue(state, log)
@@ -2035,8 +2189,7 @@ class CaylusEngine(GameEngine):
         if entry["remaining"] > 0:
             avail = self._get_available_favor_tracks(state, entry["player_idx"], entry["tracks_used"])
             if not avail:
-                p = find_player_by_idx(state, entry["player_idx"])
-                log.append(f"{player_name(p)} has no more available favor tracks")
+                log.append(log_event("favors_exhausted", entry["player_idx"]))
                 entry["remaining"] = 0
             else:
                 return self._result(state, log)
@@ -2056,7 +2209,7 @@ class CaylusEngine(GameEngine):
             more = self._advance_activation(state, [])
             log.extend(self._collect_log(more))
         elif return_action == "after_castle":
-            log.append("— Phase 7: End of Turn —")
+            log.append(log_event("phase_end_turn"))
             more = self._process_end_turn(state, [])
             log.extend(self._collect_log(more))
         elif return_action == "after_count":
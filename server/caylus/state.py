@@ -4,8 +4,7 @@ Caylus — constants, building definitions, and helper functions.
 All game data is defined here so engine.py can focus on control flow.
 """
 
-import random
-from copy import deepcopy
+from server.rng import shuffle
 
 # ── Player Colors ────────────────────────────────────────────────────
 
@@ -177,6 +176,19 @@ PRESTIGE_BUILDINGS = [
      "cost": {"gold": 1, "stone": 1, "wood": 1}, "vp": 5},
 ]
 
+RESIDENTIAL_BUILDING = {
+    "id": "residential", "name": "Residential", "type": "residential", "category": "residential",
+    "description": "+1 denier income",
+}
+
+# Every building definition by id. Road slots and the building stock hold
+# only ids; look definitions up here rather than copying them into state.
+BUILDINGS = {
+    b["id"]: b
+    for b in (NEUTRAL_BUILDINGS + BASIC_BUILDINGS + WOOD_BUILDINGS + STONE_BUILDINGS
+              + PRESTIGE_BUILDINGS + [RESIDENTIAL_BUILDING])
+}
+
 # ── Favor Tracks ─────────────────────────────────────────────────────
 
 FAVOR_TRACKS = {
@@ -267,7 +279,7 @@ def create_player(index, player_id, name):
     }
 
 
-def generate_road():
+def generate_road(rng):
     """Build the initial road.
 
     Layout (0-indexed):
@@ -281,23 +293,21 @@ def generate_road():
     The gold mine is at a fixed position further down the road,
     matching the original board game layout.
     """
-    neutrals = deepcopy(NEUTRAL_BUILDINGS)
-    random.shuffle(neutrals)
+    neutrals = [b["id"] for b in NEUTRAL_BUILDINGS]
+    shuffle(rng, neutrals)
     road = []
     # Positions 0–5: neutral buildings
     for i, b in enumerate(neutrals):
         road.append({"index": i, "building": b, "worker": None, "house": None})
     # Positions 6–7: Peddler and Marketplace (first two basic buildings)
-    fixed_early = [b for b in deepcopy(BASIC_BUILDINGS) if b["id"] != "b_goldmine"]
+    fixed_early = [b["id"] for b in BASIC_BUILDINGS if b["id"] != "b_goldmine"]
     for i, b in enumerate(fixed_early):
         road.append({"index": 6 + i, "building": b, "worker": None, "house": None})
     # Positions 8–14: empty
     for i in range(8, GOLD_MINE_POSITION):
         road.append({"index": i, "building": None, "worker": None, "house": None})
-    # Position 15: Gold Mine
-    gold_mine = deepcopy(next(b for b in BASIC_BUILDINGS if b["id"] == "b_goldmine"))
-    gold_mine["fixed"] = True  # Mark as fixed so it's not skipped for building placement
-    road.append({"index": GOLD_MINE_POSITION, "building": gold_mine, "worker": None, "house": None})
+    # Position 15: Gold Mine (FIXED_POSITIONS keeps builders off it)
+    road.append({"index": GOLD_MINE_POSITION, "building": "b_goldmine", "worker": None, "house": None})
     # Positions 16–29: empty
     for i in range(GOLD_MINE_POSITION + 1, ROAD_SIZE):
         road.append({"index": i, "building": None, "worker": None, "house": None})
@@ -331,11 +341,11 @@ def create_castle():
 
 
 def create_building_stock():
-    """Create the available building stock (wood, stone, prestige)."""
+    """Create the available building stock (wood, stone, prestige) as lists of ids."""
     return {
-        "wood": deepcopy(WOOD_BUILDINGS),
-        "stone": deepcopy(STONE_BUILDINGS),
-        "prestige": deepcopy(PRESTIGE_BUILDINGS),
+        "wood": [b["id"] for b in WOOD_BUILDINGS],
+        "stone": [b["id"] for b in STONE_BUILDINGS],
+        "prestige": [b["id"] for b in PRESTIGE_BUILDINGS],
     }
 
 
@@ -382,7 +392,7 @@ def count_residential_buildings(state, player_idx):
     count = 0
     for slot in state["road"]:
         if (slot["building"] and
-                slot["building"]["type"] == "residential" and
+                BUILDINGS[slot["building"]]["type"] == "residential" and
                 slot["house"] == player_idx):
             count += 1
     return count
@@ -392,7 +402,7 @@ def player_has_building(state, player_idx, building_id):
     """Check if a player owns a specific building on the road."""
     for slot in state["road"]:
         if (slot["building"] and
-                slot["building"]["id"] == building_id and
+                slot["building"] == building_id and
                 slot["house"] == player_idx):
             return True
     return False
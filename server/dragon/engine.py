@@ -8,8 +8,12 @@ All state is a plain dict. No side effects, no networking.
 from copy import deepcopy
 
 from server.game_engine import GameEngine, ActionResult
+from server.log_events import log_event
+from server.snapshot import SnapshotCodec
+from server.rng import new_rng
+from server.views import Private, build_view, drop, hidden_items
 from server.dragon.state import (
-    PERSON_TYPES, ACTION_INFO, ACTION_IDS, EVENT_TYPES, PLAYER_COLORS,
+    PERSON_TYPES, ACTION_INFO, ACTION_IDS, EVENTS, PLAYER_COLORS,
     count_symbols, get_person_track_order, combo_key,
     generate_event_tiles, generate_person_tiles, create_player, deal_action_groups,
     execute_taxes, execute_harvest, execute_fireworks, execute_military,
@@ -18,11 +22,91 @@ from server.dragon.state import (
 )
 
 
+# Other players' cards show as placeholders (count, not contents)
+REDACTIONS = [
+    Private(("players", "*", "cards"), hidden_items, owner="player_id"),
+    # The seed would reveal future action-group deals
+    Private(("rng",), drop),
+]
+
+
+# ── Log events ───────────────────────────────────────
+
+LOG_EVENTS = {
+    "draft": "{player} drafted {first} and {second}",
+    "draft_complete": "Draft complete! Starting Round 1.",
+    "pay_occupied": "{player} paid {cost}¥ for occupied group.",
+    "choose_build": "{player} chose Build — awaiting placement.",
+    "taxes": "{player}: Collected {total}¥ (2 base + {bonus} tax collectors). Now {yuan}¥.",
+    "harvest": "{player}: Harvested {total} rice (1 base + {bonus} farmers). Now {rice} rice.",
+    "fireworks": "{player}: Gained {total} fireworks (1 base + {bonus} pyrotechnists). Now {fireworks}.",
+    "military": "{player}: Advanced {total} steps (1 base + {bonus} warriors). Now at {track}.",
+    "research": "{player}: Gained {total} VP (1 base + {bonus} scholars). Now {vp} VP.",
+    "build": "{player}: Built {total} floor(s) (1 base + {bonus} craftsmen).",
+    "privilege_small": "{player}: Bought small privilege (2¥). {yuan}¥ left.",
+    "privilege_large": "{player}: Bought large privilege (7¥). {yuan}¥ left.",
+    "skip": "{player} skipped. Took {need}¥ (now {yuan}¥).",
+    "play_card": "{player} played {card} card.",
+    "card_discarded": "No matching tiles available — card discarded.",
+    "release_unplaced": "{player} released {person} immediately (no placement).",
+    "place_person": "{player} placed {person} in Palace {palace} (+{value} person track).",
+    "replace_person": "{player} replaced {old} with {person} in Palace {palace} (+{value} person track).",
+    "peace": "Peace reigns. Nothing happens.",
+    "tribute_paid": "{player} pays 4¥.",
+    "tribute_short": "{player} pays {paid}¥, releases {count}.",
+    "no_inhabited": "{player} has no inhabited palaces.",
+    "no_rice": "{player} has no rice — all {count} palace(s) unfed.",
+    "contagion": "{player} releases {count} (3-{healers} healers).",
+    "protected": "{player} protected.",
+    "warriors": "{player} +{vp} VP (warriors).",
+    "fewest_warriors": "{player} fewest ({count}), releases 1.",
+    "festival_first": "{player} wins! +6 VP, returns {count}.",
+    "festival_second": "{player} 2nd! +3 VP, returns {count}.",
+    "feed": "{player} feeds {count} palace(s) ({rice} rice left).",
+    "unfed": "{player} has {count} unfed palace(s) — must release 1 person from each.",
+    "release": "{player} releases {person} from Palace {palace}.",
+    "release_reason": "{player} releases {person} from Palace {palace} ({reason}).",
+    "decay": "{player}: empty palace decays.",
+    "round_score": "{player}: +{total} VP ({palaces} palaces, {ladies} ladies, {privileges} privileges)",
+    "round_start": "Round {round} begins!",
+    "final_scoring": "=== FINAL SCORING ===",
+    "final_score": "{player}: {final} VP (game {game} + persons {persons} + monks {monks} + money {money})",
+    "winner": "Winner: {player} with {final} VP!",
+}
+
+
+# ── Snapshots ────────────────────────────────────────
+
+SNAPSHOT_CODEC = SnapshotCodec(
+    "dragon",
+    strings=[
+        "id", "slot", "index", "player_id", "name", "color", "palaces", "floors", "persons",
+        "yuan", "rice", "fireworks", "privileges", "small", "large", "person_track",
+        "scoring_track", "cards",
+        "game", "player_count", "player_ids", "players", "events", "remaining_tiles",
+        "current_round", "phase", "sub_phase", "draft", "current_drafter", "used_combos",
+        "action", "order_idx", "turn_order", "action_groups", "dragons", "person", "event",
+        "resolved", "log", "release_queue", "drought_queue", "scoring", "scored", "details",
+        "rng", "seed", "draws", "player_idx", "count", "reason",
+        "dragon", "feed", "release", "final", "awaiting_build",
+        *EVENTS, *PERSON_TYPES, *ACTION_IDS,
+    ],
+    atoms=generate_person_tiles(5)
+          + [{"type_id": type_id, "is_wild": False} for type_id in PERSON_TYPES]
+          + [{"type_id": None, "is_wild": True}]
+          + PLAYER_COLORS,
+)
+
+
 class DragonEngine(GameEngine):
 
+    catalog = {"events": EVENTS, "persons": PERSON_TYPES, "actions": ACTION_INFO}
+    log_events = LOG_EVENTS
+    snapshot_codec = SNAPSHOT_CODEC
+
     # ── Setup ────────────────────────────────────────────────────────
 
-    def initial_state(self, player_ids, player_names):
+    def initial_state(self, player_ids, player_names, seed=None):
         player_count = len(player_ids)
         if player_count < 2 or player_count > 5:
             raise ValueError("Dragon requires 2-5 players")
@@ -31,7 +115,8 @@ class DragonEngine(GameEngine):
         for i, (pid, name) in enumerate(zip(player_ids, player_names)):
             players.append(create_player(i, pid, name))
 
-        events = generate_event_tiles()
+        rng = new_rng(seed)
+        events = generate_event_tiles(rng)
         tiles = generate_person_tiles(player_count)
 
         return {
@@ -85,6 +170,8 @@ class DragonEngine(GameEngine):
 
             # Game log
             "log": [],
+
+            "rng": rng,
         }
 
     # ── Player View ──────────────────────────────────────────────────
@@ -92,18 +179,10 @@ class DragonEngine(GameEngine):
     def get_player_view(self, state, player_id):
         """
         Dragon is mostly open information — everyone can see everything.
-        The only hidden info is other players' cards (hand).
-        We return the full state but redact other players' hands.
+        The only hidden info is other players' cards (hand); see REDACTIONS.
+        (Tiles are face-up in the board game, so remaining_tiles stays visible.)
         """
-        view = deepcopy(state)
-
-        # Remove internal tile pool from view (players shouldn't see upcoming tiles)
-        # Actually in the board game the tiles are face-up, so keep remaining_tiles visible
-
-        for p in view["players"]:
-            if p["player_id"] != player_id:
-                # Show card count but not contents
-                p["cards"] = [{"hidden": True} for _ in p["cards"]]
+        view = build_view(state, REDACTIONS, player_id)
 
         view["your_player_id"] = player_id
         view["your_player_idx"] = self._player_idx(state, player_id)
@@ -188,7 +267,7 @@ class DragonEngine(GameEngine):
                 info["description"] = "Person phase complete"
         elif phase == "event":
             ev = state["events"][state["current_round"]]
-            info["description"] = f"Event: {ev['name']}"
+            info["description"] = f"Event: {EVENTS[ev['id']]['name']}"
             info["event"] = ev
         elif phase == "scoring":
             info["description"] = "Scoring phase"
@@ -200,24 +279,25 @@ class DragonEngine(GameEngine):
     # ── Valid Actions ────────────────────────────────────────────────
 
     def get_valid_actions(self, state, player_id):
+        return list(self.iter_valid_actions(state, player_id))
+
+    def iter_valid_actions(self, state, player_id):
         pidx = self._player_idx(state, player_id)
         if pidx is None:
-            return []
+            return
 
         phase = state["phase"]
 
         if phase == "draft":
-            return self._valid_draft_actions(state, pidx)
-        if phase == "action":
-            return self._valid_action_actions(state, pidx)
-        if phase == "person":
-            return self._valid_person_actions(state, pidx)
-        if phase == "event":
-            return self._valid_event_actions(state, pidx)
-        if phase == "scoring":
-            return self._valid_scoring_actions(state, pidx)
-
-        return []
+            yield from self._valid_draft_actions(state, pidx)
+        elif phase == "action":
+            yield from self._valid_action_actions(state, pidx)
+        elif phase == "person":
+            yield from self._valid_person_actions(state, pidx)
+        elif phase == "event":
+            yield from self._valid_event_actions(state, pidx)
+        elif phase == "scoring":
+            yield from self._valid_scoring_actions(state, pidx)
 
     # ── Apply Action ─────────────────────────────────────────────────
 
@@ -328,7 +408,7 @@ class DragonEngine(GameEngine):
 
         state["draft"]["used_combos"].append(ck)
 
-        log = [f"{player['name']} drafted {PERSON_TYPES[type_a]['name']} and {PERSON_TYPES[type_b]['name']}"]
+        log = [log_event("draft", pidx, PERSON_TYPES[type_a]["name"], PERSON_TYPES[type_b]["name"])]
 
         # Advance to next drafter or start game
         next_drafter = pidx + 1
@@ -337,7 +417,7 @@ class DragonEngine(GameEngine):
             state["phase"] = "action"
             state["draft"]["current_drafter"] = None
             self._setup_action_phase(state)
-            log.append("Draft complete! Starting Round 1.")
+            log.append(log_event("draft_complete"))
         else:
             state["draft"]["current_drafter"] = next_drafter
 
@@ -348,7 +428,7 @@ class DragonEngine(GameEngine):
     def _setup_action_phase(self, state):
         players = state["players"]
         order = get_person_track_order(players)
-        groups = deal_action_groups(state["player_count"])
+        groups = deal_action_groups(state["player_count"], state["rng"])
         state["action"] = {
             "order_idx": 0,
             "turn_order": order,
@@ -441,13 +521,13 @@ class DragonEngine(GameEngine):
 
         log = []
         if cost > 0:
-            log.append(f"{player['name']} paid {cost}¥ for occupied group.")
+            log.append(log_event("pay_occupied", pidx, cost))
 
         # Build is special — needs placement input
         if action_id == "build":
             state["sub_phase"] = "awaiting_build"
             state["action"]["_build_cost_paid"] = cost
-            log.append(f"{player['name']} chose Build — awaiting placement.")
+            log.append(log_event("choose_build", pidx))
             return ActionResult(new_state=state, log=log)
 
         # Execute action
@@ -459,9 +539,9 @@ class DragonEngine(GameEngine):
             needed = 2 if size == "small" else 7
             if player["yuan"] < needed:
                 raise ValueError(f"Not enough yuan for {size} privilege")
-            msg = execute_privilege(player, size)
+            event = execute_privilege(player, size)
         else:
-            msg = {
+            event = {
                 "taxes": execute_taxes,
                 "harvest": execute_harvest,
                 "fireworks": execute_fireworks,
@@ -469,7 +549,7 @@ class DragonEngine(GameEngine):
                 "research": execute_research,
             }[action_id](player)
 
-        log.append(f"{player['name']}: {msg}")
+        log.append(event)
         self._advance_action_turn(state)
 
         return ActionResult(new_state=state, log=log)
@@ -484,8 +564,7 @@ class DragonEngine(GameEngine):
         player = state["players"][pidx]
         placement = action.get("placement", [])
 
-        msg = execute_build(player, placement)
-        log = [f"{player['name']}: {msg}"]
+        log = [execute_build(player, placement)]
 
         state["sub_phase"] = None
         if "_build_cost_paid" in state["action"]:
@@ -505,7 +584,7 @@ class DragonEngine(GameEngine):
         need = max(0, 3 - player["yuan"])
         player["yuan"] += need
 
-        log = [f"{player['name']} skipped. Took {need}¥ (now {player['yuan']}¥)."]
+        log = [log_event("skip", pidx, need, player["yuan"])]
         self._advance_action_turn(state)
         return ActionResult(new_state=state, log=log)
 
@@ -610,10 +689,10 @@ class DragonEngine(GameEngine):
         # Remove card from hand
         player["cards"].pop(card_index)
         card_name = "Wild" if card["is_wild"] else PERSON_TYPES[card["type_id"]]["name"]
-        log.append(f"{player['name']} played {card_name} card.")
+        log.append(log_event("play_card", pidx, card_name))
 
         if not matching:
-            log.append("No matching tiles available — card discarded.")
+            log.append(log_event("card_discarded"))
             self._advance_person_turn(state)
             return ActionResult(new_state=state, log=log)
 
@@ -641,7 +720,7 @@ class DragonEngine(GameEngine):
         tile_type = PERSON_TYPES[tile["type_id"]]
 
         if release_immediately:
-            log.append(f"{player['name']} released {tile_type['name']} immediately (no placement).")
+            log.append(log_event("release_unplaced", pidx, tile_type["name"]))
             self._advance_person_turn(state)
             return ActionResult(new_state=state, log=log)
 
@@ -660,7 +739,7 @@ class DragonEngine(GameEngine):
             # Has space — just add
             palace["persons"].append(tile)
             player["person_track"] += tile["value"]
-            log.append(f"{player['name']} placed {tile_type['name']} in Palace {palace_index + 1} (+{tile['value']} person track).")
+            log.append(log_event("place_person", pidx, tile_type["name"], palace_index + 1, tile["value"]))
         elif has_empty_anywhere:
             raise ValueError("Must place in a palace with empty slots first")
         else:
@@ -674,10 +753,8 @@ class DragonEngine(GameEngine):
             replaced_type = PERSON_TYPES[replaced["type_id"]]
             palace["persons"][replace_index] = tile
             player["person_track"] += tile["value"]
-            log.append(
-                f"{player['name']} replaced {replaced_type['name']} with {tile_type['name']} "
-                f"in Palace {palace_index + 1} (+{tile['value']} person track)."
-            )
+            log.append(log_event("replace_person", pidx, replaced_type["name"], tile_type["name"],
+                                 palace_index + 1, tile["value"]))
 
         self._advance_person_turn(state)
         return ActionResult(new_state=state, log=log)
@@ -716,7 +793,7 @@ class DragonEngine(GameEngine):
         # Not yet resolved — need "resolve" trigger
         if not ev["resolved"] and not ev["release_queue"] and not ev["drought_queue"] and not ev["log"]:
             # Any player can trigger (but typically first player)
-            return [{"kind": "resolve_event", "description": f"Resolve {event_tile['name']}"}]
+            return [{"kind": "resolve_event", "description": f"Resolve {EVENTS[event_tile['id']]['name']}"}]
 
         # Drought feeding
         if ev["drought_queue"]:
@@ -792,7 +869,7 @@ class DragonEngine(GameEngine):
         eid = event_tile["id"]
 
         if eid == "peace":
-            log.append("Peace reigns. Nothing happens.")
+            log.append(log_event("peace"))
             apply_decay(players, log)
             ev["resolved"] = True
             return ActionResult(new_state=state, log=log)
@@ -801,22 +878,26 @@ class DragonEngine(GameEngine):
             for i, p in enumerate(players):
                 if p["yuan"] >= 4:
                     p["yuan"] -= 4
-                    log.append(f"{p['name']} pays 4¥.")
+                    log.append(log_event("tribute_paid", i))
                 else:
                     shortfall = 4 - p["yuan"]
                     p["yuan"] = 0
-                    log.append(f"{p['name']} pays {4 - shortfall}¥, releases {shortfall}.")
-                    releases.append({"player_idx": i, "count": shortfall, "reason": "Tribute"})
+                    log.append(log_event("tribute_short", i, 4 - shortfall, shortfall))
+                    # Only courtiers on hand can be released
+                    total_persons = sum(len(pal["persons"]) for pal in p["palaces"])
+                    if min(shortfall, total_persons) > 0:
+                        releases.append({"player_idx": i, "count": min(shortfall, total_persons),
+                                         "reason": "Tribute"})
 
         elif eid == "drought":
             dq = []
             for i, p in enumerate(players):
                 inhabited = [j for j, pal in enumerate(p["palaces"]) if len(pal["persons"]) > 0]
                 if not inhabited:
-                    log.append(f"{p['name']} has no inhabited palaces.")
+                    log.append(log_event("no_inhabited", i))
                     continue
                 if p["rice"] == 0:
-                    log.append(f"{p['name']} has no rice — all {len(inhabited)} palace(s) unfed.")
+                    log.append(log_event("no_rice", i, len(inhabited)))
                     dq.append({"player_idx": i, "phase": "release", "unfed_palaces": inhabited})
                 else:
                     dq.append({"player_idx": i, "phase": "feed"})
@@ -836,10 +917,10 @@ class DragonEngine(GameEngine):
                 total_persons = sum(len(pal["persons"]) for pal in p["palaces"])
                 actual = min(lose, total_persons)
                 if actual > 0:
-                    log.append(f"{p['name']} releases {actual} (3-{healers} healers).")
+                    log.append(log_event("contagion", i, actual, healers))
                     releases.append({"player_idx": i, "count": actual, "reason": "Contagion"})
                 else:
-                    log.append(f"{p['name']} protected.")
+                    log.append(log_event("protected", i))
 
         elif eid == "mongolInvasion":
             helmet_counts = []
@@ -848,7 +929,7 @@ class DragonEngine(GameEngine):
                 h = count_symbols(p, "warrior")
                 helmet_counts.append(h)
                 p["scoring_track"] += h
-                log.append(f"{p['name']} +{h} VP (warriors).")
+                log.append(log_event("warriors", i, h))
                 if h < min_helmets:
                     min_helmets = h
 
@@ -856,7 +937,7 @@ class DragonEngine(GameEngine):
                 if h == min_helmets:
                     has_persons = any(len(pal["persons"]) > 0 for pal in players[i]["palaces"])
                     if has_persons:
-                        log.append(f"{players[i]['name']} fewest ({h}), releases 1.")
+                        log.append(log_event("fewest_warriors", i, h))
                         releases.append({"player_idx": i, "count": 1, "reason": "Mongols"})
 
         elif eid == "dragonFestival":
@@ -869,12 +950,12 @@ class DragonEngine(GameEngine):
                     p["scoring_track"] += 6
                     ret = (p["fireworks"] + 1) // 2  # ceil
                     p["fireworks"] -= ret
-                    log.append(f"{p['name']} wins! +6 VP, returns {ret}.")
+                    log.append(log_event("festival_first", i, ret))
                 elif p["fireworks"] > 0 and m2 > 0 and p["fireworks"] == m2:
                     p["scoring_track"] += 3
                     ret = (p["fireworks"] + 1) // 2
                     p["fireworks"] -= ret
-                    log.append(f"{p['name']} 2nd! +3 VP, returns {ret}.")
+                    log.append(log_event("festival_second", i, ret))
 
         # Set up release queue if needed
         if releases:
@@ -909,11 +990,11 @@ class DragonEngine(GameEngine):
 
         player["rice"] -= len(fed_palaces)
         log = ev["log"]
-        log.append(f"{player['name']} feeds {len(fed_palaces)} palace(s) ({player['rice']} rice left).")
+        log.append(log_event("feed", pidx, len(fed_palaces), player["rice"]))
 
         unfed = [i for i in inhabited if i not in fed_palaces]
         if unfed:
-            log.append(f"{player['name']} has {len(unfed)} unfed palace(s) — must release 1 person from each.")
+            log.append(log_event("unfed", pidx, len(unfed)))
             ev["drought_queue"][0] = {"player_idx": pidx, "phase": "release", "unfed_palaces": unfed}
         else:
             self._advance_drought_queue(state)
@@ -941,7 +1022,7 @@ class DragonEngine(GameEngine):
             released = palace["persons"].pop(person_index)
             name = PERSON_TYPES[released["type_id"]]["name"]
             log = ev["log"]
-            log.append(f"{player['name']} releases {name} from Palace {palace_idx + 1}.")
+            log.append(log_event("release", pidx, name, palace_idx + 1))
 
             remaining_unfed = dq["unfed_palaces"][1:]
             if remaining_unfed:
@@ -971,7 +1052,7 @@ class DragonEngine(GameEngine):
             released = palace["persons"].pop(person_index)
             name = PERSON_TYPES[released["type_id"]]["name"]
             log = ev["log"]
-            log.append(f"{player['name']} releases {name} from Palace {palace_index + 1} ({rq['reason']}).")
+            log.append(log_event("release_reason", pidx, name, palace_index + 1, rq["reason"]))
 
             rq["count"] -= 1
             if rq["count"] <= 0:
@@ -1025,7 +1106,7 @@ class DragonEngine(GameEngine):
             p["scoring_track"] += total
             d = {"player_idx": i, "palaces": palace_pts, "ladies": ladies, "privileges": priv, "total": total}
             details.append(d)
-            log.append(f"{p['name']}: +{total} VP ({palace_pts} palaces, {ladies} ladies, {priv} privileges)")
+            log.append(log_event("round_score", i, total, palace_pts, ladies, priv))
 
         sc["scored"] = True
         sc["details"] = details
@@ -1048,13 +1129,13 @@ class DragonEngine(GameEngine):
 
         return ActionResult(
             new_state=state,
-            log=[f"Round {current + 1} begins!"],
+            log=[log_event("round_start", current + 1)],
         )
 
     def _do_final_scoring(self, state):
         state["phase"] = "final"
         players = state["players"]
-        log = ["=== FINAL SCORING ==="]
+        log = [log_event("final_scoring")]
         results = []
 
         for p in players:
@@ -1080,14 +1161,12 @@ class DragonEngine(GameEngine):
                 "final_score": final,
                 "person_track": p["person_track"],
             })
-            log.append(
-                f"{p['name']}: {final} VP "
-                f"(game {p['scoring_track']} + persons {person_pts} + monks {monk_pts} + money {money_pts})"
-            )
+            log.append(log_event("final_score", p["index"], final, p["scoring_track"],
+                                 person_pts, monk_pts, money_pts))
 
         results.sort(key=lambda r: (r["final_score"], r["person_track"]), reverse=True)
         state["final_results"] = results
-        log.append(f"Winner: {results[0]['name']} with {results[0]['final_score']} VP!")
+        log.append(log_event("winner", results[0]["player_idx"], results[0]["final_score"]))
 
         return ActionResult(new_state=state, log=log, game_over=True)
 
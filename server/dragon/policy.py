@@ -0,0 +1,106 @@
+"""
+Scripted random play for In the Year of the Dragon.
+
+Dragon's valid actions are descriptors the client fills in (which two
+courtiers to draft, where to put floors, which palaces to feed), so a
+self-play policy can't just pick one. random_policy fills each in with a
+legal random choice and has the selfplay signature:
+
+    python -m server.selfplay dragon --games 50   # used for "random"
+"""
+
+from server.dragon.state import combo_key
+
+
+def draft_pick(actions):
+    """The first two-courtier pick the draft descriptor allows."""
+    descriptor = actions[0]
+    types = descriptor["available_types"]
+    forbidden = set(descriptor["forbidden_combos"])
+    for i, a in enumerate(types):
+        for b in types[i + 1:]:
+            if combo_key(a, b) not in forbidden:
+                return {"kind": "draft_pick", "picks": [a, b]}
+    raise ValueError("No draft pick available")
+
+
+def random_policy(engine, state, player_id, actions, rng):
+    descriptor = actions[0]
+    kind = descriptor["kind"]
+    player = state["players"][state["player_ids"].index(player_id)]
+    if kind == "draft_pick":
+        return draft_pick(actions)
+    if kind == "choose_action":
+        return _choose_action(descriptor, player, rng)
+    if kind == "confirm_build":
+        return _confirm_build(descriptor)
+    if kind == "play_person":
+        return _play_person(state, player, rng)
+    if kind == "feed_palaces":
+        palaces = [p["palace_index"] for p in descriptor["inhabited_palaces"]]
+        rng.shuffle(palaces)
+        return {"kind": "feed_palaces", "fed_palaces": palaces[:descriptor["must_feed"]]}
+    if kind == "release_person" and descriptor["persons"]:
+        person = rng.choice(descriptor["persons"])
+        action = {"kind": "release_person", "person_index": person["person_index"]}
+        palace_index = person.get("palace_index", descriptor.get("palace_index"))
+        if palace_index is not None:
+            action["palace_index"] = palace_index
+        return action
+    # Complete actions (resolve_event, score, next_round, skip_action)
+    return rng.choice(actions)
+
+
+def _choose_action(descriptor, player, rng):
+    groups = [g for g in descriptor["groups"] if g["can_afford"]]
+    if not groups or rng.random() < 0.15:
+        return {"kind": "skip_action"}
+    group = rng.choice(groups)
+    action_id = rng.choice(group["actions"])
+    action = {"kind": "choose_action", "group_index": group["group_index"], "action_id": action_id}
+    if action_id == "privilege":
+        left = player["yuan"] - group["cost"]
+        if left >= 7 and rng.random() < 0.5:
+            action["privilege_size"] = "large"
+        elif left >= 2:
+            action["privilege_size"] = "small"
+        else:
+            return {"kind": "skip_action"}
+    return action
+
+
+def _confirm_build(descriptor):
+    # Top up existing palaces to 3 floors, then start new ones
+    remaining = descriptor["total_floors"]
+    placement = []
+    for i, palace in enumerate(descriptor["palaces"]):
+        add = min(3 - palace["floors"], remaining)
+        if add > 0:
+            placement.append({"palace_index": i, "floors": add})
+            remaining -= add
+    while remaining > 0:
+        floors = min(3, remaining)
+        placement.append({"palace_index": "new", "floors": floors})
+        remaining -= floors
+    return {"kind": "confirm_build", "placement": placement}
+
+
+def _play_person(state, player, rng):
+    card_index = rng.randrange(len(player["cards"]))
+    card = player["cards"][card_index]
+    tiles = [t for t in state["remaining_tiles"] if card["is_wild"] or t["type_id"] == card["type_id"]]
+    action = {"kind": "play_person", "card_index": card_index}
+    if not tiles:
+        return action
+    action["tile_id"] = rng.choice(tiles)["id"]
+    palaces = player["palaces"]
+    open_palaces = [i for i, p in enumerate(palaces) if len(p["persons"]) < p["floors"]]
+    if open_palaces and rng.random() >= 0.15:
+        action["palace_index"] = rng.choice(open_palaces)
+    elif palaces and not open_palaces and rng.random() >= 0.15:
+        palace_index = rng.randrange(len(palaces))
+        action["palace_index"] = palace_index
+        action["replace_index"] = rng.randrange(len(palaces[palace_index]["persons"]))
+    else:
+        action["release_immediately"] = True
+    return action
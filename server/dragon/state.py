@@ -3,9 +3,11 @@ Constants and state helpers for In the Year of the Dragon.
 Direct port of the JSX config data + utility functions.
 """
 
-import random
 from copy import deepcopy
 
+from server.log_events import log_event
+from server.rng import shuffle
+
 # ── Person Types ─────────────────────────────────────────────────────
 
 PERSON_TYPES = {
@@ -99,6 +101,9 @@ EVENT_TYPES = [
     {"id": "dragonFestival",  "name": "Dragon Festival",  "icon": "🐉",  "color": "#e74c3c"},
 ]
 
+# Event tiles in state hold only {"id", "slot"}; look the rest up here.
+EVENTS = {e["id"]: e for e in EVENT_TYPES}
+
 PLAYER_COLORS = [
     {"name": "Red",    "primary": "#b33025", "light": "#e8453a", "dark": "#7a1f17"},
     {"name": "Blue",   "primary": "#2563a8", "light": "#3b82d6", "dark": "#1a4270"},
@@ -137,19 +142,20 @@ def combo_key(a, b):
 
 # ── Tile Generation ──────────────────────────────────────────────────
 
-def generate_event_tiles():
+def generate_event_tiles(rng):
     """Generate the 12-month event track: 2 peace + 10 shuffled non-peace."""
+    peace_id = EVENT_TYPES[0]["id"]
     events = [
-        {**EVENT_TYPES[0], "slot": 0},
-        {**EVENT_TYPES[0], "slot": 1},
+        {"id": peace_id, "slot": 0},
+        {"id": peace_id, "slot": 1},
     ]
 
     non_peace = EVENT_TYPES[1:]
     pool = []
     for e in non_peace:
-        pool.append({**e})
-        pool.append({**e})
-    random.shuffle(pool)
+        pool.append({"id": e["id"]})
+        pool.append({"id": e["id"]})
+    shuffle(rng, pool)
 
     # Avoid consecutive same events
     placed = []
@@ -173,7 +179,7 @@ def generate_event_tiles():
             placed.append(tile)
 
     for i, t in enumerate(placed):
-        events.append({**t, "slot": i + 2})
+        events.append({"id": t["id"], "slot": i + 2})
 
     return events
 
@@ -241,10 +247,10 @@ def create_player(index, player_id, name):
     }
 
 
-def deal_action_groups(player_count):
+def deal_action_groups(player_count, rng):
     """Shuffle action types into groups, one per player."""
     shuffled = ACTION_IDS[:]
-    random.shuffle(shuffled)
+    shuffle(rng, shuffled)
     groups = [[] for _ in range(player_count)]
     for i, action_id in enumerate(shuffled):
         groups[i % player_count].append(action_id)
@@ -257,42 +263,42 @@ def execute_taxes(player):
     bonus = count_symbols(player, "taxCollector")
     total = 2 + bonus
     player["yuan"] += total
-    return f"Collected {total}¥ (2 base + {bonus} tax collectors). Now {player['yuan']}¥."
+    return log_event("taxes", player["index"], total, bonus, player["yuan"])
 
 
 def execute_harvest(player):
     bonus = count_symbols(player, "farmer")
     total = 1 + bonus
     player["rice"] += total
-    return f"Harvested {total} rice (1 base + {bonus} farmers). Now {player['rice']} rice."
+    return log_event("harvest", player["index"], total, bonus, player["rice"])
 
 
 def execute_fireworks(player):
     bonus = count_symbols(player, "pyrotechnist")
     total = 1 + bonus
     player["fireworks"] += total
-    return f"Gained {total} fireworks (1 base + {bonus} pyrotechnists). Now {player['fireworks']}."
+    return log_event("fireworks", player["index"], total, bonus, player["fireworks"])
 
 
 def execute_military(player):
     bonus = count_symbols(player, "warrior")
     total = 1 + bonus
     player["person_track"] += total
-    return f"Advanced {total} steps (1 base + {bonus} warriors). Now at {player['person_track']}."
+    return log_event("military", player["index"], total, bonus, player["person_track"])
 
 
 def execute_research(player):
     bonus = count_symbols(player, "scholar")
     total = 1 + bonus
     player["scoring_track"] += total
-    return f"Gained {total} VP (1 base + {bonus} scholars). Now {player['scoring_track']} VP."
+    return log_event("research", player["index"], total, bonus, player["scoring_track"])
 
 
 def execute_build(player, placement):
     """
     Apply a build action with explicit placement.
     placement is a list of dicts: [{"palace_index": 0, "floors": 1}, {"palace_index": "new", "floors": 2}]
-    Returns log string.
+    Returns a log event.
     """
     bonus = count_symbols(player, "craftsman")
     total = 1 + bonus
@@ -316,13 +322,13 @@ def execute_build(player, placement):
                 raise ValueError(f"Palace {idx} would exceed 3 floors")
             palace["floors"] += entry["floors"]
 
-    return f"Built {total} floor(s) (1 base + {bonus} craftsmen)."
+    return log_event("build", player["index"], total, bonus)
 
 
 def execute_build_auto(player):
     """
     Fallback auto-build: fills existing palaces first, then creates new ones.
-    Used when we want a simple default. Returns (log_string, resulting_palaces).
+    Used when we want a simple default. Returns a log event.
     """
     bonus = count_symbols(player, "craftsman")
     total = 1 + bonus
@@ -340,7 +346,7 @@ def execute_build_auto(player):
         player["palaces"].append({"floors": floors, "persons": []})
         remaining -= floors
 
-    return f"Built {total} floor(s) (1 base + {bonus} craftsmen)."
+    return log_event("build", player["index"], total, bonus)
 
 
 def execute_privilege(player, size):
@@ -349,13 +355,13 @@ def execute_privilege(player, size):
             raise ValueError("Not enough yuan for small privilege")
         player["yuan"] -= 2
         player["privileges"]["small"] += 1
-        return f"Bought small privilege (2¥). {player['yuan']}¥ left."
+        return log_event("privilege_small", player["index"], player["yuan"])
     elif size == "large":
         if player["yuan"] < 7:
             raise ValueError("Not enough yuan for large privilege")
         player["yuan"] -= 7
         player["privileges"]["large"] += 1
-        return f"Bought large privilege (7¥). {player['yuan']}¥ left."
+        return log_event("privilege_large", player["index"], player["yuan"])
     else:
         raise ValueError(f"Invalid privilege size: {size}")
 
@@ -368,7 +374,7 @@ def apply_decay(players, log):
         new_palaces = []
         for pal in p["palaces"]:
             if pal["persons"] == [] and pal["floors"] > 0:
-                log.append(f"{p['name']}: empty palace decays.")
+                log.append(log_event("decay", p["index"]))
                 pal["floors"] -= 1
             if pal["floors"] > 0:
                 new_palaces.append(pal)
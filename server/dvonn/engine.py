@@ -2,21 +2,71 @@
 
 from copy import deepcopy
 
+from server.action_space import ActionSpace
 from server.game_engine import GameEngine, ActionResult
+from server.log_events import log_event
+from server.snapshot import SnapshotCodec
 from server.dvonn.state import (
     PIECES_PER_PLAYER, DVONN_PIECE_COUNT, TOTAL_SPACES,
-    board_key, parse_key, generate_board, create_player,
-    get_neighbors, get_line_destinations, is_straight_line,
-    is_surrounded, find_connected_to_dvonn,
+    parse_key, generate_board, create_player,
+    line_destinations, is_straight_line, is_key_surrounded,
+    Mobility, find_cut_off_by,
+)
+
+
+# ── Action space ─────────────────────────────────────
+
+_POSITIONS = list(generate_board())
+
+ACTION_SPACE = ActionSpace([
+    ("place_piece", [("position", _POSITIONS)]),
+    ("move_stack", [("from", _POSITIONS), ("to", _POSITIONS)]),
+    ("pass", []),
+])
+
+
+# ── Log events ───────────────────────────────────
+
+LOG_EVENTS = {
+    "place_piece": "{player} placed a {piece} piece at {position}.",
+    "dvonn_placed": "All DVONN pieces placed. Now place colored pieces.",
+    "board_full": "Board is full! Movement phase begins.",
+    "move_stack": "{player} moved stack from {from} to {to} (height {height}).",
+    "pass": "{player} passed (no valid moves).",
+    "no_moves": "{player} also has no valid moves.",
+    "remove_stack": "Removed disconnected stack at {position} ({count} pieces).",
+    "final_score": "Game over! {first_player} controls {first_count} pieces, "
+                   "{second_player} controls {second_count} pieces.",
+    "win": "{player} wins!",
+    "draw": "It's a draw!",
+}
+
+
+# ── Snapshots ────────────────────────────────────────
+
+SNAPSHOT_CODEC = SnapshotCodec(
+    "dvonn",
+    strings=[
+        "stack", "row", "col", "white", "black", "dvonn",
+        "game", "player_ids", "player_count", "players", "board", "current_player", "phase",
+        "placement_sub_phase", "pieces_placed", "consecutive_passes", "last_move",
+        "last_removed", "game_over", "winner", "from", "to",
+        "index", "player_id", "name", "color", "pieces_to_place", "dvonn_to_place",
+        "placement", "colored", "movement",
+    ],
+    boards=[_POSITIONS],
 )
 
 
 class DvonnEngine(GameEngine):
     player_count_range = (2, 2)
+    action_space = ACTION_SPACE
+    log_events = LOG_EVENTS
+    snapshot_codec = SNAPSHOT_CODEC
 
     # ── Abstract method implementations ──────────────────
 
-    def initial_state(self, player_ids, player_names):
+    def initial_state(self, player_ids, player_names, seed=None):
         players = [
             create_player(i, pid, name)
             for i, (pid, name) in enumerate(zip(player_ids, player_names))
@@ -46,18 +96,20 @@ class DvonnEngine(GameEngine):
         return view
 
     def get_valid_actions(self, state, player_id):
+        return list(self.iter_valid_actions(state, player_id))
+
+    def iter_valid_actions(self, state, player_id):
         if state["game_over"]:
-            return []
+            return
 
         player_idx = self._player_index(state, player_id)
         if player_idx is None:
-            return []
+            return
 
         if state["phase"] == "placement":
-            return self._valid_placement_actions(state, player_idx)
+            yield from self._iter_placement_actions(state, player_idx)
         elif state["phase"] == "movement":
-            return self._valid_movement_actions(state, player_idx)
-        return []
+            yield from self._iter_movement_actions(state, player_idx)
 
     def apply_action(self, state, player_id, action):
         state = deepcopy(state)
@@ -108,16 +160,14 @@ class DvonnEngine(GameEngine):
 
     # ── Placement phase ──────────────────────────────────
 
-    def _valid_placement_actions(self, state, player_idx):
+    def _iter_placement_actions(self, state, player_idx):
         if player_idx != state["current_player"]:
-            return []
+            return
 
         # All empty spaces are valid placement targets
-        actions = []
         for key, space in state["board"].items():
             if len(space["stack"]) == 0:
-                actions.append({"kind": "place_piece", "position": key})
-        return actions
+                yield {"kind": "place_piece", "position": key}
 
     def _apply_place_piece(self, state, player_id, player_idx, action):
         if state["phase"] != "placement":
@@ -152,9 +202,8 @@ class DvonnEngine(GameEngine):
             player["pieces_to_place"] -= 1
 
         state["pieces_placed"] += 1
-        player_name = player["name"]
         piece_type = "DVONN" if sub == "dvonn" else player["color"]
-        log = [f"{player_name} placed a {piece_type} piece at {position}."]
+        log = [log_event("place_piece", player_idx, piece_type, position)]
 
         # Determine next player and phase transitions
         if sub == "dvonn":
@@ -164,7 +213,7 @@ class DvonnEngine(GameEngine):
                 state["placement_sub_phase"] = "colored"
                 # Black places first colored piece
                 state["current_player"] = 1
-                log.append("All DVONN pieces placed. Now place colored pieces.")
+                log.append(log_event("dvonn_placed"))
             else:
                 state["current_player"] = 1 - state["current_player"]
         else:
@@ -174,7 +223,7 @@ class DvonnEngine(GameEngine):
                 state["phase"] = "movement"
                 state["placement_sub_phase"] = None
                 state["current_player"] = 0  # White moves first
-                log.append("Board is full! Movement phase begins.")
+                log.append(log_event("board_full"))
             else:
                 state["current_player"] = 1 - state["current_player"]
 
@@ -182,13 +231,22 @@ class DvonnEngine(GameEngine):
 
     # ── Movement phase ───────────────────────────────────
 
-    def _valid_movement_actions(self, state, player_idx):
+    def _iter_movement_actions(self, state, player_idx):
         if player_idx != state["current_player"]:
-            return []
+            return
+
+        has_moves = False
+        for action in self._iter_stack_moves(state, player_idx):
+            has_moves = True
+            yield action
+
+        if not has_moves:
+            yield {"kind": "pass"}
 
+    def _iter_stack_moves(self, state, player_idx):
+        """Yield every move_stack action for a player (not counting pass)."""
         board = state["board"]
         player_color = state["players"][player_idx]["color"]
-        actions = []
 
         for key, space in board.items():
             stack = space["stack"]
@@ -197,24 +255,16 @@ class DvonnEngine(GameEngine):
             # Must control the stack (top piece = player's color)
             if stack[-1] != player_color:
                 continue
-            row, col = parse_key(key)
             # Cannot move if surrounded on all 6 sides
-            if is_surrounded(board, row, col):
+            if is_key_surrounded(board, key):
                 continue
 
-            stack_height = len(stack)
-            destinations = get_line_destinations(board, row, col, stack_height)
-            for dest_row, dest_col in destinations:
-                actions.append({
+            for dest_key in line_destinations(board, key, len(stack)):
+                yield {
                     "kind": "move_stack",
                     "from": key,
-                    "to": board_key(dest_row, dest_col),
-                })
-
-        if not actions:
-            actions = [{"kind": "pass"}]
-
-        return actions
+                    "to": dest_key,
+                }
 
     def _apply_move_stack(self, state, player_id, player_idx, action):
         if state["phase"] != "movement":
@@ -246,7 +296,8 @@ class DvonnEngine(GameEngine):
         to_row, to_col = parse_key(to_key)
 
         # Surrounded check
-        if is_surrounded(board, from_row, from_col):
+        mobility = Mobility(board)
+        if mobility.is_surrounded(from_key):
             raise ValueError("Stack is surrounded and cannot move")
 
         # Straight line + distance check
@@ -263,20 +314,20 @@ class DvonnEngine(GameEngine):
         # Execute move: place source stack on top of destination
         to_space["stack"].extend(stack)
         from_space["stack"] = []
+        mobility.vacate(from_key)
+        mobility.retop(to_key)
 
         state["last_move"] = {"from": from_key, "to": to_key}
         state["consecutive_passes"] = 0
 
-        player_name = state["players"][player_idx]["name"]
-        log = [f"{player_name} moved stack from {from_key} to {to_key} "
-               f"(height {stack_height})."]
+        log = [log_event("move_stack", player_idx, from_key, to_key, stack_height)]
 
         # Remove disconnected pieces
-        removed = self._remove_disconnected(state, log)
+        removed = self._remove_disconnected(state, from_key, log, mobility)
         state["last_removed"] = removed
 
         # Check game end
-        return self._check_game_end_and_advance(state, log)
+        return self._check_game_end_and_advance(state, log, mobility)
 
     def _apply_pass(self, state, player_id, player_idx):
         if state["phase"] != "movement":
@@ -285,13 +336,10 @@ class DvonnEngine(GameEngine):
             raise ValueError("Not your turn")
 
         # Verify no valid moves
-        actions = self._valid_movement_actions(state, player_idx)
-        has_real_moves = any(a["kind"] != "pass" for a in actions)
-        if has_real_moves:
+        if self._player_can_move(state, player_idx):
             raise ValueError("You have valid moves — cannot pass")
 
-        player_name = state["players"][player_idx]["name"]
-        log = [f"{player_name} passed (no valid moves)."]
+        log = [log_event("pass", player_idx)]
 
         state["consecutive_passes"] += 1
         state["last_move"] = None
@@ -304,40 +352,36 @@ class DvonnEngine(GameEngine):
         state["current_player"] = 1 - state["current_player"]
 
         # If the next player also can't move, end the game
-        next_actions = self._valid_movement_actions(state, state["current_player"])
-        next_has_moves = any(a["kind"] != "pass" for a in next_actions)
-        if not next_has_moves:
+        if not self._player_can_move(state, state["current_player"]):
             state["consecutive_passes"] += 1
-            next_name = state["players"][state["current_player"]]["name"]
-            log.append(f"{next_name} also has no valid moves.")
+            log.append(log_event("no_moves", state["current_player"]))
             return self._end_game(state, log)
 
         return ActionResult(state, log=log)
 
     # ── Connectivity removal ─────────────────────────────
 
-    def _remove_disconnected(self, state, log):
-        """Remove all stacks not connected to a DVONN piece. Returns list of removed keys."""
+    def _remove_disconnected(self, state, vacated_key, log, mobility):
+        """Remove the stacks that emptying vacated_key cut off from every DVONN piece.
+        Returns list of removed keys."""
         board = state["board"]
-        connected = find_connected_to_dvonn(board)
-        removed = []
+        removed = find_cut_off_by(board, vacated_key)
 
-        for key, space in board.items():
-            if space["stack"] and key not in connected:
-                pieces_count = len(space["stack"])
-                removed.append(key)
-                log.append(f"Removed disconnected stack at {key} ({pieces_count} pieces).")
-                space["stack"] = []
+        for key in removed:
+            space = board[key]
+            log.append(log_event("remove_stack", key, len(space["stack"])))
+            space["stack"] = []
+            mobility.vacate(key)
 
         return removed
 
     # ── Turn advancement & game end ──────────────────────
 
-    def _check_game_end_and_advance(self, state, log):
+    def _check_game_end_and_advance(self, state, log, mobility):
         """After a move, check if the game should end, otherwise advance turn."""
         # Check if either player can move
-        white_can_move = self._player_can_move(state, 0)
-        black_can_move = self._player_can_move(state, 1)
+        white_can_move = mobility.can_move(state["players"][0]["color"])
+        black_can_move = mobility.can_move(state["players"][1]["color"])
 
         if not white_can_move and not black_can_move:
             return self._end_game(state, log)
@@ -351,20 +395,7 @@ class DvonnEngine(GameEngine):
 
     def _player_can_move(self, state, player_idx):
         """Check if a player has any valid moves (not counting pass)."""
-        board = state["board"]
-        player_color = state["players"][player_idx]["color"]
-
-        for key, space in board.items():
-            stack = space["stack"]
-            if not stack or stack[-1] != player_color:
-                continue
-            row, col = parse_key(key)
-            if is_surrounded(board, row, col):
-                continue
-            destinations = get_line_destinations(board, row, col, len(stack))
-            if destinations:
-                return True
-        return False
+        return next(self._iter_stack_moves(state, player_idx), None) is not None
 
     def _end_game(self, state, log):
         state["game_over"] = True
@@ -387,18 +418,17 @@ class DvonnEngine(GameEngine):
         p0 = state["players"][0]
         p1 = state["players"][1]
 
-        log.append(f"Game over! {p0['name']} controls {scores[0]} pieces, "
-                   f"{p1['name']} controls {scores[1]} pieces.")
+        log.append(log_event("final_score", 0, scores[0], 1, scores[1]))
 
         if scores[0] > scores[1]:
             state["winner"] = p0["player_id"]
-            log.append(f"{p0['name']} wins!")
+            log.append(log_event("win", 0))
         elif scores[1] > scores[0]:
             state["winner"] = p1["player_id"]
-            log.append(f"{p1['name']} wins!")
+            log.append(log_event("win", 1))
         else:
             state["winner"] = None
-            log.append("It's a draw!")
+            log.append(log_event("draw"))
 
         return ActionResult(state, log=log, game_over=True)
 
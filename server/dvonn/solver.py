@@ -0,0 +1,301 @@
+"""
+Exact DVONN endgame solver.
+
+Late in a DVONN game few stacks can still move, and the rest of the game
+can be searched to the end. The solver plays it out with negamax and
+alpha-beta over a transposition table, and reports the final score
+difference under perfect play along with a move that achieves it:
+
+    solver = EndgameSolver("dvonn_endgame.sqlite")
+    solution = solver.solve(state)
+    solution.score   # pieces the player to move ends up with, minus the opponent's
+    solution.move    # a move_stack or pass action, as get_valid_actions yields them
+
+Positions are keyed by a canonical form: the mover's pieces are always
+relabelled the same color, and the board is reduced over its four
+symmetries (the two mirror images and the half turn), so a position and
+its reflections share one entry. Each canonical position with an exact
+value is written to an SQLite file, so a position that was already solved
+is answered by a single indexed lookup. The same file can be reused
+across games and processes. Without a path the solver keeps its table in
+memory only.
+
+Only the parts of a stack that matter to the rest of the game are kept:
+its height, its top piece and whether it holds a DVONN piece.
+"""
+
+import sqlite3
+from array import array
+from dataclasses import dataclass
+
+from server.dvonn.state import BOARD_ORDER, NEIGHBOR_KEYS, RAYS, parse_key, board_key, ROW_SIZES
+
+# ── Compact positions ────────────────────────────────
+# A cell is one int: height << 3 | has_dvonn << 2 | top, where top is
+# MOVER (the player to move), OTHER, or DVONN_TOP. 0 is an empty space.
+
+MOVER, OTHER, DVONN_TOP = 0, 1, 2
+_HAS_DVONN = 4
+
+KEYS = list(BOARD_ORDER)
+_IDS = {key: i for i, key in enumerate(KEYS)}
+_NEIGHBORS = [tuple(_IDS[n] for n in NEIGHBOR_KEYS[key]) for key in KEYS]
+_RAYS = [tuple(tuple(_IDS[n] for n in ray) for ray in RAYS[key]) for key in KEYS]
+
+
+def _symmetries():
+    """Cell permutations for the identity, both mirror images and the half turn."""
+    last_row = len(ROW_SIZES) - 1
+
+    def flip_rows(row, col):
+        return last_row - row, col
+
+    def flip_cols(row, col):
+        return row, ROW_SIZES[row] - 1 - col
+
+    maps = [
+        lambda row, col: (row, col),
+        flip_rows,
+        flip_cols,
+        lambda row, col: flip_cols(*flip_rows(row, col)),
+    ]
+    return [tuple(_IDS[board_key(*f(*parse_key(key)))] for key in KEYS) for f in maps]
+
+
+# Each is its own inverse: key cell k is cells[perm[k]] and vice versa.
+SYMMETRIES = _symmetries()
+
+# code -> the same cell seen from the other player's side
+_SWAPPED = [code and (code & ~3) | (OTHER, MOVER, DVONN_TOP, 3)[code & 3]
+            for code in range((len(KEYS) + 1) << 3)]
+
+
+def encode_board(board, mover_color):
+    """Return a DVONN board as a list of cell codes, relative to mover_color."""
+    cells = []
+    for key in KEYS:
+        stack = board[key]["stack"]
+        if not stack:
+            cells.append(0)
+            continue
+        top = stack[-1]
+        side = DVONN_TOP if top == "dvonn" else MOVER if top == mover_color else OTHER
+        cells.append(len(stack) << 3 | ("dvonn" in stack) << 2 | side)
+    return cells
+
+
+def canonical(cells):
+    """
+    Return (key, symmetry) for a position: key is the smallest of its
+    symmetric images as bytes, and SYMMETRIES[symmetry] maps cell ids
+    between the two.
+    """
+    best = None
+    for n, perm in enumerate(SYMMETRIES):
+        image = [cells[i] for i in perm]
+        if best is None or image < best:
+            best, symmetry = image, n
+    return array("H", best).tobytes(), symmetry
+
+
+# ── Rules on compact positions ───────────────────────
+
+def _moves(cells, side):
+    """(from, to) cell pairs for side's stack moves."""
+    moves = []
+    for i, code in enumerate(cells):
+        if not code or code & 3 != side:
+            continue
+        neighbors = _NEIGHBORS[i]
+        if len(neighbors) == 6 and all(cells[n] for n in neighbors):
+            continue
+        height = code >> 3
+        for ray in _RAYS[i]:
+            if len(ray) >= height and cells[ray[height - 1]]:
+                moves.append((i, ray[height - 1]))
+    return moves
+
+
+def _cut_off(cells, vacated):
+    """Cells cut off from every DVONN piece by emptying vacated (see state.find_cut_off_by)."""
+    cut = []
+    owner = {}
+    for start in _NEIGHBORS[vacated]:
+        if start in owner or not cells[start]:
+            continue
+        owner[start] = start
+        group = [start]
+        frontier = [start]
+        reached = False
+        while frontier and not reached:
+            current = frontier.pop()
+            if cells[current] & _HAS_DVONN:
+                reached = True
+                break
+            for n in _NEIGHBORS[current]:
+                if n in owner:
+                    if owner[n] != start:
+                        reached = True
+                elif cells[n]:
+                    owner[n] = start
+                    group.append(n)
+                    frontier.append(n)
+        if not reached:
+            cut.extend(group)
+    return cut
+
+
+def _final_score(cells):
+    """Mover's controlled pieces minus the opponent's."""
+    score = 0
+    for code in cells:
+        if code & 3 == MOVER:
+            score += code >> 3
+        elif code & 3 == OTHER:
+            score -= code >> 3
+    return score
+
+
+# ── Solver ───────────────────────────────────────────
+
+EXACT, LOWER, UPPER = 0, 1, 2
+PASS = (-1, -1)
+
+# No final score difference can reach this: there are only 49 pieces.
+_MAX_SCORE = 50
+
+
+@dataclass(frozen=True)
+class Solution:
+    score: int   # final score difference for the player to move
+    move: dict   # a best action for them
+
+
+class EndgameSolver:
+    """
+    Solves DVONN movement-phase positions exactly.
+
+    node_limit bounds a single solve; a position that needs more nodes
+    raises ValueError, so callers can try the solver on any position and
+    fall back when it's still too early in the game.
+    """
+
+    def __init__(self, cache_path=None, node_limit=2_000_000):
+        self.node_limit = node_limit
+        self.table = {}   # canonical key -> (flag, value, canonical move)
+        self._db = None
+        if cache_path is not None:
+            self._db = sqlite3.connect(cache_path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS solved ("
+                "position BLOB PRIMARY KEY, score INTEGER, move_from INTEGER, move_to INTEGER)"
+            )
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def solve(self, state):
+        """Return the Solution for the player to move in a DVONN state."""
+        if state["phase"] != "movement" or state["game_over"]:
+            raise ValueError("Only movement-phase positions can be solved")
+        mover = state["players"][state["current_player"]]["color"]
+        cells = encode_board(state["board"], mover)
+
+        self._nodes = 0
+        self._new = []
+        score = self._search(cells, -_MAX_SCORE, _MAX_SCORE)
+        if self._db is not None and self._new:
+            with self._db:
+                self._db.executemany("INSERT OR REPLACE INTO solved VALUES (?, ?, ?, ?)", self._new)
+
+        key, symmetry = canonical(cells)
+        move = self._lookup(key)[2]
+        if move == PASS:
+            action = {"kind": "pass"}
+        else:
+            perm = SYMMETRIES[symmetry]
+            action = {"kind": "move_stack", "from": KEYS[perm[move[0]]], "to": KEYS[perm[move[1]]]}
+        return Solution(score, action)
+
+    def _lookup(self, key):
+        entry = self.table.get(key)
+        if entry is None and self._db is not None:
+            row = self._db.execute(
+                "SELECT score, move_from, move_to FROM solved WHERE position = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                entry = self.table[key] = (EXACT, row[0], (row[1], row[2]))
+        return entry
+
+    def _store(self, key, flag, value, move):
+        self.table[key] = (flag, value, move)
+        if flag == EXACT and self._db is not None:
+            self._new.append((key, value, move[0], move[1]))
+
+    def _search(self, cells, alpha, beta):
+        self._nodes += 1
+        if self._nodes > self.node_limit:
+            raise ValueError("Position is too large to solve")
+
+        key, symmetry = canonical(cells)
+        entry = self._lookup(key)
+        hint = None
+        if entry is not None:
+            flag, value, hint = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER and value >= beta:
+                return value
+            if flag == UPPER and value <= alpha:
+                return value
+
+        perm = SYMMETRIES[symmetry]
+        moves = _moves(cells, MOVER)
+        if not moves:
+            if not _moves(cells, OTHER):
+                value = _final_score(cells)
+                self._store(key, EXACT, value, PASS)
+                return value
+            # Forced pass: same board, other side to move
+            value = -self._search([_SWAPPED[code] for code in cells], -beta, -alpha)
+            self._store(key, EXACT if alpha < value < beta else LOWER if value >= beta else UPPER,
+                        value, PASS)
+            return value
+
+        # Taking opponent stacks, tallest first, then the table's best move
+        moves.sort(key=lambda move: -(cells[move[1]] >> 3) if cells[move[1]] & 3 == OTHER else 0)
+        if hint is not None and hint != PASS:
+            best_first = (perm[hint[0]], perm[hint[1]])
+            if best_first in moves:
+                moves.remove(best_first)
+                moves.insert(0, best_first)
+
+        original_alpha = alpha
+        best_value, best_move = None, None
+        for src, dst in moves:
+            child = list(cells)
+            moving = child[src]
+            child[dst] = ((moving >> 3) + (child[dst] >> 3)) << 3 \
+                | (moving | child[dst]) & _HAS_DVONN | moving & 3
+            child[src] = 0
+            for cut in _cut_off(child, src):
+                child[cut] = 0
+            value = -self._search([_SWAPPED[code] for code in child], -beta, -alpha)
+            if best_value is None or value > best_value:
+                best_value, best_move = value, (src, dst)
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if best_value <= original_alpha:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self._store(key, flag, best_value, (perm[best_move[0]], perm[best_move[1]]))
+        return best_value
+
@@ -89,30 +89,55 @@ def get_neighbors(row, col):
     return result
 
 
+# ── Static tables ─────────────────────────────────────
+# Geometry never changes, so every position's neighbors and lines are
+# worked out once here rather than by cube math on each call.
+
+def _ray(row, col, dq, dr):
+    """Keys from (row, col) in one direction out to the board edge."""
+    q, r = _to_cube(row, col)
+    keys = []
+    while True:
+        q, r = q + dq, r + dr
+        pos = _from_cube(q, r)
+        if pos is None:
+            return tuple(keys)
+        keys.append(board_key(*pos))
+
+
+# Board order of every key
+BOARD_ORDER = {key: i for i, key in enumerate(generate_board())}
+# key -> adjacent keys
+NEIGHBOR_KEYS = {key: tuple(board_key(nr, nc) for nr, nc in get_neighbors(*parse_key(key)))
+                 for key in BOARD_ORDER}
+# key -> per direction (in _CUBE_DIRS order), the keys out to the edge;
+# a stack of height h moving that way lands on ray[h - 1]
+RAYS = {key: tuple(_ray(*parse_key(key), dq, dr) for dq, dr in _CUBE_DIRS)
+        for key in BOARD_ORDER}
+
+
 # ── Line movement ─────────────────────────────────────
 
-def get_line_destinations(board, row, col, stack_height):
+def line_destinations(board, key, stack_height):
     """
-    Return list of (dest_row, dest_col) reachable by moving exactly
-    stack_height steps in a straight line from (row, col).
-    Must land on an occupied space (non-empty stack). Can jump over empties.
+    Return keys reachable by moving exactly stack_height steps in a
+    straight line from key. Must land on an occupied space (non-empty
+    stack). Can jump over empties.
     """
     if stack_height < 1:
         return []
-
-    q, r = _to_cube(row, col)
     destinations = []
+    for ray in RAYS[key]:
+        if len(ray) >= stack_height:
+            dest_key = ray[stack_height - 1]
+            if board[dest_key]["stack"]:
+                destinations.append(dest_key)
+    return destinations
 
-    for dq, dr in _CUBE_DIRS:
-        tq, tr = q + dq * stack_height, r + dr * stack_height
-        pos = _from_cube(tq, tr)
-        if pos is None:
-            continue
-        dest_key = board_key(pos[0], pos[1])
-        if dest_key in board and len(board[dest_key]["stack"]) > 0:
-            destinations.append(pos)
 
-    return destinations
+def get_line_destinations(board, row, col, stack_height):
+    """Return line_destinations of (row, col) as (dest_row, dest_col) pairs."""
+    return [parse_key(key) for key in line_destinations(board, board_key(row, col), stack_height)]
 
 
 def is_straight_line(from_row, from_col, to_row, to_col, distance):
@@ -129,19 +154,77 @@ def is_straight_line(from_row, from_col, to_row, to_col, distance):
 
 # ── Surrounded check ──────────────────────────────────
 
-def is_surrounded(board, row, col):
+def is_key_surrounded(board, key):
     """A piece/stack is surrounded if ALL 6 neighbors are occupied."""
-    neighbors = get_neighbors(row, col)
+    neighbors = NEIGHBOR_KEYS[key]
     if len(neighbors) < 6:
         # Edge/corner pieces have fewer than 6 neighbors — not fully surrounded
         return False
-    for nr, nc in neighbors:
-        key = board_key(nr, nc)
-        if key not in board or len(board[key]["stack"]) == 0:
+    for nkey in neighbors:
+        if not board[nkey]["stack"]:
             return False
     return True
 
 
+def is_surrounded(board, row, col):
+    return is_key_surrounded(board, board_key(row, col))
+
+
+# ── Mobility ──────────────────────────────────────────
+
+class Mobility:
+    """
+    Who can still move, kept up to date through one move's changes.
+
+    Counts each position's occupied neighbors (a stack is surrounded at
+    6) and keeps, per color, the set of stacks that color controls and
+    that aren't surrounded — the only stacks that might move. A move
+    never fills a space, so after building it once per action, vacate()
+    on the emptied source and on each removed stack is all the upkeep
+    there is; retop() covers the destination changing hands.
+    """
+
+    __slots__ = ("board", "occupied_neighbors", "movable")
+
+    def __init__(self, board):
+        self.board = board
+        occupied = {key for key, space in board.items() if space["stack"]}
+        counts = self.occupied_neighbors = {
+            key: len(occupied.intersection(neighbors)) for key, neighbors in NEIGHBOR_KEYS.items()
+        }
+        self.movable = {"white": set(), "black": set()}
+        for key in occupied:
+            top = board[key]["stack"][-1]
+            if top in self.movable and counts[key] < 6:
+                self.movable[top].add(key)
+
+    def is_surrounded(self, key):
+        return self.occupied_neighbors[key] == 6
+
+    def retop(self, key):
+        """Refresh key's movable-set membership from its stack."""
+        for stacks in self.movable.values():
+            stacks.discard(key)
+        stack = self.board[key]["stack"]
+        if stack and stack[-1] in self.movable and self.occupied_neighbors[key] < 6:
+            self.movable[stack[-1]].add(key)
+
+    def vacate(self, key):
+        """Account for key's stack having been taken off the board."""
+        self.retop(key)
+        for nkey in NEIGHBOR_KEYS[key]:
+            self.occupied_neighbors[nkey] -= 1
+            self.retop(nkey)
+
+    def can_move(self, color):
+        """Does color have any legal stack move?"""
+        board = self.board
+        for key in self.movable[color]:
+            if line_destinations(board, key, len(board[key]["stack"])):
+                return True
+        return False
+
+
 # ── Connectivity (flood fill from DVONN pieces) ──────
 
 def find_connected_to_dvonn(board):
@@ -152,28 +235,67 @@ def find_connected_to_dvonn(board):
     # Find all positions containing at least one "dvonn" piece
     dvonn_positions = []
     for key, space in board.items():
-        if any(piece == "dvonn" for piece in space["stack"]):
+        if "dvonn" in space["stack"]:
             dvonn_positions.append(key)
 
-    # BFS from all DVONN positions
-    visited = set()
-    queue = list(dvonn_positions)
-    visited.update(queue)
+    # Flood fill from all DVONN positions
+    visited = set(dvonn_positions)
+    frontier = list(dvonn_positions)
 
-    while queue:
-        current = queue.pop(0)
-        row, col = parse_key(current)
-        for nr, nc in get_neighbors(row, col):
-            nkey = board_key(nr, nc)
+    while frontier:
+        current = frontier.pop()
+        for nkey in NEIGHBOR_KEYS[current]:
             if nkey in visited:
                 continue
-            if nkey in board and len(board[nkey]["stack"]) > 0:
+            if nkey in board and board[nkey]["stack"]:
                 visited.add(nkey)
-                queue.append(nkey)
+                frontier.append(nkey)
 
     return visited
 
 
+def find_cut_off_by(board, vacated_key):
+    """
+    Return keys of the stacks cut off from every DVONN piece by emptying
+    vacated_key, in board order.
+
+    Assumes every stack was connected to a DVONN piece before — true all
+    through the movement phase, since a move only empties its source
+    space and each move's disconnected stacks are removed straight away.
+    So only the groups around the vacated space need checking: each is
+    flood-filled until it reaches a DVONN piece (it stays) or runs out
+    (it is removed).
+    """
+    cut_off = []
+    owner = {}  # key -> the neighbor whose search reached it
+    for start in NEIGHBOR_KEYS[vacated_key]:
+        if start in owner or not board[start]["stack"]:
+            continue
+        owner[start] = start
+        group = [start]
+        frontier = [start]
+        reached = False
+        while frontier and not reached:
+            current = frontier.pop()
+            if "dvonn" in board[current]["stack"]:
+                reached = True
+                break
+            for nkey in NEIGHBOR_KEYS[current]:
+                if nkey in owner:
+                    # Meeting an earlier search means meeting one that
+                    # stopped early — at a DVONN piece
+                    if owner[nkey] != start:
+                        reached = True
+                elif board[nkey]["stack"]:
+                    owner[nkey] = start
+                    group.append(nkey)
+                    frontier.append(nkey)
+        if not reached:
+            cut_off.extend(group)
+    cut_off.sort(key=BOARD_ORDER.__getitem__)
+    return cut_off
+
+
 # ── Player creation ───────────────────────────────────
 
 def create_player(index, player_id, name):
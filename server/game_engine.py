@@ -6,21 +6,39 @@ The server knows nothing about game-specific rules — it just routes
 player actions through these methods and broadcasts the results.
 """
 
+import hashlib
+import json
+import pickle
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Iterator
+
+from server.action_space import ActionSpace, action_key
+from server.batch import DictBatch, StateBatch
+from server.log_events import render_log
+from server.snapshot import SnapshotCodec
 
 
 @dataclass
 class ActionResult:
     """Returned by apply_action to tell the server what happened."""
     new_state: dict
-    # If non-empty, broadcast a log/message to all players
-    log: list[str] = field(default_factory=list)
+    # If non-empty, broadcast to all players with the new state: log events
+    # (see server.log_events) or plain strings
+    log: list = field(default_factory=list)
     # If the game is over after this action
     game_over: bool = False
 
 
+def state_fingerprint(state: dict) -> bytes:
+    """
+    Digest of a state's full contents. States with different contents get
+    different fingerprints; equal states usually share one (a different
+    key order or aliasing only costs a cache miss).
+    """
+    return hashlib.blake2b(pickle.dumps(state, pickle.HIGHEST_PROTOCOL), digest_size=16).digest()
+
+
 class GameEngine(ABC):
     """
     Pure-logic game engine. No networking, no rendering — just rules.
@@ -32,11 +50,43 @@ class GameEngine(ABC):
     # Subclasses can override to restrict player counts.
     player_count_range: tuple[int, int] = (2, 5)
 
+    # Subclasses whose actions can be enumerated up front set this to an
+    # ActionSpace so actions can be exchanged as small integers.
+    action_space: ActionSpace | None = None
+
+    # Read-only definitions (cards, tiles, buildings) that states refer to
+    # by id, e.g. {"buildings": {"w_farm": {...}}}. Sent to each client
+    # once per connection rather than inside every state.
+    catalog: dict | None = None
+
+    # Text for the log events the engine emits, {code: template}. Shipped
+    # to clients in the catalog so they render logs themselves.
+    log_events: dict | None = None
+
+    # Action kinds whose expensive legality check apply_action may skip
+    # when get_valid_actions offered the same action for an identical
+    # state (see _collect_valid_actions).
+    prevalidated_kinds: frozenset[str] = frozenset()
+
+    # Binary snapshot format. Engines set this to a SnapshotCodec declaring
+    # their board layouts and common cell/card values; without one,
+    # snapshots use the generic encoding only.
+    snapshot_codec: SnapshotCodec | None = None
+
+    # StateBatch subclass that packs many states into arrays for batched
+    # playouts (see pack_batch); None falls back to a DictBatch.
+    batch_class: type[StateBatch] | None = None
+
     @abstractmethod
-    def initial_state(self, player_ids: list[str], player_names: list[str]) -> dict:
+    def initial_state(self, player_ids: list[str], player_names: list[str],
+                      seed: int | None = None) -> dict:
         """
         Create the starting game state for the given players.
         Called once when a game room starts.
+
+        Engines that shuffle or deal keep a server.rng stream seeded with
+        `seed` (random if None) in state["rng"] and draw only from it, so
+        the same seed and actions replay to the same states.
         """
         ...
 
@@ -58,6 +108,145 @@ class GameEngine(ABC):
         """
         ...
 
+    def iter_valid_actions(self, state: dict, player_id: str) -> Iterator[dict]:
+        """
+        Lazily yield the actions this player can currently take, in the
+        same order as get_valid_actions. Engines whose move generation is
+        expensive should override this so callers that only need the first
+        few actions don't pay for the whole list.
+        """
+        yield from self.get_valid_actions(state, player_id)
+
+    def has_any_valid_action(self, state: dict, player_id: str) -> bool:
+        """
+        Return True if this player has at least one valid action.
+        Stops at the first action found instead of building the full list.
+        """
+        return next(iter(self.iter_valid_actions(state, player_id)), None) is not None
+
+    def _collect_valid_actions(self, state: dict, player_id: str) -> list[dict]:
+        """
+        Build the valid-action list. If it offers any prevalidated_kinds
+        actions, remember them with the state's fingerprint, so a following
+        apply_action on an identical state can validate them with a set
+        lookup instead of re-running the check.
+        """
+        actions = list(self.iter_valid_actions(state, player_id))
+        cache = self.__dict__.setdefault("_legal_cache", {})
+        offered = {action_key(a) for a in actions if a.get("kind") in self.prevalidated_kinds}
+        if offered:
+            cache[player_id] = (state_fingerprint(state), offered)
+        else:
+            cache.pop(player_id, None)
+        return actions
+
+    def _is_known_legal(self, state: dict, player_id: str, action: dict) -> bool:
+        """
+        True if action was among the valid actions last collected for a
+        state with the same contents. False means "unknown", not "illegal"
+        — callers fall back to full validation. The state is fingerprinted
+        only when the action was offered, so a miss costs a lookup.
+        """
+        entry = self.__dict__.get("_legal_cache", {}).get(player_id)
+        if entry is None or action.get("kind") not in self.prevalidated_kinds:
+            return False
+        try:
+            if action_key(action) not in entry[1]:
+                return False
+        except TypeError:
+            return False
+        return entry[0] == state_fingerprint(state)
+
+    def pack_batch(self, states: list[dict]) -> StateBatch:
+        """
+        Pack many states into a StateBatch (see server.batch) for batched
+        playouts: the engine's packed batch_class if it has one, otherwise
+        a DictBatch over apply_action. Needs an action space.
+        """
+        return (self.batch_class or DictBatch)(self, states)
+
+    def apply_many(self, batch: StateBatch, actions: list[int | None]) -> None:
+        """
+        Advance every game of a batch from pack_batch by one action, given
+        as an action-space index (None leaves a game as it is), in one pass.
+        Raises ValueError on the first illegal action, as batch.step does.
+        """
+        batch.step(actions)
+
+    def encode_action(self, state: dict, action: dict) -> int:
+        """
+        Return the integer index of an action in this engine's fixed
+        action space. Raises ValueError if the engine has no action space
+        or the action falls outside it.
+        """
+        return self._require_action_space().encode(action)
+
+    def decode_action(self, state: dict, index: int) -> dict:
+        """
+        Return the action dict for an integer index, in the shape
+        apply_action accepts. Raises ValueError on an unknown index.
+        """
+        return self._require_action_space().decode(index)
+
+    def legal_action_mask(self, state: dict, player_id: str) -> int:
+        """
+        Return the player's valid actions as a bit mask over the action
+        space (bit i set when action i is legal). Use
+        action_space.mask_to_bytes for a compact wire form.
+        """
+        self._require_action_space()
+        mask = 0
+        for action in self.iter_valid_actions(state, player_id):
+            mask |= 1 << self.encode_action(state, action)
+        return mask
+
+    def _require_action_space(self) -> ActionSpace:
+        if self.action_space is None:
+            raise ValueError(f"{type(self).__name__} has no fixed action space")
+        return self.action_space
+
+    def get_catalog(self) -> dict:
+        """Return the engine's static catalog ({} if it has none)."""
+        catalog = dict(self.catalog or {})
+        if self.log_events:
+            catalog["log"] = self.log_events
+        return catalog
+
+    def render_log(self, state: dict, log: list) -> list[str]:
+        """Return an ActionResult log as display text."""
+        names = [p["name"] for p in state.get("players", [])]
+        return render_log(log, self.log_events or {}, names)
+
+    def catalog_hash(self) -> str:
+        """Short content hash of the catalog, for client-side caching."""
+        cls = type(self)
+        cached = cls.__dict__.get("_catalog_hash")
+        if cached is None:
+            blob = json.dumps(self.get_catalog(), sort_keys=True, separators=(",", ":"))
+            cached = hashlib.sha256(blob.encode()).hexdigest()[:16]
+            cls._catalog_hash = cached
+        return cached
+
+    def encode_snapshot(self, state: dict) -> bytes:
+        """Pack a state into a compact, versioned binary snapshot."""
+        return self._get_snapshot_codec().encode(state)
+
+    def decode_snapshot(self, data: bytes) -> dict:
+        """
+        Rebuild the state dict from encode_snapshot's bytes. Raises
+        ValueError for another game's snapshot, a different schema version
+        or corrupt data.
+        """
+        return self._get_snapshot_codec().decode(data)
+
+    def _get_snapshot_codec(self) -> SnapshotCodec:
+        cls = type(self)
+        codec = cls.__dict__.get("snapshot_codec")
+        if codec is None:
+            codec = SnapshotCodec(cls.__name__)
+            cls.snapshot_codec = codec
+        return codec
+
     @abstractmethod
     def apply_action(self, state: dict, player_id: str, action: dict) -> ActionResult:
         """
@@ -92,6 +281,7 @@ class GameEngine(ABC):
         """
         from copy import deepcopy
         view = deepcopy(state)
+        view.pop("rng", None)
         view["your_player_id"] = None
         view["valid_actions"] = []
         return view
@@ -2,21 +2,78 @@
 
 from copy import deepcopy
 
+from server.action_space import ActionSpace
 from server.game_engine import GameEngine, ActionResult
+from server.log_events import log_event
+from server.snapshot import SnapshotCodec
 from server.gipf.state import (
     hex_key, parse_hex, generate_board, create_player,
     setup_basic, setup_standard,
     EDGE_DOTS, EDGE_DOT_MAP,
-    can_push, execute_push, find_rows_of_four,
+    can_push, iter_pushable_dots, execute_push, find_rows_of_four,
+    all_line_segments,
+)
+
+
+# ── Action space ─────────────────────────────────────
+
+# resolve_row's keep_gipf is encoded as a flag: keep all of the resolver's
+# own GIPF-pieces in the row, or keep none (the only two choices offered).
+ACTION_SPACE = ActionSpace(
+    [
+        ("set_mode", [("mode", ["basic", "standard", "tournament"])]),
+        ("push", [("dot", [d["dot_key"] for d in EDGE_DOTS]), ("is_gipf", [False, True])]),
+        ("resolve_row", [("row_keys", all_line_segments(4)), ("keep_gipf", [False, True])]),
+    ],
+    set_fields=[("resolve_row", "row_keys")],
+)
+
+
+# ── Log events ───────────────────────────────────
+
+LOG_EVENTS = {
+    "mode_basic": "Game mode: Basic. White begins!",
+    "mode_standard": "Game mode: Standard. White begins!",
+    "mode_tournament": "Game mode: Tournament. White begins!",
+    "push_piece": "{player} pushed a piece from {dot}.",
+    "push_gipf": "{player} pushed a GIPF-piece from {dot}.",
+    "resolve_row": "{player} resolved a row.",
+    "must_resolve_rows": "{player} must resolve their row(s).",
+    "form_rows": "{player} formed {count} row(s) of 4!",
+    "no_reserve": "{player} has no pieces in reserve!",
+    "no_gipf": "{player} has no GIPF pieces!",
+    "win": "{player} wins!",
+}
+
+
+# ── Snapshots ────────────────────────────────────────
+
+SNAPSHOT_CODEC = SnapshotCodec(
+    "gipf",
+    strings=[
+        "game", "player_ids", "player_count", "players", "board", "current_player", "mode",
+        "phase", "sub_phase", "pending_rows", "opponent_pending_rows", "row_resolver",
+        "game_over", "winner",
+        "index", "player_id", "name", "color", "reserve", "captured_opponent", "has_played_single",
+        "keys", "core_keys", "extension_keys",
+        "gipf", "white", "black", "basic", "standard", "tournament", "config", "play",
+        "push", "resolve_rows",
+    ],
+    atoms=[{"color": color, "is_gipf": is_gipf}
+           for color in ("white", "black") for is_gipf in (False, True)],
+    boards=[list(generate_board())],
 )
 
 
 class GipfEngine(GameEngine):
     player_count_range = (2, 2)
+    action_space = ACTION_SPACE
+    log_events = LOG_EVENTS
+    snapshot_codec = SNAPSHOT_CODEC
 
     # ── Abstract method implementations ──────────────────
 
-    def initial_state(self, player_ids, player_names):
+    def initial_state(self, player_ids, player_names, seed=None):
         players = [
             create_player(i, pid, name, 15)
             for i, (pid, name) in enumerate(zip(player_ids, player_names))
@@ -45,17 +102,37 @@ class GipfEngine(GameEngine):
         return view
 
     def get_valid_actions(self, state, player_id):
+        return list(self.iter_valid_actions(state, player_id))
+
+    def iter_valid_actions(self, state, player_id):
         if state["game_over"]:
-            return []
+            return
         player_idx = self._player_index(state, player_id)
         if player_idx is None:
-            return []
+            return
 
         if state["phase"] == "config":
-            return self._valid_config_actions(state, player_idx)
+            yield from self._iter_config_actions(state, player_idx)
         elif state["phase"] == "play":
-            return self._valid_play_actions(state, player_idx)
-        return []
+            yield from self._iter_play_actions(state, player_idx)
+
+    def encode_action(self, state, action):
+        if action.get("kind") == "resolve_row":
+            action = dict(action, keep_gipf=bool(action.get("keep_gipf")))
+        return super().encode_action(state, action)
+
+    def decode_action(self, state, index):
+        action = super().decode_action(state, index)
+        if action["kind"] == "resolve_row":
+            keep = []
+            if action["keep_gipf"] and state.get("row_resolver") is not None:
+                color = state["players"][state["row_resolver"]]["color"]
+                for key in action["row_keys"]:
+                    piece = state["board"].get(key)
+                    if piece and piece["is_gipf"] and piece["color"] == color:
+                        keep.append(key)
+            action["keep_gipf"] = keep
+        return action
 
     def apply_action(self, state, player_id, action):
         state = deepcopy(state)
@@ -114,14 +191,12 @@ class GipfEngine(GameEngine):
 
     # ── Config phase ─────────────────────────────────────
 
-    def _valid_config_actions(self, state, player_idx):
+    def _iter_config_actions(self, state, player_idx):
         if player_idx != 0:
-            return []
-        return [
-            {"kind": "set_mode", "mode": "basic"},
-            {"kind": "set_mode", "mode": "standard"},
-            {"kind": "set_mode", "mode": "tournament"},
-        ]
+            return
+        yield {"kind": "set_mode", "mode": "basic"}
+        yield {"kind": "set_mode", "mode": "standard"}
+        yield {"kind": "set_mode", "mode": "tournament"}
 
     def _apply_set_mode(self, state, player_idx, action):
         if state["phase"] != "config" or player_idx != 0:
@@ -152,62 +227,53 @@ class GipfEngine(GameEngine):
         state["sub_phase"] = "push"
         state["current_player"] = 0
 
-        mode_names = {"basic": "Basic", "standard": "Standard", "tournament": "Tournament"}
-        log = [f"Game mode: {mode_names[mode]}. White begins!"]
+        log = [log_event(f"mode_{mode}")]
         return ActionResult(state, log=log)
 
     # ── Play phase: valid actions ────────────────────────
 
-    def _valid_play_actions(self, state, player_idx):
+    def _iter_play_actions(self, state, player_idx):
         sub = state.get("sub_phase")
 
         if sub == "push":
             if player_idx != state["current_player"]:
-                return []
-            return self._valid_push_actions(state, player_idx)
+                return
+            yield from self._iter_push_actions(state, player_idx)
 
         elif sub == "resolve_rows":
             rr = state.get("row_resolver")
             if player_idx != rr:
-                return []
-            return self._valid_resolve_actions(state, player_idx)
-
-        return []
+                return
+            yield from self._iter_resolve_actions(state, player_idx)
 
-    def _valid_push_actions(self, state, player_idx):
+    def _iter_push_actions(self, state, player_idx):
         player = state["players"][player_idx]
         if player["reserve"] <= 0:
-            return []
+            return
 
         mode = state["mode"]
-        actions = []
-
-        for dot_info in EDGE_DOTS:
-            if not can_push(state["board"], dot_info):
-                continue
 
+        for dot_info in iter_pushable_dots(state["board"]):
             if mode == "basic":
                 # Only single pieces
-                actions.append({"kind": "push", "dot": dot_info["dot_key"], "is_gipf": False})
+                yield {"kind": "push", "dot": dot_info["dot_key"], "is_gipf": False}
             elif mode == "standard":
                 # Can always play single or GIPF (if reserve >= 2 for GIPF)
-                actions.append({"kind": "push", "dot": dot_info["dot_key"], "is_gipf": False})
+                yield {"kind": "push", "dot": dot_info["dot_key"], "is_gipf": False}
                 if player["reserve"] >= 2:
-                    actions.append({"kind": "push", "dot": dot_info["dot_key"], "is_gipf": True})
+                    yield {"kind": "push", "dot": dot_info["dot_key"], "is_gipf": True}
             elif mode == "tournament":
                 if not player["has_played_single"]:
                     # Must play GIPF pieces (can also choose to play single to stop GIPF phase)
                     if player["reserve"] >= 2:
-                        actions.append({"kind": "push", "dot": dot_info["dot_key"], "is_gipf": True})
+                        yield {"kind": "push", "dot": dot_info["dot_key"], "is_gipf": True}
                     # Can play single (which locks out future GIPF plays)
-                    actions.append({"kind": "push", "dot": dot_info["dot_key"], "is_gipf": False})
+                    yield {"kind": "push", "dot": dot_info["dot_key"], "is_gipf": False}
                 else:
                     # Already played single — only single pieces
-                    actions.append({"kind": "push", "dot": dot_info["dot_key"], "is_gipf": False})
-
-        return actions
+                    yield {"kind": "push", "dot": dot_info["dot_key"], "is_gipf": False}
 
-    def _valid_resolve_actions(self, state, player_idx):
+    def _iter_resolve_actions(self, state, player_idx):
         """Offer row resolution choices."""
         player = state["players"][player_idx]
         player_color = player["color"]
@@ -218,9 +284,8 @@ class GipfEngine(GameEngine):
             rows = state.get("opponent_pending_rows", [])
 
         if not rows:
-            return []
+            return
 
-        actions = []
         for row in rows:
             # Find GIPF pieces in this row that belong to the resolver
             gipf_in_row = []
@@ -231,27 +296,25 @@ class GipfEngine(GameEngine):
 
             if not gipf_in_row:
                 # No GIPF pieces — straightforward removal
-                actions.append({
+                yield {
                     "kind": "resolve_row",
                     "row_keys": row["keys"],
                     "keep_gipf": [],
-                })
+                }
             else:
                 # Player can choose to keep or remove each GIPF piece
                 # For simplicity: offer "keep all" and "remove all" options
                 # Plus individual choices would be too many — keep it simple
-                actions.append({
+                yield {
                     "kind": "resolve_row",
                     "row_keys": row["keys"],
                     "keep_gipf": list(gipf_in_row),  # keep all own GIPF
-                })
-                actions.append({
+                }
+                yield {
                     "kind": "resolve_row",
                     "row_keys": row["keys"],
                     "keep_gipf": [],  # remove all
-                })
-
-        return actions
+                }
 
     # ── Play phase: apply actions ────────────────────────
 
@@ -291,8 +354,7 @@ class GipfEngine(GameEngine):
         if mode == "tournament" and not is_gipf:
             player["has_played_single"] = True
 
-        piece_type = "GIPF-piece" if is_gipf else "piece"
-        log = [f"{player['name']} pushed a {piece_type} from {dot_key}."]
+        log = [log_event("push_gipf" if is_gipf else "push_piece", player_idx, dot_key)]
 
         # Check for rows of 4
         return self._check_rows(state, player_idx, log)
@@ -336,7 +398,7 @@ class GipfEngine(GameEngine):
                 player["captured_opponent"] += capture_count
                 # Don't return to opponent's reserve
 
-        log.append(f"{player['name']} resolved a row.")
+        log.append(log_event("resolve_row", player_idx))
 
         # Remove this row from pending
         if player_idx == state["current_player"]:
@@ -378,7 +440,7 @@ class GipfEngine(GameEngine):
             state["opponent_pending_rows"] = opp_rows
             if opp_rows:
                 state["row_resolver"] = opp_idx
-                log.append(f"{opp['name']} must resolve their row(s).")
+                log.append(log_event("must_resolve_rows", opp_idx))
                 return ActionResult(state, log=log)
 
         if player_idx != state["current_player"] and state.get("opponent_pending_rows"):
@@ -406,13 +468,13 @@ class GipfEngine(GameEngine):
         if my_rows:
             state["sub_phase"] = "resolve_rows"
             state["row_resolver"] = player_idx
-            log.append(f"{state['players'][player_idx]['name']} formed {len(my_rows)} row(s) of 4!")
+            log.append(log_event("form_rows", player_idx, len(my_rows)))
             return ActionResult(state, log=log)
 
         if opp_rows:
             state["sub_phase"] = "resolve_rows"
             state["row_resolver"] = 1 - player_idx
-            log.append(f"{state['players'][1 - player_idx]['name']} formed {len(opp_rows)} row(s) of 4!")
+            log.append(log_event("form_rows", 1 - player_idx, len(opp_rows)))
             return ActionResult(state, log=log)
 
         # No rows — check win and advance
@@ -435,7 +497,7 @@ class GipfEngine(GameEngine):
         next_player = state["players"][state["current_player"]]
         if next_player["reserve"] <= 0:
             winner_idx = 1 - state["current_player"]
-            log.append(f"{next_player['name']} has no pieces in reserve!")
+            log.append(log_event("no_reserve", state["current_player"]))
             return self._end_game_winner(state, winner_idx, log)
 
         return ActionResult(state, log=log)
@@ -471,10 +533,10 @@ class GipfEngine(GameEngine):
                         if piece and piece["color"] == opp_color
                     )
                     if opp_pieces_on_board > 0 and state["players"][opp_idx]["has_played_single"]:
-                        log.append(f"{state['players'][opp_idx]['name']} has no GIPF pieces!")
+                        log.append(log_event("no_gipf", opp_idx))
                         return self._end_game_winner(state, idx, log)
                 elif mode == "standard":
-                    log.append(f"{state['players'][opp_idx]['name']} has no GIPF pieces!")
+                    log.append(log_event("no_gipf", opp_idx))
                     return self._end_game_winner(state, idx, log)
 
         return None
@@ -484,7 +546,7 @@ class GipfEngine(GameEngine):
         state["phase"] = "game_over"
         state["sub_phase"] = None
         state["winner"] = state["players"][winner_idx]["player_id"]
-        log.append(f"{state['players'][winner_idx]['name']} wins!")
+        log.append(log_event("win", winner_idx))
         return ActionResult(state, log=log, game_over=True)
 
     # ── Helpers ──────────────────────────────────────────
@@ -1,9 +1,10 @@
 """GIPF board geometry, edge dots, push mechanics, and row detection."""
 
+from server.hexgrid import AXIAL_DIRS, DIR_INDEX, HexGrid, hex_distance, hex_key, parse_hex
+
 # ── Constants ─────────────────────────────────────────
 
 BOARD_RADIUS = 3
-AXIAL_DIRS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1)]
 
 # Starting corner spots (the 6 vertices of the radius-3 hex, one step inside)
 # These are at distance 2 from center, positioned toward each corner
@@ -25,19 +26,6 @@ INITIAL_CORNERS = [
 
 # ── Coordinate helpers ────────────────────────────────
 
-def hex_key(q, r):
-    return f"{q},{r}"
-
-
-def parse_hex(key):
-    parts = key.split(",")
-    return int(parts[0]), int(parts[1])
-
-
-def hex_distance(q, r):
-    return max(abs(q), abs(r), abs(q + r))
-
-
 def is_board_spot(q, r):
     """On the 37-spot hex board (radius 3)."""
     return hex_distance(q, r) <= BOARD_RADIUS
@@ -55,6 +43,42 @@ def generate_board():
     return board
 
 
+GRID = HexGrid(parse_hex(key) for key in generate_board())
+_LINE_KEYS = [tuple(GRID.to_keys(line)) for line in GRID.lines]
+
+# One bit per spot (bit i is GRID cell id i), for occupancy masks
+SPOT_BITS = {key: 1 << i for i, key in enumerate(GRID.keys)}
+_LINE_MASKS = [sum(SPOT_BITS[key] for key in line) for line in _LINE_KEYS]
+
+
+def occupancy(board):
+    """Bitmask of the occupied spots."""
+    mask = 0
+    for key, piece in board.items():
+        if piece is not None:
+            mask |= SPOT_BITS[key]
+    return mask
+
+
+def all_lines():
+    """Return every straight line across the board as a list of keys.
+
+    Lines run along the 3 axial directions (1,0), (0,1) and (1,-1), each
+    ordered along its direction — the same order find_rows_of_four scans in.
+    """
+    return [list(line) for line in _LINE_KEYS]
+
+
+def all_line_segments(min_length):
+    """Return every run of at least min_length consecutive spots on a line."""
+    segments = []
+    for line in all_lines():
+        for start in range(len(line)):
+            for end in range(start + min_length, len(line) + 1):
+                segments.append(line[start:end])
+    return segments
+
+
 # ── Edge dots ─────────────────────────────────────────
 
 def generate_edge_dots():
@@ -93,41 +117,50 @@ def generate_edge_dots():
 EDGE_DOTS = generate_edge_dots()
 EDGE_DOT_MAP = {d["dot_key"]: d for d in EDGE_DOTS}
 
+# The spots a push from each dot runs along, first spot to far edge, and
+# the same line as an occupancy mask
+PUSH_LINES = {
+    d["dot_key"]: (d["first_spot_key"],)
+    + GRID.key_rays[d["first_spot_key"]][DIR_INDEX[d["direction"]]]
+    for d in EDGE_DOTS
+}
+PUSH_MASKS = {dot: sum(SPOT_BITS[key] for key in line) for dot, line in PUSH_LINES.items()}
+
 
 # ── Push mechanics ────────────────────────────────────
 
 def can_push(board, dot_info):
     """Check if we can push from this edge dot (line not completely full)."""
-    dq, dr = dot_info["direction"]
-    q, r = parse_hex(dot_info["first_spot_key"])
-
     # Walk along the line until we find an empty spot or go off the board
-    while is_board_spot(q, r):
-        key = hex_key(q, r)
+    for key in PUSH_LINES[dot_info["dot_key"]]:
         if board.get(key) is None:
             return True  # Found an empty spot — room to push
-        q += dq
-        r += dr
 
     return False  # Line is full — cannot push
 
 
+def iter_pushable_dots(board):
+    """Yield the edge dots whose line is not full, in EDGE_DOTS order.
+
+    The occupancy mask is rebuilt from the board on every call, one pass
+    over the 37 spots (the state keeps no mask to maintain per push); each
+    line is then one mask test.
+    """
+    occupied = occupancy(board)
+    for dot_info in EDGE_DOTS:
+        mask = PUSH_MASKS[dot_info["dot_key"]]
+        if occupied & mask != mask:
+            yield dot_info
+
+
 def execute_push(board, dot_info, piece):
     """Push a piece from an edge dot into the board.
 
     piece: {"color": str, "is_gipf": bool}
     Mutates board in place.
     """
-    dq, dr = dot_info["direction"]
-    fq, fr = parse_hex(dot_info["first_spot_key"])
-
-    # Collect all spots on this line (from first_spot in direction until off-board)
-    line = []
-    q, r = fq, fr
-    while is_board_spot(q, r):
-        line.append(hex_key(q, r))
-        q += dq
-        r += dr
+    # All spots on this line, from first_spot in direction until off-board
+    line = PUSH_LINES[dot_info["dot_key"]]
 
     # Find the first empty spot in the line
     first_empty = None
@@ -160,94 +193,67 @@ def find_rows_of_four(board, color):
 
     A row includes the 4+ core same-color pieces plus any direct extensions
     (pieces of any color that continue the line beyond the core).
+
+    Only lines holding at least 4 pieces of the color are walked; the
+    color's occupancy mask rules out the rest with one AND each.
     """
+    own = 0
+    for key, piece in board.items():
+        if piece is not None and piece["color"] == color:
+            own |= SPOT_BITS[key]
+
     rows = []
-    check_dirs = [(1, 0), (0, 1), (1, -1)]  # 3 directions (avoid reverse duplicates)
-
-    for dq, dr in check_dirs:
-        # Group positions into lines by their perpendicular coordinate
-        lines = {}
-        for q in range(-BOARD_RADIUS, BOARD_RADIUS + 1):
-            for r in range(-BOARD_RADIUS, BOARD_RADIUS + 1):
-                if not is_board_spot(q, r):
-                    continue
-                if (dq, dr) == (1, 0):
-                    line_id = r
-                elif (dq, dr) == (0, 1):
-                    line_id = q
-                else:
-                    line_id = q + r
-                if line_id not in lines:
-                    lines[line_id] = []
-                lines[line_id].append((q, r))
-
-        for line_id, points in lines.items():
-            # Sort along the direction
-            if (dq, dr) == (1, 0):
-                points.sort(key=lambda p: p[0])
-            elif (dq, dr) == (0, 1):
-                points.sort(key=lambda p: p[1])
-            else:
-                points.sort(key=lambda p: p[0])
-
-            # Find runs of 4+ same-color pieces
-            # We need contiguous runs (no gaps — all spots must be occupied)
-            i = 0
-            while i < len(points):
-                q, r = points[i]
-                key = hex_key(q, r)
-                piece = board.get(key)
-
-                if piece is not None and piece["color"] == color:
-                    # Start a run
-                    run_start = i
-                    run_end = i
-                    while run_end + 1 < len(points):
-                        nq, nr = points[run_end + 1]
-                        nkey = hex_key(nq, nr)
-                        npiece = board.get(nkey)
-                        if npiece is not None and npiece["color"] == color:
-                            run_end += 1
-                        else:
-                            break
-
-                    run_len = run_end - run_start + 1
-                    if run_len >= 4:
-                        # Found a row! Now find extensions
-                        core_keys = [hex_key(*points[j]) for j in range(run_start, run_end + 1)]
-
-                        # Extend backward
-                        ext_keys = []
-                        j = run_start - 1
-                        while j >= 0:
-                            ek = hex_key(*points[j])
-                            if board.get(ek) is not None:
-                                ext_keys.append(ek)
-                                j -= 1
-                            else:
-                                break
-
-                        # Extend forward
-                        j = run_end + 1
-                        while j < len(points):
-                            ek = hex_key(*points[j])
-                            if board.get(ek) is not None:
-                                ext_keys.append(ek)
-                                j += 1
-                            else:
-                                break
-
-                        rows.append({
-                            "keys": core_keys + ext_keys,
-                            "core_keys": core_keys,
-                            "extension_keys": ext_keys,
-                        })
+    for line, mask in zip(_LINE_KEYS, _LINE_MASKS):
+        if (own & mask).bit_count() >= 4:
+            _find_rows_in_line(board, line, color, rows)
+    return rows
 
-                    i = run_end + 1
-                else:
-                    i += 1
 
-    return rows
+def _find_rows_in_line(board, line, color, rows):
+    # Find runs of 4+ same-color pieces
+    # We need contiguous runs (no gaps — all spots must be occupied)
+    i = 0
+    while i < len(line):
+        piece = board.get(line[i])
+
+        if piece is not None and piece["color"] == color:
+            # Start a run
+            run_start = i
+            run_end = i
+            while run_end + 1 < len(line):
+                npiece = board.get(line[run_end + 1])
+                if npiece is not None and npiece["color"] == color:
+                    run_end += 1
+                else:
+                    break
+
+            run_len = run_end - run_start + 1
+            if run_len >= 4:
+                # Found a row! Now find extensions
+                core_keys = list(line[run_start:run_end + 1])
+
+                # Extend backward
+                ext_keys = []
+                j = run_start - 1
+                while j >= 0 and board.get(line[j]) is not None:
+                    ext_keys.append(line[j])
+                    j -= 1
+
+                # Extend forward
+                j = run_end + 1
+                while j < len(line) and board.get(line[j]) is not None:
+                    ext_keys.append(line[j])
+                    j += 1
+
+                rows.append({
+                    "keys": core_keys + ext_keys,
+                    "core_keys": core_keys,
+                    "extension_keys": ext_keys,
+                })
+
+            i = run_end + 1
+        else:
+            i += 1
 
 
 # ── Setup helpers ─────────────────────────────────────
@@ -0,0 +1,109 @@
+"""
+Precomputed hex board geometry.
+
+The hex games keep their boards as dicts keyed by "q,r" strings — the form
+states, views, snapshots and clients all share. Walking such a board by
+coordinate arithmetic formats and parses keys in the inner loop; a HexGrid
+does that work once per board shape instead. Each cell gets a dense integer
+id (its index in the cell list), and the grid precomputes, per cell and per
+direction, the neighboring cell and the ray out to the board edge, plus
+every straight line across the board.
+
+    GRID = HexGrid(cells)                  # (q, r) pairs, in board order
+    for ray in GRID.key_rays[key]:         # one tuple of keys per direction
+        ...
+    GRID.ids[key], GRID.keys[cell_id]      # key <-> id
+
+Every table exists by id (steps, rays, neighbors, lines) for code that keeps
+int-indexed arrays or bitmasks, and by key (key_steps, key_rays,
+key_neighbors) for code that reads a "q,r" board directly. Directions are
+indices into AXIAL_DIRS throughout; d ^ 1 is the opposite direction.
+Rays and lines stop at the first position that isn't a cell, so holes in a
+board (Tzaar's center) end them just like the edge does.
+"""
+
+AXIAL_DIRS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1)]
+DIR_INDEX = {d: i for i, d in enumerate(AXIAL_DIRS)}
+
+# The three line axes, as direction indices: (1, 0), (0, 1) and (1, -1).
+LINE_AXES = (0, 2, 4)
+
+
+def hex_key(q, r):
+    return f"{q},{r}"
+
+
+def parse_hex(key):
+    q, r = key.split(",")
+    return int(q), int(r)
+
+
+def hex_distance(q, r):
+    """Distance from the center (0, 0)."""
+    return max(abs(q), abs(r), abs(q + r))
+
+
+class HexGrid:
+    """
+    Geometry of one board shape.
+
+    keys[i], coords[i]  — cell i's "q,r" key and (q, r) pair; ids maps back
+    steps[i][d]         — the cell one step from i in direction d, or None
+    rays[i][d]          — the cells from i in direction d out to the edge
+    neighbors[i]        — the adjacent cells, in direction order
+    lines               — every maximal straight run of cells along the
+                          three LINE_AXES, each ordered along its axis;
+                          lines_through[i] lists the lines containing i
+    """
+
+    def __init__(self, cells):
+        self.coords = [tuple(cell) for cell in cells]
+        self.keys = [hex_key(q, r) for q, r in self.coords]
+        self.ids = {key: i for i, key in enumerate(self.keys)}
+        self.size = len(self.keys)
+
+        index = {cell: i for i, cell in enumerate(self.coords)}
+        self.steps = [tuple(index.get((q + dq, r + dr)) for dq, dr in AXIAL_DIRS)
+                      for q, r in self.coords]
+        self.rays = [tuple(self._ray(i, d) for d in range(len(AXIAL_DIRS)))
+                     for i in range(self.size)]
+        self.neighbors = [tuple(n for n in steps if n is not None) for steps in self.steps]
+
+        # Lines start at cells with no predecessor along their axis; taking
+        # axes in order and starts in id order lists them as a scan of the
+        # board in cell order would meet them.
+        self.lines = []
+        self.lines_through = [[] for _ in range(self.size)]
+        for axis in LINE_AXES:
+            for i in range(self.size):
+                if self.steps[i][axis ^ 1] is None:
+                    line = (i,) + self.rays[i][axis]
+                    for cell in line:
+                        self.lines_through[cell].append(len(self.lines))
+                    self.lines.append(line)
+
+        keys = self.keys
+        self.key_steps = {keys[i]: tuple(None if n is None else keys[n] for n in steps)
+                          for i, steps in enumerate(self.steps)}
+        self.key_rays = {keys[i]: tuple(tuple(keys[n] for n in ray) for ray in rays)
+                         for i, rays in enumerate(self.rays)}
+        self.key_neighbors = {keys[i]: tuple(keys[n] for n in neighbors)
+                              for i, neighbors in enumerate(self.neighbors)}
+
+    def _ray(self, cell, direction):
+        ray = []
+        cell = self.steps[cell][direction]
+        while cell is not None:
+            ray.append(cell)
+            cell = self.steps[cell][direction]
+        return tuple(ray)
+
+    def to_keys(self, cells):
+        """Return the keys of a sequence of cell ids."""
+        return [self.keys[i] for i in cells]
+
+    def windows(self, length):
+        """Every run of `length` consecutive cells on a line, as id tuples."""
+        return [line[i:i + length]
+                for line in self.lines
+                for i in range(len(line) - length + 1)]
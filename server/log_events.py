@@ -0,0 +1,69 @@
+"""
+Structured game log events.
+
+Engines put compact events in ActionResult.log instead of English
+sentences. An event is a list: a code followed by its arguments.
+
+    log.append(log_event("move_stack", player_idx, from_key, to_key, height))
+    # -> ["move_stack", 0, "1,2", "1,4", 3]
+
+Each engine maps its codes to text in a LOG_EVENTS dict (its `log_events`
+attribute):
+
+    LOG_EVENTS = {"move_stack": "{player} moved stack from {from} to {to} (height {height})."}
+
+Arguments fill the template's {fields} in the order the fields first
+appear. A field named "player" or ending in "_player" takes a player index
+and renders as that player's name. Arguments are ints and strings only,
+and templates use bare {field} placeholders (no format specs), so clients
+render exactly the same text.
+
+The templates reach clients in the engine catalog, so text is produced
+only where a log is displayed; render_log does the same on the server
+(tests, self-play, tools). Plain strings are still accepted in a log and
+pass through unchanged, for messages that have no event code yet.
+"""
+
+from string import Formatter
+
+_field_orders = {}
+
+
+def log_event(code, *args):
+    """Build a log event."""
+    return [code, *args]
+
+
+def template_fields(template):
+    """Field names of a template, in order of first appearance."""
+    fields = _field_orders.get(template)
+    if fields is None:
+        fields = []
+        for _, name, _, _ in Formatter().parse(template):
+            if name is not None and name not in fields:
+                fields.append(name)
+        _field_orders[template] = fields
+    return fields
+
+
+def is_player_field(name):
+    return name == "player" or name.endswith("_player")
+
+
+def render_entry(entry, templates, player_names):
+    """Return one log entry (event or plain string) as text."""
+    if isinstance(entry, str):
+        return entry
+    code, *args = entry
+    template = templates.get(code)
+    if template is None:
+        raise ValueError(f"Unknown log event '{code}'")
+    values = {}
+    for name, arg in zip(template_fields(template), args):
+        values[name] = player_names[arg] if is_player_field(name) else arg
+    return template.format_map(values)
+
+
+def render_log(log, templates, player_names):
+    """Return a list of log entries as text."""
+    return [render_entry(entry, templates, player_names) for entry in log]
@@ -6,18 +6,87 @@ Build ascending expedition columns. Game ends when draw pile is empty.
 """
 
 from copy import deepcopy
+from server.action_space import ActionSpace
 from server.game_engine import GameEngine, ActionResult
+from server.log_events import log_event
+from server.snapshot import SnapshotCodec
+from server.rng import new_rng
+from server.views import Private, build_view, count, drop, top_and_count
 from server.lostcities.state import (
     EXPEDITIONS, EXPEDITION_NAMES, HAND_SIZE,
-    generate_deck, create_player, score_player, can_place_card,
+    all_cards, generate_deck, create_player, score_player, can_place_card,
+)
+
+
+# Card ids are stable ("red_w0", "red_7", …) and already name their
+# expedition, so play/discard are encoded by card id alone.
+CARD_IDS = [card["id"] for card in sorted(
+    all_cards(), key=lambda c: (EXPEDITIONS.index(c["expedition"]), c["id"]))]
+
+ACTION_SPACE = ActionSpace([
+    ("play", [("card_id", CARD_IDS)]),
+    ("discard", [("card_id", CARD_IDS)]),
+    ("draw", [], {"source": "draw_pile"}),
+    ("draw", [("expedition", EXPEDITIONS)], {"source": "discard"}),
+])
+
+
+REDACTIONS = [
+    Private(("draw_pile",), count, rename="draw_pile_count"),
+    # Discard piles show their top card only (plus count)
+    Private(("discard_piles", "*"), top_and_count),
+    Private(("players", "*", "hand"), count, owner="player_id"),
+    Private(("rng",), drop),
+]
+
+
+# ── Log events ───────────────────────────────────
+
+LOG_EVENTS = {
+    "play": "{player} plays {card} on {expedition}",
+    "discard": "{player} discards {card} to {expedition}",
+    "draw_pile": "{player} draws from the draw pile",
+    "draw_discard": "{player} draws from {expedition} discard",
+    "deck_empty": "Draw pile is empty — game over!",
+    "score": "{player}: {points} points",
+    "draw": "It's a draw!",
+    "win": "{player} wins!",
+}
+
+
+# ── Snapshots ────────────────────────────────────────
+
+SNAPSHOT_CODEC = SnapshotCodec(
+    "lostcities",
+    strings=[
+        *EXPEDITIONS,
+        "index", "player_id", "name", "hand", "expeditions",
+        "game", "player_ids", "player_count", "players", "draw_pile", "discard_piles",
+        "current_player", "phase", "last_discarded_expedition", "game_over", "winner",
+        "scoring", "rng", "seed", "draws",
+        "expedition_scores", "subtotal", "wager_count", "multiplier", "result", "bonus",
+        "total", "card_count",
+        "lostcities", "play", "draw",
+    ],
+    atoms=all_cards(),
 )
 
 
 class LostCitiesEngine(GameEngine):
     player_count_range = (2, 2)
-
-    def initial_state(self, player_ids, player_names):
-        deck = generate_deck()
+    action_space = ACTION_SPACE
+    log_events = LOG_EVENTS
+    snapshot_codec = SNAPSHOT_CODEC
+
+    def decode_action(self, state, index):
+        action = super().decode_action(state, index)
+        if action["kind"] in ("play", "discard"):
+            action["expedition"] = action["card_id"].rsplit("_", 1)[0]
+        return action
+
+    def initial_state(self, player_ids, player_names, seed=None):
+        rng = new_rng(seed)
+        deck = generate_deck(rng)
         players = []
         for i, (pid, name) in enumerate(zip(player_ids, player_names)):
             p = create_player(i, pid, name)
@@ -38,29 +107,14 @@ class LostCitiesEngine(GameEngine):
             "game_over": False,
             "winner": None,
             "scoring": None,
+            "rng": rng,
         }
 
     # ── Views ─────────────────────────────────────────────────────
 
     def get_player_view(self, state, player_id):
-        view = deepcopy(state)
+        view = build_view(state, REDACTIONS, player_id)
         view["your_player_id"] = player_id
-        view["draw_pile_count"] = len(state["draw_pile"])
-        del view["draw_pile"]
-
-        # Show discard pile top cards only (plus count)
-        for exp in EXPEDITIONS:
-            pile = view["discard_piles"][exp]
-            view["discard_piles"][exp] = {
-                "top": pile[-1] if pile else None,
-                "count": len(pile),
-            }
-
-        # Hide opponent's hand
-        for p in view["players"]:
-            if p["player_id"] != player_id:
-                p["hand"] = len(p["hand"])
-
         view["valid_actions"] = self.get_valid_actions(state, player_id)
         return view
 
@@ -89,47 +143,47 @@ class LostCitiesEngine(GameEngine):
     # ── Valid Actions ─────────────────────────────────────────────
 
     def get_valid_actions(self, state, player_id):
+        return list(self.iter_valid_actions(state, player_id))
+
+    def iter_valid_actions(self, state, player_id):
         if state["game_over"]:
-            return []
+            return
         idx = next((i for i, p in enumerate(state["players"])
                      if p["player_id"] == player_id), None)
         if idx is None or idx != state["current_player"]:
-            return []
+            return
 
         player = state["players"][idx]
-        actions = []
 
         if state["phase"] == "play":
             for card in player["hand"]:
                 # Option 1: play to expedition
                 if can_place_card(player["expeditions"][card["expedition"]], card):
-                    actions.append({
+                    yield {
                         "kind": "play",
                         "card_id": card["id"],
                         "expedition": card["expedition"],
-                    })
+                    }
                 # Option 2: discard
-                actions.append({
+                yield {
                     "kind": "discard",
                     "card_id": card["id"],
                     "expedition": card["expedition"],
-                })
+                }
 
         elif state["phase"] == "draw":
             # Draw from draw pile
             if state["draw_pile"]:
-                actions.append({"kind": "draw", "source": "draw_pile"})
+                yield {"kind": "draw", "source": "draw_pile"}
             # Draw from any non-empty discard pile (except last discarded)
             for exp in EXPEDITIONS:
                 if (state["discard_piles"][exp]
                         and exp != state.get("last_discarded_expedition")):
-                    actions.append({
+                    yield {
                         "kind": "draw",
                         "source": "discard",
                         "expedition": exp,
-                    })
-
-        return actions
+                    }
 
     # ── Apply Action ──────────────────────────────────────────────
 
@@ -169,7 +223,7 @@ class LostCitiesEngine(GameEngine):
         state["last_discarded_expedition"] = None
 
         card_label = "wager" if card["value"] == 0 else str(card["value"])
-        log = [f"{player['name']} plays {card_label} on {EXPEDITION_NAMES[exp]}"]
+        log = [log_event("play", idx, card_label, EXPEDITION_NAMES[exp])]
         return ActionResult(new_state=state, log=log)
 
     def _apply_discard(self, state, idx, action):
@@ -186,7 +240,7 @@ class LostCitiesEngine(GameEngine):
         state["last_discarded_expedition"] = exp
 
         card_label = "wager" if card["value"] == 0 else str(card["value"])
-        log = [f"{player['name']} discards {card_label} to {EXPEDITION_NAMES[exp]}"]
+        log = [log_event("discard", idx, card_label, EXPEDITION_NAMES[exp])]
         return ActionResult(new_state=state, log=log)
 
     def _apply_draw(self, state, idx, action):
@@ -202,7 +256,7 @@ class LostCitiesEngine(GameEngine):
                 raise ValueError("Draw pile is empty")
             card = state["draw_pile"].pop()
             player["hand"].append(card)
-            log.append(f"{player['name']} draws from the draw pile")
+            log.append(log_event("draw_pile", idx))
         elif source == "discard":
             exp = action.get("expedition")
             if not exp or exp not in EXPEDITIONS:
@@ -214,9 +268,7 @@ class LostCitiesEngine(GameEngine):
                 raise ValueError(f"No cards in {EXPEDITION_NAMES[exp]} discard")
             card = pile.pop()
             player["hand"].append(card)
-            log.append(
-                f"{player['name']} draws from {EXPEDITION_NAMES[exp]} discard"
-            )
+            log.append(log_event("draw_discard", idx, EXPEDITION_NAMES[exp]))
         else:
             raise ValueError(f"Invalid draw source: {source}")
 
@@ -232,15 +284,13 @@ class LostCitiesEngine(GameEngine):
                 state["winner"] = 1
             else:
                 state["winner"] = "draw"
-            log.append("Draw pile is empty — game over!")
-            for i, p in enumerate(state["players"]):
-                log.append(f"{p['name']}: {scores[i]['total']} points")
+            log.append(log_event("deck_empty"))
+            for i, score in enumerate(scores):
+                log.append(log_event("score", i, score["total"]))
             if state["winner"] == "draw":
-                log.append("It's a draw!")
+                log.append(log_event("draw"))
             else:
-                log.append(
-                    f"{state['players'][state['winner']]['name']} wins!"
-                )
+                log.append(log_event("win", state["winner"]))
         else:
             # Next player's turn
             state["current_player"] = 1 - state["current_player"]
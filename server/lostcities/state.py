@@ -7,7 +7,7 @@ Lost Cities – constants, card generation, and scoring helpers.
 = 60 cards total.  2 players, 8-card hands.
 """
 
-import random
+from server.rng import shuffle
 
 EXPEDITIONS = ["yellow", "blue", "white", "green", "red"]
 
@@ -33,8 +33,8 @@ BONUS_THRESHOLD = 8
 BONUS_POINTS = 20
 
 
-def generate_deck():
-    """Return a shuffled list of all 60 cards."""
+def all_cards():
+    """Return all 60 cards in a fixed order."""
     cards = []
     for exp in EXPEDITIONS:
         # 3 wager cards per expedition
@@ -43,7 +43,13 @@ def generate_deck():
         # expedition cards 2–10
         for v in range(2, 11):
             cards.append({"expedition": exp, "value": v, "id": f"{exp}_{v}"})
-    random.shuffle(cards)
+    return cards
+
+
+def generate_deck(rng):
+    """Return all 60 cards, shuffled from the rng stream."""
+    cards = all_cards()
+    shuffle(rng, cards)
     return cards
 
 
@@ -1,26 +1,96 @@
 """LYNGK game engine — GameEngine subclass."""
 
 from copy import deepcopy
+from itertools import product
 
+from server.action_space import ActionSpace
 from server.game_engine import GameEngine, ActionResult
+from server.log_events import log_event
+from server.snapshot import SnapshotCodec
+from server.rng import new_rng
 from server.lyngk.state import (
-    ACTIVE_COLORS, JOKER_COLOR, MAX_CLAIMS_PER_PLAYER,
+    ACTIVE_COLORS, ALL_PIECE_COLORS, JOKER_COLOR, MAX_CLAIMS_PER_PLAYER, MAX_STACK_HEIGHT,
     hex_key, parse_hex, generate_board, create_player,
-    setup_random, get_stack_top, find_valid_moves,
-    can_stack_on, can_move, is_moveable_by, is_complete_stack,
+    setup_random, get_stack_top, is_complete_stack,
+    MoveIndex, split_claims, codes_fit, code_can_move, code_moveable,
+)
+
+
+# ── Action space ─────────────────────────────────────
+
+_POSITIONS = list(generate_board())
+
+ACTION_SPACE = ActionSpace([
+    ("claim_color", [("color", ACTIVE_COLORS)]),
+    ("move", [("from", _POSITIONS), ("to", _POSITIONS)]),
+    ("pass", []),
+])
+
+
+# ── Log events ───────────────────────────────────
+
+LOG_EVENTS = {
+    "claim": "{player} claimed {color}!",
+    "move": "{player} moved from {from} to {to} (height {height}).",
+    "score_stack": "{player} completed a 5-stack with {color} on top! ({score} points)",
+    "dead_stack": "5-stack completed with neutral/opponent color on top — remains as obstacle.",
+    "pass": "{player} passed (no valid moves).",
+    "skipped": "{player} has no valid moves — skipped.",
+    "final_score": "Game over! {first_player}: {first_score} stacks, {second_player}: {second_score} stacks.",
+    "win": "{player} wins!",
+    "draw": "Draw!",
+}
+
+
+# ── Snapshots ────────────────────────────────────────
+
+def _stacks():
+    """Every stack a cell can hold, shortest first, so small stacks get one-byte indices."""
+    stacks = [[]]
+    for height in range(1, MAX_STACK_HEIGHT + 1):
+        for pieces in product(ALL_PIECE_COLORS, repeat=height):
+            colors = [c for c in pieces if c != JOKER_COLOR]
+            if len(set(colors)) == len(colors) and height - len(colors) <= 3:
+                stacks.append(list(pieces))
+    return stacks
+
+
+SNAPSHOT_CODEC = SnapshotCodec(
+    "lyngk",
+    version=2,
+    strings=[
+        *ALL_PIECE_COLORS, "white",
+        "game", "player_ids", "player_count", "players", "board", "claims", "scores",
+        "current_player", "phase", "game_over", "winner", "rng", "seed", "draws",
+        "index", "player_id", "name", "color",
+        "lyngk", "play",
+    ],
+    boards=[_POSITIONS],
+    cells=_stacks(),
+    shapes=[
+        ["game", "player_ids", "player_count", "players", "board", "claims", "scores",
+         "current_player", "phase", "game_over", "winner", "rng"],
+        ["index", "player_id", "name", "color"],
+        ["white", "black"],
+        ["seed", "draws"],
+    ],
 )
 
 
 class LyngkEngine(GameEngine):
     player_count_range = (2, 2)
+    action_space = ACTION_SPACE
+    log_events = LOG_EVENTS
+    snapshot_codec = SNAPSHOT_CODEC
 
-    def initial_state(self, player_ids, player_names):
+    def initial_state(self, player_ids, player_names, seed=None):
         players = [
             create_player(i, pid, name)
             for i, (pid, name) in enumerate(zip(player_ids, player_names))
         ]
         board = generate_board()
-        setup_random(board)
+        rng = new_rng(seed)
+        setup_random(board, rng)
 
         return {
             "game": "lyngk",
@@ -34,25 +104,29 @@ class LyngkEngine(GameEngine):
             "phase": "play",
             "game_over": False,
             "winner": None,
+            "rng": rng,
         }
 
     def get_player_view(self, state, player_id):
         view = deepcopy(state)
+        view.pop("rng", None)
         view["your_player_id"] = player_id
         view["valid_actions"] = self.get_valid_actions(state, player_id)
         return view
 
     def get_valid_actions(self, state, player_id):
+        return list(self.iter_valid_actions(state, player_id))
+
+    def iter_valid_actions(self, state, player_id):
         if state["game_over"]:
-            return []
+            return
         player_idx = self._player_index(state, player_id)
         if player_idx is None:
-            return []
+            return
         if player_idx != state["current_player"]:
-            return []
+            return
 
         player_color = state["players"][player_idx]["color"]
-        actions = []
 
         # Claim color actions (before move, max 2 per player)
         my_claims = state["claims"].get(player_color, [])
@@ -61,18 +135,17 @@ class LyngkEngine(GameEngine):
             opp_claims = state["claims"].get(opp_color, [])
             for color in ACTIVE_COLORS:
                 if color not in my_claims and color not in opp_claims:
-                    actions.append({"kind": "claim_color", "color": color})
+                    yield {"kind": "claim_color", "color": color}
 
         # Move actions
-        moves = find_valid_moves(state["board"], state["claims"], player_color)
-        for m in moves:
-            actions.append({"kind": "move", "from": m["from"], "to": m["to"]})
+        has_moves = False
+        for m in MoveIndex(state["board"]).iter_moves(state["claims"], player_color):
+            has_moves = True
+            yield {"kind": "move", "from": m["from"], "to": m["to"]}
 
         # Pass if no moves (but claims still possible)
-        if not moves:
-            actions.append({"kind": "pass"})
-
-        return actions
+        if not has_moves:
+            yield {"kind": "pass"}
 
     def apply_action(self, state, player_id, action):
         state = deepcopy(state)
@@ -130,7 +203,7 @@ class LyngkEngine(GameEngine):
 
         my_claims.append(color)
 
-        log = [f"{player['name']} claimed {color}!"]
+        log = [log_event("claim", player_idx, color)]
         # Claiming doesn't end the turn — player still needs to move
         return ActionResult(state, log=log)
 
@@ -156,21 +229,23 @@ class LyngkEngine(GameEngine):
         player = state["players"][player_idx]
         pc = player["color"]
 
-        if not is_moveable_by(from_stack, state["claims"], pc):
+        index = MoveIndex(board)
+        from_code, to_code = index.code(from_key), index.code(to_key)
+        mine, theirs = split_claims(state["claims"], pc)
+        if not code_moveable(from_code, mine, theirs):
             raise ValueError("Cannot move this piece/stack")
 
-        top = get_stack_top(from_stack)
-        if not can_stack_on(from_stack, to_stack):
+        if not codes_fit(from_code, to_code):
             raise ValueError("Invalid stacking — colors conflict or too tall")
-        if not can_move(from_stack, to_stack, top, state["claims"], pc):
+        if not code_can_move(from_code, to_code, mine):
             raise ValueError("Movement restricted for this piece type")
 
         # Execute move
         new_stack = to_stack + from_stack
-        board[to_key] = new_stack
-        board[from_key] = []
+        index.set_stack(to_key, new_stack)
+        index.set_stack(from_key, [])
 
-        log = [f"{player['name']} moved from {from_key} to {to_key} (height {len(new_stack)})."]
+        log = [log_event("move", player_idx, from_key, to_key, len(new_stack))]
 
         # Check for completed 5-stack
         if is_complete_stack(new_stack):
@@ -178,46 +253,43 @@ class LyngkEngine(GameEngine):
             # Is the top color claimed by current player?
             if stack_top in state["claims"].get(pc, []):
                 state["scores"][player_idx] += 1
-                board[to_key] = []  # Remove from board
-                log.append(f"{player['name']} completed a 5-stack with {stack_top} on top! ({state['scores'][player_idx]} points)")
+                index.set_stack(to_key, [])  # Remove from board
+                log.append(log_event("score_stack", player_idx, stack_top, state["scores"][player_idx]))
             else:
-                log.append(f"5-stack completed with neutral/opponent color on top — remains as obstacle.")
+                log.append(log_event("dead_stack"))
 
         # Check game end
-        return self._check_end_and_advance(state, player_idx, log)
+        return self._check_end_and_advance(state, player_idx, log, index)
 
     def _apply_pass(self, state, player_idx):
         player = state["players"][player_idx]
         pc = player["color"]
 
         # Verify no valid moves
-        moves = find_valid_moves(state["board"], state["claims"], pc)
-        if moves:
+        index = MoveIndex(state["board"])
+        if index.has_move(state["claims"], pc):
             raise ValueError("You have valid moves — cannot pass")
 
-        log = [f"{player['name']} passed (no valid moves)."]
-        return self._check_end_and_advance(state, player_idx, log)
+        log = [log_event("pass", player_idx)]
+        return self._check_end_and_advance(state, player_idx, log, index)
 
     # ── End detection ────────────────────────────────────
 
-    def _check_end_and_advance(self, state, player_idx, log):
+    def _check_end_and_advance(self, state, player_idx, log, index):
         # Advance turn
         state["current_player"] = 1 - state["current_player"]
         next_pc = state["players"][state["current_player"]]["color"]
 
         # Check if next player has moves
-        next_moves = find_valid_moves(state["board"], state["claims"], next_pc)
-        if not next_moves:
+        if not index.has_move(state["claims"], next_pc):
             # Check if original player also has no moves
             orig_pc = state["players"][player_idx]["color"]
-            orig_moves = find_valid_moves(state["board"], state["claims"], orig_pc)
-            if not orig_moves:
+            if not index.has_move(state["claims"], orig_pc):
                 return self._end_game(state, log)
             else:
                 # Skip back to original player
                 state["current_player"] = player_idx
-                next_name = state["players"][1 - player_idx]["name"]
-                log.append(f"{next_name} has no valid moves — skipped.")
+                log.append(log_event("skipped", 1 - player_idx))
 
         return ActionResult(state, log=log)
 
@@ -228,18 +300,18 @@ class LyngkEngine(GameEngine):
         s0, s1 = state["scores"]
         p0, p1 = state["players"]
 
-        log.append(f"Game over! {p0['name']}: {s0} stacks, {p1['name']}: {s1} stacks.")
+        log.append(log_event("final_score", 0, s0, 1, s1))
 
         if s0 > s1:
             state["winner"] = p0["player_id"]
-            log.append(f"{p0['name']} wins!")
+            log.append(log_event("win", 0))
         elif s1 > s0:
             state["winner"] = p1["player_id"]
-            log.append(f"{p1['name']} wins!")
+            log.append(log_event("win", 1))
         else:
             # Tiebreaker: count stack heights on board
             state["winner"] = None
-            log.append("Draw!")
+            log.append(log_event("draw"))
 
         return ActionResult(state, log=log, game_over=True)
 
@@ -1,6 +1,7 @@
 """LYNGK board geometry, stacking, movement, and scoring."""
 
-import random
+from server.hexgrid import AXIAL_DIRS, HexGrid, hex_key, parse_hex
+from server.rng import shuffle
 
 # ── Constants ─────────────────────────────────────────
 
@@ -14,8 +15,6 @@ TOTAL_ON_BOARD = PIECES_PER_COLOR * len(ACTIVE_COLORS) + JOKER_COUNT  # 43
 MAX_STACK_HEIGHT = 5
 MAX_CLAIMS_PER_PLAYER = 2
 
-AXIAL_DIRS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1)]
-
 # Color display info
 COLOR_STYLES = {
     "ivory": {"hex": "#f5e6c8", "ref": "TZAAR"},
@@ -29,15 +28,6 @@ COLOR_STYLES = {
 
 # ── Coordinate helpers ────────────────────────────────
 
-def hex_key(q, r):
-    return f"{q},{r}"
-
-
-def parse_hex(key):
-    parts = key.split(",")
-    return int(parts[0]), int(parts[1])
-
-
 def is_valid(q, r):
     """Board: |q| <= 3, |r| <= 4, |q+r| <= 3. 43 positions."""
     return abs(q) <= 3 and abs(r) <= 4 and abs(q + r) <= 3
@@ -60,21 +50,72 @@ def all_positions():
 
 
 ALL_POSITIONS = all_positions()
+GRID = HexGrid(ALL_POSITIONS)
 
 
-def setup_random(board):
-    """Place 43 pieces randomly: 8 of each active color + 3 jokers."""
+def setup_random(board, rng):
+    """Place 43 pieces randomly (from the rng stream): 8 of each active color + 3 jokers."""
     pieces = []
     for color in ACTIVE_COLORS:
         pieces.extend([color] * PIECES_PER_COLOR)
     pieces.extend([JOKER_COLOR] * JOKER_COUNT)
-    random.shuffle(pieces)
+    shuffle(rng, pieces)
 
     keys = list(board.keys())
     for i, key in enumerate(keys):
         board[key] = [pieces[i]]
 
 
+# ── Stack codes ───────────────────────────────────────
+# Move generation compares stacks pairwise, so it works on a compact code
+# per stack, (height, colors, top): colors has one bit per active color
+# in the stack (jokers add none, being wild), so two stacks can combine
+# when their heights fit and their color bits don't overlap.
+
+COLOR_BITS = {color: 1 << i for i, color in enumerate(ACTIVE_COLORS)}
+COLOR_BITS[JOKER_COLOR] = 0
+
+
+def encode_stack(stack):
+    """Return (height, color bitmask, top color) for a non-empty stack."""
+    colors = 0
+    for color in stack:
+        colors |= COLOR_BITS[color]
+    return len(stack), colors, stack[-1]
+
+
+def codes_fit(from_code, to_code):
+    """Can a stack be placed on another: combined height <= MAX_STACK_HEIGHT, no repeated color."""
+    return from_code[0] + to_code[0] <= MAX_STACK_HEIGHT and not from_code[1] & to_code[1]
+
+
+def code_can_move(from_code, to_code, my_claims):
+    """Movement restriction of can_move, on codes; my_claims is the mover's claimed colors."""
+    if from_code[2] in my_claims:
+        return True
+    if from_code[0] == 1:
+        return to_code[0] == 1
+    return to_code[0] <= from_code[0]
+
+
+def split_claims(player_claims, current_player_color):
+    """Return (colors claimed by current_player_color, colors claimed by anyone else) as sets."""
+    mine = set(player_claims.get(current_player_color, []))
+    theirs = set()
+    for player_color, claims in player_claims.items():
+        if player_color != current_player_color:
+            theirs.update(claims)
+    return mine, theirs
+
+
+def code_moveable(code, mine, theirs):
+    """is_moveable_by on a code, given split_claims."""
+    height, _, top = code
+    if top == JOKER_COLOR and height == 1:
+        return False
+    return top not in theirs or top in mine
+
+
 # ── Movement helpers ──────────────────────────────────
 
 def get_stack_top(stack):
@@ -91,31 +132,14 @@ def find_targets(board, from_key):
 
     Returns list of target keys.
     """
-    q, r = parse_hex(from_key)
     targets = []
 
-    for dq, dr in AXIAL_DIRS:
-        nq, nr = q + dq, r + dr
-
-        # Check adjacent first
-        if is_valid(nq, nr):
-            nk = hex_key(nq, nr)
-            if nk in board and len(board[nk]) > 0:
+    # The first occupied position along each direction, adjacent or not
+    for ray in GRID.key_rays[from_key]:
+        for nk in ray:
+            if board[nk]:
                 targets.append(nk)
-                continue
-            # Adjacent is empty — continue in this direction
-            elif nk in board:
-                nq += dq
-                nr += dr
-                while is_valid(nq, nr):
-                    nk = hex_key(nq, nr)
-                    if nk in board and len(board[nk]) > 0:
-                        targets.append(nk)
-                        break
-                    elif nk not in board:
-                        break
-                    nq += dq
-                    nr += dr
+                break
 
     return targets
 
@@ -127,45 +151,18 @@ def can_stack_on(from_stack, to_stack):
     - Combined height <= MAX_STACK_HEIGHT
     - All colors must be different (jokers are wildcards)
     """
-    if len(from_stack) + len(to_stack) > MAX_STACK_HEIGHT:
-        return False
-
-    # Check color uniqueness: non-joker colors must all be different
-    non_joker_colors = set()
-    for color in from_stack + to_stack:
-        if color != JOKER_COLOR:
-            if color in non_joker_colors:
-                return False
-            non_joker_colors.add(color)
-
-    return True
+    return codes_fit(encode_stack(from_stack), encode_stack(to_stack))
 
 
 def can_move(from_stack, to_stack, from_top, player_claims, current_player_color):
     """Check if a move from from_stack to to_stack is valid considering movement restrictions.
 
     - Single neutral piece → can only land on single pieces
-    - Stack with neutral top → can land on singles or equal/shorter stacks
+    - Stack with neutral top → can land on equal or shorter stacks
     - Claimed color on top → can land on any piece/stack (subject to stacking rules)
     """
-    from_top_color = from_top
-
-    # Determine if the top color is claimed by current player
-    is_claimed_by_me = from_top_color in player_claims.get(current_player_color, [])
-
-    if is_claimed_by_me:
-        # Claimed color on top — can land on anything (stacking rules apply separately)
-        return True
-
-    # Neutral or opponent's claimed color — restricted movement
-    from_height = len(from_stack)
-
-    if from_height == 1:
-        # Single neutral piece — can only land on single pieces
-        return len(to_stack) == 1
-    else:
-        # Stack with neutral top — can land on equal or shorter
-        return len(to_stack) <= from_height
+    my_claims = player_claims.get(current_player_color, [])
+    return code_can_move((len(from_stack), 0, from_top), (len(to_stack), 0, None), my_claims)
 
 
 def is_moveable_by(stack, player_claims, current_player_color):
@@ -178,20 +175,62 @@ def is_moveable_by(stack, player_claims, current_player_color):
     """
     if not stack:
         return False
+    return code_moveable(encode_stack(stack), *split_claims(player_claims, current_player_color))
 
-    top = stack[-1]
 
-    # Joker alone cannot be moved
-    if top == JOKER_COLOR and len(stack) == 1:
-        return False
+class MoveIndex:
+    """
+    Stack codes for a board, kept current as it changes within one action.
 
-    # Check if top color is claimed
-    for player_color, claims in player_claims.items():
-        if top in claims:
-            return player_color == current_player_color
+    A cell's code is worked out on first use and then cached, so the move
+    listing and end-of-turn checks of one action encode each stack once.
+    set_stack() updates the board and drops the cell's code.
+
+        index = MoveIndex(board)
+        index.iter_moves(claims, "white")     # same moves, same order as iter_valid_moves
+        index.set_stack(from_key, [])
+    """
+
+    __slots__ = ("board", "_codes")
+
+    def __init__(self, board):
+        self.board = board
+        self._codes = {}
+
+    def code(self, key):
+        """The code of the (non-empty) stack at key."""
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = encode_stack(self.board[key])
+        return code
+
+    def set_stack(self, key, stack):
+        self.board[key] = stack
+        self._codes.pop(key, None)
+
+    def iter_moves(self, player_claims, current_player_color):
+        """Lazily yield valid moves as {"from": key, "to": key}, in board order."""
+        mine, theirs = split_claims(player_claims, current_player_color)
+        board = self.board
+        code_of = self.code
+        for key, stack in board.items():
+            if not stack:
+                continue
+            code = code_of(key)
+            if not code_moveable(code, mine, theirs):
+                continue
+            for tk in find_targets(board, key):
+                to_code = code_of(tk)
+                if codes_fit(code, to_code) and code_can_move(code, to_code, mine):
+                    yield {"from": key, "to": tk}
+
+    def has_move(self, player_claims, current_player_color):
+        return next(self.iter_moves(player_claims, current_player_color), None) is not None
 
-    # Unclaimed / joker on stack → either player can move
-    return True
+
+def iter_valid_moves(board, player_claims, current_player_color):
+    """Lazily yield valid moves for the current player as {"from": key, "to": key}."""
+    return MoveIndex(board).iter_moves(player_claims, current_player_color)
 
 
 def find_valid_moves(board, player_claims, current_player_color):
@@ -199,26 +238,12 @@ def find_valid_moves(board, player_claims, current_player_color):
 
     Returns list of {"from": key, "to": key}.
     """
-    moves = []
-
-    for key, stack in board.items():
-        if not stack:
-            continue
-        if not is_moveable_by(stack, player_claims, current_player_color):
-            continue
-
-        top = get_stack_top(stack)
-        targets = find_targets(board, key)
+    return list(iter_valid_moves(board, player_claims, current_player_color))
 
-        for tk in targets:
-            to_stack = board[tk]
-            if not can_stack_on(stack, to_stack):
-                continue
-            if not can_move(stack, to_stack, top, player_claims, current_player_color):
-                continue
-            moves.append({"from": key, "to": tk})
 
-    return moves
+def has_valid_move(board, player_claims, current_player_color):
+    """Check whether the player has at least one move, stopping at the first."""
+    return MoveIndex(board).has_move(player_claims, current_player_color)
 
 
 def is_complete_stack(stack):
@@ -0,0 +1,247 @@
+"""
+Opt-in profiling for game engines.
+
+An EngineProfiler attaches to one engine instance (one room) and records
+call counts, cumulative and max wall time for the engine's public methods
+and for every module-level helper function in the game's package
+(server.<game>.*), such as can_claim_flag or find_capture_sequences.
+It can also run cProfile around engine calls and dump the stats to a file.
+
+Engine methods are wrapped on the profiled instance only. Helpers are
+module globals shared by every room of the game, so they are wrapped
+process-wide: while any room of a game is profiled, the other rooms of
+that game call its helpers through the wrappers too. A wrapper records
+only inside a profiled room's engine call; elsewhere it costs one extra
+Python call per helper call. Wrapping is counted per module and undone
+when the game's last profiler detaches, so with no profiler attached
+nothing is wrapped and no room pays anything.
+
+Switched on by:
+  BGE_PROFILE=all | yinsh,caylus   profile every new room (of those games)
+  BGE_PROFILE_INTERVAL=60          seconds between printed summaries
+  BGE_PROFILE_DIR=profiles         where cProfile dumps are written
+or per room with the admin-only "profile" message (see client/PROTOCOL.md).
+"""
+
+import cProfile
+import os
+import sys
+import time
+import types
+from pathlib import Path
+
+PUBLIC_METHODS = (
+    "initial_state", "get_player_view", "get_valid_actions", "apply_action",
+    "get_waiting_for", "get_phase_info", "get_spectator_view",
+)
+
+# The profiler whose engine call is running. Engine calls are synchronous,
+# so a plain global is enough to attribute helper calls to the right room.
+_current = None
+
+# module -> {name: original function}, and how many attached profilers
+# use each module's wrappers; the last one to detach restores the module
+_patched_modules = {}
+_patch_counts = {}
+
+
+def profiling_requested(game_name):
+    """True if BGE_PROFILE asks for new rooms of this game to be profiled."""
+    setting = os.environ.get("BGE_PROFILE", "").strip()
+    if not setting:
+        return False
+    if setting.lower() in ("1", "all", "true"):
+        return True
+    return game_name in {g.strip() for g in setting.split(",")}
+
+
+class _Stat:
+    __slots__ = ("calls", "total", "max", "depth")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.depth = 0
+
+
+class EngineProfiler:
+    """Collects timing for one engine instance. attach() to start, detach() to stop."""
+
+    def __init__(self, engine, label, summary_interval=None, out=print):
+        self.engine = engine
+        self.label = label
+        self.package = type(engine).__module__.rsplit(".", 1)[0]
+        if summary_interval is None:
+            summary_interval = float(os.environ.get("BGE_PROFILE_INTERVAL", "60"))
+        self.summary_interval = summary_interval
+        self.out = out
+        self.stats = {}
+        self.attached = False
+        self._modules = []
+        self._cprofile = None
+        self._last_summary = time.monotonic()
+
+    # ── Attaching ────────────────────────────────────────
+
+    def attach(self):
+        if self.attached:
+            return self
+        for name in PUBLIC_METHODS:
+            setattr(self.engine, name, self._wrap_method(name, getattr(self.engine, name)))
+        # Remember the modules counted here: the package may import more
+        # modules while attached, and detach must release exactly these
+        self._modules = self._package_modules()
+        for module in self._modules:
+            if _patch_counts.get(module.__name__, 0) == 0:
+                _patch_helpers(module, self.package)
+            _patch_counts[module.__name__] = _patch_counts.get(module.__name__, 0) + 1
+        self.attached = True
+        return self
+
+    def detach(self):
+        if not self.attached:
+            return self
+        for name in PUBLIC_METHODS:
+            self.engine.__dict__.pop(name, None)
+        for module in self._modules:
+            _patch_counts[module.__name__] -= 1
+            if _patch_counts[module.__name__] == 0:
+                del _patch_counts[module.__name__]
+                _restore_helpers(module)
+        self._modules = []
+        self.stop_cprofile()
+        self.attached = False
+        return self
+
+    def _package_modules(self):
+        prefix = self.package + "."
+        return [m for name, m in sorted(sys.modules.items())
+                if name.startswith(prefix) and isinstance(m, types.ModuleType)]
+
+    def _wrap_method(self, name, method):
+        profiler = self
+
+        def wrapper(*args, **kwargs):
+            global _current
+            outer, _current = _current, profiler
+            cprof = profiler._cprofile if outer is None else None
+            if cprof is not None:
+                cprof.enable()
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profiler.record(name, time.perf_counter() - start)
+                if cprof is not None:
+                    cprof.disable()
+                _current = outer
+                if outer is None:
+                    profiler._maybe_summarize()
+
+        wrapper.__name__ = name
+        return wrapper
+
+    # ── Recording ────────────────────────────────────────
+
+    def record(self, name, elapsed):
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self.stats[name] = _Stat()
+        stat.calls += 1
+        stat.total += elapsed
+        if elapsed > stat.max:
+            stat.max = elapsed
+
+    def _maybe_summarize(self):
+        if self.summary_interval <= 0:
+            return
+        now = time.monotonic()
+        if now - self._last_summary >= self.summary_interval:
+            self._last_summary = now
+            self.out(self.summary())
+
+    def summary(self, limit=25):
+        """Return a text table of the slowest entries by cumulative time."""
+        rows = sorted(self.stats.items(), key=lambda kv: kv[1].total, reverse=True)[:limit]
+        lines = [f"[profile {self.label}] {'name':<36} {'calls':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>9}"]
+        for name, s in rows:
+            lines.append(f"[profile {self.label}] {name:<36} {s.calls:>8} {s.total * 1000:>10.1f} "
+                         f"{s.total / s.calls * 1000:>9.3f} {s.max * 1000:>9.3f}")
+        return "\n".join(lines)
+
+    def as_dict(self):
+        return {name: {"calls": s.calls, "total_ms": s.total * 1000, "max_ms": s.max * 1000}
+                for name, s in self.stats.items()}
+
+    # ── cProfile ─────────────────────────────────────────
+
+    def start_cprofile(self):
+        if self._cprofile is None:
+            self._cprofile = cProfile.Profile()
+
+    def stop_cprofile(self):
+        self._cprofile = None
+
+    def dump_cprofile(self, directory=None):
+        """Write collected cProfile stats to a .prof file and return its path."""
+        if self._cprofile is None:
+            raise ValueError("cProfile is not running for this room")
+        directory = Path(directory or os.environ.get("BGE_PROFILE_DIR", "profiles"))
+        directory.mkdir(parents=True, exist_ok=True)
+        safe_label = "".join(c if c.isalnum() else "_" for c in self.label)
+        path = directory / f"{safe_label}_{time.strftime('%Y%m%d-%H%M%S')}.prof"
+        self._cprofile.dump_stats(path)
+        return str(path)
+
+
+# ── Helper patching ──────────────────────────────────────
+
+def _is_helper(value, package):
+    return isinstance(value, types.FunctionType) and (value.__module__ or "").startswith(package + ".")
+
+
+def _wrap_helper(fn):
+    name = fn.__name__
+
+    def wrapper(*args, **kwargs):
+        profiler = _current
+        if profiler is None:
+            return fn(*args, **kwargs)
+        stat = profiler.stats.get(name)
+        if stat is None:
+            stat = profiler.stats[name] = _Stat()
+        # Only the outermost call of a recursive helper adds to its time
+        stat.depth += 1
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stat.depth -= 1
+            elapsed = time.perf_counter() - start
+            stat.calls += 1
+            if stat.depth == 0:
+                stat.total += elapsed
+                if elapsed > stat.max:
+                    stat.max = elapsed
+
+    wrapper.__name__ = name
+    wrapper.__wrapped__ = fn
+    return wrapper
+
+
+def _patch_helpers(module, package):
+    originals = {}
+    wrapped = {}
+    for name, value in list(vars(module).items()):
+        if _is_helper(value, package):
+            originals[name] = value
+            if value not in wrapped:
+                wrapped[value] = _wrap_helper(value)
+            setattr(module, name, wrapped[value])
+    _patched_modules[module.__name__] = originals
+
+
+def _restore_helpers(module):
+    for name, value in _patched_modules.pop(module.__name__, {}).items():
+        setattr(module, name, value)
@@ -2,23 +2,74 @@
 
 from copy import deepcopy
 
+from server.action_space import ActionSpace
 from server.game_engine import GameEngine, ActionResult
+from server.log_events import log_event
+from server.snapshot import SnapshotCodec
 from server.punct.state import (
-    SHAPES, ROTATIONS, ALL_POSITIONS,
-    hex_key, parse_hex, is_valid, is_central,
-    compute_piece_cells, create_piece, get_piece_cells,
-    build_grid, get_top_piece_at, is_piece_blocked,
-    is_straight_line, is_bridge_placement,
+    SHAPES, ROTATIONS, ALL_POSITIONS, CENTRAL_POSITIONS, GRID,
+    parse_hex,
+    piece_cells, compute_piece_cells, create_piece, get_piece_cells,
+    Occupancy, is_straight_line,
     check_connection, count_central_dots,
     generate_reserve, get_piece_shape_from_id, get_piece_color_from_id,
     create_player,
 )
 
 
+# ── Action space ─────────────────────────────────────
+
+_POSITIONS = sorted(ALL_POSITIONS, key=parse_hex)
+_PIECE_IDS = generate_reserve("white") + generate_reserve("black")
+_ROTATION_IDXS = list(range(max(len(r) for r in ROTATIONS.values())))
+
+ACTION_SPACE = ActionSpace([
+    ("set_mode", [("mode", ["basic", "standard"])]),
+    ("place", [("piece_id", _PIECE_IDS), ("punct_pos", _POSITIONS), ("rotation_idx", _ROTATION_IDXS)]),
+    ("move", [("piece_id", _PIECE_IDS), ("new_punct_pos", _POSITIONS), ("rotation_idx", _ROTATION_IDXS)]),
+    ("jump", [("piece_id", _PIECE_IDS), ("new_punct_pos", _POSITIONS), ("rotation_idx", _ROTATION_IDXS)]),
+])
+
+
+# ── Log events ───────────────────────────────────
+
+LOG_EVENTS = {
+    "mode_basic": "Game mode: Basic. White begins!",
+    "mode_standard": "Game mode: Standard. White begins!",
+    "place": "{player} placed {shape} piece at {position}.",
+    "move": "{player} moved {shape} piece to {position}.",
+    "jump": "{player} jumped {shape} piece to {position} (level {level}).",
+    "connected": "{player} connected opposite sides and wins!",
+    "central_count": "All pieces placed! Central hex — White: {white}, Black: {black}",
+    "central_win": "{player} wins by central control!",
+    "draw": "Draw!",
+    "no_connection": "All pieces placed with no connection — game is a draw!",
+}
+
+
+# ── Snapshots ────────────────────────────────────────
+
+SNAPSHOT_CODEC = SnapshotCodec(
+    "punct",
+    strings=[
+        "id", "color", "shape", "punct_pos", "minor_positions", "level", "white", "black",
+        *SHAPES,
+        "game", "player_ids", "player_count", "players", "pieces", "reserve", "current_player",
+        "mode", "phase", "sub_phase", "is_first_move", "game_over", "winner",
+        "index", "player_id", "name",
+        "punct", "basic", "standard", "config", "play",
+        *_PIECE_IDS, *_POSITIONS,
+    ],
+)
+
+
 class PunctEngine(GameEngine):
     player_count_range = (2, 2)
+    action_space = ACTION_SPACE
+    log_events = LOG_EVENTS
+    snapshot_codec = SNAPSHOT_CODEC
 
-    def initial_state(self, player_ids, player_names):
+    def initial_state(self, player_ids, player_names, seed=None):
         players = [
             create_player(i, pid, name)
             for i, (pid, name) in enumerate(zip(player_ids, player_names))
@@ -49,17 +100,19 @@ class PunctEngine(GameEngine):
         return view
 
     def get_valid_actions(self, state, player_id):
+        return list(self.iter_valid_actions(state, player_id))
+
+    def iter_valid_actions(self, state, player_id):
         if state["game_over"]:
-            return []
+            return
         player_idx = self._player_index(state, player_id)
         if player_idx is None:
-            return []
+            return
 
         if state["phase"] == "config":
-            return self._valid_config_actions(state, player_idx)
+            yield from self._iter_config_actions(state, player_idx)
         elif state["phase"] == "play":
-            return self._valid_play_actions(state, player_idx)
-        return []
+            yield from self._iter_play_actions(state, player_idx)
 
     def apply_action(self, state, player_id, action):
         state = deepcopy(state)
@@ -111,13 +164,11 @@ class PunctEngine(GameEngine):
 
     # ── Config ───────────────────────────────────────────
 
-    def _valid_config_actions(self, state, player_idx):
+    def _iter_config_actions(self, state, player_idx):
         if player_idx != 0:
-            return []
-        return [
-            {"kind": "set_mode", "mode": "basic"},
-            {"kind": "set_mode", "mode": "standard"},
-        ]
+            return
+        yield {"kind": "set_mode", "mode": "basic"}
+        yield {"kind": "set_mode", "mode": "standard"}
 
     def _apply_set_mode(self, state, player_idx, action):
         if state["phase"] != "config" or player_idx != 0:
@@ -132,34 +183,35 @@ class PunctEngine(GameEngine):
         state["current_player"] = 0
         state["is_first_move"] = True
 
-        log = [f"Game mode: {'Basic' if mode == 'basic' else 'Standard'}. White begins!"]
+        log = [log_event(f"mode_{mode}")]
         return ActionResult(state, log=log)
 
     # ── Valid actions ────────────────────────────────────
 
-    def _valid_play_actions(self, state, player_idx):
+    def _iter_play_actions(self, state, player_idx):
         if player_idx != state["current_player"]:
-            return []
+            return
 
         color = state["players"][player_idx]["color"]
-        actions = []
+        occupancy = Occupancy(state["pieces"])
 
         # 1) Place from reserve
         reserve = state["reserve"].get(color, [])
         if reserve:
-            actions.extend(self._valid_placements(state, color, reserve))
+            yield from self._iter_placements(state, color, reserve, occupancy)
 
         # 2) Move pieces on board
-        actions.extend(self._valid_moves(state, color))
+        yield from self._iter_moves(state, color, occupancy)
 
         # 3) Jump (stack) pieces
-        actions.extend(self._valid_jumps(state, color))
+        yield from self._iter_jumps(state, color, occupancy)
 
-        return actions
-
-    def _valid_placements(self, state, color, reserve):
+    def _iter_placements(self, state, color, reserve, occupancy):
         """Generate all valid place actions."""
-        actions = []
+        grid = occupancy.grid
+        # First move, and standard mode: no cells in central hexagon
+        avoid_center = state["is_first_move"] or state["mode"] == "standard"
+
         # Group reserve by shape to avoid duplicate rotations for same shape
         seen_shapes = set()
         for pid in reserve:
@@ -171,172 +223,99 @@ class PunctEngine(GameEngine):
             rotations = ROTATIONS[shape]
             for rot_idx in range(len(rotations)):
                 for key in ALL_POSITIONS:
-                    q, r = parse_hex(key)
-                    cells = compute_piece_cells(q, r, shape, rot_idx)
+                    cells = piece_cells(key, shape, rot_idx)
                     if cells is None:
                         continue
 
                     # All cells must be empty
-                    if any(state["pieces"].get(c) is not None for c in cells):
-                        # Check grid instead
-                        grid = build_grid(state["pieces"])
-                        if any(c in grid and grid[c] for c in cells):
-                            continue
-
-                    # Check grid for occupied cells
-                    grid = build_grid(state["pieces"])
-                    occupied = False
-                    for c in cells:
-                        if c in grid and grid[c]:
-                            occupied = True
-                            break
-                    if occupied:
+                    if any(c in grid for c in cells):
                         continue
 
-                    # First move: no cells in central hexagon
-                    if state["is_first_move"]:
-                        if any(is_central(*parse_hex(c)) for c in cells):
-                            continue
-
-                    # Standard mode: new pieces cannot be placed in central hex
-                    if state["mode"] == "standard":
-                        if any(is_central(*parse_hex(c)) for c in cells):
-                            continue
-
-                    # Find the actual piece_id to use
-                    actual_pid = None
-                    for rpid in reserve:
-                        if get_piece_shape_from_id(rpid) == shape:
-                            actual_pid = rpid
-                            break
-
-                    if actual_pid:
-                        actions.append({
-                            "kind": "place",
-                            "piece_id": actual_pid,
-                            "punct_pos": key,
-                            "rotation_idx": rot_idx,
-                        })
+                    if avoid_center and any(c in CENTRAL_POSITIONS for c in cells):
+                        continue
 
-        return actions
+                    yield {
+                        "kind": "place",
+                        "piece_id": pid,   # the first reserve piece of this shape
+                        "punct_pos": key,
+                        "rotation_idx": rot_idx,
+                    }
 
-    def _valid_moves(self, state, color):
+    def _iter_moves(self, state, color, occupancy):
         """Generate valid move actions (board-level moves)."""
-        actions = []
-        grid = build_grid(state["pieces"])
+        grid = occupancy.grid
 
         for pid, piece in state["pieces"].items():
             if piece["color"] != color:
                 continue
             if piece["level"] != 1:
                 continue  # Only ground-level pieces can "move" (not jump)
-            if is_piece_blocked(state["pieces"], pid):
+            if occupancy.covered[pid]:
                 continue
 
-            pq, pr = parse_hex(piece["punct_pos"])
             shape = piece["shape"]
+            # Our piece is moving away from its own cells
+            own_cells = set(get_piece_cells(piece))
 
             # PUNCT moves in straight line to any empty position
-            for dq, dr in [(1,0),(-1,0),(0,1),(0,-1),(1,-1),(-1,1)]:
-                nq, nr = pq + dq, pr + dr
-                while is_valid(nq, nr):
+            for ray in GRID.key_rays[piece["punct_pos"]]:
+                for nk in ray:
                     # Check if we can place piece here with some rotation
                     for rot_idx in range(len(ROTATIONS[shape])):
-                        cells = compute_piece_cells(nq, nr, shape, rot_idx)
+                        cells = piece_cells(nk, shape, rot_idx)
                         if cells is None:
                             continue
 
                         # All cells must be empty (ignoring our own piece's current cells)
-                        own_cells = set(get_piece_cells(piece))
-                        valid = True
-                        for c in cells:
-                            if c in own_cells:
-                                continue  # our piece is moving away from here
-                            if c in grid and grid[c]:
-                                # Check if it's only our piece
-                                occupants = [(p, l) for p, l in grid[c] if p != pid]
-                                if occupants:
-                                    valid = False
-                                    break
-
-                        if valid:
-                            actions.append({
+                        if all(c in own_cells or c not in grid for c in cells):
+                            yield {
                                 "kind": "move",
                                 "piece_id": pid,
-                                "new_punct_pos": hex_key(nq, nr),
+                                "new_punct_pos": nk,
                                 "rotation_idx": rot_idx,
-                            })
+                            }
 
-                    nq += dq
-                    nr += dr
-
-        return actions
-
-    def _valid_jumps(self, state, color):
+    def _iter_jumps(self, state, color, occupancy):
         """Generate valid jump (stacking) actions."""
-        actions = []
-        grid = build_grid(state["pieces"])
+        pieces = state["pieces"]
 
-        for pid, piece in state["pieces"].items():
+        for pid, piece in pieces.items():
             if piece["color"] != color:
                 continue
-            if is_piece_blocked(state["pieces"], pid):
+            if occupancy.covered[pid]:
                 continue
 
-            pq, pr = parse_hex(piece["punct_pos"])
             shape = piece["shape"]
 
             # PUNCT moves in straight line, must land on own piece
-            for dq, dr in [(1,0),(-1,0),(0,1),(0,-1),(1,-1),(-1,1)]:
-                nq, nr = pq + dq, pr + dr
-                while is_valid(nq, nr):
-                    nk = hex_key(nq, nr)
+            for ray in GRID.key_rays[piece["punct_pos"]]:
+                for nk in ray:
                     # PUNCT must land on own piece
-                    top_at_punct = get_top_piece_at(grid, state["pieces"], nk)
-                    if top_at_punct and state["pieces"][top_at_punct]["color"] == color and top_at_punct != pid:
-                        target_level = state["pieces"][top_at_punct]["level"]
-                        new_level = target_level + 1
+                    top_at_punct = occupancy.top(nk)
+                    if top_at_punct and pieces[top_at_punct]["color"] == color and top_at_punct != pid:
+                        target_level = pieces[top_at_punct]["level"]
 
                         for rot_idx in range(len(ROTATIONS[shape])):
-                            cells = compute_piece_cells(nq, nr, shape, rot_idx)
+                            cells = piece_cells(nk, shape, rot_idx)
                             if cells is None:
                                 continue
 
-                            # Validate: PUNCT on own piece, minor dots on any piece or bridge
-                            own_cells = set(get_piece_cells(piece))
+                            # Minor dots: must land on some piece at the PUNCT's
+                            # level, or be unsupported (a bridge)
                             valid = True
-
-                            for ci, c in enumerate(cells):
-                                if c in own_cells and c != nk:
-                                    pass  # moving away from this cell
-                                if ci == 0:
-                                    # PUNCT - already validated on own piece above
-                                    continue
-                                # Minor dots: must land on some piece at appropriate level
-                                # or form a bridge
-                                top = get_top_piece_at(grid, state["pieces"], c)
-                                if top and top != pid:
-                                    top_level = state["pieces"][top]["level"]
-                                    if top_level != target_level:
-                                        valid = False  # not at same level
-                                        break
-                                elif not top or top == pid:
-                                    # Unsupported — only valid if bridging
-                                    # For now, allow and check bridge separately
-                                    pass
+                            for c in cells[1:]:
+                                top = occupancy.top(c)
+                                if top and top != pid and pieces[top]["level"] != target_level:
+                                    valid = False  # not at same level
+                                    break
 
                             if valid:
-                                actions.append({
+                                yield {
                                     "kind": "jump",
                                     "piece_id": pid,
-                                    "new_punct_pos": hex_key(nq, nr),
+                                    "new_punct_pos": nk,
                                     "rotation_idx": rot_idx,
-                                })
-
-                    nq += dq
-                    nr += dr
-
-        return actions
+                                }
 
     # ── Apply actions ────────────────────────────────────
 
@@ -361,27 +340,27 @@ class PunctEngine(GameEngine):
             raise ValueError("Invalid placement — cells off board")
 
         # Validate empty
-        grid = build_grid(state["pieces"])
+        occupancy = Occupancy(state["pieces"])
         for c in cells:
-            if c in grid and grid[c]:
+            if not occupancy.is_empty(c):
                 raise ValueError("Cells not empty")
 
         # First move / standard mode: no central hex
         if state["is_first_move"] or state["mode"] == "standard":
-            if any(is_central(*parse_hex(c)) for c in cells):
+            if any(c in CENTRAL_POSITIONS for c in cells):
                 raise ValueError("Cannot place in central hexagon")
 
         # Place the piece
         piece = create_piece(pid, color, shape, cells[0], [cells[1], cells[2]], level=1)
         state["pieces"][pid] = piece
+        occupancy.add(pid)
         reserve.remove(pid)
 
         state["is_first_move"] = False
 
-        player_name = state["players"][player_idx]["name"]
-        log = [f"{player_name} placed {shape} piece at {punct_pos}."]
+        log = [log_event("place", player_idx, shape, punct_pos)]
 
-        return self._check_win_and_advance(state, player_idx, log)
+        return self._check_win_and_advance(state, player_idx, log, occupancy)
 
     def _apply_move(self, state, player_idx, action):
         if state["phase"] != "play" or player_idx != state["current_player"]:
@@ -396,10 +375,11 @@ class PunctEngine(GameEngine):
 
         piece = state["pieces"][pid]
         color = state["players"][player_idx]["color"]
+        occupancy = Occupancy(state["pieces"])
 
         if piece["color"] != color:
             raise ValueError("Not your piece")
-        if is_piece_blocked(state["pieces"], pid):
+        if occupancy.covered[pid]:
             raise ValueError("Piece is blocked")
 
         # Validate straight line
@@ -414,24 +394,21 @@ class PunctEngine(GameEngine):
         if cells is None:
             raise ValueError("Invalid position — cells off board")
 
-        # Remove piece temporarily, check cells are empty
-        old_cells = set(get_piece_cells(piece))
-        del state["pieces"][pid]
-        grid = build_grid(state["pieces"])
-
+        # Lift the piece, check cells are empty
+        occupancy.remove(pid)
         for c in cells:
-            if c in grid and grid[c]:
-                state["pieces"][pid] = piece  # restore
+            if not occupancy.is_empty(c):
                 raise ValueError("Destination cells occupied")
 
         # Place at new position
+        del state["pieces"][pid]
         new_piece = create_piece(pid, color, shape, cells[0], [cells[1], cells[2]], level=1)
         state["pieces"][pid] = new_piece
+        occupancy.add(pid)
 
-        player_name = state["players"][player_idx]["name"]
-        log = [f"{player_name} moved {shape} piece to {new_punct}."]
+        log = [log_event("move", player_idx, shape, new_punct)]
 
-        return self._check_win_and_advance(state, player_idx, log)
+        return self._check_win_and_advance(state, player_idx, log, occupancy)
 
     def _apply_jump(self, state, player_idx, action):
         if state["phase"] != "play" or player_idx != state["current_player"]:
@@ -446,10 +423,11 @@ class PunctEngine(GameEngine):
 
         piece = state["pieces"][pid]
         color = state["players"][player_idx]["color"]
+        occupancy = Occupancy(state["pieces"])
 
         if piece["color"] != color:
             raise ValueError("Not your piece")
-        if is_piece_blocked(state["pieces"], pid):
+        if occupancy.covered[pid]:
             raise ValueError("Piece is blocked")
 
         # Validate straight line
@@ -465,37 +443,36 @@ class PunctEngine(GameEngine):
             raise ValueError("Invalid position — cells off board")
 
         # PUNCT must land on own piece
-        # Temporarily remove this piece to check what's beneath
-        del state["pieces"][pid]
-        grid = build_grid(state["pieces"])
+        # Lift this piece to check what's beneath
+        occupancy.remove(pid)
 
-        punct_top = get_top_piece_at(grid, state["pieces"], cells[0])
+        punct_top = occupancy.top(cells[0])
         if not punct_top or state["pieces"][punct_top]["color"] != color:
-            state["pieces"][pid] = piece  # restore
             raise ValueError("PUNCT must land on your own piece")
 
         target_level = state["pieces"][punct_top]["level"]
         new_level = target_level + 1
 
-        # Restore and create new piece at higher level
+        # Put it back at its new, higher position
+        del state["pieces"][pid]
         new_piece = create_piece(pid, color, shape, cells[0], [cells[1], cells[2]], level=new_level)
         state["pieces"][pid] = new_piece
+        occupancy.add(pid)
 
-        player_name = state["players"][player_idx]["name"]
-        log = [f"{player_name} jumped {shape} piece to {new_punct} (level {new_level})."]
+        log = [log_event("jump", player_idx, shape, new_punct, new_level)]
 
-        return self._check_win_and_advance(state, player_idx, log)
+        return self._check_win_and_advance(state, player_idx, log, occupancy)
 
     # ── Win check & turn advance ─────────────────────────
 
-    def _check_win_and_advance(self, state, player_idx, log):
+    def _check_win_and_advance(self, state, player_idx, log, occupancy):
         # Check connection for both players
         for idx, player in enumerate(state["players"]):
-            if check_connection(state["pieces"], player["color"]):
+            if check_connection(state["pieces"], player["color"], occupancy.grid):
                 state["game_over"] = True
                 state["phase"] = "game_over"
                 state["winner"] = player["player_id"]
-                log.append(f"{player['name']} connected opposite sides and wins!")
+                log.append(log_event("connected", idx))
                 return ActionResult(state, log=log, game_over=True)
 
         # Check if all pieces placed (standard mode tiebreaker)
@@ -505,32 +482,32 @@ class PunctEngine(GameEngine):
         if white_reserve == 0 and black_reserve == 0:
             if state["mode"] == "standard":
                 # Count central hexagon dots
-                w_central = count_central_dots(state["pieces"], "white")
-                b_central = count_central_dots(state["pieces"], "black")
-                log.append(f"All pieces placed! Central hex — White: {w_central}, Black: {b_central}")
+                w_central = count_central_dots(state["pieces"], "white", occupancy.grid)
+                b_central = count_central_dots(state["pieces"], "black", occupancy.grid)
+                log.append(log_event("central_count", w_central, b_central))
 
                 if w_central > b_central:
                     state["game_over"] = True
                     state["phase"] = "game_over"
                     state["winner"] = state["players"][0]["player_id"]
-                    log.append(f"{state['players'][0]['name']} wins by central control!")
+                    log.append(log_event("central_win", 0))
                 elif b_central > w_central:
                     state["game_over"] = True
                     state["phase"] = "game_over"
                     state["winner"] = state["players"][1]["player_id"]
-                    log.append(f"{state['players'][1]['name']} wins by central control!")
+                    log.append(log_event("central_win", 1))
                 else:
                     state["game_over"] = True
                     state["phase"] = "game_over"
                     state["winner"] = None
-                    log.append("Draw!")
+                    log.append(log_event("draw"))
                 return ActionResult(state, log=log, game_over=True)
             else:
                 # Basic mode: game ends undecided if no connection
                 state["game_over"] = True
                 state["phase"] = "game_over"
                 state["winner"] = None
-                log.append("All pieces placed with no connection — game is a draw!")
+                log.append(log_event("no_connection"))
                 return ActionResult(state, log=log, game_over=True)
 
         # Advance turn
@@ -1,10 +1,11 @@
 """PUNCT board geometry, piece shapes, rotation, stacking, bridging, connection detection."""
 
+from server.hexgrid import AXIAL_DIRS, DIR_INDEX, HexGrid, hex_distance, hex_key, parse_hex
+
 # ── Constants ─────────────────────────────────────────
 
 BOARD_RADIUS = 8
 CENTRAL_RADIUS = 2
-AXIAL_DIRS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1)]
 
 _EXCLUDED_CORNERS = {(8, 0), (-8, 0), (0, 8), (0, -8), (8, -8), (-8, 8)}
 
@@ -48,19 +49,6 @@ ROTATIONS = {
 
 # ── Coordinate helpers ────────────────────────────────
 
-def hex_key(q, r):
-    return f"{q},{r}"
-
-
-def parse_hex(key):
-    parts = key.split(",")
-    return int(parts[0]), int(parts[1])
-
-
-def hex_distance(q, r):
-    return max(abs(q), abs(r), abs(q + r))
-
-
 def is_valid(q, r):
     """On the 211-space board."""
     if hex_distance(q, r) > BOARD_RADIUS:
@@ -86,6 +74,8 @@ def generate_positions():
 
 
 ALL_POSITIONS = generate_positions()
+GRID = HexGrid(sorted(map(parse_hex, ALL_POSITIONS)))
+CENTRAL_POSITIONS = frozenset(key for key in ALL_POSITIONS if is_central(*parse_hex(key)))
 
 
 # ── Board sides (for connection) ─────────────────────
@@ -145,26 +135,37 @@ SIDE_PAIRS = _compute_sides()
 
 # ── Piece helpers ─────────────────────────────────────
 
-def compute_piece_cells(punct_q, punct_r, shape, rotation_idx):
-    """Compute the 3 cell positions for a piece.
-    Returns (punct_key, minor1_key, minor2_key) or None if any cell off-board.
-    """
-    rotations = ROTATIONS[shape]
-    if rotation_idx < 0 or rotation_idx >= len(rotations):
-        return None
+def _piece_cell_table():
+    """{shape: [{punct_key: cells or None} per rotation]} for every position."""
+    table = {}
+    for shape, rotations in ROTATIONS.items():
+        table[shape] = []
+        for d1, d2 in rotations:
+            i1, i2 = DIR_INDEX[d1], DIR_INDEX[d2]
+            by_key = {}
+            for key, steps in GRID.key_steps.items():
+                m1k, m2k = steps[i1], steps[i2]
+                by_key[key] = None if m1k is None or m2k is None else (key, m1k, m2k)
+            table[shape].append(by_key)
+    return table
 
-    d1, d2 = rotations[rotation_idx]
-    m1q, m1r = punct_q + d1[0], punct_r + d1[1]
-    m2q, m2r = punct_q + d2[0], punct_r + d2[1]
 
-    pk = hex_key(punct_q, punct_r)
-    m1k = hex_key(m1q, m1r)
-    m2k = hex_key(m2q, m2r)
+_PIECE_CELLS = _piece_cell_table()
 
-    if pk not in ALL_POSITIONS or m1k not in ALL_POSITIONS or m2k not in ALL_POSITIONS:
+
+def piece_cells(punct_key, shape, rotation_idx):
+    """Return (punct_key, minor1_key, minor2_key), or None if any cell is off-board."""
+    rotations = _PIECE_CELLS[shape]
+    if rotation_idx < 0 or rotation_idx >= len(rotations):
         return None
+    return rotations[rotation_idx].get(punct_key)
 
-    return (pk, m1k, m2k)
+
+def compute_piece_cells(punct_q, punct_r, shape, rotation_idx):
+    """Compute the 3 cell positions for a piece.
+    Returns (punct_key, minor1_key, minor2_key) or None if any cell off-board.
+    """
+    return piece_cells(hex_key(punct_q, punct_r), shape, rotation_idx)
 
 
 def create_piece(piece_id, color, shape, punct_key, minor_keys, level=1):
@@ -209,9 +210,11 @@ def get_top_piece_at(grid, pieces, cell_key):
     return grid[cell_key][-1][0]  # highest level
 
 
-def get_visible_dots(pieces):
-    """Return dict of {cell_key: color} for all dots visible from above."""
-    grid = build_grid(pieces)
+def get_visible_dots(pieces, grid=None):
+    """Return dict of {cell_key: color} for all dots visible from above.
+    grid, if given, is pieces' build_grid (or an Occupancy's)."""
+    if grid is None:
+        grid = build_grid(pieces)
     visible = {}
     for cell_key, entries in grid.items():
         if entries:
@@ -233,6 +236,77 @@ def is_piece_blocked(pieces, piece_id):
     return False
 
 
+class Occupancy:
+    """
+    build_grid's cell -> [(piece_id, level), ...] index plus a covered
+    flag per piece (is_piece_blocked), kept current as pieces come and go.
+
+    Action generation and validation read one Occupancy instead of
+    rebuilding the grid per candidate or per piece; add() and remove()
+    update the grid and the flags of the pieces under the cells they
+    touch:
+
+        occupancy = Occupancy(state["pieces"])
+        occupancy.remove(pid)                  # before changing pieces[pid]
+        state["pieces"][pid] = new_piece
+        occupancy.add(pid)
+    """
+
+    __slots__ = ("pieces", "grid", "covered")
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.grid = build_grid(pieces)
+        self.covered = {pid: False for pid in pieces}
+        for entries in self.grid.values():
+            top_level = entries[-1][1]
+            for pid, level in entries:
+                if level < top_level:
+                    self.covered[pid] = True
+
+    def is_empty(self, cell_key):
+        return not self.grid.get(cell_key)
+
+    def top(self, cell_key):
+        """The piece_id on top at a cell, or None (get_top_piece_at)."""
+        entries = self.grid.get(cell_key)
+        return entries[-1][0] if entries else None
+
+    def add(self, piece_id):
+        """Index pieces[piece_id], which has just been put on the board."""
+        level = self.pieces[piece_id]["level"]
+        for cell_key in get_piece_cells(self.pieces[piece_id]):
+            entries = self.grid.setdefault(cell_key, [])
+            # After any equal levels, as build_grid's stable sort would
+            at = len(entries)
+            while at and entries[at - 1][1] > level:
+                at -= 1
+            entries.insert(at, (piece_id, level))
+            for pid, below in entries:
+                if below < level:
+                    self.covered[pid] = True
+        self.covered[piece_id] = any(
+            self.grid[cell_key][-1][1] > level for cell_key in get_piece_cells(self.pieces[piece_id])
+        )
+
+    def remove(self, piece_id):
+        """Drop pieces[piece_id] from the index; call before changing or deleting it."""
+        uncovered = set()
+        for cell_key in get_piece_cells(self.pieces[piece_id]):
+            entries = [entry for entry in self.grid[cell_key] if entry[0] != piece_id]
+            if entries:
+                self.grid[cell_key] = entries
+                uncovered.update(pid for pid, _ in entries)
+            else:
+                del self.grid[cell_key]
+        del self.covered[piece_id]
+        for pid in uncovered:
+            level = self.pieces[pid]["level"]
+            self.covered[pid] = any(
+                self.grid[cell_key][-1][1] > level for cell_key in get_piece_cells(self.pieces[pid])
+            )
+
+
 # ── Movement validation ──────────────────────────────
 
 def is_straight_line(q1, r1, q2, r2):
@@ -301,11 +375,11 @@ def is_bridge_placement(shape, cells, pieces, grid):
 
 # ── Connection detection ─────────────────────────────
 
-def check_connection(pieces, color):
+def check_connection(pieces, color, grid=None):
     """Check if 'color' has connected any pair of opposite sides.
     Returns True if visible dots form a path between opposite sides.
     """
-    visible = get_visible_dots(pieces)
+    visible = get_visible_dots(pieces, grid)
 
     # Get all cells with visible dots of this color
     color_cells = {key for key, c in visible.items() if c == color}
@@ -325,9 +399,7 @@ def check_connection(pieces, color):
             current = queue.pop(0)
             if current in side_b:
                 return True
-            cq, cr = parse_hex(current)
-            for dq, dr in AXIAL_DIRS:
-                nk = hex_key(cq + dq, cr + dr)
+            for nk in GRID.key_neighbors[current]:
                 if nk in color_cells and nk not in visited:
                     visited.add(nk)
                     queue.append(nk)
@@ -335,15 +407,13 @@ def check_connection(pieces, color):
     return False
 
 
-def count_central_dots(pieces, color):
+def count_central_dots(pieces, color, grid=None):
     """Count visible dots of 'color' in the central hexagon."""
-    visible = get_visible_dots(pieces)
+    visible = get_visible_dots(pieces, grid)
     count = 0
     for key, c in visible.items():
-        if c == color:
-            q, r = parse_hex(key)
-            if is_central(q, r):
-                count += 1
+        if c == color and key in CENTRAL_POSITIONS:
+            count += 1
     return count
 
 
@@ -0,0 +1,37 @@
+"""
+Registry of the game engines the server exposes, by game name.
+
+Engines are imported on demand so tools (self-play, benchmarks) can load
+a game without importing the websocket server or every other engine.
+"""
+
+import importlib
+
+ENGINES = {
+    "dragon": "server.dragon.engine:DragonEngine",
+    "battleline": "server.battleline.engine:BattleLineEngine",
+    "arboretum": "server.arboretum.engine:ArboretumEngine",
+    "lostcities": "server.lostcities.engine:LostCitiesEngine",
+    "caylus": "server.caylus.engine:CaylusEngine",
+    "tamsk": "server.tamsk.engine:TamskEngine",
+    "dvonn": "server.dvonn.engine:DvonnEngine",
+    "yinsh": "server.yinsh.engine:YinshEngine",
+    "zertz": "server.zertz.engine:ZertzEngine",
+    "tzaar": "server.tzaar.engine:TzaarEngine",
+    "gipf": "server.gipf.engine:GipfEngine",
+    "punct": "server.punct.engine:PunctEngine",
+    "lyngk": "server.lyngk.engine:LyngkEngine",
+}
+
+
+def load_engine(game_name):
+    """Return the GameEngine class registered under game_name."""
+    if game_name not in ENGINES:
+        raise ValueError(f"Unknown game: {game_name}. Available: {list(ENGINES)}")
+    module_name, class_name = ENGINES[game_name].split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def load_engines():
+    """Return {game_name: GameEngine class} for every registered game."""
+    return {name: load_engine(name) for name in ENGINES}
@@ -0,0 +1,69 @@
+"""
+Seeded, serializable randomness for game state.
+
+Engines that shuffle or deal keep their random stream inside the state as
+a plain dict, {"seed": int, "draws": int}, and draw from it with the
+functions here instead of the global random module. Draw n is a pure
+function of (seed, n) (SplitMix64), so the stream needs no hidden
+generator object: copying the state copies the stream, and replaying a
+game's seed and actions reproduces every state byte for byte.
+
+    state["rng"] = new_rng(seed)
+    shuffle(state["rng"], deck)
+
+The seed reveals future draws, so engines must keep "rng" out of player
+and spectator views.
+"""
+
+import random
+
+_MASK64 = (1 << 64) - 1
+_GAMMA = 0x9E3779B97F4A7C15
+
+
+def new_rng(seed=None):
+    """
+    Return a fresh stream. With seed None, the seed is taken from the global
+    random module, so callers that random.seed() first stay reproducible.
+    """
+    if seed is None:
+        seed = random.getrandbits(63)
+    return {"seed": int(seed), "draws": 0}
+
+
+def next_u64(rng):
+    """Return the stream's next 64-bit value and advance it."""
+    rng["draws"] += 1
+    z = (rng["seed"] + rng["draws"] * _GAMMA) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def randbelow(rng, n):
+    """Uniform integer in [0, n)."""
+    if n <= 0:
+        raise ValueError("randbelow needs a positive bound")
+    limit = (1 << 64) - (1 << 64) % n   # reject the biased tail
+    while True:
+        value = next_u64(rng)
+        if value < limit:
+            return value % n
+
+
+def shuffle(rng, items):
+    """Shuffle a list in place (Fisher-Yates)."""
+    for i in range(len(items) - 1, 0, -1):
+        j = randbelow(rng, i + 1)
+        items[i], items[j] = items[j], items[i]
+
+
+def sample(rng, population, k):
+    """Return k distinct items from population, in selection order."""
+    pool = list(population)
+    if not 0 <= k <= len(pool):
+        raise ValueError("Sample larger than population")
+    for i in range(k):
+        j = i + randbelow(rng, len(pool) - i)
+        pool[i], pool[j] = pool[j], pool[i]
+    return pool[:k]
@@ -7,6 +7,7 @@ commands to pluggable game engines. Knows nothing about specific game rules.
 
 import asyncio
 import json
+import os
 import secrets
 import time
 from dataclasses import dataclass, field
@@ -14,6 +15,7 @@ from dataclasses import dataclass, field
 import websockets
 
 from server.game_engine import GameEngine
+from server.profiling import EngineProfiler, profiling_requested
 
 
 def generate_room_code():
@@ -55,6 +57,8 @@ class Room:
     locked: bool = False
     created_at: float = field(default_factory=time.time)
     game_name: str = "unknown"
+    profiler: EngineProfiler = None
+    log: list = field(default_factory=list)            # every log event so far, in order
 
     @property
     def player_list(self):
@@ -99,6 +103,8 @@ class GameServer:
 
         room = Room(code=code, host_id=player_id, engine=engine, game_name=game_name)
         room.players[player_id] = host
+        if profiling_requested(game_name):
+            room.profiler = EngineProfiler(engine, f"{game_name}:{code}").attach()
 
         self.rooms[code] = room
         self.tokens[token] = (code, player_id)
@@ -153,6 +159,7 @@ class GameServer:
         player_names = [room.players[pid].name for pid in player_ids]
 
         room.game_state = room.engine.initial_state(player_ids, player_names)
+        room.log = []
         room.started = True
 
         return room.game_state
@@ -263,6 +270,9 @@ class GameServer:
                 elif msg_type == "unlock_room":
                     await self._handle_lock(room, player_id, False)
 
+                elif msg_type == "profile":
+                    await self._handle_profile(room, player_id, msg)
+
                 else:
                     await self._send(websocket, {"type": "error", "message": f"Unknown message type: {msg_type}"})
 
@@ -334,10 +344,11 @@ class GameServer:
                 "room_code": code,
                 "token": token,
             })
+            await self._send_catalog(room, websocket, msg.get("catalog_hash"))
 
             # Send current game state if game is in progress
             if room.started and room.game_state:
-                await self._send_spectator_state(room, websocket)
+                await self._send_spectator_state(room, websocket, log_start=0)
 
             # Notify room of new spectator
             await self._broadcast(room, {
@@ -401,9 +412,10 @@ class GameServer:
                 "room_code": room_code,
                 "token": token,
             })
+            await self._send_catalog(room, websocket, msg.get("catalog_hash"))
 
             if room.started and room.game_state:
-                await self._send_spectator_state(room, websocket)
+                await self._send_spectator_state(room, websocket, log_start=0)
 
             return (room_code, "spectator", token)
 
@@ -426,6 +438,7 @@ class GameServer:
             "is_host": player_id == room.host_id,
             "game_started": room.started,
         })
+        await self._send_catalog(room, websocket, msg.get("catalog_hash"))
 
         # Broadcast updated player list
         await self._broadcast(room, {
@@ -437,7 +450,7 @@ class GameServer:
 
         # If game is in progress, send current state
         if room.started:
-            await self._send_game_state(room, player_id)
+            await self._send_game_state(room, player_id, log_start=0)
 
         return (room_code, player_id)
 
@@ -470,15 +483,12 @@ class GameServer:
             result = room.engine.apply_action(room.game_state, player_id, action)
             room.game_state = result.new_state
 
-            # Broadcast log to everyone
-            if result.log:
-                await self._broadcast(room, {
-                    "type": "game_log",
-                    "messages": result.log,
-                })
+            # Log events ride along in the state frame
+            log_start = len(room.log)
+            room.log.extend(result.log)
 
             # Send updated state to each player
-            await self._broadcast_game_state(room)
+            await self._broadcast_game_state(room, log_start)
 
             if result.game_over:
                 await self._broadcast(room, {"type": "game_over"})
@@ -542,6 +552,46 @@ class GameServer:
             "spectator_count": len([s for s in room.spectators.values() if s.connected]),
         })
 
+    async def _handle_profile(self, room, requester_id, msg):
+        """Admin-only: control engine profiling for this room."""
+        player = room.players.get(requester_id)
+        websocket = player.websocket if player else None
+        admin_token = os.environ.get("BGE_ADMIN_TOKEN")
+        if not admin_token or not secrets.compare_digest(str(msg.get("admin_token", "")), admin_token):
+            if websocket:
+                await self._send(websocket, {"type": "error", "message": "Admin token required"})
+            return
+
+        command = msg.get("command")
+        reply = {"type": "profile", "command": command}
+        try:
+            if command == "start":
+                if room.profiler is None:
+                    room.profiler = EngineProfiler(room.engine, f"{room.game_name}:{room.code}")
+                room.profiler.attach()
+                if msg.get("cprofile"):
+                    room.profiler.start_cprofile()
+            elif command == "stop":
+                if room.profiler is not None:
+                    room.profiler.detach()
+                    reply["stats"] = room.profiler.as_dict()
+                    room.profiler = None
+            elif command == "summary":
+                if room.profiler is None:
+                    raise ValueError("Profiling is not running for this room")
+                reply["summary"] = room.profiler.summary()
+                reply["stats"] = room.profiler.as_dict()
+            elif command == "dump":
+                if room.profiler is None:
+                    raise ValueError("Profiling is not running for this room")
+                reply["path"] = room.profiler.dump_cprofile()
+            else:
+                raise ValueError(f"Unknown profile command: {command}")
+        except ValueError as e:
+            reply = {"type": "error", "message": str(e)}
+        if websocket:
+            await self._send(websocket, reply)
+
     # ── Broadcasting ─────────────────────────────────────────────────
 
     async def _send(self, websocket, data):
@@ -559,8 +609,26 @@ class GameServer:
             if spectator.connected and spectator.websocket:
                 await self._send(spectator.websocket, data)
 
-    async def _send_game_state(self, room, player_id):
-        """Send personalized game view to one player."""
+    async def _send_catalog(self, room, websocket, cached_hash=None):
+        """Send the engine's static catalog, unless the client has this version cached."""
+        catalog = room.engine.get_catalog()
+        if not catalog:
+            return
+        digest = room.engine.catalog_hash()
+        if cached_hash == digest:
+            return
+        await self._send(websocket, {
+            "type": "catalog",
+            "game": room.game_name,
+            "hash": digest,
+            "catalog": catalog,
+        })
+
+    async def _send_game_state(self, room, player_id, log_start=None):
+        """
+        Send personalized game view to one player, with the room's log
+        events from log_start on (none by default).
+        """
         player = room.players.get(player_id)
         if not player or not player.websocket or not room.game_state:
             return
@@ -575,9 +643,10 @@ class GameServer:
             "phase_info": phase_info,
             "waiting_for": waiting_for,
             "your_turn": player_id in waiting_for,
+            **self._log_fields(room, log_start),
         })
 
-    async def _send_spectator_state(self, room, websocket):
+    async def _send_spectator_state(self, room, websocket, log_start=None):
         """Send spectator view of game state."""
         if not room.game_state:
             return
@@ -591,49 +660,37 @@ class GameServer:
             "phase_info": phase_info,
             "waiting_for": [],
             "your_turn": False,
+            **self._log_fields(room, log_start),
         })
 
-    async def _broadcast_game_state(self, room):
+    async def _broadcast_game_state(self, room, log_start=None):
         """Send personalized game view to each connected player + spectators."""
         for player_id in room.players:
-            await self._send_game_state(room, player_id)
+            await self._send_game_state(room, player_id, log_start)
         # Also update spectators
         for spectator in room.spectators.values():
             if spectator.connected and spectator.websocket:
-                await self._send_spectator_state(room, spectator.websocket)
+                await self._send_spectator_state(room, spectator.websocket, log_start)
+
+    def _log_fields(self, room, log_start):
+        """
+        The "log" and "log_start" fields of a game_state frame: room.log
+        entries from log_start on. log_start 0 carries the whole log, so
+        the client replaces its copy; otherwise it appends.
+        """
+        if log_start is None:
+            log_start = len(room.log)
+        return {"log": room.log[log_start:], "log_start": log_start}
 
 
 # ── Server Entry Point ───────────────────────────────────────────────
 
 async def run_server(host="0.0.0.0", port=8765):
-    from server.dragon.engine import DragonEngine
-    from server.battleline.engine import BattleLineEngine
-    from server.arboretum.engine import ArboretumEngine
-    from server.lostcities.engine import LostCitiesEngine
-    from server.caylus.engine import CaylusEngine
-    from server.tamsk.engine import TamskEngine
-    from server.dvonn.engine import DvonnEngine
-    from server.yinsh.engine import YinshEngine
-    from server.zertz.engine import ZertzEngine
-    from server.tzaar.engine import TzaarEngine
-    from server.gipf.engine import GipfEngine
-    from server.punct.engine import PunctEngine
-    from server.lyngk.engine import LyngkEngine
+    from server.registry import load_engines
 
     server = GameServer()
-    server.register_engine("dragon", DragonEngine)
-    server.register_engine("battleline", BattleLineEngine)
-    server.register_engine("arboretum", ArboretumEngine)
-    server.register_engine("lostcities", LostCitiesEngine)
-    server.register_engine("caylus", CaylusEngine)
-    server.register_engine("tamsk", TamskEngine)
-    server.register_engine("dvonn", DvonnEngine)
-    server.register_engine("yinsh", YinshEngine)
-    server.register_engine("zertz", ZertzEngine)
-    server.register_engine("tzaar", TzaarEngine)
-    server.register_engine("gipf", GipfEngine)
-    server.register_engine("punct", PunctEngine)
-    server.register_engine("lyngk", LyngkEngine)
+    for game_name, engine_class in load_engines().items():
+        server.register_engine(game_name, engine_class)
 
     print(f"Game server starting on ws://{host}:{port}")
     print(f"Registered games: {list(server.engines.keys())}")
@@ -0,0 +1,395 @@
+"""
+Compact binary snapshots of game state.
+
+A snapshot is the state dict packed into a small byte string for
+persistence, replication and replay storage:
+
+    data = engine.encode_snapshot(state)
+    state == engine.decode_snapshot(data)     # always True
+
+Layout: a header (magic, format version, the engine's schema version and
+the game name) followed by a raw-deflate payload. The payload is a tagged
+value stream in which
+
+  - small ints, the engine's declared `strings`, and any string or dict
+    shape (key tuple) already seen cost one or two bytes;
+  - dicts listed in the engine's `atoms` (cell contents, cards) are
+    written as small-int enum indices;
+  - dicts keyed by board position are written as packed cell arrays in
+    the fixed order of one of the engine's `boards` layouts, with a
+    presence bitmap instead of the "q,r" keys; with declared `cells`
+    (every value a cell commonly holds) each cell is a single index,
+    bit-packed when there are only a few of them;
+  - dict key lists declared in `shapes` (the state's own keys, player
+    dicts) cost one byte even the first time they appear.
+
+Anything the engine doesn't declare falls back to the generic encoding,
+so every JSON state round-trips (tuples come back as lists, as they would
+through JSON); declarations only make it smaller.
+Bump an engine's schema version whenever its strings, atoms, boards,
+cells or shapes change, since old snapshots index into them.
+"""
+
+import struct
+import zlib
+
+MAGIC = b"BG"
+FORMAT_VERSION = 1
+
+# Value tags. Single-byte forms are used for the common small cases.
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _STR_REF, _LIST, _DICT, _SHAPE_REF, _ATOM, _BOARD = range(12)
+_SHORT_LIST = 0x0C      # 0x0C-0x1F: list of length 0..19
+_SHORT_SHAPE = 0x20     # 0x20-0x3F: dict with known shape 0..31
+_SHORT_STR = 0x40       # 0x40-0x7F: string ref 0..63
+_SHORT_INT = 0x80       # 0x80-0xFF: int 0..127
+
+_DOUBLE = struct.Struct("<d")
+
+
+def _value_key(value):
+    """Hashable key for any JSON value; equal keys mean equal values of the same types."""
+    if isinstance(value, dict):
+        return ("dict",) + tuple((k, _value_key(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return ("list",) + tuple(_value_key(v) for v in value)
+    return (type(value), value)
+
+
+def _clone(value):
+    """Fresh copy of a declared cell value, so decoded states share nothing."""
+    if isinstance(value, dict):
+        return {k: _clone(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clone(v) for v in value]
+    return value
+
+
+def _atom_key(value):
+    """Hashable key for a flat dict, or None if it has nested values."""
+    try:
+        key = tuple((k, type(v), v) for k, v in value.items())
+        hash(key)
+        return key
+    except TypeError:
+        return None
+
+
+class SnapshotCodec:
+    """
+    Binary snapshot format for one engine.
+
+    game    — game name written to (and checked in) the header
+    version — the engine's schema version; bump when any of the
+              declarations below change
+    strings — vocabulary known up front (state keys, phase names, colors);
+              each is written as a one- or two-byte reference
+    atoms   — dicts written as enum indices: flat dicts of scalars, e.g.
+              every card or every kind of cell content
+    boards  — key orders for position-keyed dicts, e.g. [ALL_POSITIONS];
+              any dict whose keys follow one of them in order (gaps allowed)
+              is packed as a cell array
+    cells   — values board cells hold, most common first (e.g. every
+              stack up to some height); each is then written as one
+              varint index instead of a tagged value, or as a few bits
+              when fewer than 16 are declared
+    shapes  — dict key lists known up front, e.g. the state's own keys
+    """
+
+    def __init__(self, game, version=1, strings=(), atoms=(), boards=(), cells=(), shapes=()):
+        self.game = game
+        self.version = version
+        self.atoms = [dict(a) for a in atoms]
+        self._atom_size = max((len(a) for a in self.atoms), default=0)
+        self._atom_index = {}
+        for i, atom in enumerate(self.atoms):
+            key = _atom_key(atom)
+            if key is None:
+                raise ValueError(f"Snapshot atom {atom!r} is not a flat dict")
+            self._atom_index.setdefault(key, i)
+        self.boards = [list(keys) for keys in boards]
+        self._board_key_sets = [frozenset(keys) for keys in self.boards]
+        # Board keys double as vocabulary: positions also appear as values
+        vocabulary = list(strings) + [k for keys in self.boards for k in keys]
+        self.strings = list(dict.fromkeys(vocabulary))
+        self._string_index = {s: i for i, s in enumerate(self.strings)}
+        self.cells = list(cells)
+        self._cell_index = {}
+        for i, cell in enumerate(self.cells):
+            self._cell_index.setdefault(_value_key(cell), i)
+        # Bits per packed cell index (0 = escape), or 0 for varint indices
+        self._cell_bits = len(self.cells).bit_length() if len(self.cells) < 16 else 0
+        self.shapes = list(dict.fromkeys(tuple(keys) for keys in shapes))
+
+    # ── Public ───────────────────────────────────────────
+
+    def encode(self, state):
+        out = _Writer(self)
+        out.value(state)
+        game = self.game.encode()
+        header = MAGIC + bytes([FORMAT_VERSION, self.version, len(game)]) + game
+        deflate = zlib.compressobj(9, zlib.DEFLATED, -15)
+        return header + deflate.compress(out.buf) + deflate.flush()
+
+    def decode(self, data):
+        data = bytes(data)
+        if data[:2] != MAGIC or len(data) < 5:
+            raise ValueError("Not a game state snapshot")
+        if data[2] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format version {data[2]}")
+        if data[3] != self.version:
+            raise ValueError(f"Snapshot schema version {data[3]} does not match "
+                             f"{self.game} version {self.version}")
+        end = 5 + data[4]
+        game = data[5:end].decode()
+        if game != self.game:
+            raise ValueError(f"Snapshot is for {game}, not {self.game}")
+        try:
+            payload = zlib.decompress(data[end:], -15)
+            reader = _Reader(self, payload)
+            state = reader.value()
+        except (zlib.error, IndexError, UnicodeDecodeError, struct.error) as e:
+            raise ValueError(f"Corrupt snapshot: {e}")
+        if reader.pos != len(payload):
+            raise ValueError("Corrupt snapshot: trailing data")
+        return state
+
+    def _match_board(self, d):
+        """Index of a board layout d's keys follow in order, or None."""
+        for i, keys in enumerate(self.boards):
+            if len(d) > len(keys) or not d.keys() <= self._board_key_sets[i]:
+                continue
+            if len(d) == len(keys):
+                if list(d) == keys:
+                    return i
+            elif list(d) == [k for k in keys if k in d]:
+                return i
+        return None
+
+
+# ── Encoding ─────────────────────────────────────────────
+
+class _Writer:
+
+    def __init__(self, codec):
+        self.codec = codec
+        self.buf = bytearray()
+        self.strings = dict(codec._string_index)
+        self.shapes = {keys: i for i, keys in enumerate(codec.shapes)}
+
+    def uint(self, n):
+        buf = self.buf
+        while n > 0x7F:
+            buf.append((n & 0x7F) | 0x80)
+            n >>= 7
+        buf.append(n)
+
+    def tagged_uint(self, tag, n):
+        self.buf.append(tag)
+        self.uint(n)
+
+    def string(self, s):
+        ref = self.strings.get(s)
+        if ref is not None:
+            if ref < 64:
+                self.buf.append(_SHORT_STR + ref)
+            else:
+                self.tagged_uint(_STR_REF, ref)
+            return
+        self.strings[s] = len(self.strings)
+        raw = s.encode()
+        self.tagged_uint(_STR, len(raw))
+        self.buf += raw
+
+    def value(self, v):
+        if v is None:
+            self.buf.append(_NONE)
+        elif v is True:
+            self.buf.append(_TRUE)
+        elif v is False:
+            self.buf.append(_FALSE)
+        elif isinstance(v, int):
+            if 0 <= v < 128:
+                self.buf.append(_SHORT_INT + v)
+            else:
+                self.tagged_uint(_INT, v * 2 if v >= 0 else -v * 2 - 1)
+        elif isinstance(v, float):
+            self.buf.append(_FLOAT)
+            self.buf += _DOUBLE.pack(v)
+        elif isinstance(v, str):
+            self.string(v)
+        elif isinstance(v, (list, tuple)):
+            if len(v) < _SHORT_SHAPE - _SHORT_LIST:
+                self.buf.append(_SHORT_LIST + len(v))
+            else:
+                self.tagged_uint(_LIST, len(v))
+            for item in v:
+                self.value(item)
+        elif isinstance(v, dict):
+            self.mapping(v)
+        else:
+            raise ValueError(f"Cannot snapshot value of type {type(v).__name__}")
+
+    def mapping(self, d):
+        if len(d) <= self.codec._atom_size:
+            atom = self.codec._atom_index.get(_atom_key(d))
+            if atom is not None:
+                self.tagged_uint(_ATOM, atom)
+                return
+        board = self.codec._match_board(d) if d else None
+        if board is not None:
+            self.board(board, d)
+            return
+        keys = tuple(d)
+        shape = self.shapes.get(keys)
+        if shape is None:
+            self.shapes[keys] = len(self.shapes)
+            self.tagged_uint(_DICT, len(keys))
+            for k in keys:
+                self.value(k)
+        elif shape < 32:
+            self.buf.append(_SHORT_SHAPE + shape)
+        else:
+            self.tagged_uint(_SHAPE_REF, shape)
+        for v in d.values():
+            self.value(v)
+
+    def board(self, index, d):
+        keys = self.codec.boards[index]
+        self.tagged_uint(_BOARD, index)
+        bits = 0
+        if len(d) != len(keys):
+            for i, k in enumerate(keys):
+                if k in d:
+                    bits |= 1 << i
+        self.uint(bits)
+        cell_index = self.codec._cell_index
+        if not cell_index:
+            for v in d.values():
+                self.value(v)
+            return
+        # Declared cells as index + 1; 0 escapes to a tagged value
+        width = self.codec._cell_bits
+        if not width:
+            for v in d.values():
+                i = cell_index.get(_value_key(v))
+                if i is None:
+                    self.buf.append(0)
+                    self.value(v)
+                else:
+                    self.uint(i + 1)
+            return
+        # Few cells: indices packed `width` bits each, escaped values after
+        packed = shift = 0
+        escaped = []
+        for v in d.values():
+            i = cell_index.get(_value_key(v))
+            if i is None:
+                escaped.append(v)
+            else:
+                packed |= (i + 1) << shift
+            shift += width
+        self.buf += packed.to_bytes((shift + 7) // 8, "little")
+        for v in escaped:
+            self.value(v)
+
+
+# ── Decoding ─────────────────────────────────────────────
+
+class _Reader:
+
+    def __init__(self, codec, payload):
+        self.codec = codec
+        self.data = payload
+        self.pos = 0
+        self.strings = list(codec.strings)
+        self.shapes = [list(keys) for keys in codec.shapes]
+
+    def uint(self):
+        data = self.data
+        n = shift = 0
+        while True:
+            b = data[self.pos]
+            self.pos += 1
+            n |= (b & 0x7F) << shift
+            if b < 0x80:
+                return n
+            shift += 7
+
+    def value(self):
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag >= _SHORT_INT:
+            return tag - _SHORT_INT
+        if tag >= _SHORT_STR:
+            return self.strings[tag - _SHORT_STR]
+        if tag >= _SHORT_SHAPE:
+            return self.shaped(self.shapes[tag - _SHORT_SHAPE])
+        if tag >= _SHORT_LIST:
+            return [self.value() for _ in range(tag - _SHORT_LIST)]
+        if tag == _NONE:
+            return None
+        if tag == _FALSE:
+            return False
+        if tag == _TRUE:
+            return True
+        if tag == _INT:
+            n = self.uint()
+            return n >> 1 if not n & 1 else -((n + 1) >> 1)
+        if tag == _FLOAT:
+            (v,) = _DOUBLE.unpack_from(self.data, self.pos)
+            self.pos += 8
+            return v
+        if tag == _STR:
+            return self.new_string()
+        if tag == _STR_REF:
+            return self.strings[self.uint()]
+        if tag == _LIST:
+            return [self.value() for _ in range(self.uint())]
+        if tag == _DICT:
+            keys = [self.value() for _ in range(self.uint())]
+            self.shapes.append(keys)
+            return self.shaped(keys)
+        if tag == _SHAPE_REF:
+            return self.shaped(self.shapes[self.uint()])
+        if tag == _ATOM:
+            return dict(self.codec.atoms[self.uint()])
+        if tag == _BOARD:
+            keys = self.codec.boards[self.uint()]
+            bits = self.uint()
+            if bits:
+                keys = [k for i, k in enumerate(keys) if bits >> i & 1]
+            if self.codec._cell_bits:
+                return self.packed_cells(keys)
+            if self.codec.cells:
+                return {k: self.cell() for k in keys}
+            return {k: self.value() for k in keys}
+        raise ValueError(f"Corrupt snapshot: unknown tag {tag}")
+
+    def cell(self):
+        i = self.uint()
+        return _clone(self.codec.cells[i - 1]) if i else self.value()
+
+    def packed_cells(self, keys):
+        width = self.codec._cell_bits
+        size = (len(keys) * width + 7) // 8
+        if self.pos + size > len(self.data):
+            raise IndexError("packed cells run past the payload")
+        packed = int.from_bytes(self.data[self.pos:self.pos + size], "little")
+        self.pos += size
+        mask = (1 << width) - 1
+        cells = self.codec.cells
+        board = {}
+        for n, k in enumerate(keys):
+            i = packed >> (n * width) & mask
+            board[k] = _clone(cells[i - 1]) if i else self.value()
+        return board
+
+    def new_string(self):
+        n = self.uint()
+        s = self.data[self.pos:self.pos + n].decode()
+        self.pos += n
+        self.strings.append(s)
+        return s
+
+    def shaped(self, keys):
+        return {k: self.value() for k in keys}
@@ -3,20 +3,88 @@
 import time
 from copy import deepcopy
 
+from server.action_space import ActionSpace
 from server.game_engine import GameEngine, ActionResult
+from server.log_events import log_event
+from server.snapshot import SnapshotCodec
 from server.tamsk.state import (
     RINGS_PER_PLAYER, HOURGLASS_TIMER_SECS, PRESSURE_TIMER_SECS,
-    hex_key, parse_hex, hex_neighbors, generate_board, create_player,
+    GRID, generate_board, create_player,
     setup_hourglasses, get_player_hourglasses, get_hourglass_at,
 )
 
 
+# ── Action space ─────────────────────────────────────
+
+_POSITIONS = list(generate_board())
+_HOURGLASS_IDS = list(setup_hourglasses())
+
+ACTION_SPACE = ActionSpace([
+    ("set_level", [("level", [1, 2, 3])]),
+    ("move_hourglass", [("hourglass_id", _HOURGLASS_IDS), ("to", _POSITIONS)]),
+    ("place_ring", []),
+    ("place_bonus_ring", [("space", _POSITIONS)]),
+    ("skip_bonus_ring", []),
+    ("activate_pressure", []),
+    ("pass", []),
+])
+
+
+# ── Log events ───────────────────────────────────
+
+LOG_EVENTS = {
+    "timers_expired": "Game ended — timers expired.",
+    "level_1": "Game started at Level 1 (No Timers).",
+    "level_2": "Game started at Level 2 (Timers Active).",
+    "level_3": "Game started at Level 3 (Full Game).",
+    "move": "{player} moved {hourglass} to {space}.",
+    "ring_window_expired": "Ring window expired.",
+    "place_ring": "{player} placed a ring at {space}. ({remaining} remaining)",
+    "pass": "{player} passed (no valid moves).",
+    "bonus_rings": "{player} has {count} bonus ring(s) to place (pressure penalty).",
+    "place_bonus_ring": "{player} placed a bonus ring at {space}. ({remaining} remaining)",
+    "skip_bonus_rings": "{player} declined to place bonus ring(s).",
+    "flip_pressure": "{player} flipped the pressure timer! ({seconds}s)",
+    "auto_pass": "{player} has no valid moves — auto-passed.",
+    "pressure_expired": "Pressure timer expired! {player} earns a bonus ring.",
+    "hourglasses_dead": "All of {player}'s hourglasses are dead.",
+    "win_more_rings": "{player} wins! (more rings placed)",
+    "win_surviving_hourglasses": "{player} wins by tiebreaker (surviving hourglasses).",
+    "final_score": "Game over! {first_player}: {first_rings} rings placed, {second_player}: {second_rings} rings placed.",
+    "win": "{player} wins!",
+    "win_tiebreaker": "{player} wins the tiebreaker (surviving hourglass)!",
+    "draw": "It's a draw!",
+}
+
+
+# ── Snapshots ────────────────────────────────────────
+
+SNAPSHOT_CODEC = SnapshotCodec(
+    "tamsk",
+    strings=[
+        "capacity", "rings", "black", "red", "color", "id", "position", "timer_remaining",
+        "timer_started_at", "is_dead",
+        "game", "player_ids", "player_count", "players", "board", "hourglasses",
+        "current_player", "phase", "sub_phase", "level", "turn_number", "turns_taken",
+        "hourglasses_moved_initial", "consecutive_passes", "moved_to_space",
+        "ring_window_start", "ring_window_space", "ring_window_mover", "pressure_timer",
+        "active", "activated_by", "bonus_rings", "game_over", "winner",
+        "index", "player_id", "name", "rings_remaining", "passed",
+        "tamsk", "config", "play", "move", "ring_window", "bonus_ring",
+    ],
+    boards=[_POSITIONS, _HOURGLASS_IDS],
+)
+
+
 class TamskEngine(GameEngine):
     player_count_range = (2, 2)
+    action_space = ACTION_SPACE
+    log_events = LOG_EVENTS
+    snapshot_codec = SNAPSHOT_CODEC
 
     # ── Abstract method implementations ──────────────────
 
-    def initial_state(self, player_ids, player_names):
+    def initial_state(self, player_ids, player_names, seed=None):
         players = [
             create_player(i, pid, name)
             for i, (pid, name) in enumerate(zip(player_ids, player_names))
@@ -59,20 +127,22 @@ class TamskEngine(GameEngine):
         return view
 
     def get_valid_actions(self, state, player_id):
+        return list(self.iter_valid_actions(state, player_id))
+
+    def iter_valid_actions(self, state, player_id):
         if state["game_over"]:
-            return []
+            return
 
         player_idx = self._player_index(state, player_id)
         if player_idx is None:
-            return []
+            return
 
         phase = state["phase"]
 
         if phase == "config":
-            return self._valid_config_actions(state, player_idx)
+            yield from self._iter_config_actions(state, player_idx)
         elif phase == "play":
-            return self._valid_play_actions(state, player_id, player_idx)
-        return []
+            yield from self._iter_play_actions(state, player_id, player_idx)
 
     def apply_action(self, state, player_id, action):
         state = deepcopy(state)
@@ -84,7 +154,7 @@ class TamskEngine(GameEngine):
             raise ValueError("Unknown player")
 
         if game_ended:
-            return ActionResult(state, log=["Game ended — timers expired."], game_over=True)
+            return ActionResult(state, log=[log_event("timers_expired")], game_over=True)
 
         if state["game_over"]:
             raise ValueError("Game is over")
@@ -97,7 +167,7 @@ class TamskEngine(GameEngine):
                 state["ring_window_space"] = None
                 state["ring_window_mover"] = None
                 cp = state["current_player"]
-                return self._maybe_enter_bonus_ring_phase(state, cp, ["Ring window expired."])
+                return self._maybe_enter_bonus_ring_phase(state, cp, [log_event("ring_window_expired")])
 
         if kind == "set_level":
             return self._apply_set_level(state, player_idx, action)
@@ -160,14 +230,12 @@ class TamskEngine(GameEngine):
 
     # ── Config phase ─────────────────────────────────────
 
-    def _valid_config_actions(self, state, player_idx):
+    def _iter_config_actions(self, state, player_idx):
         if player_idx != 0:
-            return []
-        return [
-            {"kind": "set_level", "level": 1},
-            {"kind": "set_level", "level": 2},
-            {"kind": "set_level", "level": 3},
-        ]
+            return
+        yield {"kind": "set_level", "level": 1}
+        yield {"kind": "set_level", "level": 2}
+        yield {"kind": "set_level", "level": 3}
 
     def _apply_set_level(self, state, player_idx, action):
         if state["phase"] != "config":
@@ -188,22 +256,20 @@ class TamskEngine(GameEngine):
         state["sub_phase"] = "move"
         state["current_player"] = 0
 
-        level_names = {1: "No Timers", 2: "Timers Active", 3: "Full Game"}
-        log = [f"Game started at Level {level} ({level_names[level]})."]
+        log = [log_event(f"level_{level}")]
         return ActionResult(state, log=log)
 
     # ── Play phase: valid actions ────────────────────────
 
-    def _valid_play_actions(self, state, player_id, player_idx):
+    def _iter_play_actions(self, state, player_id, player_idx):
         if state["phase"] != "play":
-            return []
+            return
 
         sub = state.get("sub_phase", "move")
         cp = state["current_player"]
-        actions = []
 
         if sub == "move" and player_idx == cp:
-            actions = self._valid_move_actions(state, player_idx)
+            yield from self._iter_move_actions(state, player_idx)
             # No pass action needed — auto-pass happens in _advance_turn
 
         elif sub == "ring_window":
@@ -216,20 +282,20 @@ class TamskEngine(GameEngine):
                 mover_idx = state.get("ring_window_mover")
                 if can_place and state["players"][player_idx]["rings_remaining"] > 0:
                     if player_idx == mover_idx and elapsed < 3.0:
-                        actions.append({"kind": "place_ring"})
+                        yield {"kind": "place_ring"}
                     elif elapsed >= 3.0:
-                        actions.append({"kind": "place_ring"})
+                        yield {"kind": "place_ring"}
 
         elif sub == "bonus_ring" and player_idx == cp:
             # Pressure penalty: player chooses any board space for bonus ring
             player = state["players"][player_idx]
             if player["rings_remaining"] > 0:
                 for space_key in state["board"]:
-                    actions.append({
+                    yield {
                         "kind": "place_bonus_ring",
                         "space": space_key,
-                    })
-            actions.append({"kind": "skip_bonus_ring"})
+                    }
+            yield {"kind": "skip_bonus_ring"}
 
         # Level 3: non-current player can flip pressure timer (only at zero)
         if (state["level"] == 3
@@ -241,15 +307,12 @@ class TamskEngine(GameEngine):
             if pt["timer_started_at"] is not None:
                 remaining = max(0, remaining - (now - pt["timer_started_at"]))
             if remaining <= 0:
-                actions.append({"kind": "activate_pressure"})
-
-        return actions
+                yield {"kind": "activate_pressure"}
 
-    def _valid_move_actions(self, state, player_idx):
-        """Enumerate all valid hourglass moves for the current player."""
+    def _iter_move_actions(self, state, player_idx):
+        """Yield all valid hourglass moves for the current player."""
         player_color = state["players"][player_idx]["color"]
         hourglasses = get_player_hourglasses(state["hourglasses"], player_color)
-        actions = []
 
         # Level 2/3: first 3 turns must each move a different hourglass
         forced_set = None
@@ -267,9 +330,7 @@ class TamskEngine(GameEngine):
             if forced_set is not None and h["id"] not in forced_set:
                 continue
 
-            hq, hr = parse_hex(h["position"])
-            for nq, nr in hex_neighbors(hq, hr):
-                dest_key = hex_key(nq, nr)
+            for dest_key in GRID.key_neighbors[h["position"]]:
                 # No other hourglass there
                 if dest_key in occupied:
                     continue
@@ -277,13 +338,14 @@ class TamskEngine(GameEngine):
                 space = state["board"][dest_key]
                 if len(space["rings"]) >= space["capacity"]:
                     continue
-                actions.append({
+                yield {
                     "kind": "move_hourglass",
                     "hourglass_id": h["id"],
                     "to": dest_key,
-                })
+                }
 
-        return actions
+    def _has_move(self, state, player_idx):
+        return next(self._iter_move_actions(state, player_idx), None) is not None
 
     # ── Play phase: apply actions ────────────────────────
 
@@ -315,10 +377,7 @@ class TamskEngine(GameEngine):
                 raise ValueError("Must move a different hourglass in your first 3 turns")
 
         # Validate destination
-        hq, hr = parse_hex(h["position"])
-        dq, dr = parse_hex(dest)
-        neighbors = hex_neighbors(hq, hr)
-        if (dq, dr) not in neighbors:
+        if dest not in GRID.key_neighbors[h["position"]]:
             raise ValueError("Destination is not adjacent")
 
         occupied = {hh["position"] for hh in state["hourglasses"].values()}
@@ -358,8 +417,7 @@ class TamskEngine(GameEngine):
 
         state["consecutive_passes"] = 0
 
-        player_name = state["players"][player_idx]["name"]
-        log.append(f"{player_name} moved {hid} to {dest}.")
+        log.append(log_event("move", player_idx, hid, dest))
 
         # Enter ring window if destination can accept a ring and someone has rings
         space = state["board"][dest]
@@ -400,8 +458,7 @@ class TamskEngine(GameEngine):
         space["rings"].append(player["color"])
         player["rings_remaining"] -= 1
 
-        player_name = player["name"]
-        log = [f"{player_name} placed a ring at {space_key}. ({player['rings_remaining']} remaining)"]
+        log = [log_event("place_ring", player_idx, space_key, player["rings_remaining"])]
 
         # Clear ring window state
         state["ring_window_start"] = None
@@ -419,12 +476,10 @@ class TamskEngine(GameEngine):
             raise ValueError("Not your turn")
 
         # Verify no valid moves
-        valid_moves = self._valid_move_actions(state, player_idx)
-        if valid_moves:
+        if self._has_move(state, player_idx):
             raise ValueError("You have valid moves — cannot pass")
 
-        player_name = state["players"][player_idx]["name"]
-        log = [f"{player_name} passed (no valid moves)."]
+        log = [log_event("pass", player_idx)]
 
         state["players"][player_idx]["passed"] = True
         state["consecutive_passes"] += 1
@@ -440,8 +495,7 @@ class TamskEngine(GameEngine):
         bonus = state["bonus_rings"][player_idx]
         if bonus > 0 and state["players"][player_idx]["rings_remaining"] > 0:
             state["sub_phase"] = "bonus_ring"
-            player_name = state["players"][player_idx]["name"]
-            log.append(f"{player_name} has {bonus} bonus ring(s) to place (pressure penalty).")
+            log.append(log_event("bonus_rings", player_idx, bonus))
             return ActionResult(state, log=log)
         # No bonus rings — clear any leftover and advance
         state["bonus_rings"][player_idx] = 0
@@ -468,8 +522,7 @@ class TamskEngine(GameEngine):
         player["rings_remaining"] -= 1
         state["bonus_rings"][player_idx] -= 1
 
-        player_name = player["name"]
-        log = [f"{player_name} placed a bonus ring at {space_key}. ({player['rings_remaining']} remaining)"]
+        log = [log_event("place_bonus_ring", player_idx, space_key, player["rings_remaining"])]
 
         # If more bonus rings remain, stay in bonus_ring phase
         if state["bonus_rings"][player_idx] > 0 and player["rings_remaining"] > 0:
@@ -486,8 +539,7 @@ class TamskEngine(GameEngine):
         if player_idx != state["current_player"]:
             raise ValueError("Not your turn")
 
-        player_name = state["players"][player_idx]["name"]
-        log = [f"{player_name} declined to place bonus ring(s)."]
+        log = [log_event("skip_bonus_rings", player_idx)]
         state["bonus_rings"][player_idx] = 0
         return self._advance_turn(state, log)
 
@@ -515,8 +567,7 @@ class TamskEngine(GameEngine):
         pt["active"] = True
         pt["activated_by"] = player_id
 
-        player_name = state["players"][player_idx]["name"]
-        log = [f"{player_name} flipped the pressure timer! ({PRESSURE_TIMER_SECS}s)"]
+        log = [log_event("flip_pressure", player_idx, PRESSURE_TIMER_SECS)]
         return ActionResult(state, log=log)
 
     # ── Turn advancement ─────────────────────────────────
@@ -551,10 +602,8 @@ class TamskEngine(GameEngine):
         # Auto-pass if the new current player has no valid moves.
         # This prevents stalling to bleed opponent timer.
         cp = state["current_player"]
-        valid_moves = self._valid_move_actions(state, cp)
-        if not valid_moves:
-            player_name = state["players"][cp]["name"]
-            log.append(f"{player_name} has no valid moves — auto-passed.")
+        if not self._has_move(state, cp):
+            log.append(log_event("auto_pass", cp))
             state["players"][cp]["passed"] = True
             state["consecutive_passes"] += 1
 
@@ -677,8 +726,7 @@ class TamskEngine(GameEngine):
                 pt["timer_started_at"] = None  # sand stopped
                 opponent_idx = 1 - player_idx
                 state["bonus_rings"][opponent_idx] += 1
-                opponent_name = state["players"][opponent_idx]["name"]
-                log.append(f"Pressure timer expired! {opponent_name} earns a bonus ring.")
+                log.append(log_event("pressure_expired", opponent_idx))
 
         # Move was made — timer is no longer "active" (no penalty applies)
         # but sand keeps flowing if it hasn't drained
@@ -697,15 +745,13 @@ class TamskEngine(GameEngine):
             )
             if all_dead:
                 opp_idx = 1 - pidx
-                player_name = state["players"][pidx]["name"]
-                opp_name = state["players"][opp_idx]["name"]
-                log.append(f"All of {player_name}'s hourglasses are dead.")
+                log.append(log_event("hourglasses_dead", pidx))
 
                 my_remaining = state["players"][pidx]["rings_remaining"]
                 opp_remaining = state["players"][opp_idx]["rings_remaining"]
 
                 if my_remaining > opp_remaining:
-                    log.append(f"{opp_name} wins! (more rings placed)")
+                    log.append(log_event("win_more_rings", opp_idx))
                     state["winner"] = state["players"][opp_idx]["player_id"]
                     return self._end_game(state, log)
                 elif my_remaining == opp_remaining:
@@ -717,12 +763,12 @@ class TamskEngine(GameEngine):
                     )
                     if opp_all_dead:
                         return self._end_game(state, log)
-                    log.append(f"{opp_name} wins by tiebreaker (surviving hourglasses).")
+                    log.append(log_event("win_surviving_hourglasses", opp_idx))
                     state["winner"] = state["players"][opp_idx]["player_id"]
                     return self._end_game(state, log)
                 else:
                     # Dead player actually placed more rings — they win
-                    log.append(f"{player_name} wins! (more rings placed)")
+                    log.append(log_event("win_more_rings", pidx))
                     state["winner"] = state["players"][pidx]["player_id"]
                     return self._end_game(state, log)
 
@@ -741,29 +787,27 @@ class TamskEngine(GameEngine):
         r0 = p0["rings_remaining"]
         r1 = p1["rings_remaining"]
 
-        log.append(f"Game over! {p0['name']}: {RINGS_PER_PLAYER - r0} rings placed, "
-                   f"{p1['name']}: {RINGS_PER_PLAYER - r1} rings placed.")
+        log.append(log_event("final_score", 0, RINGS_PER_PLAYER - r0, 1, RINGS_PER_PLAYER - r1))
 
         if r0 < r1:
             state["winner"] = p0["player_id"]
-            log.append(f"{p0['name']} wins!")
+            log.append(log_event("win", 0))
         elif r1 < r0:
             state["winner"] = p1["player_id"]
-            log.append(f"{p1['name']} wins!")
+            log.append(log_event("win", 1))
         else:
             # Tiebreaker for Level 2/3: player with a surviving hourglass
             if state["level"] >= 2:
                 winner = self._tiebreak_by_hourglasses(state)
                 if winner is not None:
                     state["winner"] = state["players"][winner]["player_id"]
-                    log.append(f"{state['players'][winner]['name']} wins the tiebreaker "
-                               f"(surviving hourglass)!")
+                    log.append(log_event("win_tiebreaker", winner))
                 else:
                     state["winner"] = None
-                    log.append("It's a draw!")
+                    log.append(log_event("draw"))
             else:
                 state["winner"] = None
-                log.append("It's a draw!")
+                log.append(log_event("draw"))
 
         return ActionResult(state, log=log, game_over=True)
 
@@ -2,6 +2,8 @@
 
 import random
 
+from server.hexgrid import HexGrid, hex_key, parse_hex
+
 # ── Constants ────────────────────────────────────────────
 RINGS_PER_PLAYER = 32
 HOURGLASS_TIMER_SECS = 180  # 3 minutes
@@ -23,17 +25,6 @@ HEX_DIRECTIONS = [
 
 # ── Hex coordinate helpers ───────────────────────────────
 
-def hex_key(q, r):
-    """Serialize axial coords to string key."""
-    return f"{q},{r}"
-
-
-def parse_hex(key):
-    """Deserialize string key to (q, r) tuple."""
-    parts = key.split(",")
-    return int(parts[0]), int(parts[1])
-
-
 def hex_distance(q1, r1, q2, r2):
     """Cube-coordinate distance between two axial hex positions."""
     dq = q1 - q2
@@ -84,6 +75,9 @@ def generate_board():
     return board
 
 
+GRID = HexGrid(parse_hex(key) for key in generate_board())
+
+
 def create_player(index, player_id, name):
     """Create a player state dict."""
     color = "black" if index == 0 else "red"
@@ -0,0 +1,338 @@
+"""
+Packed TZAAR batches (see server.batch).
+
+Every game's board lives in three flat bytearrays, one byte per cell and
+`size` rows of GRID.size cells: owner (0 empty, 1 white, 2 black), piece
+type (an index into PIECE_TYPES) and stack height. During play cells only
+ever empty out, so each game also keeps, for every occupied cell and
+direction, the first occupied cell along that ray (`links`, 255 for
+none). A move vacates one cell and rewrites another; only those two
+cells' moves change, and the cells around the vacated one are joined
+up across it. So each color's captures and stacks are kept as sets of
+action indices and updated in place, listing them is a copy, and the
+mandatory-capture check at the end of a turn is an empty-set test.
+"""
+
+from array import array
+
+from server.batch import StateBatch
+from server.tzaar.state import GRID, PIECE_TYPES, setup_random, setup_fixed, create_player
+
+N = GRID.size
+NONE = 255
+COLORS = ("white", "black")
+PHASES = ("config", "play", "game_over")
+SUB_PHASES = (None, "first_action", "second_action")
+SETUPS = ("random", "fixed")
+
+_COLOR_INDEX = {color: i for i, color in enumerate(COLORS)}
+_TYPE_INDEX = {ptype: i for i, ptype in enumerate(PIECE_TYPES)}
+_PHASE_INDEX = {phase: i for i, phase in enumerate(PHASES)}
+_SUB_INDEX = {sub: i for i, sub in enumerate(SUB_PHASES)}
+
+
+def _fixed_board():
+    board = dict.fromkeys(GRID.keys)
+    setup_fixed(board)
+    return board
+
+
+_FIXED_BOARD = _fixed_board()
+_FULL_LINKS = bytes(NONE if n is None else n for steps in GRID.steps for n in steps)
+_FULL_PAIRS = [(c, steps[d]) for c, steps in enumerate(GRID.steps)
+               for d in range(0, 6, 2) if steps[d] is not None]
+
+
+class TzaarBatch(StateBatch):
+    """TZAAR games packed into bytearrays, with incrementally kept move sets."""
+
+    def __init__(self, engine, states):
+        super().__init__(engine, states)
+        n = self.size
+        space = engine.action_space
+        self._setup_offset = space.offset("set_setup")
+        self._capture_offset = space.offset("capture")
+        self._stack_offset = space.offset("stack")
+        self._pass_index = space.offset("pass")
+
+        self.cells = bytearray(n * N)
+        self.types = bytearray(n * N)
+        self.heights = bytearray(n * N)
+        self.links = bytearray([NONE]) * (n * N * 6)
+        self.type_counts = bytearray(n * 6)       # [game][color][type]
+        self.phase = bytearray(n)
+        self.sub_phase = bytearray(n)
+        self.current = bytearray(n)
+        self.opening = bytearray(n)
+        self.winner = array("b", [-1]) * n
+        # Per game and color (index 2 * game + color): legal move indices
+        self.captures = [set() for _ in range(2 * n)]
+        self.stacks = [set() for _ in range(2 * n)]
+        self.player_ids = []
+        self.names = []
+        self.rngs = []
+
+        for i, state in enumerate(states):
+            if state.get("game") != "tzaar":
+                raise ValueError(f"Game {i} is not a tzaar state")
+            self.player_ids.append(list(state["player_ids"]))
+            self.names.append([p["name"] for p in state["players"]])
+            self.rngs.append(dict(state["rng"]))
+            self.phase[i] = _PHASE_INDEX[state["phase"]]
+            self.sub_phase[i] = _SUB_INDEX[state["sub_phase"]]
+            self.current[i] = state["current_player"]
+            self.opening[i] = state["is_opening_move"]
+            if state["winner"] is not None:
+                self.winner[i] = state["player_ids"].index(state["winner"])
+            self._load(i, state["board"])
+
+    # ── Packing ──────────────────────────────────────────
+
+    def _load(self, i, board):
+        """Write a dict board into game i's rows and rebuild its links and move sets."""
+        b = i * N
+        cells, types, heights = self.cells, self.types, self.heights
+        counts = self.type_counts
+        counts[6 * i:6 * i + 6] = bytes(6)
+        for c, key in enumerate(GRID.keys):
+            piece = board[key]
+            if piece is None:
+                cells[b + c] = types[b + c] = heights[b + c] = 0
+                continue
+            color = _COLOR_INDEX[piece["color"]]
+            ptype = _TYPE_INDEX[piece["type"]]
+            cells[b + c] = color + 1
+            types[b + c] = ptype
+            heights[b + c] = piece["height"]
+            counts[6 * i + 3 * color + ptype] += 1
+
+        k = 2 * i - 1
+        for color in (1, 2):
+            self.captures[k + color].clear()
+            self.stacks[k + color].clear()
+        if all(cells[b:b + N]):
+            # A full board, as every setup leaves it: rays see the next cell
+            self.links[b * 6:(b + N) * 6] = _FULL_LINKS
+            pairs = _FULL_PAIRS
+        else:
+            pairs = self._link(i)
+        for p, q in pairs:
+            self._join(b, k, p, q)
+
+    def _link(self, i):
+        """Rebuild game i's links; return every pair of cells that see each other, once."""
+        b = i * N
+        cells, links = self.cells, self.links
+        pairs = []
+        for c in range(N):
+            if not cells[b + c]:
+                continue
+            for d, ray in enumerate(GRID.rays[c]):
+                first = NONE
+                for x in ray:
+                    if cells[b + x]:
+                        first = x
+                        break
+                links[(b + c) * 6 + d] = first
+                if first != NONE and d % 2 == 0:
+                    pairs.append((c, first))
+        return pairs
+
+    def _join(self, b, k, p, q):
+        """Add the moves between occupied cells p and q, which see each other along a line."""
+        cells, heights = self.cells, self.heights
+        cp, cq = cells[b + p], cells[b + q]
+        if cp == cq:
+            stacks = self.stacks[k + cp]
+            stacks.add(self._stack_offset + p * N + q)
+            stacks.add(self._stack_offset + q * N + p)
+        else:
+            hp, hq = heights[b + p], heights[b + q]
+            if hp >= hq:
+                self.captures[k + cp].add(self._capture_offset + p * N + q)
+            if hq >= hp:
+                self.captures[k + cq].add(self._capture_offset + q * N + p)
+
+    def state(self, i):
+        b = i * N
+        cells, types, heights = self.cells, self.types, self.heights
+        board = {}
+        for c, key in enumerate(GRID.keys):
+            owner = cells[b + c]
+            board[key] = None if not owner else {
+                "color": COLORS[owner - 1],
+                "type": PIECE_TYPES[types[b + c]],
+                "height": heights[b + c],
+            }
+        player_ids = self.player_ids[i]
+        winner = self.winner[i]
+        return {
+            "game": "tzaar",
+            "player_ids": list(player_ids),
+            "player_count": 2,
+            "players": [create_player(p, pid, name)
+                        for p, (pid, name) in enumerate(zip(player_ids, self.names[i]))],
+            "board": board,
+            "current_player": self.current[i],
+            "phase": PHASES[self.phase[i]],
+            "sub_phase": SUB_PHASES[self.sub_phase[i]],
+            "is_opening_move": bool(self.opening[i]),
+            "game_over": self.phase[i] == 2,
+            "winner": None if winner < 0 else player_ids[winner],
+            "rng": dict(self.rngs[i]),
+        }
+
+    # ── Queries ──────────────────────────────────────────
+
+    def legal_actions(self, i):
+        """
+        Captures, then (as a second action) stacks and pass. Within each
+        kind the order is the move set's: repeatable for the same games
+        and actions, but not sorted.
+        """
+        phase = self.phase[i]
+        if phase == 1:
+            k = 2 * i + self.current[i]
+            if self.sub_phase[i] == 1:
+                return [*self.captures[k]]
+            return [*self.captures[k], *self.stacks[k], self._pass_index]
+        if phase == 0:
+            return [self._setup_offset, self._setup_offset + 1]
+        return []
+
+    def to_move(self, i):
+        phase = self.phase[i]
+        if phase == 2:
+            return -1
+        return self.current[i] if phase == 1 else 0
+
+    # ── Stepping ─────────────────────────────────────────
+
+    def step(self, actions):
+        self._check_actions(actions)
+        phase, sub_phase, current = self.phase, self.sub_phase, self.current
+        captures, stacks, counts = self.captures, self.stacks, self.type_counts
+        capture_offset, stack_offset = self._capture_offset, self._stack_offset
+        for i, index in enumerate(actions):
+            if index is None:
+                continue
+            if phase[i] != 1:
+                setup = index - self._setup_offset
+                if phase[i] != 0 or not 0 <= setup < len(SETUPS):
+                    raise ValueError(f"Action {index} is not legal in game {i}")
+                self._set_setup(i, setup)
+                continue
+
+            player = current[i]
+            sub = sub_phase[i]
+            k = 2 * i + player
+            if index in captures[k]:
+                from_id, to_id = divmod(index - capture_offset, N)
+                self._move(i, from_id, to_id, True)
+                opponent = 6 * i + 3 * (1 - player)
+                if 0 in counts[opponent:opponent + 3]:
+                    self._end_game_winner(i, player)
+                elif sub == 1 and not self.opening[i]:
+                    sub_phase[i] = 2
+                else:
+                    self.opening[i] = 0
+                    self._advance_turn(i)
+            elif sub == 2 and index in stacks[k]:
+                from_id, to_id = divmod(index - stack_offset, N)
+                self._move(i, from_id, to_id, False)
+                self._advance_turn(i)
+            elif sub == 2 and index == self._pass_index:
+                self._advance_turn(i)
+            else:
+                raise ValueError(f"Action {index} is not legal in game {i}")
+
+    def _set_setup(self, i, setup):
+        if SETUPS[setup] == "random":
+            board = dict.fromkeys(GRID.keys)
+            setup_random(board, self.rngs[i])
+        else:
+            board = _FIXED_BOARD
+        self._load(i, board)
+        self.phase[i] = 1
+        self.sub_phase[i] = 1
+        self.current[i] = 0
+        self.opening[i] = 1
+
+    def _move(self, i, from_id, to_id, capture):
+        """Move the piece at from_id onto to_id, keeping links and move sets current."""
+        b = i * N
+        k = 2 * i - 1                 # move sets of owner code c are at k + c
+        cells, types, heights, links = self.cells, self.types, self.heights, self.links
+        captures, stacks = self.captures, self.stacks
+        capture_offset, stack_offset = self._capture_offset, self._stack_offset
+
+        # Drop every move into or out of the two cells
+        for c in (from_id, to_id):
+            owner = cells[b + c]
+            own_captures, own_stacks = captures[k + owner], stacks[k + owner]
+            capture_from, stack_from = capture_offset + c * N, stack_offset + c * N
+            for x in links[(b + c) * 6:(b + c) * 6 + 6]:
+                if x == NONE:
+                    continue
+                other = cells[b + x]
+                if other == owner:
+                    own_stacks.discard(stack_from + x)
+                    own_stacks.discard(stack_offset + x * N + c)
+                else:
+                    own_captures.discard(capture_from + x)
+                    captures[k + other].discard(capture_offset + x * N + c)
+
+        # Rewrite the two cells
+        owner = cells[b + from_id]
+        if capture:
+            counts = 6 * i + 3 * (cells[b + to_id] - 1)
+            self.type_counts[counts + types[b + to_id]] -= 1
+            heights[b + to_id] = heights[b + from_id]
+            cells[b + to_id] = owner
+        else:
+            counts = 6 * i + 3 * (owner - 1)
+            self.type_counts[counts + types[b + to_id]] -= 1
+            heights[b + to_id] += heights[b + from_id]
+        types[b + to_id] = types[b + from_id]
+        cells[b + from_id] = types[b + from_id] = heights[b + from_id] = 0
+
+        # Join the vacated cell's neighbors across it, line by line
+        base = (b + from_id) * 6
+        for d in range(0, 6, 2):
+            x, y = links[base + d], links[base + d + 1]
+            if x != NONE:
+                links[(b + x) * 6 + d + 1] = y
+            if y != NONE:
+                links[(b + y) * 6 + d] = x
+                if x != NONE:
+                    self._join(b, k, y, x)
+
+        # And add the rewritten cell's moves with everything it sees
+        height = heights[b + to_id]
+        own_captures, own_stacks = captures[k + owner], stacks[k + owner]
+        capture_from, stack_from = capture_offset + to_id * N, stack_offset + to_id * N
+        for x in links[(b + to_id) * 6:(b + to_id) * 6 + 6]:
+            if x == NONE:
+                continue
+            other = cells[b + x]
+            if other == owner:
+                own_stacks.add(stack_from + x)
+                own_stacks.add(stack_offset + x * N + to_id)
+            else:
+                other_height = heights[b + x]
+                if height >= other_height:
+                    own_captures.add(capture_from + x)
+                if other_height >= height:
+                    captures[k + other].add(capture_offset + x * N + to_id)
+
+    def _advance_turn(self, i):
+        player = 1 - self.current[i]
+        self.current[i] = player
+        self.sub_phase[i] = 1
+        if not self.captures[2 * i + player]:
+            self._end_game_winner(i, 1 - player)
+
+    def _end_game_winner(self, i, winner):
+        self.phase[i] = 2
+        self.sub_phase[i] = 0
+        self.winner[i] = winner
@@ -0,0 +1,288 @@
+"""
+TZAAR search bot.
+
+A TZAAR turn is a compulsory capture followed by a capture, a stack or a
+pass, so a whole turn branches roughly as the square of a single action.
+The bot searches each turn as one compound move: a negamax tree whose
+side to move changes only once both actions are made, with depth counted
+in whole turns. On top of that are alpha-beta pruning, a Zobrist-hashed
+transposition table, move ordering (the table's move first, then
+captures of the opponent's scarcest types and tallest stacks), and
+iterative deepening that stops when the time budget runs out.
+
+    bot = TzaarBot(time_budget=1.0)
+    action = bot.choose_action(state)    # one of the engine's valid actions
+
+The engine's API is untouched: the bot reads a state and returns one
+action, and asks again for the turn's second action (the table makes the
+second search cheap). policy() plugs it into server.selfplay:
+
+    python -m server.selfplay tzaar --policy server.tzaar.bot:policy
+"""
+
+import random
+import time
+
+from server.tzaar.state import OPPONENT, PieceIndex
+
+WIN = 1_000_000
+EXACT, LOWER, UPPER = 0, 1, 2
+PASS = ("pass", None, None)
+
+# Scarcity penalty per type left on top: losing a type loses the game,
+# so the last few of a type are worth far more than the first.
+_SCARCITY = [0] + [1200 // count for count in range(1, 31)]
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class _Zobrist:
+    """Random 64-bit codes per (key, color, type, height), drawn on first use."""
+
+    def __init__(self):
+        self._rng = random.Random(0x7A4A)
+        self._codes = {}
+        self.second = self._rng.getrandbits(64)   # mid-turn, second action due
+        self.black = self._rng.getrandbits(64)    # black to move
+
+    def piece(self, key, piece):
+        code_key = (key, piece["color"], piece["type"], piece["height"])
+        code = self._codes.get(code_key)
+        if code is None:
+            code = self._codes[code_key] = self._rng.getrandbits(64)
+        return code
+
+    def board(self, board):
+        code = 0
+        for key, piece in board.items():
+            if piece is not None:
+                code ^= self.piece(key, piece)
+        return code
+
+
+class TzaarBot:
+    """
+    Alpha-beta TZAAR player. time_budget is in seconds per choose_action
+    call; the transposition table is kept between calls (up to
+    table_size entries) so consecutive turns reuse earlier work.
+    """
+
+    def __init__(self, time_budget=1.0, max_depth=10, table_size=1_000_000):
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.table_size = table_size
+        self.table = {}
+        self.zobrist = _Zobrist()
+        self.depth_reached = 0
+        self.nodes = 0
+
+    # ── Entry point ──────────────────────────────────
+
+    def choose_action(self, state):
+        """Return the bot's action for the player to move in a play-phase state."""
+        if state["phase"] != "play" or state["game_over"]:
+            raise ValueError("The bot only plays play-phase positions")
+        color = state["players"][state["current_player"]]["color"]
+        second = state["sub_phase"] == "second_action"
+
+        self.index = PieceIndex(dict(state["board"]))
+        self.hash = self.zobrist.board(self.index.board)
+        # Only White's very first turn ends after one action
+        self.opening = state["is_opening_move"] and not second
+        self.deadline = time.perf_counter() + self.time_budget
+        self.nodes = 0
+        if len(self.table) > self.table_size:
+            self.table.clear()
+
+        best = None
+        for depth in range(1, self.max_depth + 1):
+            try:
+                value, move = self._search_root(color, second, depth)
+            except _OutOfTime:
+                break
+            best, self.depth_reached = move, depth
+            if abs(value) >= WIN:
+                break   # forced result found
+        if best is None:
+            # Not even one turn deep in time: any legal action will do
+            best = self._ordered_moves(color, second, None)[0]
+        kind, from_key, to_key = best
+        if kind == "pass":
+            return {"kind": "pass"}
+        return {"kind": kind, "from": from_key, "to": to_key}
+
+    # ── Search ───────────────────────────────────────
+
+    def _search_root(self, color, second, depth):
+        moves = self._ordered_moves(color, second, self._table_move(color, second))
+        if not moves:
+            raise ValueError("No legal actions")
+        alpha, best = -WIN * 2, None
+        for move in moves:
+            value = self._child_value(color, second, move, depth, alpha, WIN * 2)
+            if best is None or value > alpha:
+                alpha, best = value, move
+        self._store(color, second, depth, EXACT, alpha, best)
+        return alpha, best
+
+    def _negamax(self, color, second, depth, alpha, beta):
+        """Value of the position for color, searching `depth` more turns."""
+        self.nodes += 1
+        if not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise _OutOfTime
+
+        if not second and depth == 0:
+            return self._evaluate(color)
+        if second and depth == 1:
+            return self._last_action_value(color)
+
+        entry = self.table.get(self._key(color, second))
+        table_move = None
+        if entry is not None:
+            entry_depth, flag, value, table_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta:
+                    return value
+                if flag == UPPER and value <= alpha:
+                    return value
+
+        moves = self._ordered_moves(color, second, table_move)
+        if not moves:
+            return -WIN - depth   # no capture to open the turn: lost
+
+        original_alpha = alpha
+        best_value, best_move = None, None
+        for move in moves:
+            value = self._child_value(color, second, move, depth, alpha, beta)
+            if best_value is None or value > best_value:
+                best_value, best_move = value, move
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        flag = UPPER if best_value <= original_alpha else LOWER if best_value >= beta else EXACT
+        self._store(color, second, depth, flag, best_value, best_move)
+        return best_value
+
+    def _child_value(self, color, second, move, depth, alpha, beta):
+        """Make move for color, score the result for color, and take it back."""
+        index, zobrist = self.index, self.zobrist
+        kind, from_key, to_key = move
+        if kind == "pass":
+            return -self._negamax(OPPONENT[color], False, depth - 1, -beta, -alpha)
+
+        board = index.board
+        mover, target = board[from_key], board[to_key]
+        if kind == "capture":
+            index.capture(from_key, to_key)
+        else:
+            index.stack(from_key, to_key)
+        change = zobrist.piece(from_key, mover) ^ zobrist.piece(to_key, target) \
+            ^ zobrist.piece(to_key, board[to_key])
+        self.hash ^= change
+        opening, self.opening = self.opening, False
+        try:
+            if kind == "capture" and index.has_lost(OPPONENT[color]):
+                value = WIN + depth
+            elif not second and not opening:
+                # Same player, second action of the turn
+                value = self._negamax(color, True, depth, alpha, beta)
+            else:
+                value = -self._negamax(OPPONENT[color], False, depth - 1, -beta, -alpha)
+        finally:
+            self.opening = opening
+            self.hash ^= change
+            if kind == "capture":
+                index.undo_capture(from_key, to_key, target)
+            else:
+                index.undo_stack(from_key, to_key, mover, target)
+        return value
+
+    # ── Moves and evaluation ─────────────────────────
+
+    def _ordered_moves(self, color, second, table_move):
+        """color's legal actions, most promising first."""
+        board = self.index.board
+        type_counts = self.index.type_counts[OPPONENT[color]]
+        captures, stacks = [], []
+        for move in self.index.iter_moves(color, stacks=second):
+            if move[0] == "capture":
+                target = board[move[2]]
+                captures.append((_SCARCITY[type_counts[target["type"]]], target["height"], move))
+            else:
+                stacks.append(move)
+        captures.sort(key=lambda c: (c[0], c[1]), reverse=True)
+        moves = [move for _, _, move in captures]
+        if second:
+            moves += stacks
+            moves.append(PASS)
+        if table_move in moves:
+            moves.remove(table_move)
+            moves.insert(0, table_move)
+        return moves
+
+    def _evaluate(self, color):
+        return self._material(color) - self._material(OPPONENT[color])
+
+    def _material(self, color):
+        index = self.index
+        score = 10 * len(index.pieces[color]) + 3 * index.heights[color]
+        for count in index.type_counts[color].values():
+            score -= _SCARCITY[count]
+        return score
+
+    def _last_action_value(self, color):
+        """
+        Value of the search's last second action, worked out without
+        making it. A stack only ever lowers _material (one piece fewer on
+        top, its type no more common), so the best finish is the best
+        capture or a pass.
+        """
+        index = self.index
+        board = index.board
+        opponent_counts = index.type_counts[OPPONENT[color]]
+        gain = 0
+        for _, from_key, to_key in index.iter_moves(color, stacks=False):
+            target = board[to_key]
+            count = opponent_counts[target["type"]]
+            if count == 1:
+                return WIN + 1
+            gain = max(gain, 10 + 3 * target["height"] + _SCARCITY[count - 1] - _SCARCITY[count])
+        return self._evaluate(color) + gain
+
+    # ── Transposition table ──────────────────────────
+
+    def _key(self, color, second):
+        key = self.hash
+        if color == "black":
+            key ^= self.zobrist.black
+        if second:
+            key ^= self.zobrist.second
+        return key
+
+    def _table_move(self, color, second):
+        entry = self.table.get(self._key(color, second))
+        return entry[3] if entry is not None else None
+
+    def _store(self, color, second, depth, flag, value, move):
+        self.table[self._key(color, second)] = (depth, flag, value, move)
+
+
+# ── Self-play policy ─────────────────────────────────
+
+_default_bot = None
+
+
+def policy(engine, state, player_id, actions, rng):
+    """server.selfplay policy: search play-phase positions, pick setup at random."""
+    global _default_bot
+    if state["phase"] != "play":
+        return rng.choice(actions)
+    if _default_bot is None:
+        _default_bot = TzaarBot()
+    return _default_bot.choose_action(state)
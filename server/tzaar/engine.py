@@ -2,22 +2,71 @@
 
 from copy import deepcopy
 
+from server.action_space import ActionSpace
 from server.game_engine import GameEngine, ActionResult
+from server.log_events import log_event
+from server.snapshot import SnapshotCodec
+from server.tzaar.batch import TzaarBatch
+from server.rng import new_rng
 from server.tzaar.state import (
     PIECE_TYPES,
-    hex_key, parse_hex, generate_board, create_player,
+    generate_board, create_player,
     setup_random, setup_fixed,
-    find_captures, find_stacks, find_line_target,
-    check_loss, get_type_counts,
+    OPPONENT, PieceIndex, iter_line_targets,
+)
+
+
+# ── Action space ─────────────────────────────────────
+
+_POSITIONS = list(generate_board())
+
+ACTION_SPACE = ActionSpace([
+    ("set_setup", [("setup", ["random", "fixed"])]),
+    ("capture", [("from", _POSITIONS), ("to", _POSITIONS)]),
+    ("stack", [("from", _POSITIONS), ("to", _POSITIONS)]),
+    ("pass", []),
+])
+
+
+# ── Log events ───────────────────────────────────
+
+LOG_EVENTS = {
+    "setup_random": "Random setup. White opens with a single capture.",
+    "setup_fixed": "Fixed setup. White opens with a single capture.",
+    "capture": "{player} captured at {position} (height {height} vs {target_height}).",
+    "stack": "{player} stacked at {position} (now height {height}).",
+    "pass": "{player} passed their second action.",
+    "no_captures": "{player} has no valid captures — loses!",
+    "win": "{player} wins!",
+}
+
+
+# ── Snapshots ────────────────────────────────────────
+
+SNAPSHOT_CODEC = SnapshotCodec(
+    "tzaar",
+    strings=[
+        "game", "player_ids", "player_count", "players", "board", "current_player", "phase",
+        "sub_phase", "is_opening_move", "game_over", "winner", "rng", "seed", "draws",
+        "index", "player_id", "name", "color",
+        "tzaar", "white", "black", "config", "play", "first_action", "second_action",
+    ],
+    atoms=[{"color": color, "type": ptype, "height": height}
+           for height in range(1, 11) for color in ("white", "black") for ptype in PIECE_TYPES],
+    boards=[_POSITIONS],
 )
 
 
 class TzaarEngine(GameEngine):
     player_count_range = (2, 2)
+    action_space = ACTION_SPACE
+    log_events = LOG_EVENTS
+    snapshot_codec = SNAPSHOT_CODEC
+    batch_class = TzaarBatch
 
     # ── Abstract method implementations ──────────────────
 
-    def initial_state(self, player_ids, player_names):
+    def initial_state(self, player_ids, player_names, seed=None):
         players = [
             create_player(i, pid, name)
             for i, (pid, name) in enumerate(zip(player_ids, player_names))
@@ -34,26 +83,30 @@ class TzaarEngine(GameEngine):
             "is_opening_move": True,
             "game_over": False,
             "winner": None,
+            "rng": new_rng(seed),
         }
 
     def get_player_view(self, state, player_id):
         view = deepcopy(state)
+        view.pop("rng", None)
         view["your_player_id"] = player_id
         view["valid_actions"] = self.get_valid_actions(state, player_id)
         return view
 
     def get_valid_actions(self, state, player_id):
+        return list(self.iter_valid_actions(state, player_id))
+
+    def iter_valid_actions(self, state, player_id):
         if state["game_over"]:
-            return []
+            return
         player_idx = self._player_index(state, player_id)
         if player_idx is None:
-            return []
+            return
 
         if state["phase"] == "config":
-            return self._valid_config_actions(state, player_idx)
+            yield from self._iter_config_actions(state, player_idx)
         elif state["phase"] == "play":
-            return self._valid_play_actions(state, player_idx)
-        return []
+            yield from self._iter_play_actions(state, player_idx)
 
     def apply_action(self, state, player_id, action):
         state = deepcopy(state)
@@ -109,13 +162,11 @@ class TzaarEngine(GameEngine):
 
     # ── Config phase ─────────────────────────────────────
 
-    def _valid_config_actions(self, state, player_idx):
+    def _iter_config_actions(self, state, player_idx):
         if player_idx != 0:
-            return []
-        return [
-            {"kind": "set_setup", "setup": "random"},
-            {"kind": "set_setup", "setup": "fixed"},
-        ]
+            return
+        yield {"kind": "set_setup", "setup": "random"}
+        yield {"kind": "set_setup", "setup": "fixed"}
 
     def _apply_set_setup(self, state, player_idx, action):
         if state["phase"] != "config":
@@ -128,7 +179,7 @@ class TzaarEngine(GameEngine):
             raise ValueError("Setup must be 'random' or 'fixed'")
 
         if setup == "random":
-            setup_random(state["board"])
+            setup_random(state["board"], state["rng"])
         else:
             setup_fixed(state["board"])
 
@@ -137,39 +188,32 @@ class TzaarEngine(GameEngine):
         state["current_player"] = 0  # White goes first
         state["is_opening_move"] = True
 
-        setup_name = "Random" if setup == "random" else "Fixed"
-        log = [f"{setup_name} setup. White opens with a single capture."]
+        log = [log_event(f"setup_{setup}")]
         return ActionResult(state, log=log)
 
     # ── Play phase: valid actions ────────────────────────
 
-    def _valid_play_actions(self, state, player_idx):
+    def _iter_play_actions(self, state, player_idx):
         if player_idx != state["current_player"]:
-            return []
+            return
 
         sub = state.get("sub_phase")
         player_color = state["players"][player_idx]["color"]
 
         if sub == "first_action":
             # Must capture
-            captures = find_captures(state["board"], player_color)
-            return [{"kind": "capture", "from": c["from"], "to": c["to"]} for c in captures]
-
+            moves = PieceIndex(state["board"]).iter_moves(player_color, stacks=False)
         elif sub == "second_action":
-            actions = []
-            # Can capture
-            captures = find_captures(state["board"], player_color)
-            for c in captures:
-                actions.append({"kind": "capture", "from": c["from"], "to": c["to"]})
-            # Can stack
-            stacks = find_stacks(state["board"], player_color)
-            for s in stacks:
-                actions.append({"kind": "stack", "from": s["from"], "to": s["to"]})
-            # Can always pass
-            actions.append({"kind": "pass"})
-            return actions
+            # Can capture or stack
+            moves = PieceIndex(state["board"]).iter_moves(player_color)
+        else:
+            return
 
-        return []
+        for kind, from_key, to_key in moves:
+            yield {"kind": kind, "from": from_key, "to": to_key}
+        if sub == "second_action":
+            # Can always pass
+            yield {"kind": "pass"}
 
     # ── Play phase: apply actions ────────────────────────
 
@@ -192,7 +236,7 @@ class TzaarEngine(GameEngine):
         target = board.get(to_key)
         player = state["players"][player_idx]
         player_color = player["color"]
-        opp_color = "black" if player_color == "white" else "white"
+        opp_color = OPPONENT[player_color]
 
         if not attacker or attacker["color"] != player_color:
             raise ValueError("No piece of yours at source")
@@ -205,13 +249,13 @@ class TzaarEngine(GameEngine):
         self._validate_line_move(board, from_key, to_key)
 
         # Execute capture
-        board[to_key] = attacker
-        board[from_key] = None
+        index = PieceIndex(board)
+        index.capture(from_key, to_key)
 
-        log = [f"{player['name']} captured at {to_key} (height {attacker['height']} vs {target['height']})."]
+        log = [log_event("capture", player_idx, to_key, attacker["height"], target["height"])]
 
         # Check win: did opponent lose a type?
-        if check_loss(board, opp_color):
+        if index.has_lost(opp_color):
             return self._end_game_winner(state, player_idx, log)
 
         # Advance phase
@@ -219,13 +263,13 @@ class TzaarEngine(GameEngine):
             if state["is_opening_move"]:
                 # White's first turn — only one action
                 state["is_opening_move"] = False
-                return self._advance_turn(state, log)
+                return self._advance_turn(state, log, index)
             else:
                 state["sub_phase"] = "second_action"
                 return ActionResult(state, log=log)
         else:
             # second_action capture — turn is done
-            return self._advance_turn(state, log)
+            return self._advance_turn(state, log, index)
 
     def _apply_stack(self, state, player_idx, action):
         if state["phase"] != "play" or state.get("sub_phase") != "second_action":
@@ -252,16 +296,12 @@ class TzaarEngine(GameEngine):
         self._validate_line_move(board, from_key, to_key)
 
         # Stack: mover goes on top of base
-        board[to_key] = {
-            "color": player_color,
-            "type": mover["type"],  # top piece determines type
-            "height": mover["height"] + base["height"],
-        }
-        board[from_key] = None
+        index = PieceIndex(board)
+        index.stack(from_key, to_key)
 
-        log = [f"{player['name']} stacked at {to_key} (now height {board[to_key]['height']})."]
+        log = [log_event("stack", player_idx, to_key, board[to_key]["height"])]
 
-        return self._advance_turn(state, log)
+        return self._advance_turn(state, log, index)
 
     def _apply_pass(self, state, player_idx):
         if state["phase"] != "play" or state.get("sub_phase") != "second_action":
@@ -269,21 +309,15 @@ class TzaarEngine(GameEngine):
         if player_idx != state["current_player"]:
             raise ValueError("Not your turn")
 
-        player = state["players"][player_idx]
-        log = [f"{player['name']} passed their second action."]
+        log = [log_event("pass", player_idx)]
 
-        return self._advance_turn(state, log)
+        return self._advance_turn(state, log, PieceIndex(state["board"]))
 
     # ── Movement validation ──────────────────────────────
 
     def _validate_line_move(self, board, from_key, to_key):
         """Validate that to_key is the first occupied space in a straight line from from_key."""
-        from server.tzaar.state import AXIAL_DIRS
-        fq, fr = parse_hex(from_key)
-        tq, tr = parse_hex(to_key)
-
-        for dq, dr in AXIAL_DIRS:
-            target = find_line_target(board, from_key, dq, dr)
+        for target in iter_line_targets(board, from_key):
             if target == to_key:
                 return  # Valid
 
@@ -291,19 +325,16 @@ class TzaarEngine(GameEngine):
 
     # ── Turn advancement ─────────────────────────────────
 
-    def _advance_turn(self, state, log):
+    def _advance_turn(self, state, log, index):
         state["current_player"] = 1 - state["current_player"]
         state["sub_phase"] = "first_action"
 
         # Check if the new current player can capture (mandatory first action)
         player_color = state["players"][state["current_player"]]["color"]
-        captures = find_captures(state["board"], player_color)
-
-        if not captures:
+        if not index.has_capture(player_color):
             # Can't capture → loses
             winner_idx = 1 - state["current_player"]
-            player_name = state["players"][state["current_player"]]["name"]
-            log.append(f"{player_name} has no valid captures — loses!")
+            log.append(log_event("no_captures", state["current_player"]))
             return self._end_game_winner(state, winner_idx, log)
 
         return ActionResult(state, log=log)
@@ -315,8 +346,7 @@ class TzaarEngine(GameEngine):
         state["phase"] = "game_over"
         state["sub_phase"] = None
         state["winner"] = state["players"][winner_idx]["player_id"]
-        p = state["players"][winner_idx]
-        log.append(f"{p['name']} wins!")
+        log.append(log_event("win", winner_idx))
         return ActionResult(state, log=log, game_over=True)
 
     # ── Helpers ──────────────────────────────────────────
@@ -1,6 +1,7 @@
 """TZAAR board geometry, movement, setup, and win detection."""
 
-import random
+from server.hexgrid import AXIAL_DIRS, DIR_INDEX, HexGrid, hex_distance, hex_key, parse_hex
+from server.rng import shuffle
 
 # ── Constants ─────────────────────────────────────────
 
@@ -8,28 +9,12 @@ PIECE_TYPES = ["tzaar", "tzarra", "tott"]
 PIECES_PER_PLAYER = {"tzaar": 6, "tzarra": 9, "tott": 15}
 BOARD_MAX_RADIUS = 4
 
-AXIAL_DIRS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1)]
-
 # Type display labels
 TYPE_LABELS = {"tzaar": "Z", "tzarra": "A", "tott": "T"}
 
 
 # ── Coordinate helpers ────────────────────────────────
 
-def hex_key(q, r):
-    return f"{q},{r}"
-
-
-def parse_hex(key):
-    parts = key.split(",")
-    return int(parts[0]), int(parts[1])
-
-
-def hex_distance(q, r):
-    """Distance from center (0,0)."""
-    return max(abs(q), abs(r), abs(q + r))
-
-
 def is_valid(q, r):
     """On the board: distance 1-4 from center (no center space)."""
     d = hex_distance(q, r)
@@ -57,11 +42,14 @@ def all_positions():
 
 ALL_POSITIONS = all_positions()
 
+# The center space isn't a cell, so rays through it stop there
+GRID = HexGrid(ALL_POSITIONS)
+
 
 # ── Setup ─────────────────────────────────────────────
 
-def setup_random(board):
-    """Randomly assign 30 white + 30 black pieces to the 60 spaces."""
+def setup_random(board, rng):
+    """Randomly assign (from the rng stream) 30 white + 30 black pieces to the 60 spaces."""
     pieces = []
     for color in ("white", "black"):
         for ptype, count in PIECES_PER_PLAYER.items():
@@ -69,7 +57,7 @@ def setup_random(board):
                 pieces.append({"color": color, "type": ptype, "height": 1})
 
     positions = list(board.keys())
-    random.shuffle(pieces)
+    shuffle(rng, pieces)
     for i, key in enumerate(positions):
         board[key] = pieces[i]
 
@@ -105,68 +93,169 @@ def find_line_target(board, from_key, dq, dr):
     """Move in direction (dq, dr) from from_key over empty spaces.
     Return the key of the first occupied space, or None if line goes off board.
     Cannot cross center (0,0) which doesn't exist as a position."""
-    q, r = parse_hex(from_key)
+    return _ray_target(board, GRID.key_rays[from_key][DIR_INDEX[(dq, dr)]])
 
-    while True:
-        q += dq
-        r += dr
 
-        # Check if we hit the center (0,0) — blocked
-        if q == 0 and r == 0:
-            return None
+def iter_line_targets(board, from_key):
+    """Yield the first occupied space in each direction from from_key."""
+    for ray in GRID.key_rays[from_key]:
+        target_key = _ray_target(board, ray)
+        if target_key is not None:
+            yield target_key
 
-        key = hex_key(q, r)
-
-        if key not in board:
-            # Off the board
-            return None
 
+def _ray_target(board, ray):
+    for key in ray:
         if board[key] is not None:
-            # Found an occupied space
             return key
+    return None
+
 
-        # Empty space — continue
+def iter_captures(board, player_color):
+    """Lazily yield valid capture moves for player_color as {"from": key, "to": key}."""
+    for _, from_key, to_key in PieceIndex(board).iter_moves(player_color, stacks=False):
+        yield {"from": from_key, "to": to_key}
 
 
 def find_captures(board, player_color):
     """Find all valid capture moves for player_color.
     Returns list of {"from": key, "to": key}."""
-    opp_color = "black" if player_color == "white" else "white"
-    captures = []
+    return list(iter_captures(board, player_color))
 
-    for key, piece in board.items():
-        if piece is None or piece["color"] != player_color:
-            continue
 
-        for dq, dr in AXIAL_DIRS:
-            target_key = find_line_target(board, key, dq, dr)
-            if target_key is None:
-                continue
-            target = board[target_key]
-            if target["color"] == opp_color and piece["height"] >= target["height"]:
-                captures.append({"from": key, "to": target_key})
+def has_any_capture(board, player_color):
+    """Check whether player_color has at least one capture, stopping at the first."""
+    return PieceIndex(board).has_capture(player_color)
 
-    return captures
+
+def iter_stacks(board, player_color):
+    """Lazily yield valid stacking moves for player_color as {"from": key, "to": key}."""
+    for kind, from_key, to_key in PieceIndex(board).iter_moves(player_color):
+        if kind == "stack":
+            yield {"from": from_key, "to": to_key}
 
 
 def find_stacks(board, player_color):
     """Find all valid stacking moves for player_color.
     Returns list of {"from": key, "to": key}."""
-    stacks = []
+    return list(iter_stacks(board, player_color))
+
+
+# ── Piece index ───────────────────────────────────────
+
+OPPONENT = {"white": "black", "black": "white"}
+
 
-    for key, piece in board.items():
-        if piece is None or piece["color"] != player_color:
-            continue
+class PieceIndex:
+    """
+    Where each color's pieces are and how many of each type are on top.
+
+    Built from a board in one pass, then kept current by capture() and
+    stack(), which also update the board itself (undo_capture() and
+    undo_stack() take them back, for searches). Move generation walks
+    only the mover's pieces, each ray once for both kinds of move, and a
+    loss is a glance at three counters:
 
-        for dq, dr in AXIAL_DIRS:
-            target_key = find_line_target(board, key, dq, dr)
-            if target_key is None:
-                continue
-            target = board[target_key]
-            if target["color"] == player_color:
-                stacks.append({"from": key, "to": target_key})
+        index = PieceIndex(board)
+        index.capture(from_key, to_key)
+        if index.has_lost("black"): ...
+    """
 
-    return stacks
+    __slots__ = ("board", "pieces", "type_counts", "heights")
+
+    def __init__(self, board):
+        self.board = board
+        self.pieces = {"white": set(), "black": set()}
+        self.type_counts = {color: {t: 0 for t in PIECE_TYPES} for color in self.pieces}
+        self.heights = {color: 0 for color in self.pieces}   # total pieces, stacks included
+        for key, piece in board.items():
+            if piece is not None:
+                self.pieces[piece["color"]].add(key)
+                self.type_counts[piece["color"]][piece["type"]] += 1
+                self.heights[piece["color"]] += piece["height"]
+
+    def _in_board_order(self, color):
+        return sorted(self.pieces[color], key=GRID.ids.__getitem__)
+
+    def iter_moves(self, color, stacks=True):
+        """
+        Yield ("capture" | "stack", from_key, to_key) for color's moves:
+        every capture, then (if stacks) every stack, each in board order.
+        """
+        board = self.board
+        key_rays = GRID.key_rays
+        stack_moves = []
+        for key in self._in_board_order(color):
+            height = board[key]["height"]
+            for ray in key_rays[key]:
+                for target_key in ray:
+                    target = board[target_key]
+                    if target is not None:
+                        break
+                else:
+                    continue
+                if target["color"] != color:
+                    if height >= target["height"]:
+                        yield "capture", key, target_key
+                elif stacks:
+                    stack_moves.append(("stack", key, target_key))
+        yield from stack_moves
+
+    def has_capture(self, color):
+        return next(self.iter_moves(color, stacks=False), None) is not None
+
+    def capture(self, from_key, to_key):
+        """Move the piece at from_key onto the opponent piece at to_key, taking it."""
+        board = self.board
+        attacker, target = board[from_key], board[to_key]
+        color = attacker["color"]
+        self.pieces[color].remove(from_key)
+        self.pieces[color].add(to_key)
+        self.pieces[target["color"]].remove(to_key)
+        self.type_counts[target["color"]][target["type"]] -= 1
+        self.heights[target["color"]] -= target["height"]
+        board[to_key] = attacker
+        board[from_key] = None
+        return target
+
+    def stack(self, from_key, to_key):
+        """Move the piece at from_key on top of its own color's piece at to_key."""
+        board = self.board
+        mover, base = board[from_key], board[to_key]
+        color = mover["color"]
+        self.pieces[color].remove(from_key)
+        self.type_counts[color][base["type"]] -= 1
+        board[to_key] = {
+            "color": color,
+            "type": mover["type"],  # top piece determines type
+            "height": mover["height"] + base["height"],
+        }
+        board[from_key] = None
+        return base
+
+    def undo_capture(self, from_key, to_key, target):
+        """Reverse capture(from_key, to_key), which returned target."""
+        board = self.board
+        attacker = board[to_key]
+        color = attacker["color"]
+        self.pieces[color].remove(to_key)
+        self.pieces[color].add(from_key)
+        self.pieces[target["color"]].add(to_key)
+        self.type_counts[target["color"]][target["type"]] += 1
+        self.heights[target["color"]] += target["height"]
+        board[from_key] = attacker
+        board[to_key] = target
+
+    def undo_stack(self, from_key, to_key, mover, base):
+        """Reverse stack(from_key, to_key) of mover onto base."""
+        self.pieces[mover["color"]].add(from_key)
+        self.type_counts[mover["color"]][base["type"]] += 1
+        self.board[from_key] = mover
+        self.board[to_key] = base
+
+    def has_lost(self, color):
+        """Is any piece type missing from the tops of color's stacks?"""
+        return 0 in self.type_counts[color].values()
 
 
 # ── Win condition ─────────────────────────────────────
@@ -174,22 +263,12 @@ def find_stacks(board, player_color):
 def check_loss(board, color):
     """Check if 'color' has lost — missing any piece type on the board.
     Only the TOP piece of a stack counts for type."""
-    type_counts = {t: 0 for t in PIECE_TYPES}
-
-    for piece in board.values():
-        if piece is not None and piece["color"] == color:
-            type_counts[piece["type"]] += 1
-
-    return any(count == 0 for count in type_counts.values())
+    return PieceIndex(board).has_lost(color)
 
 
 def get_type_counts(board, color):
     """Count visible types for a color (top of stacks only)."""
-    counts = {t: 0 for t in PIECE_TYPES}
-    for piece in board.values():
-        if piece is not None and piece["color"] == color:
-            counts[piece["type"]] += 1
-    return counts
+    return dict(PieceIndex(board).type_counts[color])
 
 
 # ── Player creation ───────────────────────────────────
@@ -0,0 +1,123 @@
+"""
+Declarative hidden-information views.
+
+Engines list which parts of their state are private and how each is
+summarized; build_view then produces a player's view by copying only the
+containers on the way to a redacted value. Everything else in the view is
+shared by reference with the state, so views must be treated as
+read-only (serialize them, don't mutate them). Setting top-level keys on
+the returned view is fine — the root is always a fresh dict.
+
+    REDACTIONS = [
+        Private(("players", "*", "hand"), count, owner="player_id"),
+        Private(("draw_pile",), count, rename="draw_pile_count"),
+    ]
+    view = build_view(state, REDACTIONS, viewer_id)
+
+A "*" path step matches every element of a list or every value of a dict.
+owner names who may see the values under a "*" step:
+  None          — nobody (e.g. a face-down deck)
+  "<field>"     — the "*"-matched item's field holding a player id
+  BY_INDEX      — the "*" index is the player's seat in state["player_ids"]
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+BY_INDEX = object()
+DROP = object()
+
+
+@dataclass(frozen=True)
+class Private:
+    path: tuple
+    summarize: Callable[[Any], Any]
+    owner: Any = None
+    rename: str | None = None     # store the summary under this key instead
+    # summarize may return DROP to leave the key out of the view entirely
+
+
+# ── Summaries ────────────────────────────────────────────
+
+def count(value):
+    """Replace a collection with its size."""
+    return len(value)
+
+
+def hidden_items(value):
+    """Replace each item with a {"hidden": True} placeholder, keeping the count."""
+    return [{"hidden": True} for _ in value]
+
+
+def keep_fields(*fields):
+    """Keep only the named fields of each item (e.g. a card's type)."""
+    def summarize(value):
+        return [{f: item[f] for f in fields if f in item} for item in value]
+    return summarize
+
+
+def drop(value):
+    """Leave the value out of the view."""
+    return DROP
+
+
+def top_and_count(value):
+    """Show only the top item of a pile, plus its size."""
+    return {"top": value[-1] if value else None, "count": len(value)}
+
+
+# ── Builder ──────────────────────────────────────────────
+
+def build_view(state, redactions, viewer_id):
+    """Return viewer_id's view of state with every Private rule applied."""
+    view = dict(state)
+    copies = {id(state): view}
+    for rule in redactions:
+        _apply(state, view, rule, 0, viewer_id, copies, state)
+    return view
+
+
+def _own_copy(original, copies):
+    copy = copies.get(id(original))
+    if copy is None:
+        copy = list(original) if isinstance(original, list) else dict(original)
+        copies[id(original)] = copy
+    return copy
+
+
+def _visible_to(rule, viewer_id, owner_key, owner_item, state):
+    if rule.owner is None or viewer_id is None:
+        return False
+    if rule.owner is BY_INDEX:
+        player_ids = state["player_ids"]
+        return isinstance(owner_key, int) and owner_key < len(player_ids) and player_ids[owner_key] == viewer_id
+    return isinstance(owner_item, dict) and owner_item.get(rule.owner) == viewer_id
+
+
+def _apply(original, copy, rule, depth, viewer_id, copies, state):
+    """Walk rule.path from `original`, whose writable twin is `copy`."""
+    step = rule.path[depth]
+    last = depth == len(rule.path) - 1
+    if step == "*":
+        keys = range(len(original)) if isinstance(original, list) else list(original)
+    elif isinstance(original, dict) and step in original:
+        keys = [step]
+    else:
+        return
+    for key in keys:
+        child = original[key]
+        if step == "*" and _visible_to(rule, viewer_id, key, child, state):
+            continue
+        if last:
+            value = rule.summarize(child)
+            if value is DROP:
+                del copy[key]
+            elif rule.rename and isinstance(copy, dict):
+                del copy[key]
+                copy[rule.rename] = value
+            else:
+                copy[key] = value
+        elif isinstance(child, (dict, list)):
+            child_copy = _own_copy(child, copies)
+            copy[key] = child_copy
+            _apply(child, child_copy, rule, depth + 1, viewer_id, copies, state)
@@ -0,0 +1,439 @@
+"""
+Packed YINSH batches (see server.batch).
+
+Every game's board is one row of GRID.size bytes in a flat bytearray:
+0 empty, 1/2 a white/black ring, 3/4 a white/black marker. Next to it
+each game keeps its rings and markers as bitboards (one int per color,
+bit i is cell i, as in server.yinsh.bitboard) so rows are tested
+against precomputed 5-cell window masks. Pending rows are window ids,
+which are also the select_row action fields. A ring move is checked
+against the cells between its ends, a precomputed slice of the ray, and
+only lines through the lifted ring and the flipped markers are tested
+for rows afterwards.
+"""
+
+from array import array
+
+from server.batch import StateBatch
+from server.yinsh.bitboard import BITS, ids_of, mask_of
+from server.yinsh.state import GRID, ROW_LENGTH, RINGS_PER_PLAYER, create_player
+
+N = GRID.size
+COLORS = ("white", "black")
+PHASES = ("config", "placement", "main", "game_over")
+SUB_PHASES = (None, "place_marker", "move_ring", "remove_row", "remove_ring")
+MODES = ("normal", "blitz")
+RINGS_TO_WIN = {"normal": 3, "blitz": 1}
+
+EMPTY, RING, MARKER = 0, 1, 3         # cell code = kind + color index
+
+
+def _row_windows():
+    """
+    Every row window, numbered in select_row order: (masks, keys, per
+    line (line mask, [(window, mask), ...])).
+    """
+    masks, keys, lines = [], [], []
+    for line in GRID.lines:
+        windows = []
+        for start in range(len(line) - ROW_LENGTH + 1):
+            cells = line[start:start + ROW_LENGTH]
+            windows.append((len(masks), mask_of(cells)))
+            masks.append(mask_of(cells))
+            keys.append(GRID.to_keys(cells))
+        lines.append((mask_of(line), windows))
+    return masks, keys, lines
+
+
+def _between():
+    """between[a * N + b]: the cells strictly between a and b, or None off a line."""
+    between = [None] * (N * N)
+    for a in range(N):
+        for ray in GRID.rays[a]:
+            for k, b in enumerate(ray):
+                between[a * N + b] = ray[:k]
+    return between
+
+
+WINDOW_MASKS, WINDOW_KEYS, LINE_WINDOWS = _row_windows()
+WINDOW_IDS = {frozenset(keys): w for w, keys in enumerate(WINDOW_KEYS)}
+BETWEEN = _between()
+_PHASE_INDEX = {phase: i for i, phase in enumerate(PHASES)}
+_SUB_INDEX = {sub: i for i, sub in enumerate(SUB_PHASES)}
+
+
+class YinshBatch(StateBatch):
+    """YINSH games packed into a bytearray board per game plus bitboards."""
+
+    def __init__(self, engine, states):
+        super().__init__(engine, states)
+        n = self.size
+        space = engine.action_space
+        self._set_mode_offset = space.offset("set_mode")
+        self._place_ring_offset = space.offset("place_ring")
+        self._place_marker_offset = space.offset("place_marker")
+        self._move_ring_offset = space.offset("move_ring")
+        self._select_row_offset = space.offset("select_row")
+        self._remove_ring_offset = space.offset("remove_ring")
+        self._pass_index = space.offset("pass")
+
+        self.cells = bytearray(n * N)
+        self.phase = bytearray(n)
+        self.sub_phase = bytearray(n)
+        self.current = bytearray(n)
+        self.rings_to_win = bytearray(n)
+        self.rings_placed = bytearray(n)
+        self.markers_remaining = bytearray(n)
+        self.active_ring = array("b", [-1]) * n
+        self.row_player = array("b", [-1]) * n
+        self.winner = array("b", [-1]) * n
+        self.rings_on_board = bytearray(2 * n)    # [game][player]
+        self.rings_removed = bytearray(2 * n)
+        # Bitboards per game and color (index 2 * game + color)
+        self.rings = [0] * (2 * n)
+        self.markers = [0] * (2 * n)
+        self.pending_rows = [[] for _ in range(n)]
+        self.opponent_pending_rows = [[] for _ in range(n)]
+        self.player_ids = []
+        self.names = []
+
+        for i, state in enumerate(states):
+            if state.get("game") != "yinsh":
+                raise ValueError(f"Game {i} is not a yinsh state")
+            self.player_ids.append(list(state["player_ids"]))
+            self.names.append([p["name"] for p in state["players"]])
+            for p, player in enumerate(state["players"]):
+                self.rings_on_board[2 * i + p] = player["rings_on_board"]
+                self.rings_removed[2 * i + p] = player["rings_removed"]
+            self.phase[i] = _PHASE_INDEX[state["phase"]]
+            self.sub_phase[i] = _SUB_INDEX[state["sub_phase"]]
+            self.current[i] = state["current_player"]
+            self.rings_to_win[i] = state["rings_to_win"]
+            self.rings_placed[i] = state["rings_placed"]
+            self.markers_remaining[i] = state["markers_remaining"]
+            if state["active_ring"] is not None:
+                self.active_ring[i] = GRID.ids[state["active_ring"]]
+            if state["row_player"] is not None:
+                self.row_player[i] = state["row_player"]
+            if state["winner"] is not None:
+                self.winner[i] = state["player_ids"].index(state["winner"])
+            self.pending_rows[i] = [WINDOW_IDS[frozenset(r)] for r in state["pending_rows"]]
+            self.opponent_pending_rows[i] = [WINDOW_IDS[frozenset(r)]
+                                             for r in state["opponent_pending_rows"]]
+            b = i * N
+            for c, key in enumerate(GRID.keys):
+                cell = state["board"][key]
+                if cell is None:
+                    continue
+                color = COLORS.index(cell["color"])
+                if cell["type"] == "ring":
+                    self.cells[b + c] = RING + color
+                    self.rings[2 * i + color] |= BITS[c]
+                else:
+                    self.cells[b + c] = MARKER + color
+                    self.markers[2 * i + color] |= BITS[c]
+
+    # ── Unpacking ────────────────────────────────────────
+
+    def state(self, i):
+        b = i * N
+        cells = self.cells
+        board = {}
+        for c, key in enumerate(GRID.keys):
+            code = cells[b + c]
+            board[key] = None if code == EMPTY else {
+                "type": "ring" if code < MARKER else "marker",
+                "color": COLORS[(code - 1) % 2],
+            }
+        player_ids = self.player_ids[i]
+        players = []
+        for p, (pid, name) in enumerate(zip(player_ids, self.names[i])):
+            player = create_player(p, pid, name)
+            player["rings_on_board"] = self.rings_on_board[2 * i + p]
+            player["rings_removed"] = self.rings_removed[2 * i + p]
+            players.append(player)
+        active, row_player, winner = self.active_ring[i], self.row_player[i], self.winner[i]
+        return {
+            "game": "yinsh",
+            "player_ids": list(player_ids),
+            "player_count": 2,
+            "players": players,
+            "board": board,
+            "markers_remaining": self.markers_remaining[i],
+            "current_player": self.current[i],
+            "rings_to_win": self.rings_to_win[i],
+            "phase": PHASES[self.phase[i]],
+            "sub_phase": SUB_PHASES[self.sub_phase[i]],
+            "rings_placed": self.rings_placed[i],
+            "active_ring": None if active < 0 else GRID.keys[active],
+            "pending_rows": [list(WINDOW_KEYS[w]) for w in self.pending_rows[i]],
+            "opponent_pending_rows": [list(WINDOW_KEYS[w]) for w in self.opponent_pending_rows[i]],
+            "row_player": None if row_player < 0 else row_player,
+            "game_over": self.phase[i] == 3,
+            "winner": None if winner < 0 else player_ids[winner],
+        }
+
+    # ── Queries ──────────────────────────────────────────
+
+    def legal_actions(self, i):
+        phase = self.phase[i]
+        if phase == 2:
+            sub = self.sub_phase[i]
+            if sub == 2:
+                return self._ring_moves(i)
+            if sub == 1:
+                rings = self.rings[2 * i + self.current[i]]
+                if not rings:
+                    return [self._pass_index]
+                return [self._place_marker_offset + c for c in ids_of(rings)]
+            row_player = self.row_player[i]
+            if row_player < 0:
+                return []
+            if sub == 3:
+                rows = (self.pending_rows[i] if row_player == self.current[i]
+                        else self.opponent_pending_rows[i])
+                return [self._select_row_offset + w for w in rows]
+            return [self._remove_ring_offset + c for c in ids_of(self.rings[2 * i + row_player])]
+        if phase == 1:
+            b = i * N
+            cells = self.cells
+            return [self._place_ring_offset + c for c in range(N) if not cells[b + c]]
+        if phase == 0:
+            return [self._set_mode_offset, self._set_mode_offset + 1]
+        return []
+
+    def _ring_moves(self, i):
+        """Destinations of game i's lifted ring, in find_ring_moves order."""
+        b = i * N
+        cells = self.cells
+        offset = self._move_ring_offset
+        moves = []
+        for ray in GRID.rays[self.active_ring[i]]:
+            jumping = False
+            for c in ray:
+                code = cells[b + c]
+                if code == EMPTY:
+                    moves.append(offset + c)
+                    if jumping:
+                        break
+                elif code >= MARKER:
+                    jumping = True
+                else:
+                    break
+        return moves
+
+    def to_move(self, i):
+        phase = self.phase[i]
+        if phase == 3:
+            return -1
+        if phase == 0:
+            return 0
+        if self.sub_phase[i] >= 3 and self.row_player[i] >= 0:
+            return self.row_player[i]
+        return self.current[i]
+
+    # ── Stepping ─────────────────────────────────────────
+
+    def step(self, actions):
+        self._check_actions(actions)
+        phase, sub_phase = self.phase, self.sub_phase
+        move_ring, place_marker = self._move_ring_offset, self._place_marker_offset
+        select_row, remove_ring = self._select_row_offset, self._remove_ring_offset
+        for i, index in enumerate(actions):
+            if index is None:
+                continue
+            sub = sub_phase[i] if phase[i] == 2 else 0
+            if sub == 2 and move_ring <= index < move_ring + N:
+                self._move_ring(i, index - move_ring)
+            elif sub == 1 and place_marker <= index < place_marker + N:
+                self._place_marker(i, index - place_marker)
+            elif sub == 3 and select_row <= index < select_row + len(WINDOW_MASKS):
+                self._select_row(i, index - select_row)
+            elif sub == 4 and remove_ring <= index < remove_ring + N:
+                self._remove_ring(i, index - remove_ring)
+            elif sub == 1 and index == self._pass_index:
+                self._pass(i)
+            elif phase[i] == 1 and self._place_ring_offset <= index < self._place_ring_offset + N:
+                self._place_ring(i, index - self._place_ring_offset)
+            elif phase[i] == 0 and 0 <= index - self._set_mode_offset < len(MODES):
+                self._set_mode(i, MODES[index - self._set_mode_offset])
+            else:
+                self._illegal(i, index)
+
+    @staticmethod
+    def _illegal(i, index):
+        raise ValueError(f"Action {index} is not legal in game {i}")
+
+    def _set_mode(self, i, mode):
+        self.rings_to_win[i] = RINGS_TO_WIN[mode]
+        self.phase[i] = 1
+        self.current[i] = 0
+
+    def _place_ring(self, i, c):
+        if self.cells[i * N + c] != EMPTY:
+            self._illegal(i, self._place_ring_offset + c)
+        player = self.current[i]
+        self.cells[i * N + c] = RING + player
+        self.rings[2 * i + player] |= BITS[c]
+        self.rings_on_board[2 * i + player] += 1
+        self.rings_placed[i] += 1
+        if self.rings_placed[i] >= RINGS_PER_PLAYER * 2:
+            self.phase[i] = 2
+            self.sub_phase[i] = 1
+            self.current[i] = 0
+        else:
+            self.current[i] = 1 - player
+
+    def _place_marker(self, i, c):
+        player = self.current[i]
+        k = 2 * i + player
+        if not self.rings[k] & BITS[c] or self.markers_remaining[i] <= 0:
+            self._illegal(i, self._place_marker_offset + c)
+        self.cells[i * N + c] = MARKER + player
+        self.rings[k] ^= BITS[c]
+        self.markers[k] |= BITS[c]
+        self.markers_remaining[i] -= 1
+        self.active_ring[i] = c
+        self.sub_phase[i] = 2
+
+    def _move_ring(self, i, to_id):
+        b = i * N
+        cells = self.cells
+        from_id = self.active_ring[i]
+        between = BETWEEN[from_id * N + to_id]
+        if between is None or cells[b + to_id] != EMPTY:
+            self._illegal(i, self._move_ring_offset + to_id)
+        # Legal when the cells between are empties then one stretch of markers
+        flipped = []
+        for c in between:
+            code = cells[b + c]
+            if code >= MARKER:
+                flipped.append(c)
+            elif code != EMPTY or flipped:
+                self._illegal(i, self._move_ring_offset + to_id)
+
+        player = self.current[i]
+        cells[b + to_id] = RING + player
+        self.rings[2 * i + player] |= BITS[to_id]
+        if flipped:
+            mask = 0
+            for c in flipped:
+                cells[b + c] ^= 7          # 3 <-> 4
+                mask |= BITS[c]
+            self.markers[2 * i] ^= mask
+            self.markers[2 * i + 1] ^= mask
+        self.active_ring[i] = -1
+
+        lines = sorted({n for c in [from_id] + flipped for n in GRID.lines_through[c]})
+        my_rows = self._rows(i, player, lines)
+        opponent_rows = self._rows(i, 1 - player, lines)
+        self.pending_rows[i] = my_rows
+        self.opponent_pending_rows[i] = opponent_rows
+        if my_rows:
+            self.sub_phase[i] = 3
+            self.row_player[i] = player
+        elif opponent_rows:
+            self.sub_phase[i] = 3
+            self.row_player[i] = 1 - player
+        elif self.markers_remaining[i] <= 0:
+            self._end_game(i)
+        else:
+            self._advance_turn(i)
+
+    def _rows(self, i, color, lines=None):
+        """Window ids of color's rows on the given lines (all lines by default), in line order."""
+        markers = self.markers[2 * i + color]
+        rows = []
+        for line in range(len(LINE_WINDOWS)) if lines is None else lines:
+            line_mask, windows = LINE_WINDOWS[line]
+            if (markers & line_mask).bit_count() < ROW_LENGTH:
+                continue
+            for w, mask in windows:
+                if markers & mask == mask:
+                    rows.append(w)
+        return rows
+
+    def _select_row(self, i, w):
+        row_player = self.row_player[i]
+        mine = row_player == self.current[i]
+        pending = self.pending_rows[i] if mine else self.opponent_pending_rows[i]
+        if w not in pending:
+            self._illegal(i, self._select_row_offset + w)
+        mask = WINDOW_MASKS[w]
+        b = i * N
+        for c in ids_of(mask):
+            self.cells[b + c] = EMPTY
+        self.markers[2 * i] &= ~mask
+        self.markers[2 * i + 1] &= ~mask
+        self.markers_remaining[i] += ROW_LENGTH
+        pending = [r for r in pending if not WINDOW_MASKS[r] & mask]
+        if mine:
+            self.pending_rows[i] = pending
+        else:
+            self.opponent_pending_rows[i] = pending
+        self.sub_phase[i] = 4
+
+    def _remove_ring(self, i, c):
+        row_player = self.row_player[i]
+        k = 2 * i + row_player
+        if not self.rings[k] & BITS[c]:
+            self._illegal(i, self._remove_ring_offset + c)
+        self.cells[i * N + c] = EMPTY
+        self.rings[k] ^= BITS[c]
+        self.rings_on_board[k] -= 1
+        self.rings_removed[k] += 1
+        if self.rings_removed[k] >= self.rings_to_win[i]:
+            self._end_game_winner(i, row_player)
+            return
+
+        mine = row_player == self.current[i]
+        new_rows = self._rows(i, row_player)
+        if mine:
+            self.pending_rows[i] = new_rows
+        else:
+            self.opponent_pending_rows[i] = new_rows
+        if new_rows:
+            self.sub_phase[i] = 3
+            return
+        if mine and self.opponent_pending_rows[i]:
+            opponent_rows = self._rows(i, 1 - row_player)
+            self.opponent_pending_rows[i] = opponent_rows
+            if opponent_rows:
+                self.row_player[i] = 1 - row_player
+                self.sub_phase[i] = 3
+                return
+
+        self.pending_rows[i] = []
+        self.opponent_pending_rows[i] = []
+        self.row_player[i] = -1
+        if self.markers_remaining[i] <= 0:
+            self._end_game(i)
+        else:
+            self._advance_turn(i)
+
+    def _pass(self, i):
+        player = self.current[i]
+        if self.rings[2 * i + player]:
+            self._illegal(i, self._pass_index)
+        self.current[i] = 1 - player
+        if not self.rings[2 * i + 1 - player]:
+            self._end_game(i)
+
+    def _advance_turn(self, i):
+        self.current[i] = 1 - self.current[i]
+        self.sub_phase[i] = 1
+        self.active_ring[i] = -1
+        self.pending_rows[i] = []
+        self.opponent_pending_rows[i] = []
+        self.row_player[i] = -1
+
+    def _end_game_winner(self, i, winner):
+        self.phase[i] = 3
+        self.sub_phase[i] = 0
+        self.winner[i] = winner
+
+    def _end_game(self, i):
+        self.phase[i] = 3
+        self.sub_phase[i] = 0
+        white, black = self.rings_removed[2 * i], self.rings_removed[2 * i + 1]
+        self.winner[i] = 0 if white > black else 1 if black > white else -1
@@ -0,0 +1,138 @@
+"""
+YINSH bitboards.
+
+The wire state keeps the board as a "q,r"-keyed dict. For the engine's
+own work — ring moves, flips and row detection, which run on every move —
+the board is also read into integer bitboards, one bit per cell (bit i is
+GRID cell id i):
+
+    bits = Bitboard.from_board(state["board"])
+    bits.ring_moves(GRID.ids[active])      # [(to_id, flipped_mask), ...]
+    bits.rows("white")                     # same rows, same order as find_rows
+    bits.rows("white", touched)            # only lines through touched cells
+
+Rows are tested against precomputed masks of every 5-cell window, and a
+move's flips are one XOR of both marker boards.
+"""
+
+from server.yinsh.state import GRID, ROW_LENGTH
+
+COLORS = ("white", "black")
+
+BITS = [1 << i for i in range(GRID.size)]
+KEY_BITS = {key: BITS[i] for i, key in enumerate(GRID.keys)}
+
+
+def mask_of(cells):
+    """Bitmask of a sequence of cell ids."""
+    mask = 0
+    for i in cells:
+        mask |= BITS[i]
+    return mask
+
+
+def ids_of(mask):
+    """Cell ids of a bitmask, lowest first."""
+    ids = []
+    while mask:
+        low = mask & -mask
+        ids.append(low.bit_length() - 1)
+        mask ^= low
+    return ids
+
+
+def _row_lines():
+    """Per GRID line: its mask and its ROW_LENGTH windows as (mask, keys), in line order."""
+    lines = []
+    for line in GRID.lines:
+        windows = []
+        for i in range(len(line) - ROW_LENGTH + 1):
+            window = line[i:i + ROW_LENGTH]
+            windows.append((mask_of(window), GRID.to_keys(window)))
+        lines.append((mask_of(line), windows))
+    return lines
+
+
+ROW_LINES = _row_lines()
+
+
+class Bitboard:
+    """Ring and marker occupancy of a YINSH board, one int per kind and color."""
+
+    __slots__ = ("rings", "markers")
+
+    def __init__(self):
+        self.rings = {color: 0 for color in COLORS}
+        self.markers = {color: 0 for color in COLORS}
+
+    @classmethod
+    def from_board(cls, board):
+        bits = cls()
+        rings, markers = bits.rings, bits.markers
+        for key, cell in board.items():
+            if cell is not None:
+                kind = rings if cell["type"] == "ring" else markers
+                kind[cell["color"]] |= KEY_BITS[key]
+        return bits
+
+    def all_markers(self):
+        return self.markers["white"] | self.markers["black"]
+
+    # ── Ring movement ────────────────────────────────
+
+    def ring_moves(self, from_id):
+        """
+        Every destination of a ring at from_id, as (to_id, flipped_mask).
+
+        Same rules and order as state.find_ring_moves: each direction runs
+        over empty cells, jumps one unbroken stretch of markers to the
+        first empty cell after it, and stops at a ring.
+        """
+        rings = self.rings["white"] | self.rings["black"]
+        markers = self.all_markers()
+        moves = []
+        for ray in GRID.rays[from_id]:
+            jumped = 0
+            for cell in ray:
+                bit = BITS[cell]
+                if rings & bit:
+                    break
+                if markers & bit:
+                    jumped |= bit
+                elif jumped:
+                    moves.append((cell, jumped))
+                    break
+                else:
+                    moves.append((cell, 0))
+        return moves
+
+    def land_ring(self, color, to_id, flipped):
+        """Set down a lifted ring at to_id and flip the markers in `flipped`."""
+        self.rings[color] |= BITS[to_id]
+        self.markers["white"] ^= flipped
+        self.markers["black"] ^= flipped
+
+    # ── Rows ─────────────────────────────────────────
+
+    def rows(self, color, touched=None):
+        """
+        Every window of ROW_LENGTH same-color markers, as key lists.
+
+        With `touched` (cell ids), only lines through those cells are
+        scanned. After a ring move that is every row there can be: a turn
+        starts with no rows on the board, and only the lifted ring's marker
+        and the flipped markers change.
+        """
+        markers = self.markers[color]
+        if touched is None:
+            lines = ROW_LINES
+        else:
+            lines = [ROW_LINES[n] for n in sorted({n for i in touched for n in GRID.lines_through[i]})]
+        rows = []
+        for line_mask, windows in lines:
+            if (markers & line_mask).bit_count() < ROW_LENGTH:
+                continue
+            for mask, keys in windows:
+                if markers & mask == mask:
+                    rows.append(list(keys))
+        return rows
@@ -2,20 +2,87 @@
 
 from copy import deepcopy
 
+from server.action_space import ActionSpace
 from server.game_engine import GameEngine, ActionResult
+from server.log_events import log_event
+from server.snapshot import SnapshotCodec
+from server.yinsh.batch import YinshBatch
+from server.yinsh.bitboard import Bitboard, ids_of
 from server.yinsh.state import (
-    RINGS_PER_PLAYER, TOTAL_MARKERS, ROW_LENGTH,
-    hex_key, parse_hex, generate_board, create_player,
-    find_ring_moves, find_rows, rows_are_intersecting,
+    RINGS_PER_PLAYER, TOTAL_MARKERS, ROW_LENGTH, GRID,
+    generate_board, create_player, find_ring_moves, all_row_windows,
+)
+
+
+# ── Action space ─────────────────────────────────────
+
+_POSITIONS = list(generate_board())
+
+ACTION_SPACE = ActionSpace(
+    [
+        ("set_mode", [("mode", ["normal", "blitz"])]),
+        ("place_ring", [("position", _POSITIONS)]),
+        ("place_marker", [("ring", _POSITIONS)]),
+        ("move_ring", [("to", _POSITIONS)]),
+        ("select_row", [("row", all_row_windows())]),
+        ("remove_ring", [("ring", _POSITIONS)]),
+        ("pass", []),
+    ],
+    set_fields=[("select_row", "row")],
+)
+
+
+# ── Log events ───────────────────────────────────
+
+LOG_EVENTS = {
+    "mode_normal": "Game mode: Normal (3 rings). Place your rings!",
+    "mode_blitz": "Game mode: Blitz (1 ring). Place your rings!",
+    "place_ring": "{player} placed a ring at {position}.",
+    "rings_placed": "All rings placed! Movement phase begins.",
+    "place_marker": "{player} placed a marker at {position}.",
+    "move_ring": "{player} moved ring to {position}.",
+    "flip": "Flipped {count} marker(s).",
+    "pass": "{player} passed (no rings on board).",
+    "form_rows": "{player} formed {count} row(s)!",
+    "remove_row": "{player} removed a row of 5 markers.",
+    "remove_ring": "{player} removed a ring ({removed}/{needed}).",
+    "must_remove_rows": "{player} must remove their row(s).",
+    "final_score": "Game over! {first_player}: {first_count} rings removed, "
+                   "{second_player}: {second_count} rings removed.",
+    "win": "{player} wins!",
+    "draw": "It's a draw!",
+}
+
+
+# ── Snapshots ────────────────────────────────────────
+
+SNAPSHOT_CODEC = SnapshotCodec(
+    "yinsh",
+    strings=[
+        "game", "player_ids", "player_count", "players", "board", "markers_remaining",
+        "current_player", "rings_to_win", "phase", "sub_phase", "rings_placed",
+        "active_ring", "pending_rows", "opponent_pending_rows", "row_player",
+        "game_over", "winner",
+        "index", "player_id", "name", "color", "rings_on_board", "rings_removed",
+        "yinsh", "white", "black", "config", "placement", "main",
+        "place_marker", "move_ring", "remove_row", "remove_ring",
+    ],
+    atoms=[{"type": kind, "color": color}
+           for kind in ("ring", "marker") for color in ("white", "black")],
+    boards=[_POSITIONS],
 )
 
 
 class YinshEngine(GameEngine):
     player_count_range = (2, 2)
+    action_space = ACTION_SPACE
+    log_events = LOG_EVENTS
+    snapshot_codec = SNAPSHOT_CODEC
+    batch_class = YinshBatch
 
     # ── Abstract method implementations ──────────────────
 
-    def initial_state(self, player_ids, player_names):
+    def initial_state(self, player_ids, player_names, seed=None):
         players = [
             create_player(i, pid, name)
             for i, (pid, name) in enumerate(zip(player_ids, player_names))
@@ -47,20 +114,22 @@ class YinshEngine(GameEngine):
         return view
 
     def get_valid_actions(self, state, player_id):
+        return list(self.iter_valid_actions(state, player_id))
+
+    def iter_valid_actions(self, state, player_id):
         if state["game_over"]:
-            return []
+            return
         player_idx = self._player_index(state, player_id)
         if player_idx is None:
-            return []
+            return
 
         phase = state["phase"]
         if phase == "config":
-            return self._valid_config_actions(state, player_idx)
+            yield from self._iter_config_actions(state, player_idx)
         elif phase == "placement":
-            return self._valid_placement_actions(state, player_idx)
+            yield from self._iter_placement_actions(state, player_idx)
         elif phase == "main":
-            return self._valid_main_actions(state, player_id, player_idx)
-        return []
+            yield from self._iter_main_actions(state, player_id, player_idx)
 
     def apply_action(self, state, player_id, action):
         state = deepcopy(state)
@@ -135,13 +204,11 @@ class YinshEngine(GameEngine):
 
     # ── Config phase ─────────────────────────────────────
 
-    def _valid_config_actions(self, state, player_idx):
+    def _iter_config_actions(self, state, player_idx):
         if player_idx != 0:
-            return []
-        return [
-            {"kind": "set_mode", "mode": "normal"},
-            {"kind": "set_mode", "mode": "blitz"},
-        ]
+            return
+        yield {"kind": "set_mode", "mode": "normal"}
+        yield {"kind": "set_mode", "mode": "blitz"}
 
     def _apply_set_mode(self, state, player_idx, action):
         if state["phase"] != "config":
@@ -157,20 +224,17 @@ class YinshEngine(GameEngine):
         state["phase"] = "placement"
         state["current_player"] = 0
 
-        mode_name = "Normal (3 rings)" if mode == "normal" else "Blitz (1 ring)"
-        log = [f"Game mode: {mode_name}. Place your rings!"]
+        log = [log_event(f"mode_{mode}")]
         return ActionResult(state, log=log)
 
     # ── Placement phase ──────────────────────────────────
 
-    def _valid_placement_actions(self, state, player_idx):
+    def _iter_placement_actions(self, state, player_idx):
         if player_idx != state["current_player"]:
-            return []
-        actions = []
+            return
         for key, cell in state["board"].items():
             if cell is None:
-                actions.append({"kind": "place_ring", "position": key})
-        return actions
+                yield {"kind": "place_ring", "position": key}
 
     def _apply_place_ring(self, state, player_idx, action):
         if state["phase"] != "placement":
@@ -189,13 +253,13 @@ class YinshEngine(GameEngine):
         player["rings_on_board"] += 1
         state["rings_placed"] += 1
 
-        log = [f"{player['name']} placed a ring at {position}."]
+        log = [log_event("place_ring", player_idx, position)]
 
         if state["rings_placed"] >= RINGS_PER_PLAYER * 2:
             state["phase"] = "main"
             state["sub_phase"] = "place_marker"
             state["current_player"] = 0
-            log.append("All rings placed! Movement phase begins.")
+            log.append(log_event("rings_placed"))
         else:
             state["current_player"] = 1 - state["current_player"]
 
@@ -203,54 +267,58 @@ class YinshEngine(GameEngine):
 
     # ── Main phase: valid actions ────────────────────────
 
-    def _valid_main_actions(self, state, player_id, player_idx):
+    def _iter_main_actions(self, state, player_id, player_idx):
         sub = state.get("sub_phase")
 
         if sub == "place_marker":
             if player_idx != state["current_player"]:
-                return []
+                return
             # List all rings belonging to this player
-            player_color = state["players"][player_idx]["color"]
-            actions = []
-            for key, cell in state["board"].items():
-                if cell and cell["type"] == "ring" and cell["color"] == player_color:
-                    actions.append({"kind": "place_marker", "ring": key})
-            if not actions:
-                actions = [{"kind": "pass"}]
-            return actions
+            has_rings = False
+            for key in self._iter_ring_keys(state, player_idx):
+                has_rings = True
+                yield {"kind": "place_marker", "ring": key}
+            if not has_rings:
+                yield {"kind": "pass"}
 
         elif sub == "move_ring":
             if player_idx != state["current_player"]:
-                return []
+                return
             active = state.get("active_ring")
             if not active:
-                return []
-            moves = find_ring_moves(state["board"], active)
-            return [{"kind": "move_ring", "to": m["to"]} for m in moves]
+                return
+            # Listing walks at most six rays, cheaper than reading bitboards
+            for m in find_ring_moves(state["board"], active):
+                yield {"kind": "move_ring", "to": m["to"]}
 
         elif sub == "remove_row":
             rp = state.get("row_player")
             if player_idx != rp:
-                return []
+                return
             # Determine which pending rows to offer
             if rp == state["current_player"]:
                 rows = state.get("pending_rows", [])
             else:
                 rows = state.get("opponent_pending_rows", [])
-            return [{"kind": "select_row", "row": row} for row in rows]
+            for row in rows:
+                yield {"kind": "select_row", "row": row}
 
         elif sub == "remove_ring":
             rp = state.get("row_player")
             if player_idx != rp:
-                return []
-            player_color = state["players"][player_idx]["color"]
-            actions = []
-            for key, cell in state["board"].items():
-                if cell and cell["type"] == "ring" and cell["color"] == player_color:
-                    actions.append({"kind": "remove_ring", "ring": key})
-            return actions
+                return
+            for key in self._iter_ring_keys(state, player_idx):
+                yield {"kind": "remove_ring", "ring": key}
+
+    def _iter_ring_keys(self, state, player_idx):
+        """Yield the positions of a player's rings on the board."""
+        player_color = state["players"][player_idx]["color"]
+        for key, cell in state["board"].items():
+            if cell and cell["type"] == "ring" and cell["color"] == player_color:
+                yield key
 
-        return []
+    def _has_rings(self, state, player_idx):
+        return next(self._iter_ring_keys(state, player_idx), None) is not None
 
     # ── Main phase: apply actions ────────────────────────
 
@@ -278,7 +346,7 @@ class YinshEngine(GameEngine):
         state["active_ring"] = ring_key
         state["sub_phase"] = "move_ring"
 
-        log = [f"{player['name']} placed a marker at {ring_key}."]
+        log = [log_event("place_marker", player_idx, ring_key)]
         return ActionResult(state, log=log)
 
     def _apply_move_ring(self, state, player_idx, action):
@@ -292,15 +360,14 @@ class YinshEngine(GameEngine):
         if not to_key or not active:
             raise ValueError("Missing destination or no active ring")
 
-        # Validate move
-        moves = find_ring_moves(state["board"], active)
-        valid_move = None
-        for m in moves:
-            if m["to"] == to_key:
-                valid_move = m
-                break
+        if not isinstance(to_key, str) or to_key not in GRID.ids:
+            raise ValueError("Invalid ring destination")
+        from_id, to_id = GRID.ids[active], GRID.ids[to_key]
 
-        if valid_move is None:
+        # Validate move
+        bits = Bitboard.from_board(state["board"])
+        flipped = dict(bits.ring_moves(from_id)).get(to_id)
+        if flipped is None:
             raise ValueError("Invalid ring destination")
 
         player = state["players"][player_idx]
@@ -309,19 +376,22 @@ class YinshEngine(GameEngine):
         state["board"][to_key] = {"type": "ring", "color": player["color"]}
 
         # Flip jumped markers
-        for flip_key in valid_move["flipped"]:
+        flipped_ids = ids_of(flipped)
+        flipped_keys = GRID.to_keys(flipped_ids)
+        for flip_key in flipped_keys:
             cell = state["board"][flip_key]
-            if cell and cell["type"] == "marker":
-                cell["color"] = "white" if cell["color"] == "black" else "black"
+            cell["color"] = "white" if cell["color"] == "black" else "black"
+        bits.land_ring(player["color"], to_id, flipped)
 
         state["active_ring"] = None
 
-        log = [f"{player['name']} moved ring to {to_key}."]
-        if valid_move["flipped"]:
-            log.append(f"Flipped {len(valid_move['flipped'])} marker(s).")
+        log = [log_event("move_ring", player_idx, to_key)]
+        if flipped_keys:
+            log.append(log_event("flip", len(flipped_keys)))
 
-        # Check for rows of 5
-        return self._check_rows_after_move(state, player_idx, log)
+        # Check for rows of 5 on the lines the move changed
+        touched = [from_id] + flipped_ids
+        return self._check_rows_after_move(state, player_idx, log, bits, touched)
 
     def _apply_pass(self, state, player_idx):
         if state["phase"] != "main" or state.get("sub_phase") != "place_marker":
@@ -330,39 +400,29 @@ class YinshEngine(GameEngine):
             raise ValueError("Not your turn")
 
         # Verify no rings to place markers in
-        player_color = state["players"][player_idx]["color"]
-        has_rings = any(
-            cell and cell["type"] == "ring" and cell["color"] == player_color
-            for cell in state["board"].values()
-        )
-        if has_rings:
+        if self._has_rings(state, player_idx):
             raise ValueError("You have rings — cannot pass")
 
         player = state["players"][player_idx]
-        log = [f"{player['name']} passed (no rings on board)."]
+        log = [log_event("pass", player_idx)]
 
         state["current_player"] = 1 - state["current_player"]
 
         # Check if next player also can't move
-        next_color = state["players"][state["current_player"]]["color"]
-        next_has_rings = any(
-            cell and cell["type"] == "ring" and cell["color"] == next_color
-            for cell in state["board"].values()
-        )
-        if not next_has_rings:
+        if not self._has_rings(state, state["current_player"]):
             return self._end_game(state, log)
 
         return ActionResult(state, log=log)
 
     # ── Row handling ─────────────────────────────────────
 
-    def _check_rows_after_move(self, state, player_idx, log):
+    def _check_rows_after_move(self, state, player_idx, log, bits, touched):
         """After a ring move, detect rows for both players and enter removal flow."""
         player_color = state["players"][player_idx]["color"]
         opp_color = state["players"][1 - player_idx]["color"]
 
-        my_rows = find_rows(state["board"], player_color)
-        opp_rows = find_rows(state["board"], opp_color)
+        my_rows = bits.rows(player_color, touched)
+        opp_rows = bits.rows(opp_color, touched)
 
         state["pending_rows"] = my_rows
         state["opponent_pending_rows"] = opp_rows
@@ -370,13 +430,13 @@ class YinshEngine(GameEngine):
         if my_rows:
             state["sub_phase"] = "remove_row"
             state["row_player"] = player_idx
-            log.append(f"{state['players'][player_idx]['name']} formed {len(my_rows)} row(s)!")
+            log.append(log_event("form_rows", player_idx, len(my_rows)))
             return ActionResult(state, log=log)
 
         if opp_rows:
             state["sub_phase"] = "remove_row"
             state["row_player"] = 1 - player_idx
-            log.append(f"{state['players'][1 - player_idx]['name']} formed {len(opp_rows)} row(s)!")
+            log.append(log_event("form_rows", 1 - player_idx, len(opp_rows)))
             return ActionResult(state, log=log)
 
         # No rows — check markers exhaustion, then advance turn
@@ -419,7 +479,7 @@ class YinshEngine(GameEngine):
         state["markers_remaining"] += ROW_LENGTH
 
         player = state["players"][player_idx]
-        log = [f"{player['name']} removed a row of 5 markers."]
+        log = [log_event("remove_row", player_idx)]
 
         # Remove this row and any rows that intersected with it from pending
         if rp == state["current_player"]:
@@ -459,7 +519,7 @@ class YinshEngine(GameEngine):
         player["rings_on_board"] -= 1
         player["rings_removed"] += 1
 
-        log = [f"{player['name']} removed a ring ({player['rings_removed']}/{state['rings_to_win']})."]
+        log = [log_event("remove_ring", player_idx, player["rings_removed"], state["rings_to_win"])]
 
         # Check win condition
         if player["rings_removed"] >= state["rings_to_win"]:
@@ -472,8 +532,8 @@ class YinshEngine(GameEngine):
             remaining = state.get("opponent_pending_rows", [])
 
         # Re-detect rows since board changed
-        player_color = player["color"]
-        new_rows = find_rows(state["board"], player_color)
+        bits = Bitboard.from_board(state["board"])
+        new_rows = bits.rows(player["color"])
 
         if rp == state["current_player"]:
             state["pending_rows"] = new_rows
@@ -488,12 +548,12 @@ class YinshEngine(GameEngine):
         if rp == state["current_player"] and state.get("opponent_pending_rows"):
             # Re-detect opponent rows (board may have changed)
             opp_color = state["players"][1 - rp]["color"]
-            opp_rows = find_rows(state["board"], opp_color)
+            opp_rows = bits.rows(opp_color)
             state["opponent_pending_rows"] = opp_rows
             if opp_rows:
                 state["row_player"] = 1 - rp
                 state["sub_phase"] = "remove_row"
-                log.append(f"{state['players'][1 - rp]['name']} must remove their row(s).")
+                log.append(log_event("must_remove_rows", 1 - rp))
                 return ActionResult(state, log=log)
 
         # All rows handled — advance turn
@@ -524,7 +584,7 @@ class YinshEngine(GameEngine):
         state["phase"] = "game_over"
         state["sub_phase"] = None
         state["winner"] = state["players"][winner_idx]["player_id"]
-        log.append(f"{state['players'][winner_idx]['name']} wins!")
+        log.append(log_event("win", winner_idx))
         return ActionResult(state, log=log, game_over=True)
 
     def _end_game(self, state, log):
@@ -535,18 +595,17 @@ class YinshEngine(GameEngine):
         p0 = state["players"][0]
         p1 = state["players"][1]
 
-        log.append(f"Game over! {p0['name']}: {p0['rings_removed']} rings removed, "
-                   f"{p1['name']}: {p1['rings_removed']} rings removed.")
+        log.append(log_event("final_score", 0, p0["rings_removed"], 1, p1["rings_removed"]))
 
         if p0["rings_removed"] > p1["rings_removed"]:
             state["winner"] = p0["player_id"]
-            log.append(f"{p0['name']} wins!")
+            log.append(log_event("win", 0))
         elif p1["rings_removed"] > p0["rings_removed"]:
             state["winner"] = p1["player_id"]
-            log.append(f"{p1['name']} wins!")
+            log.append(log_event("win", 1))
         else:
             state["winner"] = None
-            log.append("It's a draw!")
+            log.append(log_event("draw"))
 
         return ActionResult(state, log=log, game_over=True)
 
@@ -1,28 +1,18 @@
 """YINSH board geometry, ring movement algorithm, and row detection."""
 
+from server.hexgrid import AXIAL_DIRS, HexGrid, hex_key, parse_hex
+
 # ── Constants ─────────────────────────────────────────
 RINGS_PER_PLAYER = 5
 TOTAL_MARKERS = 51
 ROW_LENGTH = 5
 
-# Axial hex direction vectors
-AXIAL_DIRS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1)]
-
 # The 6 corner vertices of a radius-5 hexagon (excluded from the board)
 _EXCLUDED_CORNERS = {(5, 0), (-5, 0), (0, 5), (0, -5), (5, -5), (-5, 5)}
 
 
 # ── Coordinate helpers ────────────────────────────────
 
-def hex_key(q, r):
-    return f"{q},{r}"
-
-
-def parse_hex(key):
-    parts = key.split(",")
-    return int(parts[0]), int(parts[1])
-
-
 def is_valid(q, r):
     """Check if (q, r) is one of the 85 valid board positions."""
     if max(abs(q), abs(r), abs(q + r)) > 5:
@@ -56,6 +46,26 @@ def all_positions():
 
 
 ALL_POSITIONS = all_positions()
+GRID = HexGrid(ALL_POSITIONS)
+_LINE_KEYS = [tuple(GRID.to_keys(line)) for line in GRID.lines]
+
+
+def all_lines():
+    """Return every straight line across the board as a list of keys.
+
+    Lines run along the 3 axial directions (1,0), (0,1) and (1,-1), each
+    ordered along its direction — the same order find_rows scans in.
+    """
+    return [list(line) for line in _LINE_KEYS]
+
+
+def all_row_windows():
+    """Return every run of ROW_LENGTH consecutive positions on a line."""
+    windows = []
+    for line in all_lines():
+        for i in range(len(line) - ROW_LENGTH + 1):
+            windows.append(line[i:i + ROW_LENGTH])
+    return windows
 
 
 # ── Ring movement ─────────────────────────────────────
@@ -75,16 +85,13 @@ def find_ring_moves(board, from_key):
     - Cannot move through empty spaces AFTER a jump
     - Cannot jump over rings
     """
-    q, r = parse_hex(from_key)
     moves = []
 
-    for dq, dr in AXIAL_DIRS:
-        cq, cr = q + dq, r + dr
+    for ray in GRID.key_rays[from_key]:
         jumped_markers = []
         jumping = False
 
-        while is_valid(cq, cr):
-            key = hex_key(cq, cr)
+        for key in ray:
             cell = board.get(key)
 
             if cell is None:
@@ -104,9 +111,6 @@ def find_ring_moves(board, from_key):
                 # Ring — blocked, stop
                 break
 
-            cq += dq
-            cr += dr
-
     return moves
 
 
@@ -121,56 +125,25 @@ def find_rows(board, color):
     """
     rows = []
 
-    # Only need to check 3 directions (the other 3 are reverse)
-    check_dirs = [(1, 0), (0, 1), (1, -1)]
-
-    # For each direction, scan all lines through the board
-    for dq, dr in check_dirs:
-        # Collect all lines: group positions by their perpendicular coordinate
-        lines = {}
-        for q, r in ALL_POSITIONS:
-            # Project onto the perpendicular axis to group into lines
-            # For direction (1,0): lines share the same r
-            # For direction (0,1): lines share the same q
-            # For direction (1,-1): lines share the same q+r
-            if (dq, dr) == (1, 0):
-                line_id = r
-            elif (dq, dr) == (0, 1):
-                line_id = q
-            else:  # (1, -1)
-                line_id = q + r
-
-            if line_id not in lines:
-                lines[line_id] = []
-            lines[line_id].append((q, r))
-
-        # Sort each line's points along the direction
-        for line_id, points in lines.items():
-            if (dq, dr) == (1, 0):
-                points.sort(key=lambda p: p[0])
-            elif (dq, dr) == (0, 1):
-                points.sort(key=lambda p: p[1])
+    # Every line along the 3 axes (the other 3 directions are reverses)
+    for line in _LINE_KEYS:
+        # Scan for consecutive runs of the target color
+        run = []
+        for key in line:
+            cell = board.get(key)
+            if cell and cell["type"] == "marker" and cell["color"] == color:
+                run.append(key)
             else:
-                points.sort(key=lambda p: p[0])
-
-            # Scan for consecutive runs of the target color
-            run = []
-            for pq, pr in points:
-                key = hex_key(pq, pr)
-                cell = board.get(key)
-                if cell and cell["type"] == "marker" and cell["color"] == color:
-                    run.append(key)
-                else:
-                    # Emit all windows of ROW_LENGTH from this run
-                    if len(run) >= ROW_LENGTH:
-                        for i in range(len(run) - ROW_LENGTH + 1):
-                            rows.append(run[i:i + ROW_LENGTH])
-                    run = []
-
-            # Don't forget the last run
-            if len(run) >= ROW_LENGTH:
-                for i in range(len(run) - ROW_LENGTH + 1):
-                    rows.append(run[i:i + ROW_LENGTH])
+                # Emit all windows of ROW_LENGTH from this run
+                if len(run) >= ROW_LENGTH:
+                    for i in range(len(run) - ROW_LENGTH + 1):
+                        rows.append(run[i:i + ROW_LENGTH])
+                run = []
+
+        # Don't forget the last run
+        if len(run) >= ROW_LENGTH:
+            for i in range(len(run) - ROW_LENGTH + 1):
+                rows.append(run[i:i + ROW_LENGTH])
 
     return rows
 
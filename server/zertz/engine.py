@@ -2,21 +2,88 @@
 
 from copy import deepcopy
 
+from server.action_space import ActionSpace
 from server.game_engine import GameEngine, ActionResult
+from server.log_events import log_event
+from server.snapshot import SnapshotCodec
 from server.zertz.state import (
     POOL_NORMAL, POOL_BLITZ, WIN_NORMAL, WIN_BLITZ, MARBLE_COLORS,
-    hex_key, parse_hex, generate_board, create_player,
-    find_free_rings, find_single_jumps, find_all_captures, has_any_capture,
+    generate_board, create_player, RingGraph, ring_mask,
+    iter_free_rings, has_free_ring, find_single_jumps, has_any_capture,
     find_isolated_marbles, check_win,
 )
 
 
+# ── Action space ─────────────────────────────────────
+
+_POSITIONS = list(generate_board())
+
+ACTION_SPACE = ActionSpace([
+    ("set_mode", [("mode", ["normal", "blitz"])]),
+    ("place_marble", [("color", MARBLE_COLORS), ("position", _POSITIONS)]),
+    ("capture", [("from", _POSITIONS), ("to", _POSITIONS)]),
+    ("remove_ring", [("ring", _POSITIONS)]),
+])
+
+
+# ── Log events ───────────────────────────────────
+
+LOG_EVENTS = {
+    "mode_normal": "Game mode: Normal. Place marbles and shrink the board!",
+    "mode_blitz": "Game mode: Blitz. Place marbles and shrink the board!",
+    "place_marble": "{player} placed a {color} marble at {position}.",
+    "no_free_rings": "No free rings to remove.",
+    "capture": "{player} captured a {color} marble at {position}.",
+    "multi_jump": "Multi-jump available — must continue!",
+    "remove_ring": "{player} removed ring at {position}.",
+    "claim_isolated": "{player} claimed {count} isolated marble(s).",
+    "win_captures": "{player} wins! (W:{white} G:{gray} B:{black})",
+    "final_score": "Game over! {first_player}: {first_count} marbles, {second_player}: {second_count} marbles.",
+    "win": "{player} wins!",
+    "draw": "It's a draw!",
+}
+
+
+# ── Snapshots ────────────────────────────────────────
+
+SNAPSHOT_CODEC = SnapshotCodec(
+    "zertz",
+    version=2,
+    strings=[
+        "white", "gray", "black",
+        "game", "player_ids", "player_count", "players", "board", "pool", "current_player",
+        "mode", "win_conditions", "each", "phase", "sub_phase", "must_capture",
+        "capture_position", "game_over", "winner",
+        "index", "player_id", "name", "captured",
+        "zertz", "normal", "blitz", "config", "play", "place_or_capture", "capture_sequence",
+        "remove_ring",
+    ],
+    atoms=[WIN_NORMAL, WIN_BLITZ],
+    boards=[_POSITIONS],
+    cells=[None, "white", "gray", "black"],
+    shapes=[
+        ["game", "player_ids", "player_count", "players", "board", "pool", "current_player",
+         "mode", "win_conditions", "phase", "sub_phase", "must_capture", "capture_position",
+         "game_over", "winner"],
+        ["index", "player_id", "name", "captured"],
+        ["white", "gray", "black"],
+    ],
+)
+
+
 class ZertzEngine(GameEngine):
     player_count_range = (2, 2)
+    action_space = ACTION_SPACE
+    log_events = LOG_EVENTS
+    snapshot_codec = SNAPSHOT_CODEC
+
+    # RingGraph of the last board seen; placements and captures keep it,
+    # ring removals replace it incrementally (see _rings)
+    _ring_graph = None
 
     # ── Abstract method implementations ──────────────────
 
-    def initial_state(self, player_ids, player_names):
+    def initial_state(self, player_ids, player_names, seed=None):
         players = [
             create_player(i, pid, name)
             for i, (pid, name) in enumerate(zip(player_ids, player_names))
@@ -46,18 +113,20 @@ class ZertzEngine(GameEngine):
         return view
 
     def get_valid_actions(self, state, player_id):
+        return list(self.iter_valid_actions(state, player_id))
+
+    def iter_valid_actions(self, state, player_id):
         if state["game_over"]:
-            return []
+            return
         player_idx = self._player_index(state, player_id)
         if player_idx is None:
-            return []
+            return
 
         phase = state["phase"]
         if phase == "config":
-            return self._valid_config_actions(state, player_idx)
+            yield from self._iter_config_actions(state, player_idx)
         elif phase == "play":
-            return self._valid_play_actions(state, player_idx)
-        return []
+            yield from self._iter_play_actions(state, player_idx)
 
     def apply_action(self, state, player_id, action):
         state = deepcopy(state)
@@ -119,13 +188,11 @@ class ZertzEngine(GameEngine):
 
     # ── Config phase ─────────────────────────────────────
 
-    def _valid_config_actions(self, state, player_idx):
+    def _iter_config_actions(self, state, player_idx):
         if player_idx != 0:
-            return []
-        return [
-            {"kind": "set_mode", "mode": "normal"},
-            {"kind": "set_mode", "mode": "blitz"},
-        ]
+            return
+        yield {"kind": "set_mode", "mode": "normal"}
+        yield {"kind": "set_mode", "mode": "blitz"}
 
     def _apply_set_mode(self, state, player_idx, action):
         if state["phase"] != "config":
@@ -149,44 +216,41 @@ class ZertzEngine(GameEngine):
         state["sub_phase"] = "place_or_capture"
         state["must_capture"] = False  # no marbles on board yet
 
-        mode_name = "Normal" if mode == "normal" else "Blitz"
-        log = [f"Game mode: {mode_name}. Place marbles and shrink the board!"]
+        log = [log_event(f"mode_{mode}")]
         return ActionResult(state, log=log)
 
     # ── Play phase: valid actions ────────────────────────
 
-    def _valid_play_actions(self, state, player_idx):
+    def _iter_play_actions(self, state, player_idx):
         if player_idx != state["current_player"]:
-            return []
+            return
 
         sub = state.get("sub_phase")
 
         if sub == "place_or_capture":
-            return self._valid_place_or_capture(state, player_idx)
+            yield from self._iter_place_or_capture(state, player_idx)
         elif sub == "remove_ring":
-            return self._valid_remove_ring(state)
+            yield from self._iter_remove_ring(state)
         elif sub == "capture_sequence":
-            return self._valid_capture_continuation(state)
-        return []
+            yield from self._iter_capture_continuation(state)
 
-    def _valid_place_or_capture(self, state, player_idx):
+    def _iter_place_or_capture(self, state, player_idx):
         board = state["board"]
-        actions = []
-
-        # Check for mandatory captures
-        if has_any_capture(board):
-            # Must capture — offer all possible first jumps
-            for key, marble in board.items():
-                if marble is None:
-                    continue
-                jumps = find_single_jumps(board, key)
-                for jump in jumps:
-                    actions.append({
-                        "kind": "capture",
-                        "from": key,
-                        "to": jump["to"],
-                    })
-            return actions
+
+        # Captures are mandatory — offer all possible first jumps if any
+        can_capture = False
+        for key, marble in board.items():
+            if marble is None:
+                continue
+            for jump in find_single_jumps(board, key):
+                can_capture = True
+                yield {
+                    "kind": "capture",
+                    "from": key,
+                    "to": jump["to"],
+                }
+        if can_capture:
+            return
 
         # No captures — offer placements
         pool = state["pool"]
@@ -195,24 +259,23 @@ class ZertzEngine(GameEngine):
         for color in available_colors:
             for key, val in board.items():
                 if val is None:  # vacant ring
-                    actions.append({
+                    yield {
                         "kind": "place_marble",
                         "color": color,
                         "position": key,
-                    })
+                    }
 
-        return actions
-
-    def _valid_remove_ring(self, state):
-        free = find_free_rings(state["board"])
-        return [{"kind": "remove_ring", "ring": key} for key in free]
+    def _iter_remove_ring(self, state):
+        board = state["board"]
+        for key in iter_free_rings(board, self._rings(board)):
+            yield {"kind": "remove_ring", "ring": key}
 
-    def _valid_capture_continuation(self, state):
+    def _iter_capture_continuation(self, state):
         pos = state.get("capture_position")
         if not pos:
-            return []
-        jumps = find_single_jumps(state["board"], pos)
-        return [{"kind": "capture", "from": pos, "to": j["to"]} for j in jumps]
+            return
+        for j in find_single_jumps(state["board"], pos):
+            yield {"kind": "capture", "from": pos, "to": j["to"]}
 
     # ── Play phase: apply actions ────────────────────────
 
@@ -241,17 +304,15 @@ class ZertzEngine(GameEngine):
         state["board"][position] = color
         state["pool"][color] -= 1
 
-        player_name = state["players"][player_idx]["name"]
-        log = [f"{player_name} placed a {color} marble at {position}."]
+        log = [log_event("place_marble", player_idx, color, position)]
 
         # Check for free rings to remove
-        free = find_free_rings(state["board"])
-        if free:
+        if has_free_ring(state["board"], self._rings(state["board"])):
             state["sub_phase"] = "remove_ring"
             return ActionResult(state, log=log)
 
         # No free rings — skip removal, advance turn
-        log.append("No free rings to remove.")
+        log.append(log_event("no_free_rings"))
         return self._advance_turn(state, log)
 
     def _apply_capture(self, state, player_idx, action):
@@ -295,15 +356,14 @@ class ZertzEngine(GameEngine):
         player = state["players"][player_idx]
         player["captured"][captured_color] += 1
 
-        player_name = player["name"]
-        log = [f"{player_name} captured a {captured_color} marble at {valid_jump['captured']}."]
+        log = [log_event("capture", player_idx, captured_color, valid_jump["captured"])]
 
         # Check for more jumps from landing position
         more_jumps = find_single_jumps(board, to_key)
         if more_jumps:
             state["sub_phase"] = "capture_sequence"
             state["capture_position"] = to_key
-            log.append("Multi-jump available — must continue!")
+            log.append(log_event("multi_jump"))
             return ActionResult(state, log=log)
 
         # Capture sequence complete
@@ -328,31 +388,31 @@ class ZertzEngine(GameEngine):
             raise ValueError("Ring is occupied")
 
         # Validate it's a free ring
-        free = find_free_rings(state["board"])
-        if ring_key not in free:
+        graph = self._rings(state["board"])
+        if ring_key not in graph.removable:
             raise ValueError("Ring is not removable")
 
         # Remove the ring
         del state["board"][ring_key]
+        graph = self._ring_graph = graph.without(ring_key)
 
         player = state["players"][player_idx]
-        player_name = player["name"]
-        log = [f"{player_name} removed ring at {ring_key}."]
+        log = [log_event("remove_ring", player_idx, ring_key)]
 
         # Check for isolated marbles
-        isolated = find_isolated_marbles(state["board"])
+        isolated = find_isolated_marbles(state["board"], graph)
         if isolated:
             for key, marble_color in isolated:
                 player["captured"][marble_color] += 1
                 state["board"][key] = None
                 # Also remove the isolated rings
             # Remove all isolated rings
-            main_keys = self._get_main_component(state["board"])
-            keys_to_remove = set(state["board"].keys()) - main_keys
+            keys_to_remove = set(state["board"].keys()) - graph.main
             for key in keys_to_remove:
                 del state["board"][key]
+            self._ring_graph = graph.keep_main()
 
-            log.append(f"{player_name} claimed {len(isolated)} isolated marble(s).")
+            log.append(log_event("claim_isolated", player_idx, len(isolated)))
 
         # Check win
         if check_win(player["captured"], state["win_conditions"]):
@@ -378,29 +438,19 @@ class ZertzEngine(GameEngine):
             return self._end_game(state, log)
 
         # Update must_capture flag for next player
-        state["must_capture"] = has_any_capture(state["board"])
+        state["must_capture"] = not no_captures
 
         return ActionResult(state, log=log)
 
     # ── Helpers ──────────────────────────────────────────
 
-    def _get_main_component(self, board):
-        """Return set of keys in the largest connected component."""
-        if not board:
-            return set()
-        start = next(iter(board))
-        visited = {start}
-        queue = [start]
-        while queue:
-            current = queue.pop(0)
-            cq, cr = parse_hex(current)
-            from server.zertz.state import AXIAL_DIRS
-            for dq, dr in AXIAL_DIRS:
-                nkey = hex_key(cq + dq, cr + dr)
-                if nkey in board and nkey not in visited:
-                    visited.add(nkey)
-                    queue.append(nkey)
-        return visited
+    def _rings(self, board):
+        """The board's RingGraph: the engine's last one while the rings match."""
+        graph = self._ring_graph
+        rings = ring_mask(board)
+        if graph is None or graph.rings != rings:
+            graph = self._ring_graph = RingGraph(rings)
+        return graph
 
     def _end_game_winner(self, state, winner_idx, log):
         state["game_over"] = True
@@ -408,8 +458,9 @@ class ZertzEngine(GameEngine):
         state["sub_phase"] = None
         state["winner"] = state["players"][winner_idx]["player_id"]
         p = state["players"][winner_idx]
-        log.append(f"{p['name']} wins! (W:{p['captured']['white']} "
-                   f"G:{p['captured']['gray']} B:{p['captured']['black']})")
+        captured = p["captured"]
+        log.append(log_event("win_captures", winner_idx,
+                             captured["white"], captured["gray"], captured["black"]))
         return ActionResult(state, log=log, game_over=True)
 
     def _end_game(self, state, log):
@@ -422,17 +473,17 @@ class ZertzEngine(GameEngine):
         t0 = sum(p0["captured"].values())
         t1 = sum(p1["captured"].values())
 
-        log.append(f"Game over! {p0['name']}: {t0} marbles, {p1['name']}: {t1} marbles.")
+        log.append(log_event("final_score", 0, t0, 1, t1))
 
         if t0 > t1:
             state["winner"] = p0["player_id"]
-            log.append(f"{p0['name']} wins!")
+            log.append(log_event("win", 0))
         elif t1 > t0:
             state["winner"] = p1["player_id"]
-            log.append(f"{p1['name']} wins!")
+            log.append(log_event("win", 1))
         else:
             state["winner"] = None
-            log.append("It's a draw!")
+            log.append(log_event("draw"))
 
         return ActionResult(state, log=log, game_over=True)
 
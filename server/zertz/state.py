@@ -1,5 +1,7 @@
 """ZERTZ board geometry, capture algorithm, free ring detection, connectivity."""
 
+from server.hexgrid import AXIAL_DIRS, HexGrid, hex_key, parse_hex
+
 # ── Constants ─────────────────────────────────────────
 
 POOL_NORMAL = {"white": 6, "gray": 8, "black": 10}
@@ -10,22 +12,11 @@ WIN_BLITZ = {"each": 2, "white": 3, "gray": 4, "black": 5}
 
 MARBLE_COLORS = ["white", "gray", "black"]
 
-AXIAL_DIRS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1)]
-
 BOARD_RADIUS = 3
 
 
 # ── Coordinate helpers ────────────────────────────────
 
-def hex_key(q, r):
-    return f"{q},{r}"
-
-
-def parse_hex(key):
-    parts = key.split(",")
-    return int(parts[0]), int(parts[1])
-
-
 def is_valid(q, r):
     """Check if (q, r) is on the initial radius-3 hex board (37 positions)."""
     return max(abs(q), abs(r), abs(q + r)) <= BOARD_RADIUS
@@ -43,6 +34,11 @@ def generate_board():
     return board
 
 
+# Geometry of the full 37-ring board; removed rings are simply absent from
+# a game's board dict, so neighbors are filtered by membership.
+GRID = HexGrid(parse_hex(key) for key in generate_board())
+
+
 # ── Neighbor helpers ──────────────────────────────────
 
 def get_neighbors_on_board(board, q, r):
@@ -55,83 +51,190 @@ def get_neighbors_on_board(board, q, r):
     return result
 
 
-def is_edge_ring(board, q, r):
+def is_edge_ring(board, key):
     """A ring is on the edge if it has fewer than 6 neighbors in the board."""
     count = 0
-    for dq, dr in AXIAL_DIRS:
-        if hex_key(q + dq, r + dr) in board:
+    for nkey in GRID.key_neighbors[key]:
+        if nkey in board:
             count += 1
     return count < 6
 
 
-# ── Connectivity check ───────────────────────────────
+# ── Connectivity ─────────────────────────────────────
 
-def board_stays_connected(board, remove_key):
-    """Check if removing remove_key would keep all remaining rings connected."""
-    remaining = set(board.keys()) - {remove_key}
-    if len(remaining) <= 1:
-        return True
+# One bit per ring position (bit i is GRID cell id i)
+_RING_BITS = [1 << i for i in range(GRID.size)]
+_KEY_RING_BITS = {key: _RING_BITS[i] for i, key in enumerate(GRID.keys)}
 
-    # BFS from any remaining ring
-    start = next(iter(remaining))
-    visited = {start}
-    queue = [start]
 
-    while queue:
-        current = queue.pop(0)
-        cq, cr = parse_hex(current)
-        for dq, dr in AXIAL_DIRS:
-            nkey = hex_key(cq + dq, cr + dr)
-            if nkey in remaining and nkey not in visited:
-                visited.add(nkey)
-                queue.append(nkey)
+class RingGraph:
+    """
+    Connectivity of a set of rings; marbles don't affect it.
 
-    return len(visited) == len(remaining)
+    One Tarjan pass per connected component finds the articulation points
+    (rings whose removal would split the board), from which:
+
+        removable  — keys of edge rings whose removal keeps the rest connected
+        main       — the largest component (earliest ring on ties)
+        components — every component, as sets of keys
+
+    A graph describes one set of rings and is never changed. Removing rings
+    gives a new graph via without() and keep_main(), which reuse every
+    component the removal didn't touch. ZertzEngine keeps the graph of the
+    last board it saw; ring_graph(board) builds one from scratch.
+    """
+
+    def __init__(self, rings):
+        ids = [i for i in range(GRID.size) if rings >> i & 1]
+        self._finish(rings, _ring_parts(ids, rings))
+
+    def _finish(self, rings, parts):
+        # parts: (mask, component keys, cut keys, edge keys that aren't cuts),
+        # kept in order of each component's earliest ring
+        parts.sort(key=lambda part: part[0] & -part[0])
+        self.rings = rings
+        self._parts = parts
+        self.components = [part[1] for part in parts]
+        self.main = max(self.components, key=len) if self.components else set()
+        if len(parts) == 1:
+            self.removable = parts[0][3]
+        elif len(parts) == 2:
+            # Already split: only dropping a lone ring can leave one piece
+            self.removable = {key for part in parts if len(part[1]) == 1 for key in part[1]}
+        else:
+            self.removable = set()
+        self._cut = parts[0][2] if len(parts) == 1 else set()
+        self._connected = len(parts) <= 1
+
+    def stays_connected(self, key):
+        """Would the remaining rings be connected without this one?"""
+        if self._connected:
+            return key not in self._cut
+        return len(self.components) == 2 and {key} in self.components
+
+    def without(self, key):
+        """The graph after removing one ring; only its component is searched again."""
+        bit = _KEY_RING_BITS[key]
+        rings = self.rings & ~bit
+        parts = []
+        for part in self._parts:
+            mask = part[0]
+            if mask & bit:
+                mask &= ~bit
+                parts.extend(_ring_parts([i for i in range(GRID.size) if mask >> i & 1], rings))
+            else:
+                parts.append(part)
+        graph = RingGraph.__new__(RingGraph)
+        graph._finish(rings, parts)
+        return graph
+
+    def keep_main(self):
+        """The graph after removing every ring outside the main component."""
+        part = next(part for part in self._parts if part[1] is self.main)
+        graph = RingGraph.__new__(RingGraph)
+        graph._finish(part[0], [part])
+        return graph
+
+
+def _ring_parts(ids, rings):
+    """Tarjan over the rings with these cell ids: one part per component."""
+    neighbors = {i: [n for n in GRID.neighbors[i] if rings >> n & 1] for i in ids}
+    keys = GRID.keys
+
+    order, low = {}, {}
+    parts = []
+    for root in ids:
+        if root in order:
+            continue
+        component = [root]
+        cut = set()
+        order[root] = low[root] = len(order)
+        root_children = 0
+        stack = [(root, iter(neighbors[root]))]
+        while stack:
+            node, it = stack[-1]
+            child = next(it, None)
+            if child is None:
+                stack.pop()
+                if stack:
+                    parent = stack[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                    if parent != root and low[node] >= order[parent]:
+                        cut.add(parent)
+            elif child not in order:
+                order[child] = low[child] = len(order)
+                component.append(child)
+                if node == root:
+                    root_children += 1
+                stack.append((child, iter(neighbors[child])))
+            else:
+                low[node] = min(low[node], order[child])
+        if root_children > 1:
+            cut.add(root)
+        parts.append((
+            sum(_RING_BITS[i] for i in component),
+            {keys[i] for i in component},
+            {keys[i] for i in cut},
+            {keys[i] for i in component if i not in cut and len(neighbors[i]) < 6},
+        ))
+    return parts
+
+
+def ring_mask(board):
+    """Bitmask of the rings still on the board."""
+    rings = 0
+    for key in board:
+        rings |= _KEY_RING_BITS[key]
+    return rings
+
+
+def ring_graph(board):
+    """A fresh RingGraph of a board's rings."""
+    return RingGraph(ring_mask(board))
+
+
+def board_stays_connected(board, remove_key, graph=None):
+    """Check if removing remove_key would keep all remaining rings connected."""
+    return (graph or ring_graph(board)).stays_connected(remove_key)
 
 
 # ── Free ring detection ──────────────────────────────
 
-def find_free_rings(board):
-    """Find all rings that are vacant, on the edge, and removable without disconnecting."""
-    free = []
+def iter_free_rings(board, graph=None):
+    """Lazily yield rings that are vacant, on the edge, and removable without disconnecting.
+    graph, if given, is the board's RingGraph."""
+    removable = (graph or ring_graph(board)).removable
     for key, marble in board.items():
-        if marble is not None:
-            continue  # occupied
-        q, r = parse_hex(key)
-        if not is_edge_ring(board, q, r):
-            continue  # not on edge
-        if not board_stays_connected(board, key):
-            continue  # would disconnect
-        free.append(key)
-    return free
+        if marble is None and key in removable:
+            yield key
 
 
-# ── Capture detection ─────────────────────────────────
+def find_free_rings(board, graph=None):
+    """Find all rings that are vacant, on the edge, and removable without disconnecting."""
+    return list(iter_free_rings(board, graph))
 
-def find_single_jumps(board, from_key):
-    """Find all immediate single jumps from a marble at from_key.
-    Returns list of {"to": key, "captured": key, "direction": (dq,dr)}."""
-    q, r = parse_hex(from_key)
-    jumps = []
 
-    for dq, dr in AXIAL_DIRS:
-        mid_q, mid_r = q + dq, r + dr
-        mid_key = hex_key(mid_q, mid_r)
-        land_q, land_r = q + 2 * dq, r + 2 * dr
-        land_key = hex_key(land_q, land_r)
+def has_free_ring(board, graph=None):
+    """Quick check: is there any removable ring?"""
+    return next(iter_free_rings(board, graph), None) is not None
 
-        # Mid must exist and have a marble
-        if mid_key not in board or board[mid_key] is None:
-            continue
-        # Landing must exist and be vacant
-        if land_key not in board or board[land_key] is not None:
-            continue
 
-        jumps.append({
-            "to": land_key,
-            "captured": mid_key,
-        })
+# ── Capture detection ─────────────────────────────────
+
+# Every jump on the full board: per cell, the (captured, landing) pairs one
+# and two steps away in each direction.
+KEY_JUMPS = {key: tuple((ray[0], ray[1]) for ray in rays if len(ray) >= 2)
+             for key, rays in GRID.key_rays.items()}
 
+
+def find_single_jumps(board, from_key):
+    """Find all immediate single jumps from a marble at from_key.
+    Returns list of {"to": key, "captured": key}."""
+    jumps = []
+    for mid_key, land_key in KEY_JUMPS[from_key]:
+        # Mid must exist and have a marble; landing must exist and be vacant
+        if board.get(mid_key) is not None and land_key in board and board[land_key] is None:
+            jumps.append({"to": land_key, "captured": mid_key})
     return jumps
 
 
@@ -164,12 +267,7 @@ def find_capture_sequences(board, from_key):
             new_board[current_key] = None
             new_board[jump["captured"]] = None
 
-            step = {
-                "from": current_key,
-                "to": jump["to"],
-                "captured": jump["captured"],
-            }
-            path.append(step)
+            path.append({"from": current_key, "to": jump["to"], "captured": jump["captured"]})
             _recurse(jump["to"], new_board, path)
             path.pop()
 
@@ -181,14 +279,11 @@ def find_all_captures(board):
     """Find all possible capture sequences for any marble on the board.
     Returns list of {"start": key, "sequence": [...]} dicts."""
     all_captures = []
-
     for key, marble in board.items():
         if marble is None:
             continue
-        sequences = find_capture_sequences(board, key)
-        for seq in sequences:
+        for seq in find_capture_sequences(board, key):
             all_captures.append({"start": key, "sequence": seq})
-
     return all_captures
 
 
@@ -197,41 +292,23 @@ def has_any_capture(board):
     for key, marble in board.items():
         if marble is None:
             continue
-        jumps = find_single_jumps(board, key)
-        if jumps:
-            return True
+        for mid_key, land_key in KEY_JUMPS[key]:
+            if board.get(mid_key) is not None and land_key in board and board[land_key] is None:
+                return True
     return False
 
 
 # ── Isolated group detection ─────────────────────────
 
-def find_isolated_marbles(board):
+def find_isolated_marbles(board, graph=None):
     """After a board change, find groups of rings disconnected from the main board.
     Returns list of (key, marble_color) for marbles on isolated rings."""
     if not board:
         return []
 
-    # Find the largest connected component
-    all_keys = set(board.keys())
-    if not all_keys:
-        return []
-
-    # BFS from the first key to find the main component
-    start = next(iter(all_keys))
-    visited = {start}
-    queue = [start]
-    while queue:
-        current = queue.pop(0)
-        cq, cr = parse_hex(current)
-        for dq, dr in AXIAL_DIRS:
-            nkey = hex_key(cq + dq, cr + dr)
-            if nkey in all_keys and nkey not in visited:
-                visited.add(nkey)
-                queue.append(nkey)
-
-    # Anything not visited is isolated
+    # Anything outside the largest connected component is isolated
+    isolated_keys = set(board) - (graph or ring_graph(board)).main
     isolated_marbles = []
-    isolated_keys = all_keys - visited
     for key in isolated_keys:
         if board[key] is not None:
             isolated_marbles.append((key, board[key]))
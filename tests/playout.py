@@ -0,0 +1,84 @@
+"""
+Shared helpers for engine tests: seeded random playouts.
+
+Differential tests follow an index or cache through real games and
+compare it with a fresh computation after every action:
+
+    for step in random_playout(engine, seed):
+        step.state, step.player_id, step.action   # position and the action taken there
+        step.result.new_state                     # position after it
+
+check_batch_against_playouts runs several such games in one packed
+StateBatch (see server.batch) and checks it against them action by action.
+"""
+
+import random
+from collections import namedtuple
+
+from server.selfplay import random_policy
+
+Step = namedtuple("Step", "state player_id action result")
+
+
+def random_playout(engine, seed, setup=(), max_actions=None, policy=random_policy):
+    """
+    Play a seeded two-player game, each action chosen by a self-play
+    policy (the random one by default) from the first waiting player's
+    valid actions, and yield a Step per action.
+
+    `setup` actions are applied first, by whoever is waited on, and are
+    yielded like the rest. The game runs until no one is waited on (or
+    no one waited on has an action) unless max_actions stops it earlier.
+    """
+    rng = random.Random(seed)
+    state = engine.initial_state(["p1", "p2"], ["A", "B"], seed=seed)
+    setup = list(setup)
+    taken = 0
+    while max_actions is None or taken < max_actions:
+        waiting = engine.get_waiting_for(state)
+        if not waiting:
+            break
+        if setup:
+            player_id, action = waiting[0], setup.pop(0)
+        else:
+            for player_id in waiting:
+                actions = engine.get_valid_actions(state, player_id)
+                if actions:
+                    break
+            else:
+                break
+            action = policy(engine, state, player_id, actions, rng)
+        result = engine.apply_action(state, player_id, action)
+        yield Step(state, player_id, action, result)
+        state = result.new_state
+        taken += 1
+
+
+def check_batch_against_playouts(engine, seeds, setup=(), ordered=True):
+    """
+    Play one random playout per seed, step a batch packed from their
+    initial states through the same actions in lockstep, and assert that
+    after every step each game's state, waiting player and legal actions
+    match the engine's. With ordered=False legal actions are compared as
+    sets. Returns the number of actions checked.
+    """
+    games = [list(random_playout(engine, seed, setup)) for seed in seeds]
+    batch = engine.pack_batch([steps[0].state for steps in games])
+    checked = 0
+    for t in range(max(len(steps) for steps in games)):
+        current = [steps[t] if t < len(steps) else None for steps in games]
+        batch.step([None if step is None else engine.encode_action(step.state, step.action)
+                    for step in current])
+        for i, step in enumerate(current):
+            if step is None:
+                continue
+            state = step.result.new_state
+            assert batch.state(i) == state
+            waiting = engine.get_waiting_for(state)
+            expected = [engine.encode_action(state, action)
+                        for action in engine.get_valid_actions(state, waiting[0])] if waiting else []
+            legal = batch.legal_actions(i)
+            assert legal == expected if ordered else sorted(legal) == sorted(expected)
+            assert batch.to_move(i) == (state["player_ids"].index(waiting[0]) if waiting else -1)
+            checked += 1
+    return checked
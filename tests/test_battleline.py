@@ -17,6 +17,7 @@ from server.battleline.formations import (
     WEDGE, PHALANX, BATTALION, SKIRMISH, HOST,
 )
 from server.battleline.engine import BattleLineEngine
+from server.rng import new_rng
 
 
 # ── Helpers ───────────────────────────────────────────────────────────
@@ -28,10 +29,8 @@ def troop(color, value):
 def tactic(card_id):
     """Create a tactics card by id."""
     from server.battleline.state import TACTICS_CARDS
-    info = TACTICS_CARDS[card_id]
-    card = dict(info)
-    card["id"] = card_id
-    return card
+    assert card_id in TACTICS_CARDS
+    return {"type": "tactics", "id": card_id}
 
 
 def make_state(auto_claim=False):
@@ -329,6 +328,17 @@ class TestTurnFlow:
         assert isinstance(view["troop_deck"], int)
         assert isinstance(view["tactics_deck"], int)
 
+    def test_view_copies_only_redacted_branches(self):
+        state = make_state()
+        view = self.engine.get_player_view(state, "p1")
+        # Opponent's hand is redacted in a fresh list; the state is untouched
+        assert view["players"][1]["hand"] == [{"type": "troop"}] * 7
+        assert state["players"][1]["hand"][0]["color"] == "yellow"
+        # Own player data and the flags are shared, not copied
+        assert view["players"][0] is state["players"][0]
+        assert view["flags"] is state["flags"]
+        assert "log" not in view
+
 
 # ══════════════════════════════════════════════════════════════════════
 # Tactics Card Tests
@@ -358,7 +368,7 @@ class TestTactics:
         state["players"][1]["tactics_played"] = 0
 
         result = self.engine.apply_action(state, "p1", {"kind": "play_environment", "card_index": 0, "flag_index": 0})
-        assert "Fog" in result.log[0]
+        assert "Fog" in self.engine.render_log(result.new_state, result.log)[0]
 
     def test_leader_limit(self):
         """Can't play second leader when one is already on board."""
@@ -770,18 +780,26 @@ class TestEdgeCases:
 class TestStateGeneration:
 
     def test_troop_deck_has_60_cards(self):
-        deck = generate_troop_deck()
+        deck = generate_troop_deck(new_rng(0))
         assert len(deck) == 60
         # All unique
         cards = [(c["color"], c["value"]) for c in deck]
         assert len(set(cards)) == 60
 
     def test_tactics_deck_has_10_cards(self):
-        deck = generate_tactics_deck()
+        deck = generate_tactics_deck(new_rng(0))
         assert len(deck) == 10
         ids = [c["id"] for c in deck]
         assert len(set(ids)) == 10
 
+    def test_tactics_cards_are_referenced_by_id(self):
+        from server.battleline.state import TACTICS_CARDS
+        engine = BattleLineEngine()
+        for card in generate_tactics_deck(new_rng(0)):
+            assert card == {"type": "tactics", "id": card["id"]}
+        assert engine.get_catalog()["tactics"] is TACTICS_CARDS
+        assert engine.catalog_hash() == BattleLineEngine().catalog_hash()
+
     def test_initial_state_structure(self):
         state = create_initial_state(["p1", "p2"], ["Alice", "Bob"])
         assert state["game"] == "battleline"
@@ -799,6 +817,26 @@ class TestStateGeneration:
         assert len(state["troop_deck"]) == 46
         assert len(state["tactics_deck"]) == 10
 
+    def test_seed_and_actions_replay_byte_for_byte(self):
+        import json
+
+        def replay(seed):
+            engine = BattleLineEngine()
+            state = engine.initial_state(["p1", "p2"], ["Alice", "Bob"], seed=seed)
+            for _ in range(20):
+                player_id = engine.get_waiting_for(state)[0]
+                action = engine.get_valid_actions(state, player_id)[0]
+                state = engine.apply_action(state, player_id, action).new_state
+            return json.dumps(state, sort_keys=True)
+
+        assert replay(42) == replay(42)
+        assert replay(42) != replay(43)
+        engine = BattleLineEngine()
+        state = engine.initial_state(["p1", "p2"], ["Alice", "Bob"], seed=42)
+        assert state["rng"]["seed"] == 42
+        assert "rng" not in engine.get_player_view(state, "p1")
+        assert "rng" not in engine.get_spectator_view(state)
+
 
 # ══════════════════════════════════════════════════════════════════════
 # Integration: Phase Info
@@ -848,7 +886,7 @@ class TestAutoClaim:
         s = result.new_state
         assert s["flags"][0]["claimed_by"] == 0
         assert s["phase"] == "draw_card"
-        assert any("claims flag 1" in msg for msg in result.log)
+        assert ["claim_flag", 0, 1] in result.log
 
     def test_auto_claim_off_enters_manual_claim(self):
         """With auto_claim off, playing enters claim_flags phase."""
@@ -861,11 +899,11 @@ class TestAutoClaim:
         state = make_state(auto_claim=True)
         result = self.engine.apply_action(state, "p1", {"kind": "toggle_auto_claim"})
         assert result.new_state["auto_claim"] is False
-        assert "Auto-claim turned off" in result.log
+        assert result.log == [["auto_claim_off"]]
 
         result2 = self.engine.apply_action(result.new_state, "p1", {"kind": "toggle_auto_claim"})
         assert result2.new_state["auto_claim"] is True
-        assert "Auto-claim turned on" in result2.log
+        assert result2.log == [["auto_claim_on"]]
 
     def test_toggle_in_valid_actions(self):
         """toggle_auto_claim appears in valid actions."""
@@ -0,0 +1,113 @@
+"""
+Tests for the DVONN engine's connectivity and mobility tracking, and the
+endgame solver.
+"""
+
+from copy import deepcopy
+
+from playout import random_playout
+from server.dvonn.engine import DvonnEngine
+from server.dvonn.solver import KEYS, SYMMETRIES, EndgameSolver
+from server.dvonn.state import NEIGHBOR_KEYS, Mobility, find_connected_to_dvonn, find_cut_off_by
+
+
+class TestDvonnConnectivity:
+
+    engine = DvonnEngine()
+
+    def test_cut_off_stacks_match_full_flood_fill(self):
+        # Differential: before every move in seeded random games, the
+        # stacks the local search would remove equal a full flood fill's.
+        removals = 0
+        for seed in range(10):
+            for step in random_playout(self.engine, seed):
+                if step.action["kind"] != "move_stack":
+                    continue
+                board = deepcopy(step.state["board"])
+                board[step.action["to"]]["stack"] += board[step.action["from"]]["stack"]
+                board[step.action["from"]]["stack"] = []
+                connected = find_connected_to_dvonn(board)
+                expected = [key for key, space in board.items()
+                            if space["stack"] and key not in connected]
+                assert find_cut_off_by(board, step.action["from"]) == expected
+                removals += bool(expected)
+        assert removals > 20
+
+
+class TestDvonnMobility:
+
+    engine = DvonnEngine()
+
+    def test_tracked_mobility_matches_fresh_scan(self):
+        # After every move in seeded random games, a Mobility kept up to
+        # date through the move and its removals equals a rebuilt one,
+        # and agrees with listing the moves.
+        for seed in range(6):
+            for step in random_playout(self.engine, seed):
+                if step.action["kind"] != "move_stack":
+                    continue
+                tracked = Mobility(step.state["board"])
+                after = step.result.new_state
+                tracked.board = after["board"]
+                tracked.vacate(step.action["from"])
+                tracked.retop(step.action["to"])
+                for key in after["last_removed"]:
+                    tracked.vacate(key)
+                fresh = Mobility(after["board"])
+                assert tracked.occupied_neighbors == fresh.occupied_neighbors
+                assert tracked.movable == fresh.movable
+                for idx, player in enumerate(after["players"]):
+                    listed = next(self.engine._iter_stack_moves(after, idx), None)
+                    assert fresh.can_move(player["color"]) == (listed is not None)
+
+
+class TestDvonnEndgameSolver:
+
+    engine = DvonnEngine()
+
+    def late_positions(self, seeds):
+        """The position six actions before the end of each seeded game."""
+        return [[step.state for step in random_playout(self.engine, seed)][-6] for seed in seeds]
+
+    def minimax(self, state):
+        """Final score difference for the player to move, without pruning."""
+        engine = self.engine
+        me = state["current_player"]
+        best = None
+        for action in engine.get_valid_actions(state, state["player_ids"][me]):
+            after = engine.apply_action(state, state["player_ids"][me], action).new_state
+            if after["game_over"]:
+                scores = {"white": 0, "black": 0, "dvonn": 0}
+                for space in after["board"].values():
+                    if space["stack"]:
+                        scores[space["stack"][-1]] += len(space["stack"])
+                mine = after["players"][me]["color"]
+                value = 2 * scores[mine] - scores["white"] - scores["black"]
+            else:
+                value = self.minimax(after) if after["current_player"] == me else -self.minimax(after)
+            best = value if best is None else max(best, value)
+        return best
+
+    def test_symmetries_preserve_adjacency(self):
+        ids = {key: i for i, key in enumerate(KEYS)}
+        for perm in SYMMETRIES:
+            assert [perm[i] for i in perm] == list(range(len(KEYS)))
+            for i, key in enumerate(KEYS):
+                mapped = {KEYS[perm[ids[n]]] for n in NEIGHBOR_KEYS[key]}
+                assert mapped == set(NEIGHBOR_KEYS[KEYS[perm[i]]])
+
+    def test_matches_plain_minimax_and_cache(self, tmp_path):
+        positions = self.late_positions([0, 1, 2])
+        solver = EndgameSolver(tmp_path / "endgame.sqlite")
+        solutions = []
+        for state in positions:
+            solution = solver.solve(state)
+            assert solution.score == self.minimax(state)
+            assert solution.move in self.engine.get_valid_actions(state, state["player_ids"][state["current_player"]])
+            solutions.append(solution)
+        solver.close()
+
+        # A fresh solver answers from the file alone, without searching
+        cached = EndgameSolver(tmp_path / "endgame.sqlite", node_limit=1)
+        assert [cached.solve(state) for state in positions] == solutions
+        cached.close()
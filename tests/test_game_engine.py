@@ -0,0 +1,107 @@
+"""
+Tests for the shared GameEngine machinery: the legal-action cache and
+state batches.
+"""
+
+import random
+from copy import deepcopy
+
+import pytest
+
+from server.arboretum.engine import ArboretumEngine
+from server.batch import DictBatch, random_playouts
+from server.battleline.engine import BattleLineEngine
+from server.tzaar.batch import TzaarBatch
+from server.tzaar.engine import TzaarEngine
+
+CLAIM_FIRST_FLAG = {"kind": "claim_flag", "flag_index": 0}
+
+
+def troop(color, value):
+    return {"type": "troop", "color": color, "value": value}
+
+
+class TestLegalActionCache:
+    """apply_action trusts prevalidated actions offered for an identical state."""
+
+    engine = BattleLineEngine()
+
+    def claimable_state(self):
+        state = self.engine.initial_state(["p1", "p2"], ["Alice", "Bob"], seed=1)
+        state["auto_claim"] = False
+        state["phase"] = "claim_flags"
+        state["flags"][0]["slots"][0] = [troop("red", 8), troop("red", 9), troop("red", 10)]
+        state["flags"][0]["slots"][1] = [troop("yellow", 1), troop("blue", 3), troop("green", 7)]
+        state["flags"][0]["completion_turn"] = [1, 2]
+        return state
+
+    def test_offered_claim_is_applied(self):
+        state = self.claimable_state()
+        assert CLAIM_FIRST_FLAG in self.engine.get_valid_actions(state, "p1")
+        assert self.engine._is_known_legal(state, "p1", CLAIM_FIRST_FLAG)
+        # Keyed on contents, not identity: an equal copy is known too
+        assert self.engine._is_known_legal(deepcopy(state), "p1", CLAIM_FIRST_FLAG)
+        result = self.engine.apply_action(state, "p1", CLAIM_FIRST_FLAG)
+        assert result.new_state["flags"][0]["claimed_by"] == 0
+
+    def test_state_edited_in_place_is_validated_again(self):
+        state = self.claimable_state()
+        self.engine.get_valid_actions(state, "p1")
+        state["flags"][0]["slots"][0] = [troop("red", 1), troop("blue", 2), troop("green", 4)]
+        assert not self.engine._is_known_legal(state, "p1", CLAIM_FIRST_FLAG)
+        with pytest.raises(ValueError, match="Cannot claim"):
+            self.engine.apply_action(state, "p1", CLAIM_FIRST_FLAG)
+
+    def test_only_prevalidated_kinds_are_cached(self):
+        engine = BattleLineEngine()
+        state = engine.initial_state(["p1", "p2"], ["Alice", "Bob"], seed=1)
+        action = engine.get_valid_actions(state, "p1")[0]
+        assert action["kind"] not in engine.prevalidated_kinds
+        assert not engine._is_known_legal(state, "p1", action)
+        assert "p1" not in engine.__dict__.get("_legal_cache", {})
+
+
+class TestStateBatch:
+    """pack_batch picks the packed form where there is one; apply_many steps it."""
+
+    engine = BattleLineEngine()
+
+    def make_states(self):
+        return [self.engine.initial_state(["p1", "p2"], ["Alice", "Bob"], seed=s) for s in range(3)]
+
+    def test_dict_batch_matches_apply_action(self):
+        states = self.make_states()
+        batch = self.engine.pack_batch(states)
+        assert isinstance(batch, DictBatch)
+        actions = [self.engine.get_valid_actions(s, "p1")[i] for i, s in enumerate(states[:2])]
+        indices = [self.engine.encode_action(s, a) for s, a in zip(states, actions)]
+        self.engine.apply_many(batch, indices + [None])
+        for i, (state, action) in enumerate(zip(states, actions)):
+            assert batch.state(i) == self.engine.apply_action(state, "p1", action).new_state
+        assert batch.state(2) is states[2]
+        state = batch.state(0)
+        waiting = self.engine.get_waiting_for(state)[0]
+        assert batch.to_move(0) == state["player_ids"].index(waiting)
+        assert batch.legal_actions(0) == sorted(self.engine.encode_action(state, a)
+                                                for a in self.engine.get_valid_actions(state, waiting))
+
+    def test_dict_batch_plays_partial_actions(self):
+        # Arboretum offers place_card without a card_index; the batch
+        # must take its moves from the expanded legal mask
+        engine = ArboretumEngine()
+        states = [engine.initial_state(["p1", "p2"], ["A", "B"], seed=s) for s in range(4)]
+        batch = engine.pack_batch(states)
+        assert isinstance(batch, DictBatch)
+        assert random_playouts(batch, random.Random(2)) > 4 * 20
+        for i, state in enumerate(batch.states()):
+            assert state["game_over"], i
+            assert batch.legal_actions(i) == [] and batch.to_move(i) == -1
+
+    def test_packed_batch_used_when_declared(self):
+        engine = TzaarEngine()
+        assert isinstance(engine.pack_batch([engine.initial_state(["p1", "p2"], ["A", "B"])]), TzaarBatch)
+
+    def test_one_action_per_game(self):
+        batch = self.engine.pack_batch(self.make_states())
+        with pytest.raises(ValueError):
+            self.engine.apply_many(batch, [None, None])
@@ -0,0 +1,84 @@
+"""
+Tests for the GIPF engine's mask-filtered row detection and push listing.
+"""
+
+import random
+
+from server.gipf.state import (
+    EDGE_DOTS, PUSH_LINES, PUSH_MASKS, SPOT_BITS,
+    all_lines, can_push, execute_push, find_rows_of_four, generate_board, iter_pushable_dots, occupancy,
+)
+
+
+def random_board(rng, fill):
+    board = generate_board()
+    for key in board:
+        if rng.random() < fill:
+            board[key] = {"color": rng.choice(["white", "black"]), "is_gipf": rng.random() < 0.2}
+    return board
+
+
+def scan_rows(board, color):
+    """Rows of four found by walking every line, as before the mask filter."""
+    rows = []
+    for line in all_lines():
+        owned = [board[key] is not None and board[key]["color"] == color for key in line]
+        start = 0
+        while start < len(line):
+            end = start
+            while end < len(line) and owned[end]:
+                end += 1
+            if end - start >= 4:
+                ext = []
+                j = start - 1
+                while j >= 0 and board[line[j]] is not None:
+                    ext.append(line[j])
+                    j -= 1
+                j = end
+                while j < len(line) and board[line[j]] is not None:
+                    ext.append(line[j])
+                    j += 1
+                core = line[start:end]
+                rows.append({"keys": core + ext, "core_keys": core, "extension_keys": ext})
+            start = max(end, start + 1)
+    return rows
+
+
+class TestGipfRows:
+
+    def test_rows_match_full_line_scan(self):
+        rng = random.Random(4)
+        found = 0
+        for _ in range(1500):
+            board = random_board(rng, rng.choice([0.3, 0.6, 0.85, 1.0]))
+            for color in ("white", "black"):
+                rows = find_rows_of_four(board, color)
+                assert rows == scan_rows(board, color)
+                found += len(rows)
+        assert found > 100
+
+
+class TestGipfPushes:
+
+    def test_push_masks_cover_push_lines(self):
+        assert len(EDGE_DOTS) == 24
+        for dot, line in PUSH_LINES.items():
+            assert PUSH_MASKS[dot] == sum(SPOT_BITS[key] for key in line)
+
+    def test_pushable_dots_match_line_walk(self):
+        rng = random.Random(5)
+        for _ in range(500):
+            board = random_board(rng, rng.choice([0.5, 0.9, 1.0]))
+            # Pushes leave realistic full and nearly full lines behind
+            for dot_info in rng.sample(EDGE_DOTS, 6):
+                if can_push(board, dot_info):
+                    execute_push(board, dot_info, {"color": "white", "is_gipf": False})
+            assert occupancy(board) == sum(SPOT_BITS[k] for k, piece in board.items() if piece is not None)
+            assert list(iter_pushable_dots(board)) == [d for d in EDGE_DOTS if can_push(board, d)]
+
+    def test_empty_and_full_boards(self):
+        board = generate_board()
+        assert list(iter_pushable_dots(board)) == EDGE_DOTS
+        for key in board:
+            board[key] = {"color": "black", "is_gipf": False}
+        assert list(iter_pushable_dots(board)) == []
@@ -0,0 +1,24 @@
+"""
+Tests for the shared precomputed hex geometry.
+"""
+
+from server.hexgrid import AXIAL_DIRS, LINE_AXES, HexGrid, hex_key
+from server.tzaar.state import ALL_POSITIONS
+
+
+class TestHexGrid:
+
+    def test_rays_and_lines_match_coordinate_walks(self):
+        grid = HexGrid(ALL_POSITIONS)    # Tzaar: the center hole ends rays
+        cells = set(ALL_POSITIONS)
+        for q, r in ALL_POSITIONS:
+            for d, (dq, dr) in enumerate(AXIAL_DIRS):
+                walk, nq, nr = [], q + dq, r + dr
+                while (nq, nr) in cells:
+                    walk.append(hex_key(nq, nr))
+                    nq, nr = nq + dq, nr + dr
+                assert list(grid.key_rays[hex_key(q, r)][d]) == walk
+        assert sum(len(line) for line in grid.lines) == len(LINE_AXES) * grid.size
+        for i, through in enumerate(grid.lines_through):
+            assert len(through) == len(LINE_AXES)
+            assert all(i in grid.lines[n] for n in through)
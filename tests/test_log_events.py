@@ -0,0 +1,66 @@
+"""
+Tests for structured log events and their catalog templates.
+"""
+
+import random
+
+import pytest
+
+from server.battleline.engine import BattleLineEngine
+from server.log_events import render_log
+from server.registry import ENGINES, load_engine
+from server.selfplay import random_policy
+
+
+class TestLogEvents:
+
+    engine = BattleLineEngine()
+
+    def test_events_render_from_catalog_templates(self):
+        state = self.engine.initial_state(["p1", "p2"], ["Alice", "Bob"], seed=1)
+        result = self.engine.apply_action(state, "p1", {"kind": "play_troop", "card_index": 0, "flag_index": 0})
+        assert result.log[0][0] == "play_troop"
+        templates = self.engine.get_catalog()["log"]
+        names = [p["name"] for p in result.new_state["players"]]
+        assert render_log(result.log, templates, names) == self.engine.render_log(result.new_state, result.log)
+        assert self.engine.render_log(state, [["pass", 1], "plain text"])[1] == "plain text"
+        with pytest.raises(ValueError, match="Unknown log event"):
+            self.engine.render_log(state, [["no_such_event"]])
+
+    def test_every_engine_declares_its_events(self):
+        for name in ENGINES:
+            engine = load_engine(name)()
+            ids = [f"p{i + 1}" for i in range(max(engine.player_count_range[0], 2))]
+            state = engine.initial_state(ids, ids, seed=1)
+            rng = random.Random(1)
+            for _ in range(20):
+                actions = [(pid, engine.get_valid_actions(state, pid)) for pid in engine.get_waiting_for(state)]
+                actions = [(pid, acts) for pid, acts in actions if acts]
+                if not actions:
+                    break
+                pid, acts = actions[0]
+                try:
+                    result = engine.apply_action(state, pid, random_policy(engine, state, pid, acts, rng))
+                except ValueError:
+                    break   # open-ended actions (e.g. Dragon drafts) the random policy can't fill in
+                engine.render_log(result.new_state, result.log)   # raises on undeclared codes
+                state = result.new_state
+                if result.game_over:
+                    break
+
+    def test_caylus_logs_only_events(self):
+        engine = load_engine("caylus")()
+        ids = ["p1", "p2", "p3", "p4"]
+        state = engine.initial_state(ids, ["A", "B", "C", "D"], seed=2)
+        rng = random.Random(2)
+        for _ in range(300):
+            pid = engine.get_waiting_for(state)[0]
+            actions = engine.get_valid_actions(state, pid)
+            result = engine.apply_action(state, pid, random_policy(engine, state, pid, actions, rng))
+            assert all(isinstance(entry, list) for entry in result.log), result.log
+            engine.render_log(result.new_state, result.log)
+            state = result.new_state
+            if result.game_over:
+                break
+        stables = engine.render_log(state, [["stables_order_3", 2, 0, 1]])
+        assert stables == ["Stables: new turn order — C, A, B"]
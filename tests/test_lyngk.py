@@ -0,0 +1,43 @@
+"""
+Tests for the LYNGK engine's stack codes and move index.
+"""
+
+import random
+
+from playout import random_playout
+from server.lyngk.engine import LyngkEngine
+from server.lyngk.state import (
+    ALL_PIECE_COLORS, JOKER_COLOR, MAX_STACK_HEIGHT, MoveIndex, can_stack_on, encode_stack,
+)
+
+
+class TestLyngkMoveIndex:
+
+    engine = LyngkEngine()
+
+    def test_stack_codes_match_list_rules(self):
+        rng = random.Random(2)
+        for _ in range(2000):
+            a = rng.sample(ALL_PIECE_COLORS, rng.randint(1, 3))
+            b = rng.sample(ALL_PIECE_COLORS, rng.randint(1, 3))
+            colors = [c for c in a + b if c != JOKER_COLOR]
+            expected = len(a) + len(b) <= MAX_STACK_HEIGHT and len(colors) == len(set(colors))
+            assert can_stack_on(a, b) == expected
+
+    def test_kept_index_matches_fresh_one(self):
+        for seed in range(6):
+            index = None
+            for step in random_playout(self.engine, seed):
+                if index is None:
+                    index = MoveIndex({key: list(stack) for key, stack in step.state["board"].items()})
+                state = step.result.new_state
+                if step.action["kind"] == "move":
+                    for key in (step.action["to"], step.action["from"]):
+                        index.set_stack(key, list(state["board"][key]))
+                assert index.board == state["board"]
+                for key in state["board"]:
+                    if state["board"][key]:
+                        assert index.code(key) == encode_stack(state["board"][key])
+                for color in ("white", "black"):
+                    assert list(index.iter_moves(state["claims"], color)) == \
+                        list(MoveIndex(state["board"]).iter_moves(state["claims"], color))
@@ -0,0 +1,47 @@
+"""
+Tests for opt-in engine profiling.
+"""
+
+import server.battleline.engine as battleline_engine
+from server.battleline.engine import BattleLineEngine
+from server.battleline.state import NUM_FLAGS
+from server.profiling import EngineProfiler
+
+
+def claim_phase_state(engine):
+    """A Battle Line state whose first player has just played a troop."""
+    state = engine.initial_state(["p1", "p2"], ["Alice", "Bob"], seed=1)
+    state["auto_claim"] = False
+    return engine.apply_action(state, "p1", {"kind": "play_troop", "card_index": 0, "flag_index": 0}).new_state
+
+
+class TestProfiling:
+
+    def test_records_methods_and_helpers_then_restores(self):
+        engine = BattleLineEngine()
+        original = battleline_engine.can_claim_flag
+        profiler = EngineProfiler(engine, "battleline:TEST", summary_interval=0).attach()
+        state = claim_phase_state(engine)
+        engine.get_valid_actions(state, "p1")
+        assert profiler.stats["apply_action"].calls == 1
+        assert profiler.stats["can_claim_flag"].calls == NUM_FLAGS
+
+        profiler.detach()
+        assert battleline_engine.can_claim_flag is original
+        assert "apply_action" not in engine.__dict__
+
+    def test_other_rooms_are_not_recorded_and_last_detach_restores(self):
+        original = battleline_engine.can_claim_flag
+        profiled, other = BattleLineEngine(), BattleLineEngine()
+        first = EngineProfiler(profiled, "battleline:A", summary_interval=0).attach()
+        second = EngineProfiler(BattleLineEngine(), "battleline:B", summary_interval=0).attach()
+        state = claim_phase_state(other)
+        other.get_valid_actions(state, "p1")
+        assert "can_claim_flag" not in first.stats and "can_claim_flag" not in second.stats
+
+        first.detach()
+        assert battleline_engine.can_claim_flag is not original   # B still profiled
+        profiled.get_valid_actions(state, "p1")
+        assert "can_claim_flag" not in first.stats
+        second.detach()
+        assert battleline_engine.can_claim_flag is original
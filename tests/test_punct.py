@@ -0,0 +1,32 @@
+"""
+Tests for the PUNCT engine's occupancy index.
+"""
+
+from playout import random_playout
+from server.punct.engine import PunctEngine
+from server.punct.state import Occupancy, is_piece_blocked
+
+
+class TestPunctOccupancy:
+
+    engine = PunctEngine()
+
+    def test_kept_index_matches_fresh_one(self):
+        for seed in range(3):
+            pieces = {}
+            occupancy = Occupancy(pieces)
+            for step in random_playout(self.engine, seed, max_actions=60):
+                state = step.result.new_state
+                piece_id = step.action.get("piece_id")
+                if piece_id is None:
+                    continue
+                if piece_id in pieces:
+                    occupancy.remove(piece_id)
+                    del pieces[piece_id]
+                pieces[piece_id] = dict(state["pieces"][piece_id])
+                occupancy.add(piece_id)
+                fresh = Occupancy(state["pieces"])
+                assert occupancy.grid == fresh.grid
+                assert occupancy.covered == fresh.covered
+                for piece_id in pieces:
+                    assert occupancy.covered[piece_id] == is_piece_blocked(pieces, piece_id)
@@ -0,0 +1,48 @@
+"""
+Tests for the headless self-play runner.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from server.selfplay import main, play_game, run
+
+
+def run_args(**overrides):
+    args = dict(seed=0, games=4, policy="random", players=None, max_actions=5000, no_views=True, workers=1)
+    args.update(overrides)
+    return SimpleNamespace(**args)
+
+
+class TestSelfPlay:
+
+    def test_seeded_games_finish_and_replay(self):
+        first = play_game("battleline", seed=7, views=False)
+        again = play_game("battleline", seed=7, views=False)
+        assert first["outcome"] == "finished", first["error"]
+        assert first["actions"] == again["actions"] > 0
+
+    @pytest.mark.parametrize("game, players", [
+        ("dragon", 2), ("dragon", 5), ("arboretum", 3), ("caylus", 4), ("dvonn", 2), ("zertz", 2), ("lyngk", 2),
+    ])
+    def test_engines_finish_under_random_policy(self, game, players):
+        # Dragon's descriptors are filled in by its scripted policy
+        for seed in range(3):
+            result = play_game(game, seed=seed, num_players=players, views=seed == 0)
+            assert result["outcome"] == "finished", result["error"]
+            assert result["actions"] > 0
+
+    def test_run_with_worker_pool(self):
+        pooled = run("yinsh", run_args(workers=2))
+        alone = run("yinsh", run_args())
+        assert pooled["outcomes"] == {"finished": 4}
+        assert pooled["actions"] == alone["actions"]
+        assert pooled["latency"]["apply_action"]["calls"] == pooled["actions"]
+
+    def test_all_exits_zero(self, capsys):
+        assert main(["all", "--games", "1", "--workers", "1", "--no-views", "--json"]) == 0
+        reports = json.loads(capsys.readouterr().out)
+        for report in reports:
+            assert report["failures"] == [] or report.get("ungated"), report["game"]
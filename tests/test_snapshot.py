@@ -0,0 +1,81 @@
+"""
+Tests for the compact binary snapshot codecs.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import server.tamsk.engine
+from playout import random_playout
+from server.battleline.engine import BattleLineEngine
+from server.lostcities.engine import LostCitiesEngine
+from server.registry import ENGINES, load_engine
+from server.selfplay import resolve_policy
+
+
+class TestSnapshots:
+
+    engine = BattleLineEngine()
+
+    def played_states(self):
+        state = self.engine.initial_state(["p1", "p2"], ["Alice", "Bob"], seed=3)
+        states = [state]
+        for _ in range(40):
+            player_id = self.engine.get_waiting_for(state)[0]
+            action = self.engine.get_valid_actions(state, player_id)[0]
+            state = self.engine.apply_action(state, player_id, action).new_state
+            states.append(state)
+        return states
+
+    def test_round_trip_and_size(self):
+        for state in self.played_states():
+            data = self.engine.encode_snapshot(state)
+            assert self.engine.decode_snapshot(data) == state
+        assert len(json.dumps(state)) >= 10 * len(data)
+
+    def test_every_engine_round_trips(self):
+        for name in ENGINES:
+            engine = load_engine(name)()
+            low = engine.player_count_range[0]
+            ids = [f"p{i + 1}" for i in range(max(low, 2))]
+            state = engine.initial_state(ids, ids, seed=1)
+            assert engine.decode_snapshot(engine.encode_snapshot(state)) == state, name
+
+    @pytest.mark.parametrize("name", list(ENGINES))
+    def test_finished_games_round_trip(self, name, monkeypatch):
+        # Final scoring adds the most structure; Tamsk's clock is stopped so
+        # no hourglass runs out between listing an action and applying it
+        monkeypatch.setattr(server.tamsk.engine, "time", SimpleNamespace(time=lambda: 1e9))
+        engine = load_engine(name)()
+        for seed in range(2):
+            state = None
+            for step in random_playout(engine, seed, policy=resolve_policy("random", name)):
+                state = step.result.new_state
+            # Over, or (Tamsk) no one waited on has an action left
+            assert not any(engine.get_valid_actions(state, p) for p in engine.get_waiting_for(state)), (name, seed)
+            assert engine.decode_snapshot(engine.encode_snapshot(state)) == state, (name, seed)
+
+    @pytest.mark.parametrize("name", ["zertz", "lyngk"])
+    def test_board_games_compress_tenfold(self, name):
+        engine = load_engine(name)()
+        for seed in range(5):
+            for step in random_playout(engine, seed, max_actions=200):
+                state = step.result.new_state
+                data = engine.encode_snapshot(state)
+                assert engine.decode_snapshot(data) == state
+                assert len(json.dumps(state)) >= 10 * len(data), (seed, len(data))
+        # Cells outside the declared ones still round-trip
+        cell = next(iter(state["board"]))
+        state["board"][cell] = {"odd": [1, 2.5]}
+        assert engine.decode_snapshot(engine.encode_snapshot(state)) == state
+
+    def test_rejects_foreign_or_corrupt_snapshots(self):
+        data = self.engine.encode_snapshot(self.played_states()[0])
+        with pytest.raises(ValueError, match="lostcities"):
+            LostCitiesEngine().decode_snapshot(data)
+        with pytest.raises(ValueError, match="schema version"):
+            self.engine.decode_snapshot(data[:3] + b"\x63" + data[4:])
+        with pytest.raises(ValueError, match="Corrupt"):
+            self.engine.decode_snapshot(data[:-8])
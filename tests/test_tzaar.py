@@ -0,0 +1,131 @@
+"""
+Tests for the TZAAR engine's piece index, packed batches and the search bot.
+"""
+
+import random
+
+import pytest
+
+from playout import check_batch_against_playouts, random_playout
+from server.batch import random_playouts
+from server.tzaar.bot import TzaarBot
+from server.tzaar.engine import TzaarEngine
+from server.tzaar.state import GRID, PieceIndex
+
+RANDOM_SETUP = {"kind": "set_setup", "setup": "random"}
+
+
+class TestTzaarPieceIndex:
+
+    engine = TzaarEngine()
+
+    def test_tracked_index_matches_rebuilt(self):
+        for seed in range(10):
+            index = None
+            for step in random_playout(self.engine, seed, setup=[RANDOM_SETUP]):
+                state = step.result.new_state
+                if index is None:
+                    index = PieceIndex(state["board"])
+                    continue
+                if step.action["kind"] in ("capture", "stack"):
+                    getattr(index, step.action["kind"])(step.action["from"], step.action["to"])
+                assert index.board == state["board"]
+                fresh = PieceIndex(state["board"])
+                assert index.pieces == fresh.pieces
+                assert index.type_counts == fresh.type_counts
+                assert index.heights == fresh.heights
+
+
+class TestTzaarBatch:
+
+    engine = TzaarEngine()
+
+    def test_steps_match_apply_action(self):
+        checked = check_batch_against_playouts(self.engine, range(8), setup=[RANDOM_SETUP], ordered=False)
+        assert checked > 300
+        fixed = {"kind": "set_setup", "setup": "fixed"}
+        assert check_batch_against_playouts(self.engine, range(2), setup=[fixed], ordered=False)
+
+    def test_moves_are_kept_across_steps(self):
+        # The move sets are updated per step, never rebuilt: compare them
+        # with a fresh pack of the same positions along a playout.
+        state = self.engine.initial_state(["p1", "p2"], ["A", "B"], seed=5)
+        batch = self.engine.pack_batch([state])
+        rng = random.Random(5)
+        batch.step([self.engine.encode_action(state, RANDOM_SETUP)])
+        while batch.legal_actions(0):
+            fresh = self.engine.pack_batch([batch.state(0)])
+            assert fresh.captures == batch.captures and fresh.stacks == batch.stacks
+            batch.step([rng.choice(batch.legal_actions(0))])
+        assert batch.is_over(0)
+
+    def test_boards_are_packed_one_row_per_game(self):
+        states = [self.engine.initial_state(["p1", "p2"], ["A", "B"], seed=s) for s in range(2)]
+        states[1] = self.engine.apply_action(states[1], "p1", RANDOM_SETUP).new_state
+        batch = self.engine.pack_batch(states)
+        assert len(batch.cells) == len(batch.heights) == 2 * GRID.size
+        assert not any(batch.cells[:GRID.size])
+        assert sorted(batch.cells[GRID.size:]) == [1] * 30 + [2] * 30
+        assert batch.states() == states
+
+    def test_illegal_action_rejected(self):
+        state = self.engine.initial_state(["p1", "p2"], ["A", "B"], seed=1)
+        batch = self.engine.pack_batch([state])
+        with pytest.raises(ValueError):
+            batch.step([self.engine.action_space.offset("pass")])
+        batch.step([self.engine.encode_action(state, RANDOM_SETUP)])
+        with pytest.raises(ValueError):
+            batch.step([self.engine.action_space.offset("pass")])
+        with pytest.raises(ValueError):
+            batch.step([None, None])
+
+    def test_random_playouts_finish(self):
+        states = [self.engine.initial_state(["p1", "p2"], ["A", "B"], seed=s) for s in range(20)]
+        batch = self.engine.pack_batch(states)
+        assert random_playouts(batch, random.Random(3)) > 20 * 10
+        assert all(batch.is_over(i) for i in range(batch.size))
+
+
+class TestTzaarBot:
+
+    engine = TzaarEngine()
+
+    def test_plays_legal_actions_and_beats_random(self):
+        engine = self.engine
+        # A fixed depth, with a budget it never runs into, keeps the game
+        # the same on any machine
+        bot = TzaarBot(time_budget=60, max_depth=2)
+        rng = random.Random(1)
+        state = engine.initial_state(["p1", "p2"], ["A", "B"], seed=1)
+        state = engine.apply_action(state, "p1", RANDOM_SETUP).new_state
+        while not state["game_over"]:
+            pid = engine.get_waiting_for(state)[0]
+            actions = engine.get_valid_actions(state, pid)
+            if pid == "p1":
+                action = bot.choose_action(state)
+                assert action in actions
+                assert bot.index.board == state["board"]   # search put everything back
+            else:
+                action = rng.choice(actions)
+            state = engine.apply_action(state, pid, action).new_state
+        assert state["winner"] == "p1"
+
+    def test_takes_a_winning_capture(self):
+        engine = self.engine
+        state = engine.initial_state(["p1", "p2"], ["A", "B"])
+        state = engine.apply_action(state, "p1", {"kind": "set_setup", "setup": "fixed"}).new_state
+        board = state["board"]
+        for key in board:
+            board[key] = None
+        board["1,0"] = {"color": "white", "type": "tzarra", "height": 2}
+        board["2,0"] = {"color": "black", "type": "tzaar", "height": 1}   # black's last tzaar
+        board["-1,0"] = {"color": "white", "type": "tott", "height": 1}
+        board["-2,0"] = {"color": "black", "type": "tzarra", "height": 1}
+        board["0,3"] = {"color": "white", "type": "tzaar", "height": 1}
+        board["0,-3"] = {"color": "black", "type": "tott", "height": 1}
+        board["3,0"] = {"color": "black", "type": "tott", "height": 1}
+        board["-3,0"] = {"color": "white", "type": "tzarra", "height": 1}
+        board["4,-4"] = {"color": "black", "type": "tzarra", "height": 1}
+        state["is_opening_move"] = False
+        action = TzaarBot(time_budget=0.2).choose_action(state)
+        assert action == {"kind": "capture", "from": "1,0", "to": "2,0"}
@@ -0,0 +1,92 @@
+"""
+Tests for the YINSH engine's bitboards, row detection and packed batches.
+"""
+
+import random
+
+import pytest
+
+from playout import check_batch_against_playouts, random_playout
+from server.batch import random_playouts
+from server.yinsh.bitboard import Bitboard, ids_of
+from server.yinsh.engine import YinshEngine
+from server.yinsh.state import GRID, find_ring_moves, find_rows, generate_board
+
+
+class TestYinshBitboard:
+
+    def test_matches_dict_board_helpers(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            board = generate_board()
+            for key in board:
+                roll = rng.random()
+                if roll < 0.6:
+                    board[key] = {"type": "marker", "color": rng.choice(["white", "black"])}
+                elif roll < 0.7:
+                    board[key] = {"type": "ring", "color": rng.choice(["white", "black"])}
+            bits = Bitboard.from_board(board)
+            for color in ("white", "black"):
+                assert bits.rows(color) == find_rows(board, color)
+            for key in rng.sample(list(board), 5):
+                moves = [{"to": GRID.keys[to], "flipped": sorted(GRID.to_keys(ids_of(flipped)))}
+                         for to, flipped in bits.ring_moves(GRID.ids[key])]
+                expected = [dict(m, flipped=sorted(m["flipped"])) for m in find_ring_moves(board, key)]
+                assert moves == expected
+
+    def test_incremental_rows_match_full_scan(self):
+        # Differential: after every ring move in seeded random games, the
+        # rows found on touched lines equal a full find_rows scan.
+        engine = YinshEngine()
+        moves = 0
+        for seed in range(15):
+            for step in random_playout(engine, seed):
+                if step.action["kind"] != "move_ring":
+                    continue
+                moves += 1
+                state = step.result.new_state
+                mover = state["players"][state["player_ids"].index(step.player_id)]["color"]
+                other = "black" if mover == "white" else "white"
+                if state["sub_phase"] == "remove_row" or state["game_over"]:
+                    assert state["pending_rows"] == find_rows(state["board"], mover)
+                    assert state["opponent_pending_rows"] == find_rows(state["board"], other)
+                else:
+                    assert find_rows(state["board"], mover) == find_rows(state["board"], other) == []
+        assert moves > 500
+
+
+class TestYinshBatch:
+
+    engine = YinshEngine()
+
+    def test_steps_match_apply_action(self):
+        assert check_batch_against_playouts(self.engine, range(8)) > 800
+
+    def test_boards_are_packed_one_row_per_game(self):
+        states = [self.engine.initial_state(["p1", "p2"], ["A", "B"]) for _ in range(3)]
+        states[1]["board"]["0,0"] = {"type": "ring", "color": "black"}
+        states[1]["board"]["1,0"] = {"type": "marker", "color": "white"}
+        batch = self.engine.pack_batch(states)
+        assert len(batch.cells) == 3 * GRID.size
+        row = batch.cells[GRID.size:2 * GRID.size]
+        assert row[GRID.ids["0,0"]] == 2 and row[GRID.ids["1,0"]] == 3
+        assert sum(row) == 5 and not any(batch.cells[:GRID.size])
+        assert batch.states() == states
+
+    def test_illegal_action_rejected(self):
+        state = self.engine.initial_state(["p1", "p2"], ["A", "B"])
+        batch = self.engine.pack_batch([state])
+        space = self.engine.action_space
+        batch.step([space.encode({"kind": "set_mode", "mode": "blitz"})])
+        place_center = space.encode({"kind": "place_ring", "position": "0,0"})
+        batch.step([place_center])
+        with pytest.raises(ValueError):
+            batch.step([place_center])
+        with pytest.raises(ValueError):
+            batch.step([space.encode({"kind": "pass"})])
+
+    def test_random_playouts_finish(self):
+        states = [self.engine.initial_state(["p1", "p2"], ["A", "B"]) for _ in range(20)]
+        batch = self.engine.pack_batch(states)
+        assert random_playouts(batch, random.Random(3)) > 20 * 60
+        assert all(not batch.legal_actions(i) for i in range(batch.size))
@@ -0,0 +1,123 @@
+"""
+Tests for the ZERTZ engine's capture search and ring graph.
+"""
+
+import random
+
+from server.zertz.state import (
+    GRID, find_all_captures, find_single_jumps, generate_board, has_any_capture, ring_graph,
+)
+from server.zertz.engine import ZertzEngine
+
+
+def random_board(rng, holes, fill=0.0):
+    """A board with up to `holes` rings removed, each ring holding a marble with probability fill."""
+    board = generate_board()
+    for key in rng.sample(list(board), rng.randrange(holes)):
+        del board[key]
+    for key in board if fill else ():
+        if rng.random() < fill:
+            board[key] = rng.choice(["white", "gray", "black"])
+    return board
+
+
+class TestZertzCaptures:
+
+    def test_jump_table_matches_ray_walk(self):
+        def reference(board, key):
+            # Walk the grid rays, as the engine did before the jump table
+            return [{"to": ray[1], "captured": ray[0]} for ray in GRID.key_rays[key]
+                    if len(ray) >= 2 and board.get(ray[0]) is not None
+                    and ray[1] in board and board[ray[1]] is None]
+
+        rng = random.Random(3)
+        captures = 0
+        for _ in range(300):
+            board = random_board(rng, 8, fill=rng.choice([0.05, 0.1, 0.3, 0.5, 0.65]))
+            expected = {key: reference(board, key) for key, marble in board.items() if marble is not None}
+            for key, jumps in expected.items():
+                assert find_single_jumps(board, key) == jumps
+            assert has_any_capture(board) == any(expected.values())
+            captures += any(expected.values())
+        assert 0 < captures < 300
+
+    def test_sequences_are_maximal_and_leave_board(self):
+        rng = random.Random(4)
+        for _ in range(100):
+            board = random_board(rng, 8, fill=0.6)
+            before = dict(board)
+            for capture in find_all_captures(board):
+                after = dict(board)
+                for step in capture["sequence"]:
+                    assert step in [dict(j, **{"from": step["from"]}) for j in find_single_jumps(after, step["from"])]
+                    after[step["to"]], after[step["from"]], after[step["captured"]] = after[step["from"]], None, None
+                assert not find_single_jumps(after, capture["sequence"][-1]["to"])
+            assert board == before
+
+
+class TestZertzRingGraph:
+
+    def test_removable_rings_match_removal_by_removal_check(self):
+        def connected(keys):
+            # Flood fill, as the per-candidate check did before
+            if not keys:
+                return True
+            start = next(iter(keys))
+            seen, stack = {start}, [start]
+            while stack:
+                for n in GRID.key_neighbors[stack.pop()]:
+                    if n in keys and n not in seen:
+                        seen.add(n)
+                        stack.append(n)
+            return seen == keys
+
+        rng = random.Random(5)
+        for _ in range(200):
+            board = random_board(rng, 30)
+            graph = ring_graph(board)
+            expected = {key for key in board
+                        if sum(n in board for n in GRID.key_neighbors[key]) < 6
+                        and connected(set(board) - {key})}
+            assert graph.removable == expected
+            assert set().union(*graph.components) == set(board)
+            assert graph.main == max(graph.components, key=len)
+
+    def test_incremental_removal_matches_fresh_graph(self):
+        def same(graph, board):
+            fresh = ring_graph(board)
+            assert graph.rings == fresh.rings
+            assert graph.components == fresh.components
+            assert graph.main == fresh.main
+            assert graph.removable == fresh.removable
+            assert all(graph.stays_connected(k) == fresh.stays_connected(k) for k in board)
+
+        rng = random.Random(6)
+        for _ in range(100):
+            board = generate_board()
+            graph = ring_graph(board)
+            while board:
+                key = rng.choice(list(board))
+                del board[key]
+                graph = graph.without(key)
+                same(graph, board)
+                if len(graph.components) > 1 and rng.random() < 0.5:
+                    for key in set(board) - graph.main:
+                        del board[key]
+                    graph = graph.keep_main()
+                    same(graph, board)
+
+    def test_engine_graph_follows_ring_removals(self):
+        engine = ZertzEngine()
+        state = engine.initial_state(["p1", "p2"], ["A", "B"], seed=3)
+        rng = random.Random(3)
+        removals = 0
+        while not state["game_over"] and removals < 12:
+            player = engine.get_waiting_for(state)[0]
+            action = rng.choice(engine.get_valid_actions(state, player))
+            state = engine.apply_action(state, player, action).new_state
+            if action["kind"] == "remove_ring":
+                removals += 1
+                fresh = ring_graph(state["board"])
+                assert engine._ring_graph.rings == fresh.rings
+                assert engine._ring_graph.removable == fresh.removable
+        assert removals
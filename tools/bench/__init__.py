@@ -0,0 +1 @@
+"""Engine micro-benchmarks — time engine methods at representative positions and gate regressions."""
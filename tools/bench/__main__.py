@@ -0,0 +1,6 @@
+"""Allow running as: python -m tools.bench"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,229 @@
+"""Per-engine micro-benchmarks with stored JSON baselines and a regression gate."""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+from pathlib import Path
+
+from server.batch import random_playouts
+from server.registry import load_engine
+from server.zertz.state import find_single_jumps, generate_board, has_any_capture
+
+from .positions import SPECS, build_position
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "default.json"
+
+METHODS = ("initial_state", "get_valid_actions", "apply_action", "get_player_view", "get_spectator_view")
+
+# Seeded random playouts timed per game, for engines with a packed batch
+PLAYOUT_SEEDS = range(16)
+
+# Seeded dense mid-game Zertz boards the capture scan is timed over
+CAPTURE_BOARDS = 64
+
+
+def method_calls(position):
+    """Return {method: zero-arg callable} timing each engine method at the position."""
+    engine, state, pid = position.engine, position.state, position.player_id
+    player_ids = list(state.get("player_ids") or [f"p{i + 1}" for i in range(SPECS[position.game].players)])
+    names = [f"Bot {i + 1}" for i in range(len(player_ids))]
+    # The server asks for valid actions before applying one; do the same so
+    # engines that validate against them are measured on their real path.
+    engine.get_valid_actions(state, pid)
+    return {
+        "initial_state": lambda: engine.initial_state(player_ids, names),
+        "get_valid_actions": lambda: engine.get_valid_actions(state, pid),
+        "apply_action": lambda: engine.apply_action(state, pid, position.action),
+        "get_player_view": lambda: engine.get_player_view(state, pid),
+        "get_spectator_view": lambda: engine.get_spectator_view(state),
+    }
+
+
+def time_call(fn, repeat):
+    """Best-of-`repeat` mean time per call, in microseconds."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def play_dict_games(engine, states, rng):
+    """Random playouts one game at a time through apply_action."""
+    for state in states:
+        while True:
+            waiting = engine.get_waiting_for(state)
+            actions = engine.get_valid_actions(state, waiting[0]) if waiting else []
+            if not actions:
+                break
+            state = engine.apply_action(state, waiting[0], rng.choice(actions)).new_state
+
+
+def playout_calls(game):
+    """
+    Return {metric: zero-arg callable} playing len(PLAYOUT_SEEDS) random
+    games from their initial states: "playout" one by one through
+    apply_action, "batch_playout" together in the engine's packed batch.
+    Empty for engines without one.
+    """
+    engine = load_engine(game)()
+    if engine.batch_class is None:
+        return {}
+    player_ids = [f"p{i + 1}" for i in range(SPECS[game].players)]
+    names = [f"Bot {i + 1}" for i in range(len(player_ids))]
+
+    def initial_states():
+        return [engine.initial_state(player_ids, names, seed=seed) for seed in PLAYOUT_SEEDS]
+
+    return {
+        "playout": lambda: play_dict_games(engine, initial_states(), random.Random(0)),
+        "batch_playout": lambda: random_playouts(engine.pack_batch(initial_states()), random.Random(0)),
+    }
+
+
+def time_playouts(fn, repeat, count=len(PLAYOUT_SEEDS)):
+    """Best-of-`repeat` time per game (or per `count` items) of a callable, in microseconds."""
+    return min(timeit.Timer(fn).repeat(repeat=repeat, number=1)) / count * 1e6
+
+
+def capture_boards():
+    """Dense mid-game Zertz boards: up to 8 rings removed, half to two thirds filled."""
+    rng = random.Random(0)
+    boards = []
+    for i in range(CAPTURE_BOARDS):
+        board = generate_board()
+        for key in rng.sample(list(board), rng.randrange(9)):
+            del board[key]
+        fill = 0.5 if i % 2 else 0.65
+        for key in board:
+            if rng.random() < fill:
+                board[key] = rng.choice(["white", "gray", "black"])
+        boards.append(board)
+    return boards
+
+
+def capture_calls(game):
+    """
+    Return {"capture_scan": zero-arg callable} scanning CAPTURE_BOARDS
+    boards the way a Zertz turn does: has_any_capture, then every
+    marble's single jumps. Empty for other games.
+    """
+    if game != "zertz":
+        return {}
+    boards = capture_boards()
+
+    def scan():
+        for board in boards:
+            if has_any_capture(board):
+                for key, marble in board.items():
+                    if marble is not None:
+                        find_single_jumps(board, key)
+
+    return {"capture_scan": scan}
+
+
+def run_benchmarks(games, repeat=5, out=print):
+    """Time every method for each game. Returns {"game.method": microseconds}."""
+    results = {}
+    for game in games:
+        position = build_position(game)
+        calls = method_calls(position)
+        # apply_action must be pure (the engine copies) or the position drifts
+        calls["apply_action"]()
+        for method in METHODS:
+            us = time_call(calls[method], repeat)
+            results[f"{game}.{method}"] = us
+            out(f"  {game:<11} {method:<19} {us:12.1f} µs   ({position.description})")
+        for metric, fn in playout_calls(game).items():
+            us = time_playouts(fn, repeat)
+            results[f"{game}.{metric}"] = us
+            out(f"  {game:<11} {metric:<19} {us:12.1f} µs   (per random game)")
+        for metric, fn in capture_calls(game).items():
+            us = time_playouts(fn, repeat, CAPTURE_BOARDS)
+            results[f"{game}.{metric}"] = us
+            out(f"  {game:<11} {metric:<19} {us:12.1f} µs   (per dense board)")
+    return results
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, metrics):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "unit": "microseconds per call",
+        "metrics": dict(sorted(metrics.items())),
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def compare(baseline, current, threshold, min_delta_us):
+    """
+    Return (regressions, rows). A metric regresses when it is more than
+    `threshold` (a fraction) slower than its baseline and by at least
+    min_delta_us, so tiny metrics don't trip on timer noise.
+    """
+    regressions, rows = [], []
+    for name, now in sorted(current.items()):
+        before = baseline.get(name)
+        if before is None:
+            rows.append((name, None, now, None, "new"))
+            continue
+        ratio = now / before if before else float("inf")
+        regressed = ratio > 1 + threshold and now - before >= min_delta_us
+        rows.append((name, before, now, ratio, "REGRESSED" if regressed else "ok"))
+        if regressed:
+            regressions.append(name)
+    return regressions, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tools.bench", description=__doc__)
+    parser.add_argument("command", choices=["run", "save", "check"],
+                        help="run: print timings; save: write baseline; check: compare to baseline")
+    parser.add_argument("--games", nargs="+", default=list(SPECS), choices=list(SPECS), metavar="GAME")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats (best is kept)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before check fails (0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=10.0,
+                        help="ignore slowdowns smaller than this many µs")
+    args = parser.parse_args(argv)
+
+    print(f"Benchmarking {len(args.games)} engine(s)…")
+    current = run_benchmarks(args.games, repeat=args.repeat)
+
+    if args.command == "save":
+        metrics = {}
+        if args.baseline.exists():
+            metrics = load_baseline(args.baseline)["metrics"]
+        metrics.update(current)
+        save_baseline(args.baseline, metrics)
+        print(f"Saved {len(current)} metrics to {args.baseline}")
+        return 0
+
+    if args.command == "check":
+        baseline = load_baseline(args.baseline)["metrics"]
+        regressions, rows = compare(baseline, current, args.threshold, args.min_delta)
+        print()
+        for name, before, now, ratio, status in rows:
+            before_s = f"{before:12.1f}" if before is not None else f"{'—':>12}"
+            ratio_s = f"{ratio:6.2f}x" if ratio is not None else f"{'':>7}"
+            print(f"  {name:<32} {before_s} → {now:12.1f} µs  {ratio_s}  {status}")
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed more than {args.threshold:.0%}: "
+                  f"{', '.join(regressions)}")
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
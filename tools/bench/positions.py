@@ -0,0 +1,104 @@
+"""Representative benchmark positions, reached by seeded random play."""
+
+import random
+from dataclasses import dataclass
+
+from server.dragon.policy import draft_pick
+from server.registry import load_engine
+from server.selfplay import random_policy
+
+
+@dataclass
+class Position:
+    """A game state plus the player to move and one action to apply."""
+    game: str
+    description: str
+    engine: object
+    state: dict
+    player_id: str
+    action: dict
+
+
+@dataclass
+class PositionSpec:
+    description: str
+    players: int
+    reached: object                 # (state, actions_played) -> bool
+    choose: object = None           # (actions) -> action; default random
+    max_actions: int = 2000
+
+
+def _after(n):
+    return lambda state, played: played >= n
+
+
+def _yinsh_full_markers(state, played):
+    markers = sum(1 for cell in state["board"].values() if cell and cell["type"] == "marker")
+    return markers >= 30 and state.get("sub_phase") == "move_ring"
+
+
+def _battleline_late_claim(state, played):
+    if state["phase"] != "claim_flags" or state["turn_number"] < 16:
+        return False
+    contested = sum(1 for flag in state["flags"]
+                    if flag["claimed_by"] is None and all(flag["slots"]))
+    return contested >= 5
+
+
+def _arboretum_final_discard(state, played):
+    return state["phase"] == "discard" and not state["draw_pile"]
+
+
+def _prefer_claim(actions):
+    claims = [a for a in actions if a["kind"] == "claim_flag"]
+    return (claims or actions)[0]
+
+
+SPECS = {
+    "dragon": PositionSpec("opening draft, 5 players", 5, _after(0), draft_pick),
+    "battleline": PositionSpec("late-game claim proof", 2, _battleline_late_claim, _prefer_claim),
+    "arboretum": PositionSpec("discard triggering final scoring, 4 players", 4, _arboretum_final_discard),
+    "lostcities": PositionSpec("mid-game, 40 actions in", 2, _after(40)),
+    "caylus": PositionSpec("turn 8, 5 players", 5, lambda s, n: s["turn"] >= 8),
+    "tamsk": PositionSpec("mid-game, 12 actions in", 2, _after(12)),
+    "dvonn": PositionSpec("movement phase, 60 actions in", 2, _after(60)),
+    "yinsh": PositionSpec("30+ markers, ring to move", 2, _yinsh_full_markers),
+    "zertz": PositionSpec("mid-game, 16 actions in", 2, _after(16)),
+    "tzaar": PositionSpec("mid-game, 30 actions in", 2, _after(30)),
+    "gipf": PositionSpec("mid-game, 12 actions in", 2, _after(12)),
+    "punct": PositionSpec("mid-game, 20 actions in", 2, _after(20)),
+    "lyngk": PositionSpec("mid-game, 20 actions in", 2, _after(20)),
+}
+
+
+def build_position(game, seeds=200):
+    """
+    Play seeded random games of `game` until one reaches its spec'd
+    position, and return it. Raises ValueError if no seed gets there.
+    """
+    spec = SPECS[game]
+    engine = load_engine(game)()
+    player_ids = [f"p{i + 1}" for i in range(spec.players)]
+    names = [f"Bot {i + 1}" for i in range(spec.players)]
+    for seed in range(seeds):
+        rng = random.Random(seed)
+        state = engine.initial_state(player_ids, names, seed)
+        for played in range(spec.max_actions):
+            waiting = engine.get_waiting_for(state)
+            if not waiting:
+                break
+            for player_id in waiting:
+                actions = engine.get_valid_actions(state, player_id)
+                if actions:
+                    break
+            else:
+                break
+            if spec.reached(state, played):
+                choose = spec.choose or (lambda acts: random_policy(engine, state, player_id, acts, rng))
+                return Position(game, spec.description, engine, state, player_id, choose(actions))
+            action = random_policy(engine, state, player_id, actions, rng)
+            try:
+                state = engine.apply_action(state, player_id, action).new_state
+            except ValueError:
+                break
+    raise ValueError(f"No seed reached the {game} benchmark position ({spec.description})")